@@ -1,7 +1,16 @@
 """History integration constants."""
 
+from datetime import timedelta
+
 DOMAIN = "history"
 
 EVENT_COALESCE_TIME = 0.35
 
 MAX_PENDING_HISTORY_STATES = 2048
+
+MAX_DOWNSAMPLE_BUCKETS = 10000
+
+# Chunked history responses fetch and send the states of at most
+# CHUNK_MAX_ENTITIES entities in a CHUNK_TIME_WINDOW per message
+CHUNK_MAX_ENTITIES = 50
+CHUNK_TIME_WINDOW = timedelta(days=1)
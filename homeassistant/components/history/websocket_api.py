@@ -13,6 +13,7 @@ import voluptuous as vol
 
 from homeassistant.components import websocket_api
 from homeassistant.components.recorder import get_instance, history
+from homeassistant.components.recorder.util import session_scope
 from homeassistant.components.websocket_api import ActiveConnection, messages
 from homeassistant.const import (
     COMPRESSED_STATE_ATTRIBUTES,
@@ -30,6 +31,7 @@ from homeassistant.core import (
     is_callback,
     valid_entity_id,
 )
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.event import (
     async_track_point_in_utc_time,
     async_track_state_change_event,
@@ -38,7 +40,13 @@ from homeassistant.helpers.json import json_bytes
 from homeassistant.util.async_ import create_eager_task
 import homeassistant.util.dt as dt_util
 
-from .const import EVENT_COALESCE_TIME, MAX_PENDING_HISTORY_STATES
+from .const import (
+    CHUNK_MAX_ENTITIES,
+    CHUNK_TIME_WINDOW,
+    EVENT_COALESCE_TIME,
+    MAX_DOWNSAMPLE_BUCKETS,
+    MAX_PENDING_HISTORY_STATES,
+)
 from .helpers import entities_may_have_state_changes_after, has_states_before
 
 _LOGGER = logging.getLogger(__name__)
@@ -93,6 +101,162 @@ def _ws_get_significant_states(
     )
 
 
+def _ws_get_downsampled_states(
+    hass: HomeAssistant,
+    msg_id: int,
+    start_time: dt,
+    end_time: dt | None,
+    entity_ids: list[str],
+    bucket_size: float,
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+) -> bytes:
+    """Fetch downsampled history and convert it to json in the executor."""
+    with session_scope(hass=hass, read_only=True) as session:
+        return json_bytes(
+            messages.result_message(
+                msg_id,
+                history.get_downsampled_states_with_session(
+                    hass,
+                    session,
+                    start_time,
+                    end_time,
+                    entity_ids,
+                    bucket_size,
+                    include_start_time_state,
+                    significant_changes_only,
+                ),
+            )
+        )
+
+
+def _ws_get_significant_states_chunk(
+    hass: HomeAssistant,
+    msg_id: int,
+    start_time: dt,
+    end_time: dt,
+    entity_ids: list[str],
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    minimal_response: bool,
+    no_attributes: bool,
+    last_chunk: bool,
+) -> bytes | None:
+    """Fetch a chunk of history and convert it to json in the executor.
+
+    Returns None if the chunk has no states and is not the last one.
+    """
+    with session_scope(hass=hass, read_only=True) as session:
+        states = cast(
+            dict[str, list[dict[str, Any]]],
+            history.get_significant_states_with_session(
+                hass,
+                session,
+                start_time,
+                end_time,
+                entity_ids,
+                None,
+                include_start_time_state,
+                significant_changes_only,
+                minimal_response,
+                no_attributes,
+                True,
+            ),
+        )
+    if not states and not last_chunk:
+        return None
+    message = _generate_stream_message(states, start_time, end_time)
+    if not last_chunk:
+        # This is a hint to consumers of the api that
+        # another chunk of the history will follow
+        message["partial"] = True
+    return json_bytes(messages.event_message(msg_id, message))
+
+
+def _history_chunks(
+    start_time: dt, end_time: dt, entity_ids: list[str]
+) -> list[tuple[dt, dt, list[str]]]:
+    """Split a history request into time windows and groups of entities.
+
+    The states are fetched after the start time and before the end time
+    so each window except the last ends just after the start of the next
+    one to include the states which are exactly on the boundary.
+    """
+    windows: list[tuple[dt, dt]] = []
+    window_start = start_time
+    while (window_end := window_start + CHUNK_TIME_WINDOW) < end_time:
+        windows.append((window_start, window_end + timedelta(microseconds=1)))
+        window_start = window_end
+    windows.append((window_start, end_time))
+    return [
+        (window_start, window_end, entity_ids[idx : idx + CHUNK_MAX_ENTITIES])
+        for window_start, window_end in windows
+        for idx in range(0, len(entity_ids), CHUNK_MAX_ENTITIES)
+    ]
+
+
+async def _async_send_history_chunks(
+    hass: HomeAssistant,
+    connection: ActiveConnection,
+    msg: dict[str, Any],
+    start_time: dt,
+    end_time: dt,
+    entity_ids: list[str],
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    minimal_response: bool,
+    no_attributes: bool,
+) -> None:
+    """Fetch and send the history one chunk at a time.
+
+    The next chunk is only fetched once the previous one has been
+    sent so at most one chunk is held in memory. If fetching a chunk
+    fails an error is sent in place of the remaining chunks so the
+    client does not wait for a last event which never comes.
+    """
+    instance = get_instance(hass)
+    chunks = _history_chunks(start_time, end_time, entity_ids)
+    last_idx = len(chunks) - 1
+    try:
+        for idx, (chunk_start, chunk_end, chunk_entity_ids) in enumerate(chunks):
+            payload = await instance.async_add_read_executor_job(
+                _ws_get_significant_states_chunk,
+                hass,
+                msg["id"],
+                chunk_start,
+                chunk_end,
+                chunk_entity_ids,
+                include_start_time_state and chunk_start == start_time,
+                significant_changes_only,
+                minimal_response,
+                no_attributes,
+                idx == last_idx,
+            )
+            if payload:
+                connection.send_message(payload)
+                await connection.async_wait_send_queue_drained()
+    except Exception as err:  # noqa: BLE001
+        connection.async_handle_exception(msg, err)
+
+
+def _downsample_bucket_size(
+    start_time: dt,
+    end_time: dt | None,
+    buckets: int | None,
+    minimum_resolution: timedelta | None,
+) -> float:
+    """Return the size in seconds of a downsample bucket.
+
+    The number of buckets is capped at MAX_DOWNSAMPLE_BUCKETS.
+    """
+    span = ((end_time or dt_util.utcnow()) - start_time).total_seconds()
+    bucket_size = span / min(buckets or MAX_DOWNSAMPLE_BUCKETS, MAX_DOWNSAMPLE_BUCKETS)
+    if minimum_resolution:
+        bucket_size = max(bucket_size, minimum_resolution.total_seconds())
+    # Guard against a zero sized bucket when start and end are equal
+    return max(bucket_size, 1.0)
+
+
 @websocket_api.websocket_command(
     {
         vol.Required("type"): "history/history_during_period",
@@ -103,6 +267,11 @@ def _ws_get_significant_states(
         vol.Optional("significant_changes_only", default=True): bool,
         vol.Optional("minimal_response", default=False): bool,
         vol.Optional("no_attributes", default=False): bool,
+        vol.Optional("buckets"): vol.All(
+            int, vol.Range(min=1, max=MAX_DOWNSAMPLE_BUCKETS)
+        ),
+        vol.Optional("minimum_resolution"): cv.positive_time_period_dict,
+        vol.Optional("chunked", default=False): bool,
     }
 )
 @websocket_api.async_response
@@ -128,8 +297,20 @@ async def ws_get_history_during_period(
     else:
         end_time = None
 
+    downsampled = "buckets" in msg or "minimum_resolution" in msg
+    if (chunked := msg["chunked"]) and downsampled:
+        connection.send_error(
+            msg["id"],
+            websocket_api.ERR_INVALID_FORMAT,
+            "Downsampled history cannot be chunked",
+        )
+        return
+
     if start_time > dt_util.utcnow():
-        connection.send_result(msg["id"], {})
+        if chunked:
+            _async_send_empty_response(connection, msg["id"], start_time, end_time)
+        else:
+            connection.send_result(msg["id"], {})
         return
 
     entity_ids: list[str] = msg["entity_ids"]
@@ -152,14 +333,60 @@ async def ws_get_history_during_period(
             hass, entity_ids, start_time, no_attributes
         )
     ):
-        connection.send_result(msg["id"], {})
+        if chunked:
+            _async_send_empty_response(connection, msg["id"], start_time, end_time)
+        else:
+            connection.send_result(msg["id"], {})
         return
 
     significant_changes_only = msg["significant_changes_only"]
     minimal_response = msg["minimal_response"]
 
+    if downsampled:
+        connection.send_message(
+            await get_instance(hass).async_add_read_executor_job(
+                _ws_get_downsampled_states,
+                hass,
+                msg["id"],
+                start_time,
+                end_time,
+                entity_ids,
+                _downsample_bucket_size(
+                    start_time,
+                    end_time,
+                    msg.get("buckets"),
+                    msg.get("minimum_resolution"),
+                ),
+                include_start_time_state,
+                significant_changes_only,
+            )
+        )
+        return
+
+    if chunked:
+        # The result is sent first and the states follow as events,
+        # the last event is the one which is not partial.
+        connection.send_result(msg["id"])
+        task = create_eager_task(
+            _async_send_history_chunks(
+                hass,
+                connection,
+                msg,
+                start_time,
+                end_time or dt_util.utcnow(),
+                entity_ids,
+                include_start_time_state,
+                significant_changes_only,
+                minimal_response,
+                no_attributes,
+            )
+        )
+        connection.subscriptions[msg["id"]] = task.cancel
+        task.add_done_callback(lambda _: connection.subscriptions.pop(msg["id"], None))
+        return
+
     connection.send_message(
-        await get_instance(hass).async_add_executor_job(
+        await get_instance(hass).async_add_read_executor_job(
             _ws_get_significant_states,
             hass,
             msg["id"],
@@ -282,7 +509,7 @@ async def _async_send_historical_states(
 ) -> dt | None:
     """Fetch history significant_states and send them to the client."""
     instance = get_instance(hass)
-    last_time_ts, last_time_dt, payload = await instance.async_add_executor_job(
+    last_time_ts, last_time_dt, payload = await instance.async_add_read_executor_job(
         _generate_historical_response,
         hass,
         msg_id,
@@ -7,7 +7,12 @@ from typing import Any
 
 import voluptuous as vol
 
-from homeassistant.const import CONF_EVENT_DATA, CONF_PLATFORM, EVENT_STATE_REPORTED
+from homeassistant.const import (
+    CONF_EVENT_DATA,
+    CONF_PLATFORM,
+    EVENT_STATE_REPORTED,
+    MATCH_ALL,
+)
 from homeassistant.core import CALLBACK_TYPE, Event, HassJob, HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_validation as cv, template
@@ -48,6 +53,17 @@ def _schema_value(value: Any) -> Any:
     return value
 
 
+def _listen_key_item(items: ItemsView) -> tuple[str, Any] | None:
+    """Return the first item with a hashable value to key the listener on."""
+    for key, value in items:
+        try:
+            hash(value)
+        except TypeError:
+            continue
+        return key, value
+    return None
+
+
 async def async_attach_trigger(
     hass: HomeAssistant,
     config: ConfigType,
@@ -166,10 +182,29 @@ async def async_attach_trigger(
         )
 
     event_filter = filter_event if event_data_items or event_data_schema else None
-    removes = [
-        hass.bus.async_listen(event_type, handle_event, event_filter=event_filter)
-        for event_type in event_types
-    ]
+    key_item: tuple[str, Any] | None = None
+    keyed_event_filter = None
+    if event_data_items and (key_item := _listen_key_item(event_data_items)):
+        # The bus matches the key, the filter is only needed for the other items
+        keyed_event_filter = event_filter if len(event_data_items) > 1 else None
+    removes: list[CALLBACK_TYPE] = []
+    for event_type in event_types:
+        if key_item is None or event_type == MATCH_ALL:
+            removes.append(
+                hass.bus.async_listen(
+                    event_type, handle_event, event_filter=event_filter
+                )
+            )
+            continue
+        # Dispatch on one of the items so the bus does not have to run
+        # the filter for every event of the type, keyed listeners need
+        # an event type so MATCH_ALL uses the filter
+        key, value = key_item
+        removes.append(
+            hass.bus.async_listen_keyed(
+                event_type, key, value, handle_event, event_filter=keyed_event_filter
+            )
+        )
 
     @callback
     def remove_listen_events() -> None:
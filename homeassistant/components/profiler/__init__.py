@@ -19,14 +19,17 @@ import voluptuous as vol
 
 from homeassistant.components import persistent_notification
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TYPE
+from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TYPE, Platform
 from homeassistant.core import HomeAssistant, ServiceCall, callback
 from homeassistant.exceptions import HomeAssistantError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.service import async_register_admin_service
+from homeassistant.helpers.typing import ConfigType
 
-from .const import DOMAIN
+from . import websocket_api
+from .const import DOMAIN, LOOP_PROFILER
+from .job_profiler import LoopProfiler
 
 SERVICE_START = "start"
 SERVICE_MEMORY = "memory"
@@ -76,15 +79,28 @@ CONF_MAX_OBJECTS = "max_objects"
 LOG_INTERVAL_SUB = "log_interval_subscription"
 
 
+PLATFORMS = [Platform.SENSOR]
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
 _LOGGER = logging.getLogger(__name__)
 
 
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the profiler websocket API."""
+    websocket_api.async_setup(hass)
+    return True
+
+
 async def async_setup_entry(  # noqa: C901
     hass: HomeAssistant, entry: ConfigEntry
 ) -> bool:
     """Set up Profiler from a config entry."""
     lock = asyncio.Lock()
     domain_data = hass.data[DOMAIN] = {}
+    # The loop profiler is always on while the integration is loaded
+    loop_profiler = domain_data[LOOP_PROFILER] = LoopProfiler()
+    hass.job_profiler = loop_profiler
 
     async def _async_run_profile(call: ServiceCall) -> None:
         async with lock:
@@ -382,11 +398,17 @@ async def async_setup_entry(  # noqa: C901
         _async_dump_current_tasks,
     )
 
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
+    if not await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+        return False
+    if hass.job_profiler is hass.data[DOMAIN][LOOP_PROFILER]:
+        hass.job_profiler = None
     for service in SERVICES:
         hass.services.async_remove(domain=DOMAIN, service=service)
     if LOG_INTERVAL_SUB in hass.data[DOMAIN]:
@@ -0,0 +1,32 @@
+"""Diagnostics support for the profiler."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.websocket_api.http import async_get_websocket_stats
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.service import async_get_target_resolution_cache
+from homeassistant.helpers.timer_wheel import async_get_timer_wheel
+
+from .const import DOMAIN, LOOP_PROFILER
+from .job_profiler import LoopProfiler
+
+MAX_JOBS = 20
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, config_entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    profiler: LoopProfiler = hass.data[DOMAIN][LOOP_PROFILER]
+
+    return {
+        "loop": profiler.as_dict(MAX_JOBS),
+        "timers": async_get_timer_wheel(hass).as_dict(),
+        "target_resolution_cache": async_get_target_resolution_cache(
+            hass
+        ).async_get_stats(),
+        "websocket": async_get_websocket_stats(hass).as_dict(),
+    }
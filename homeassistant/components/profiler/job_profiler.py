@@ -0,0 +1,144 @@
+"""Measure the time jobs and events take in the event loop."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import functools
+import time
+from typing import Any
+
+from homeassistant.core import HassJob
+from homeassistant.util.event_type import EventType
+
+# Jobs which are not part of an integration are grouped as core
+CORE_GROUP = "core"
+
+_INTEGRATION_PREFIXES = ("homeassistant.components.", "custom_components.")
+
+
+@dataclass(slots=True)
+class LoopStats:
+    """Call count and event loop time."""
+
+    count: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+
+    def add(self, elapsed: float) -> None:
+        """Record a run."""
+        self.count += 1
+        self.total_time += elapsed
+        self.max_time = max(elapsed, self.max_time)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics as a dict."""
+        return {
+            "count": self.count,
+            "total_time": self.total_time,
+            "max_time": self.max_time,
+        }
+
+
+def _job_function(target: Any) -> Any:
+    """Return the function run by a job target."""
+    while isinstance(target, functools.partial):
+        target = target.func
+    return getattr(target, "__func__", target)
+
+
+def _job_source(func: Any) -> tuple[str, str]:
+    """Return the group and the label of a job function."""
+    module: str = getattr(func, "__module__", None) or type(func).__module__
+    qualname: str = getattr(func, "__qualname__", None) or type(func).__qualname__
+    group = CORE_GROUP
+    for prefix in _INTEGRATION_PREFIXES:
+        if module.startswith(prefix):
+            group = module[len(prefix) :].partition(".")[0]
+            break
+    return group, f"{module}.{qualname}"
+
+
+class LoopProfiler:
+    """Aggregate the event loop time of callback jobs and events.
+
+    Callback jobs are timed when they are run, the time of a job
+    excludes the time of the nested jobs it runs so each job is
+    only counted once. Coroutine and executor jobs are not timed
+    since they do not run when they are scheduled.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the profiler."""
+        self.started = time.monotonic()
+        self.groups: dict[str, LoopStats] = {}
+        self.jobs: dict[str, LoopStats] = {}
+        self.events: dict[EventType[Any] | str, LoopStats] = {}
+        self._sources: dict[Any, tuple[LoopStats, LoopStats]] = {}
+        self._nested_time = 0.0
+
+    def run_callback(self, hassjob: HassJob[..., Any], args: tuple[Any, ...]) -> None:
+        """Run and measure a callback job."""
+        outer_nested_time = self._nested_time
+        self._nested_time = 0.0
+        start = time.perf_counter()
+        try:
+            hassjob.target(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            own_time = elapsed - self._nested_time
+            self._nested_time = outer_nested_time + elapsed
+            self._record_job(hassjob, own_time)
+
+    def _record_job(self, hassjob: HassJob[..., Any], elapsed: float) -> None:
+        """Record the time of a job in its group and label."""
+        func = _job_function(hassjob.target)
+        # Closures created for every call share the code object
+        key = getattr(func, "__code__", None) or type(func)
+        if (stats := self._sources.get(key)) is None:
+            group, label = _job_source(func)
+            if (group_stats := self.groups.get(group)) is None:
+                group_stats = self.groups[group] = LoopStats()
+            if (job_stats := self.jobs.get(label)) is None:
+                job_stats = self.jobs[label] = LoopStats()
+            stats = self._sources[key] = (group_stats, job_stats)
+        stats[0].add(elapsed)
+        stats[1].add(elapsed)
+
+    def record_event(self, event_type: EventType[Any] | str, elapsed: float) -> None:
+        """Record the time taken to dispatch an event."""
+        if (stats := self.events.get(event_type)) is None:
+            stats = self.events[event_type] = LoopStats()
+        stats.add(elapsed)
+
+    @property
+    def total_time(self) -> float:
+        """Return the event loop time of all the jobs."""
+        return sum(stats.total_time for stats in self.groups.values())
+
+    @property
+    def total_count(self) -> int:
+        """Return the number of jobs run."""
+        return sum(stats.count for stats in self.groups.values())
+
+    def as_dict(self, limit: int | None = None) -> dict[str, Any]:
+        """Return the collected data as a dict, the slowest first."""
+        return {
+            "uptime": time.monotonic() - self.started,
+            "total_time": self.total_time,
+            "total_count": self.total_count,
+            "integrations": _slowest(self.groups, None),
+            "jobs": _slowest(self.jobs, limit),
+            "events": _slowest(self.events, limit),
+        }
+
+
+def _slowest[_KeyT](
+    stats: dict[_KeyT, LoopStats], limit: int | None
+) -> dict[_KeyT, Any]:
+    """Return the statistics with the largest total time."""
+    return {
+        name: item.as_dict()
+        for name, item in sorted(
+            stats.items(), key=lambda item: item[1].total_time, reverse=True
+        )[:limit]
+    }
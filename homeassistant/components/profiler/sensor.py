@@ -0,0 +1,120 @@
+"""Sensors of the event loop time taken by the jobs."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+import time
+
+from homeassistant.components.sensor import SensorEntity, SensorStateClass
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import PERCENTAGE, EntityCategory
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN, LOOP_PROFILER
+from .job_profiler import LoopProfiler
+
+SCAN_INTERVAL = timedelta(seconds=30)
+
+ATTR_CALLS = "calls"
+ATTR_LOOP_TIME = "loop_time"
+ATTR_INTEGRATIONS = "integrations"
+
+MAX_INTEGRATIONS = 5
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up the event loop sensors."""
+    profiler: LoopProfiler = hass.data[DOMAIN][LOOP_PROFILER]
+    async_add_entities(
+        [
+            LoopBusySensor(entry, profiler),
+            BusiestIntegrationSensor(entry, profiler),
+        ]
+    )
+
+
+class LoopProfilerSensor(SensorEntity):
+    """Base class of the sensors of the event loop profiler."""
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, entry: ConfigEntry, profiler: LoopProfiler) -> None:
+        """Initialize the sensor."""
+        self._profiler = profiler
+        self._attr_unique_id = f"{entry.entry_id}_{self._attr_translation_key}"
+
+
+class LoopBusySensor(LoopProfilerSensor):
+    """Share of the event loop time taken by the jobs since the last update."""
+
+    _attr_translation_key = "loop_busy"
+    _attr_native_unit_of_measurement = PERCENTAGE
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_suggested_display_precision = 1
+
+    def __init__(self, entry: ConfigEntry, profiler: LoopProfiler) -> None:
+        """Initialize the sensor."""
+        super().__init__(entry, profiler)
+        self._last_time = time.monotonic()
+        self._last_total_time = profiler.total_time
+
+    async def async_update(self) -> None:
+        """Update the share of the event loop time."""
+        now = time.monotonic()
+        total_time = self._profiler.total_time
+        if elapsed := now - self._last_time:
+            self._attr_native_value = min(
+                100.0, (total_time - self._last_total_time) / elapsed * 100
+            )
+        self._last_time = now
+        self._last_total_time = total_time
+
+
+class BusiestIntegrationSensor(LoopProfilerSensor):
+    """Integration which took the most event loop time since the last update."""
+
+    _attr_translation_key = "busiest_integration"
+    _unrecorded_attributes = frozenset({ATTR_INTEGRATIONS})
+
+    def __init__(self, entry: ConfigEntry, profiler: LoopProfiler) -> None:
+        """Initialize the sensor."""
+        super().__init__(entry, profiler)
+        self._last: dict[str, tuple[int, float]] = self._snapshot()
+
+    def _snapshot(self) -> dict[str, tuple[int, float]]:
+        """Return the call count and the time of the integrations."""
+        return {
+            group: (stats.count, stats.total_time)
+            for group, stats in self._profiler.groups.items()
+        }
+
+    async def async_update(self) -> None:
+        """Update the integration which took the most event loop time."""
+        current = self._snapshot()
+        deltas: list[tuple[float, int, str]] = []
+        for group, (count, total_time) in current.items():
+            last_count, last_total_time = self._last.get(group, (0, 0.0))
+            if count != last_count:
+                deltas.append((total_time - last_total_time, count - last_count, group))
+        self._last = current
+        if not deltas:
+            self._attr_native_value = None
+            self._attr_extra_state_attributes = {}
+            return
+        deltas.sort(reverse=True)
+        loop_time, calls, group = deltas[0]
+        self._attr_native_value = group
+        self._attr_extra_state_attributes = {
+            ATTR_LOOP_TIME: round(loop_time, 6),
+            ATTR_CALLS: calls,
+            ATTR_INTEGRATIONS: {
+                delta_group: round(delta_time, 6)
+                for delta_time, _, delta_group in deltas[:MAX_INTEGRATIONS]
+            },
+        }
@@ -0,0 +1,82 @@
+"""The profiler websocket API."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import time
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.timer_wheel import async_get_timer_wheel
+
+from .const import DOMAIN, LOOP_PROFILER
+from .job_profiler import LoopProfiler
+
+DEFAULT_INTERVAL = 5
+DEFAULT_LIMIT = 20
+
+
+@callback
+def async_setup(hass: HomeAssistant) -> None:
+    """Set up the profiler websocket API."""
+    websocket_api.async_register_command(hass, ws_subscribe_loop_stats)
+
+
+@callback
+@websocket_api.require_admin
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "profiler/subscribe_loop_stats",
+        vol.Optional("interval", default=DEFAULT_INTERVAL): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=3600)
+        ),
+        vol.Optional("limit", default=DEFAULT_LIMIT): vol.All(
+            int, vol.Range(min=1, max=1000)
+        ),
+    }
+)
+def ws_subscribe_loop_stats(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Subscribe to the event loop time taken by the jobs."""
+    if (domain_data := hass.data.get(DOMAIN)) is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Profiler is not loaded"
+        )
+        return
+
+    profiler: LoopProfiler = domain_data[LOOP_PROFILER]
+    last_time = time.monotonic()
+    last_total_time = profiler.total_time
+
+    @callback
+    def async_send_stats(now: datetime | None = None) -> None:
+        nonlocal last_time, last_total_time
+        current_time = time.monotonic()
+        total_time = profiler.total_time
+        busy = (total_time - last_total_time) / (current_time - last_time or 1)
+        last_time = current_time
+        last_total_time = total_time
+        connection.send_message(
+            websocket_api.event_message(
+                msg["id"],
+                {
+                    "loop_busy": min(100.0, busy * 100),
+                    **profiler.as_dict(msg["limit"]),
+                    "timers": async_get_timer_wheel(hass).as_dict(),
+                },
+            )
+        )
+
+    connection.subscriptions[msg["id"]] = async_track_time_interval(
+        hass,
+        async_send_stats,
+        timedelta(seconds=msg["interval"]),
+        name="profiler loop stats",
+    )
+    connection.send_result(msg["id"])
+    async_send_stats()
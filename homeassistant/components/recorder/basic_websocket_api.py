@@ -16,6 +16,8 @@ from .util import get_instance
 def async_setup(hass: HomeAssistant) -> None:
     """Set up the recorder websocket API."""
     websocket_api.async_register_command(hass, ws_info)
+    websocket_api.async_register_command(hass, ws_query_stats)
+    websocket_api.async_register_command(hass, ws_configure_query_stats)
 
 
 @websocket_api.websocket_command(
@@ -37,6 +39,14 @@ def ws_info(
         # for the thread state lock which will block the event loop.
         is_running = instance.is_running
         max_backlog = instance.max_backlog
+        read_queue_depth = instance.read_queue_depth
+        read_queries = {
+            name: stats.as_dict() for name, stats in instance.read_query_stats.items()
+        }
+        lru_caches = {
+            "event_data": instance.event_data_manager.cache_stats(),
+            "state_attributes": instance.state_attributes_manager.cache_stats(),
+        }
     else:
         backlog = None
         migration_in_progress = False
@@ -44,13 +54,64 @@ def ws_info(
         recording = False
         is_running = False
         max_backlog = None
+        read_queue_depth = None
+        read_queries = {}
+        lru_caches = {}
 
     recorder_info = {
         "backlog": backlog,
+        "lru_caches": lru_caches,
         "max_backlog": max_backlog,
         "migration_in_progress": migration_in_progress,
         "migration_is_live": migration_is_live,
+        "read_queries": read_queries,
+        "read_queue_depth": read_queue_depth,
         "recording": recording,
         "thread_running": is_running,
     }
     connection.send_result(msg["id"], recorder_info)
+
+
+@websocket_api.require_admin
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "recorder/query_stats",
+    }
+)
+@callback
+def ws_query_stats(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Return the query statistics and the slow query log."""
+    if not (instance := get_instance(hass)):
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Recorder is not running"
+        )
+        return
+    connection.send_result(msg["id"], instance.query_instrumentation.as_dict())
+
+
+@websocket_api.require_admin
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "recorder/query_stats/configure",
+        vol.Required("enabled"): bool,
+        vol.Optional("slow_query_threshold"): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+    }
+)
+@callback
+def ws_configure_query_stats(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Enable or disable the query statistics and the slow query log."""
+    if not (instance := get_instance(hass)):
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Recorder is not running"
+        )
+        return
+    instance.query_instrumentation.configure(
+        msg["enabled"], msg.get("slow_query_threshold")
+    )
+    connection.send_result(msg["id"])
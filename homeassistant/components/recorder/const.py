@@ -34,7 +34,11 @@ MIN_AVAILABLE_MEMORY_FOR_QUEUE_BACKLOG = 256 * 1024**2
 
 DEFAULT_MAX_BIND_VARS = 4000
 
+LRU_SNAPSHOT_STORAGE_KEY = f"{DOMAIN}.lru_snapshot"
+LRU_SNAPSHOT_STORAGE_VERSION = 1
+
 DB_WORKER_PREFIX = "DbWorker"
+DB_READ_WORKER_PREFIX = "DbReadWorker"
 
 ALL_DOMAIN_EXCLUDE_ATTRS = {ATTR_ATTRIBUTION, ATTR_RESTORED, ATTR_SUPPORTED_FEATURES}
 
@@ -48,6 +52,8 @@ CONTEXT_ID_AS_BINARY_SCHEMA_VERSION = 36
 EVENT_TYPE_IDS_SCHEMA_VERSION = 37
 STATES_META_SCHEMA_VERSION = 38
 LAST_REPORTED_SCHEMA_VERSION = 43
+ATTRIBUTES_REF_COUNT_SCHEMA_VERSION = 50
+COMPRESSED_SHARED_DATA_SCHEMA_VERSION = 51
 
 LEGACY_STATES_EVENT_ID_INDEX_SCHEMA_VERSION = 28
 
@@ -44,6 +44,7 @@ from homeassistant.helpers.event import (
     async_track_utc_time_change,
 )
 from homeassistant.helpers.start import async_at_started
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.typing import UNDEFINED, UndefinedType
 import homeassistant.util.dt as dt_util
 from homeassistant.util.enum import try_parse_enum
@@ -51,11 +52,16 @@ from homeassistant.util.event_type import EventType
 
 from . import migration, statistics
 from .const import (
+    ATTRIBUTES_REF_COUNT_SCHEMA_VERSION,
+    COMPRESSED_SHARED_DATA_SCHEMA_VERSION,
+    DB_READ_WORKER_PREFIX,
     DB_WORKER_PREFIX,
     DEFAULT_MAX_BIND_VARS,
     DOMAIN,
     KEEPALIVE_TIME,
     LAST_REPORTED_SCHEMA_VERSION,
+    LRU_SNAPSHOT_STORAGE_KEY,
+    LRU_SNAPSHOT_STORAGE_VERSION,
     MARIADB_PYMYSQL_URL_PREFIX,
     MARIADB_URL_PREFIX,
     MAX_QUEUE_BACKLOG_MIN_VALUE,
@@ -77,9 +83,17 @@ from .db_schema import (
     Statistics,
     StatisticsShortTerm,
 )
-from .executor import DBInterruptibleThreadPoolExecutor
-from .models import DatabaseEngine, StatisticData, StatisticMetaData, UnsupportedDialect
-from .pool import POOL_SIZE, MutexPool, RecorderPool
+from .executor import DBInterruptibleThreadPoolExecutor, ReadQueryStats, run_timed
+from .instrumentation import QUERY_INSTRUMENTATION, QueryInstrumentation
+from .models import (
+    DatabaseEngine,
+    StatisticData,
+    StatisticMetaData,
+    UnsupportedDialect,
+    compress_shared_json,
+)
+from .pool import POOL_SIZE, READ_POOL_SIZE, MutexPool, RecorderPool
+from .states_buffer import StatesBuffer
 from .table_managers.event_data import EventDataManager
 from .table_managers.event_types import EventTypeManager
 from .table_managers.recorder_runs import RecorderRunsManager
@@ -145,6 +159,10 @@ CONNECTIVITY_ERR = "Error in database connectivity during commit"
 
 # Pool size must accommodate Recorder thread + All db executors
 MAX_DB_EXECUTOR_WORKERS = POOL_SIZE - 1
+MAX_DB_READ_EXECUTOR_WORKERS = READ_POOL_SIZE
+# Leave at least one read worker free for other queries when
+# a single kind of query is flooding the read executor
+MAX_CONCURRENT_READS_PER_QUERY = MAX_DB_READ_EXECUTOR_WORKERS - 1
 
 
 class Recorder(threading.Thread):
@@ -211,6 +229,11 @@ class Recorder(threading.Thread):
         self.states_meta_manager = StatesMetaManager(self)
         self.state_attributes_manager = StateAttributesManager(self)
         self.statistics_meta_manager = StatisticsMetaManager(self)
+        self.states_buffer = StatesBuffer()
+        self._lru_snapshot_store: Store[dict[str, list[int]]] = Store(
+            hass, LRU_SNAPSHOT_STORAGE_VERSION, LRU_SNAPSHOT_STORAGE_KEY
+        )
+        self._lru_snapshot: dict[str, list[int]] | None = None
 
         self.event_session: Session | None = None
         self._get_session: Callable[[], Session] | None = None
@@ -220,6 +243,11 @@ class Recorder(threading.Thread):
         self.use_legacy_events_index = False
         self._database_lock_task: DatabaseLockTask | None = None
         self._db_executor: DBInterruptibleThreadPoolExecutor | None = None
+        self._db_read_executor: DBInterruptibleThreadPoolExecutor | None = None
+        self._read_admission: dict[str, asyncio.Semaphore] = {}
+        self.read_queue_depth = 0
+        self.read_query_stats: dict[str, ReadQueryStats] = {}
+        self.query_instrumentation = QueryInstrumentation()
 
         self._event_listener: CALLBACK_TYPE | None = None
         self._queue_watcher: CALLBACK_TYPE | None = None
@@ -251,6 +279,11 @@ class Recorder(threading.Thread):
             SQLITE_URL_PREFIX
         )
 
+    @property
+    def _using_memory_sqlite(self) -> bool:
+        """Short version to check if we are using sqlite3 in memory."""
+        return self.db_url == SQLITE_URL_PREFIX or ":memory:" in self.db_url
+
     @property
     def recording(self) -> bool:
         """Return if the recorder is recording."""
@@ -279,6 +312,12 @@ class Recorder(threading.Thread):
             max_workers=MAX_DB_EXECUTOR_WORKERS,
             shutdown_hook=self._shutdown_pool,
         )
+        self._db_read_executor = DBInterruptibleThreadPoolExecutor(
+            self.recorder_and_worker_thread_ids,
+            thread_name_prefix=DB_READ_WORKER_PREFIX,
+            max_workers=MAX_DB_READ_EXECUTOR_WORKERS,
+            shutdown_hook=self._shutdown_pool,
+        )
 
     def _shutdown_pool(self) -> None:
         """Close the dbpool connections in the current thread."""
@@ -353,6 +392,34 @@ class Recorder(threading.Thread):
         """Add an executor job from within the event loop."""
         return self.hass.loop.run_in_executor(self._db_executor, target, *args)
 
+    async def async_add_read_executor_job[_T](
+        self, target: Callable[..., _T], *args: Any
+    ) -> _T:
+        """Run a read only job in the read executor.
+
+        Read only jobs get their own workers and connections so they are
+        not queued behind jobs which write to the database. Concurrent
+        runs of the same target are limited so a burst of one kind of
+        query cannot occupy every read worker.
+        """
+        name = getattr(target, "__qualname__", None) or repr(target)
+        if (semaphore := self._read_admission.get(name)) is None:
+            semaphore = self._read_admission[name] = asyncio.Semaphore(
+                MAX_CONCURRENT_READS_PER_QUERY
+            )
+        self.read_queue_depth += 1
+        try:
+            async with semaphore:
+                result, elapsed = await self.hass.loop.run_in_executor(
+                    self._db_read_executor, run_timed, target, *args
+                )
+        finally:
+            self.read_queue_depth -= 1
+        if (stats := self.read_query_stats.get(name)) is None:
+            stats = self.read_query_stats[name] = ReadQueryStats()
+        stats.add(elapsed)
+        return result
+
     @callback
     def _async_check_queue(self, *_: Any) -> None:
         """Periodic check of the queue size to ensure we do not exhaust memory.
@@ -398,6 +465,8 @@ class Recorder(threading.Thread):
         if self._event_listener:
             self._event_listener()
             self._event_listener = None
+            # State changes will be missed until the listener is restarted
+            self.states_buffer.invalidate()
 
     @callback
     def _async_stop_listeners(self) -> None:
@@ -441,6 +510,8 @@ class Recorder(threading.Thread):
         self.queue_task(StopTask())
         self._async_stop_listeners()
         await self.hass.async_add_executor_job(self.join)
+        if (lru_snapshot := self._lru_snapshot) is not None:
+            await self._lru_snapshot_store.async_save(lru_snapshot)
 
     @callback
     def _async_hass_started(self, hass: HomeAssistant) -> None:
@@ -526,12 +597,15 @@ class Recorder(threading.Thread):
         """Trigger the LRU adjustment.
 
         If the number of entities has increased, increase the size of the LRU
-        cache to avoid thrashing.
+        cache to avoid thrashing. The shared data caches are also grown when
+        their hit rate is low.
         """
         if new_size := self.hass.states.async_entity_ids_count() * 2:
             self.state_attributes_manager.adjust_lru_size(new_size)
             self.states_meta_manager.adjust_lru_size(new_size)
             self.statistics_meta_manager.adjust_lru_size(new_size)
+        self.state_attributes_manager.tune_lru_size()
+        self.event_data_manager.tune_lru_size()
 
     @callback
     def async_periodic_statistics(self) -> None:
@@ -805,6 +879,7 @@ class Recorder(threading.Thread):
             # herd of queries to find the statistics meta data if
             # there are a lot of statistics graphs on the frontend.
             self.statistics_meta_manager.load(session)
+            self._warm_lru_caches(session)
 
         migration.migrate_data_live(self, self.get_session, schema_status)
 
@@ -815,6 +890,22 @@ class Recorder(threading.Thread):
         # and not the old ones as soon as the API is available.
         self.hass.add_job(self.async_set_db_ready)
 
+    def _warm_lru_caches(self, session: Session) -> None:
+        """Warm the shared data caches from the snapshot taken at shutdown.
+
+        This avoids looking up every shared attributes and event data
+        by hash in the database after a restart.
+        """
+        lru_snapshot = asyncio.run_coroutine_threadsafe(
+            self._lru_snapshot_store.async_load(), self.hass.loop
+        ).result()
+        if not lru_snapshot:
+            return
+        self.state_attributes_manager.warm(
+            lru_snapshot.get("state_attributes", []), session
+        )
+        self.event_data_manager.warm(lru_snapshot.get("event_data", []), session)
+
     def _run_event_loop(self) -> None:
         """Run the event loop for the recorder."""
         # Use a session for the event read loop
@@ -1025,9 +1116,11 @@ class Recorder(threading.Thread):
 
     def _process_one_event(self, event: Event[Any]) -> None:
         if not self.enabled:
+            self.states_buffer.invalidate()
             return
         if event.event_type == EVENT_STATE_CHANGED:
             self._process_state_changed_event_into_session(event)
+            self.states_buffer.process_state_changed_event(event)
         else:
             self._process_non_state_changed_event_into_session(event)
         # Commit if the commit interval is zero
@@ -1073,13 +1166,22 @@ class Recorder(threading.Thread):
             dbevent.data_id = data_id
         else:
             # No matching attributes found, save them in the DB
-            dbevent_data = EventData(shared_data=shared_data, hash=hash_)
-            event_data_manager.add_pending(dbevent_data)
+            dbevent_data = EventData(
+                shared_data=self._shared_json_to_store(shared_data, shared_data_bytes),
+                hash=hash_,
+            )
+            event_data_manager.add_pending(shared_data, dbevent_data)
             self._add_to_session(session, dbevent_data)
             dbevent.event_data_rel = dbevent_data
 
         self._add_to_session(session, dbevent)
 
+    def _shared_json_to_store(self, shared_json: str, shared_bytes: bytes) -> str:
+        """Return the text to store for new shared attributes or event data."""
+        if self.schema_version >= COMPRESSED_SHARED_DATA_SCHEMA_VERSION:
+            return compress_shared_json(shared_bytes)
+        return shared_json
+
     def _process_state_changed_event_into_session(
         self, event: Event[EventStateChangedData]
     ) -> None:
@@ -1155,12 +1257,21 @@ class Recorder(threading.Thread):
             dbstate.attributes_id = attributes_id
         else:
             # No matching attributes found, save them in the DB
-            dbstate_attributes = StateAttributes(shared_attrs=shared_attrs, hash=hash_)
-            state_attributes_manager.add_pending(dbstate_attributes)
+            dbstate_attributes = StateAttributes(
+                shared_attrs=self._shared_json_to_store(
+                    shared_attrs, shared_attrs_bytes
+                ),
+                hash=hash_,
+            )
+            if self.schema_version >= ATTRIBUTES_REF_COUNT_SCHEMA_VERSION:
+                # The references are counted by insert_pending
+                dbstate_attributes.ref_count = 0
+            state_attributes_manager.add_pending(shared_attrs, dbstate_attributes)
             self._add_to_session(session, dbstate_attributes)
             dbstate.state_attributes = dbstate_attributes
 
-        self._add_to_session(session, dbstate)
+        self._event_session_has_pending_writes = True
+        states_manager.add_pending_insert(dbstate)
 
     def _handle_database_error(self, err: Exception, *, setup_run: bool) -> bool:
         """Handle a database error that may result in moving away the corrupt db."""
@@ -1223,6 +1334,9 @@ class Recorder(threading.Thread):
                         for state_id, last_reported_timestamp in pending_last_reported.items()
                     ],
                 )
+        self.states_manager.insert_pending(
+            session, self.schema_version >= ATTRIBUTES_REF_COUNT_SCHEMA_VERSION
+        )
         session.commit()
 
         self._event_session_has_pending_writes = False
@@ -1382,7 +1496,7 @@ class Recorder(threading.Thread):
         kwargs: dict[str, Any] = {}
         self._completed_first_database_setup = False
 
-        if self.db_url == SQLITE_URL_PREFIX or ":memory:" in self.db_url:
+        if self._using_memory_sqlite:
             kwargs["connect_args"] = {"check_same_thread": False}
             kwargs["poolclass"] = MutexPool
             MutexPool.pool_lock = threading.RLock()
@@ -1425,7 +1539,13 @@ class Recorder(threading.Thread):
 
         migration.pre_migrate_schema(self.engine)
         Base.metadata.create_all(self.engine)
-        self._get_session = scoped_session(sessionmaker(bind=self.engine, future=True))
+        self._get_session = scoped_session(
+            sessionmaker(
+                bind=self.engine,
+                future=True,
+                info={QUERY_INSTRUMENTATION: self.query_instrumentation},
+            )
+        )
         _LOGGER.debug("Connected to recorder database")
 
     def _close_connection(self) -> None:
@@ -1476,17 +1596,28 @@ class Recorder(threading.Thread):
             not self.schema_version or self.schema_version != SCHEMA_VERSION
         )
         self.hass.add_job(self._async_startup_done, startup_failed)
+        # The ids of an in memory database do not survive a restart
+        if not startup_failed and not self._using_memory_sqlite:
+            self._lru_snapshot = {
+                "state_attributes": self.state_attributes_manager.snapshot(),
+                "event_data": self.event_data_manager.snapshot(),
+            }
 
         try:
             self._end_session()
         finally:
-            if self._db_executor:
+            executors = [
+                executor
+                for executor in (self._db_executor, self._db_read_executor)
+                if executor
+            ]
+            for executor in executors:
                 # We shutdown the executor without forcefully
                 # joining the threads until after we have tried
                 # to cleanly close the connection.
-                self._db_executor.shutdown(join_threads_or_timeout=False)
+                executor.shutdown(join_threads_or_timeout=False)
             self._close_connection()
-            if self._db_executor:
+            for executor in executors:
                 # After the connection is closed, we can join the threads
                 # or forcefully shutdown the threads if they take too long.
-                self._db_executor.join_threads_or_timeout()
+                executor.join_threads_or_timeout()
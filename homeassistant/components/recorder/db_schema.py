@@ -62,6 +62,7 @@ from .models import (
     bytes_to_ulid_or_none,
     bytes_to_uuid_hex_or_none,
     datetime_to_timestamp_or_none,
+    decompress_shared_json,
     process_timestamp,
     ulid_to_bytes_or_none,
     uuid_hex_to_bytes_or_none,
@@ -77,7 +78,7 @@ class LegacyBase(DeclarativeBase):
     """Base class for tables, used for schema migration."""
 
 
-SCHEMA_VERSION = 48
+SCHEMA_VERSION = 51
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -93,6 +94,8 @@ TABLE_STATISTICS = "statistics"
 TABLE_STATISTICS_META = "statistics_meta"
 TABLE_STATISTICS_RUNS = "statistics_runs"
 TABLE_STATISTICS_SHORT_TERM = "statistics_short_term"
+TABLE_STATISTICS_DAILY = "statistics_daily"
+TABLE_STATISTICS_MONTHLY = "statistics_monthly"
 TABLE_MIGRATION_CHANGES = "migration_changes"
 
 STATISTICS_TABLES = ("statistics", "statistics_short_term")
@@ -116,6 +119,8 @@ ALL_TABLES = [
     TABLE_STATISTICS_META,
     TABLE_STATISTICS_RUNS,
     TABLE_STATISTICS_SHORT_TERM,
+    TABLE_STATISTICS_DAILY,
+    TABLE_STATISTICS_MONTHLY,
 ]
 
 TABLES_TO_CHECK = [
@@ -415,8 +420,8 @@ class EventData(Base):
         if shared_data is None:
             return {}
         try:
-            return cast(dict[str, Any], json_loads(shared_data))
-        except JSON_DECODE_EXCEPTIONS:
+            return cast(dict[str, Any], json_loads(decompress_shared_json(shared_data)))
+        except ValueError:
             _LOGGER.exception("Error converting row to event data: %s", self)
             return {}
 
@@ -624,6 +629,8 @@ class StateAttributes(Base):
     shared_attrs: Mapped[str | None] = mapped_column(
         Text().with_variant(mysql.LONGTEXT, "mysql", "mariadb")
     )
+    # The number of states referring to the attributes, NULL if it is not known
+    ref_count: Mapped[int | None] = mapped_column(Integer)
 
     def __repr__(self) -> str:
         """Return string representation of instance for debugging."""
@@ -680,8 +687,10 @@ class StateAttributes(Base):
         if shared_attrs is None:
             return {}
         try:
-            return cast(dict[str, Any], json_loads(shared_attrs))
-        except JSON_DECODE_EXCEPTIONS:
+            return cast(
+                dict[str, Any], json_loads(decompress_shared_json(shared_attrs))
+            )
+        except ValueError:
             # When json_loads fails
             _LOGGER.exception("Error converting row to state attributes: %s", self)
             return {}
@@ -834,6 +843,61 @@ class LegacyStatisticsShortTerm(LegacyBase, _StatisticsShortTerm):
     )
 
 
+class StatisticsRollupBase:
+    """Statistics rollup base class.
+
+    Rollups summarize the long term statistics of a local day or month.
+    mean_weight is the number of hourly means the mean was computed from.
+    """
+
+    id: Mapped[int] = mapped_column(ID_TYPE, Identity(), primary_key=True)
+    created_ts: Mapped[float | None] = mapped_column(TIMESTAMP_TYPE, default=time.time)
+    metadata_id: Mapped[int | None] = mapped_column(
+        ID_TYPE,
+        ForeignKey(f"{TABLE_STATISTICS_META}.id", ondelete="CASCADE"),
+    )
+    start_ts: Mapped[float | None] = mapped_column(TIMESTAMP_TYPE, index=True)
+    mean: Mapped[float | None] = mapped_column(DOUBLE_TYPE)
+    mean_weight: Mapped[int | None] = mapped_column(Integer)
+    min: Mapped[float | None] = mapped_column(DOUBLE_TYPE)
+    max: Mapped[float | None] = mapped_column(DOUBLE_TYPE)
+    last_reset_ts: Mapped[float | None] = mapped_column(TIMESTAMP_TYPE)
+    state: Mapped[float | None] = mapped_column(DOUBLE_TYPE)
+    sum: Mapped[float | None] = mapped_column(DOUBLE_TYPE)
+
+
+class StatisticsDaily(Base, StatisticsRollupBase):
+    """Long term statistics rolled up per local day."""
+
+    __table_args__ = (
+        # Used for fetching statistics for a certain entity at a specific time
+        Index(
+            "ix_statistics_daily_statistic_id_start_ts",
+            "metadata_id",
+            "start_ts",
+            unique=True,
+        ),
+        _DEFAULT_TABLE_ARGS,
+    )
+    __tablename__ = TABLE_STATISTICS_DAILY
+
+
+class StatisticsMonthly(Base, StatisticsRollupBase):
+    """Long term statistics rolled up per local month."""
+
+    __table_args__ = (
+        # Used for fetching statistics for a certain entity at a specific time
+        Index(
+            "ix_statistics_monthly_statistic_id_start_ts",
+            "metadata_id",
+            "start_ts",
+            unique=True,
+        ),
+        _DEFAULT_TABLE_ARGS,
+    )
+    __tablename__ = TABLE_STATISTICS_MONTHLY
+
+
 class _StatisticsMeta:
     """Statistics meta data."""
 
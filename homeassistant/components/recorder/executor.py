@@ -4,7 +4,9 @@ from __future__ import annotations
 
 from collections.abc import Callable
 from concurrent.futures.thread import _threads_queues, _worker
+from dataclasses import dataclass
 import threading
+import time
 from typing import Any
 import weakref
 
@@ -23,6 +25,36 @@ def _worker_with_shutdown_hook(
     shutdown_hook()
 
 
+@dataclass(slots=True)
+class ReadQueryStats:
+    """Latency statistics for a query."""
+
+    count: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+
+    def add(self, elapsed: float) -> None:
+        """Record a query run."""
+        self.count += 1
+        self.total_time += elapsed
+        self.max_time = max(elapsed, self.max_time)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics as a dict."""
+        return {
+            "count": self.count,
+            "mean_time": self.total_time / self.count if self.count else 0.0,
+            "max_time": self.max_time,
+        }
+
+
+def run_timed[_T](target: Callable[..., _T], *args: Any) -> tuple[_T, float]:
+    """Run target and return the result and the time it took."""
+    start = time.perf_counter()
+    result = target(*args)
+    return result, time.perf_counter() - start
+
+
 class DBInterruptibleThreadPoolExecutor(InterruptibleThreadPoolExecutor):
     """A database instance that will not deadlock on shutdown."""
 
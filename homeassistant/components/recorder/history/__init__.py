@@ -3,16 +3,19 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any
+from typing import Any, cast
 
 from sqlalchemy.orm.session import Session
 
+from homeassistant.const import COMPRESSED_STATE_LAST_UPDATED, COMPRESSED_STATE_STATE
 from homeassistant.core import HomeAssistant, State
 from homeassistant.helpers.recorder import get_instance
 
 from ..filters import Filters
 from .const import NEED_ATTRIBUTE_DOMAINS, SIGNIFICANT_DOMAINS
 from .modern import (
+    downsample_states,
+    get_downsampled_states_with_session as _modern_get_downsampled_states_with_session,
     get_full_significant_states_with_session as _modern_get_full_significant_states_with_session,
     get_last_state_changes as _modern_get_last_state_changes,
     get_significant_states as _modern_get_significant_states,
@@ -24,6 +27,7 @@ from .modern import (
 __all__ = [
     "NEED_ATTRIBUTE_DOMAINS",
     "SIGNIFICANT_DOMAINS",
+    "get_downsampled_states_with_session",
     "get_full_significant_states_with_session",
     "get_last_state_changes",
     "get_significant_states",
@@ -32,6 +36,58 @@ __all__ = [
 ]
 
 
+def get_downsampled_states_with_session(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None,
+    entity_ids: list[str],
+    bucket_size: float,
+    include_start_time_state: bool = True,
+    significant_changes_only: bool = True,
+) -> dict[str, dict[str, list[Any]]]:
+    """Return states during a time period reduced to buckets of bucket_size seconds."""
+    if get_instance(hass).states_meta_manager.active:
+        return _modern_get_downsampled_states_with_session(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            bucket_size,
+            include_start_time_state,
+            significant_changes_only,
+        )
+    from .legacy import (  # pylint: disable=import-outside-toplevel
+        get_significant_states_with_session as _legacy_get_significant_states_with_session,
+    )
+
+    start_time_ts = start_time.timestamp()
+    return {
+        entity_id: downsample_states(
+            (
+                (state[COMPRESSED_STATE_STATE], state[COMPRESSED_STATE_LAST_UPDATED])
+                for state in cast(list[dict[str, Any]], states)
+            ),
+            start_time_ts,
+            bucket_size,
+        )
+        for entity_id, states in _legacy_get_significant_states_with_session(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            None,
+            include_start_time_state,
+            significant_changes_only,
+            True,
+            True,
+            True,
+        ).items()
+    }
+
+
 def get_full_significant_states_with_session(
     hass: HomeAssistant,
     session: Session,
@@ -2,6 +2,9 @@
 
 STATE_KEY = "state"
 LAST_CHANGED_KEY = "last_changed"
+DOWNSAMPLE_MIN_KEY = "min"
+DOWNSAMPLE_MEAN_KEY = "mean"
+DOWNSAMPLE_MAX_KEY = "max"
 
 SIGNIFICANT_DOMAINS = {
     "climate",
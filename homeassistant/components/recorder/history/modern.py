@@ -5,6 +5,7 @@ from __future__ import annotations
 from collections.abc import Callable, Iterable, Iterator
 from datetime import datetime
 from itertools import groupby
+import math
 from operator import itemgetter
 from typing import Any, cast
 
@@ -43,6 +44,9 @@ from ..models import (
 )
 from ..util import execute_stmt_lambda_element, session_scope
 from .const import (
+    DOWNSAMPLE_MAX_KEY,
+    DOWNSAMPLE_MEAN_KEY,
+    DOWNSAMPLE_MIN_KEY,
     LAST_CHANGED_KEY,
     NEED_ATTRIBUTE_DOMAINS,
     SIGNIFICANT_DOMAINS,
@@ -289,6 +293,181 @@ def get_significant_states_with_session(
     )
 
 
+def get_downsampled_states_with_session(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None,
+    entity_ids: list[str],
+    bucket_size: float,
+    include_start_time_state: bool = True,
+    significant_changes_only: bool = True,
+) -> dict[str, dict[str, list[Any]]]:
+    """Return states during UTC period start_time - end_time reduced to buckets.
+
+    The rows are consumed in a single pass and reduced to one entry per
+    bucket of bucket_size seconds without building a State or dict per row.
+    See downsample_states for the format of the result.
+    """
+    if not entity_ids:
+        raise ValueError("entity_ids must be provided")
+    instance = get_instance(hass)
+    if not (
+        entity_id_to_metadata_id := instance.states_meta_manager.get_many(
+            entity_ids, session, False
+        )
+    ) or not (possible_metadata_ids := extract_metadata_ids(entity_id_to_metadata_id)):
+        return {}
+    metadata_ids = possible_metadata_ids
+    metadata_ids_in_significant_domains: list[int] = []
+    if significant_changes_only:
+        metadata_ids_in_significant_domains = [
+            metadata_id
+            for entity_id, metadata_id in entity_id_to_metadata_id.items()
+            if metadata_id is not None
+            and split_entity_id(entity_id)[0] in SIGNIFICANT_DOMAINS
+        ]
+    oldest_ts: float | None = None
+    if include_start_time_state and not (
+        oldest_ts := _get_oldest_possible_ts(hass, start_time)
+    ):
+        include_start_time_state = False
+    start_time_ts = start_time.timestamp()
+    end_time_ts = datetime_to_timestamp_or_none(end_time)
+    single_metadata_id = metadata_ids[0] if len(metadata_ids) == 1 else None
+    stmt = lambda_stmt(
+        lambda: _significant_states_stmt(
+            start_time_ts,
+            end_time_ts,
+            single_metadata_id,
+            metadata_ids,
+            metadata_ids_in_significant_domains,
+            significant_changes_only,
+            True,
+            include_start_time_state,
+            oldest_ts,
+        ),
+        track_on=[
+            bool(single_metadata_id),
+            bool(metadata_ids_in_significant_domains),
+            bool(end_time_ts),
+            significant_changes_only,
+            include_start_time_state,
+        ],
+    )
+    # Passing the time window lets execute_stmt_lambda_element switch to
+    # yield_per for long ranges so the rows are never all held in memory.
+    rows = execute_stmt_lambda_element(
+        session, stmt, start_time, end_time, orm_rows=False
+    )
+    metadata_id_to_entity_id = {
+        v: k for k, v in entity_id_to_metadata_id.items() if v is not None
+    }
+    states_iter: Iterable[tuple[int, Iterable[Row]]]
+    if single_metadata_id:
+        states_iter = ((single_metadata_id, rows),)
+    else:
+        states_iter = groupby(rows, itemgetter(_FIELD_MAP["metadata_id"]))
+    state_idx = _FIELD_MAP["state"]
+    last_updated_ts_idx = _FIELD_MAP["last_updated_ts"]
+    result = {
+        metadata_id_to_entity_id[metadata_id]: downsample_states(
+            ((row[state_idx], row[last_updated_ts_idx]) for row in group),
+            start_time_ts,
+            bucket_size,
+        )
+        for metadata_id, group in states_iter
+    }
+    # Maintain the order of the requested entity ids
+    return {
+        entity_id: result[entity_id] for entity_id in entity_ids if entity_id in result
+    }
+
+
+def downsample_states(
+    states: Iterable[tuple[str | None, float | None]],
+    start_time_ts: float,
+    bucket_size: float,
+) -> dict[str, list[Any]]:
+    """Reduce (state, last_updated_ts) pairs sorted by time to buckets.
+
+    The result is column oriented: each key maps to a list with one entry
+    per non-empty bucket. The last updated column holds the start of the
+    bucket, the state column the last state seen in the bucket, and the
+    min/mean/max columns the aggregates of the numeric states in the bucket
+    or None if the bucket has no numeric states. States before start_time_ts
+    (the start time state) are accounted to the first bucket.
+    """
+    bucket_starts: list[float] = []
+    last_states: list[str | None] = []
+    mins: list[float | None] = []
+    means: list[float | None] = []
+    maxs: list[float | None] = []
+    current_bucket = -1
+    last_state: str | None = None
+    total = 0.0
+    count = 0
+    low = high = 0.0
+    isfinite = math.isfinite
+
+    for state, last_updated_ts in states:
+        if last_updated_ts and last_updated_ts > start_time_ts:
+            bucket = int((last_updated_ts - start_time_ts) // bucket_size)
+        else:
+            bucket = 0
+        if bucket != current_bucket:
+            if current_bucket != -1:
+                bucket_starts.append(start_time_ts + current_bucket * bucket_size)
+                last_states.append(last_state)
+                if count:
+                    mins.append(low)
+                    means.append(total / count)
+                    maxs.append(high)
+                else:
+                    mins.append(None)
+                    means.append(None)
+                    maxs.append(None)
+            current_bucket = bucket
+            total = 0.0
+            count = 0
+        last_state = state
+        try:
+            value = float(state)  # type: ignore[arg-type]
+        except (TypeError, ValueError):
+            continue
+        if not isfinite(value):
+            continue
+        if count:
+            if value < low:
+                low = value
+            elif value > high:
+                high = value
+        else:
+            low = high = value
+        total += value
+        count += 1
+
+    if current_bucket != -1:
+        bucket_starts.append(start_time_ts + current_bucket * bucket_size)
+        last_states.append(last_state)
+        if count:
+            mins.append(low)
+            means.append(total / count)
+            maxs.append(high)
+        else:
+            mins.append(None)
+            means.append(None)
+            maxs.append(None)
+
+    return {
+        COMPRESSED_STATE_LAST_UPDATED: bucket_starts,
+        COMPRESSED_STATE_STATE: last_states,
+        DOWNSAMPLE_MIN_KEY: mins,
+        DOWNSAMPLE_MEAN_KEY: means,
+        DOWNSAMPLE_MAX_KEY: maxs,
+    }
+
+
 def get_full_significant_states_with_session(
     hass: HomeAssistant,
     session: Session,
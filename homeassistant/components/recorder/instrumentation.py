@@ -0,0 +1,162 @@
+"""Opt-in instrumentation of the recorder queries."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import deque
+from dataclasses import dataclass, field
+import threading
+import time
+from typing import Any
+
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+
+from .executor import ReadQueryStats
+
+# Key of the instrumentation in the info of the recorder sessions
+QUERY_INSTRUMENTATION = "recorder_query_instrumentation"
+
+DEFAULT_SLOW_QUERY_THRESHOLD = 0.5
+
+# Upper bounds in seconds of the query time histogram buckets,
+# slower queries are counted in a final overflow bucket
+QUERY_TIME_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+MAX_SLOW_QUERIES = 50
+
+_LAMBDA_SUFFIX = ".<locals>.<lambda>"
+
+
+def statement_label(stmt: StatementLambdaElement) -> str:
+    """Return the label of a statement.
+
+    The label is the name of the function that built the statement,
+    which is the same for every run of the same query.
+    """
+    root = stmt
+    while (parent := getattr(root, "parent_lambda", None)) is not None:
+        root = parent
+    name: str = root.fn.__qualname__
+    return name.removesuffix(_LAMBDA_SUFFIX)
+
+
+@dataclass(slots=True)
+class StatementStats(ReadQueryStats):
+    """Latency and row count statistics for a statement label."""
+
+    rows: int = 0
+    histogram: list[int] = field(
+        default_factory=lambda: [0] * (len(QUERY_TIME_BUCKETS) + 1)
+    )
+
+    def add(self, elapsed: float, rows: int | None = None) -> None:
+        """Record a statement run."""
+        ReadQueryStats.add(self, elapsed)
+        if rows is not None:
+            self.rows += rows
+        self.histogram[bisect_left(QUERY_TIME_BUCKETS, elapsed)] += 1
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics as a dict."""
+        return {
+            **ReadQueryStats.as_dict(self),
+            "rows": self.rows,
+            "histogram": [
+                {"le": bound, "count": count}
+                for bound, count in zip(
+                    (*QUERY_TIME_BUCKETS, None), self.histogram, strict=True
+                )
+            ],
+        }
+
+
+@dataclass(slots=True, frozen=True)
+class SlowQuery:
+    """A statement which took longer than the slow query threshold."""
+
+    label: str
+    time: float
+    elapsed: float
+    rows: int | None
+    statement: str | None
+    explain: list[list[str]] | None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the slow query as a dict."""
+        return {
+            "label": self.label,
+            "time": self.time,
+            "elapsed": self.elapsed,
+            "rows": self.rows,
+            "statement": self.statement,
+            "explain": self.explain,
+        }
+
+
+class QueryInstrumentation:
+    """Collect query statistics and a log of slow queries.
+
+    The instrumentation is disabled by default. Statements are
+    recorded from the recorder thread and the database executors
+    so every access to the collected data holds the lock.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the instrumentation."""
+        self.enabled = False
+        self.slow_query_threshold = DEFAULT_SLOW_QUERY_THRESHOLD
+        self._lock = threading.Lock()
+        self._statements: dict[str, StatementStats] = {}
+        self._slow_queries: deque[SlowQuery] = deque(maxlen=MAX_SLOW_QUERIES)
+
+    def configure(self, enabled: bool, slow_query_threshold: float | None) -> None:
+        """Enable or disable the instrumentation.
+
+        The collected data is cleared when the instrumentation
+        is enabled so every run starts from a clean slate.
+        """
+        with self._lock:
+            if enabled and not self.enabled:
+                self._statements.clear()
+                self._slow_queries.clear()
+            if slow_query_threshold is not None:
+                self.slow_query_threshold = slow_query_threshold
+            self.enabled = enabled
+
+    def record(
+        self,
+        label: str,
+        elapsed: float,
+        rows: int | None,
+        statement: str | None = None,
+        explain: list[list[str]] | None = None,
+    ) -> None:
+        """Record a statement run."""
+        with self._lock:
+            if (stats := self._statements.get(label)) is None:
+                stats = self._statements[label] = StatementStats()
+            stats.add(elapsed, rows)
+            if elapsed >= self.slow_query_threshold:
+                self._slow_queries.append(
+                    SlowQuery(label, time.time(), elapsed, rows, statement, explain)
+                )
+
+    @property
+    def slow_queries(self) -> list[SlowQuery]:
+        """Return the logged slow queries, oldest first."""
+        with self._lock:
+            return list(self._slow_queries)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the collected data as a dict."""
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "slow_query_threshold": self.slow_query_threshold,
+                "statements": {
+                    label: stats.as_dict() for label, stats in self._statements.items()
+                },
+                "slow_queries": [
+                    slow_query.as_dict() for slow_query in self._slow_queries
+                ],
+            }
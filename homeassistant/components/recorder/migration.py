@@ -76,33 +76,49 @@ from .db_schema import (
     States,
     StatesMeta,
     Statistics,
+    StatisticsDaily,
     StatisticsMeta,
+    StatisticsMonthly,
     StatisticsRuns,
     StatisticsShortTerm,
 )
-from .models import process_timestamp
+from .models import compress_shared_json, process_timestamp
+from .models.compression import COMPRESSED_V1_PREFIX
 from .models.time import datetime_to_timestamp_or_none
 from .queries import (
     batch_cleanup_entity_ids,
     delete_duplicate_short_term_statistics_row,
     delete_duplicate_statistics_row,
+    find_attributes_ids_after,
     find_entity_ids_to_migrate,
     find_event_type_to_migrate,
     find_events_context_ids_to_migrate,
+    find_shared_attrs_to_compress,
+    find_shared_data_to_compress,
     find_states_context_ids_to_migrate,
     find_unmigrated_short_term_statistics_rows,
     find_unmigrated_statistics_rows,
     get_migration_changes,
+    get_statistics_start_ts_range,
     has_entity_ids_to_migrate,
     has_event_type_to_migrate,
     has_events_context_ids_to_migrate,
     has_states_context_ids_to_migrate,
+    has_statistics_to_rollup,
     has_used_states_entity_ids,
     has_used_states_event_ids,
     migrate_single_short_term_statistics_row_to_timestamp,
     migrate_single_statistics_row_to_timestamp,
+    recount_attributes_refs,
+    update_shared_attrs,
+    update_shared_data,
+)
+from .statistics import (
+    backfill_statistics_rollups,
+    cleanup_statistics_timestamp_migration,
+    get_start_time,
+    reduce_month_ts_factory,
 )
-from .statistics import cleanup_statistics_timestamp_migration, get_start_time
 from .tasks import RecorderTask
 from .util import (
     database_job_retry_wrapper,
@@ -1987,6 +2003,31 @@ class _SchemaVersion48Migrator(_SchemaVersionMigrator, target_version=48):
         _migrate_columns_to_timestamp(self.instance, self.session_maker, self.engine)
 
 
+class _SchemaVersion49Migrator(_SchemaVersionMigrator, target_version=49):
+    def _apply_update(self) -> None:
+        """Version specific update method."""
+        # Add the daily and monthly statistics rollup tables, existing
+        # statistics are rolled up by StatisticsRollupMigration
+        for table in (StatisticsDaily, StatisticsMonthly):
+            cast(Table, table.__table__).create(self.engine, checkfirst=True)
+
+
+class _SchemaVersion50Migrator(_SchemaVersionMigrator, target_version=50):
+    def _apply_update(self) -> None:
+        """Version specific update method."""
+        # The references of existing attributes are counted
+        # by StateAttributesRefCountMigration
+        _add_columns(self.session_maker, "state_attributes", ["ref_count INTEGER"])
+
+
+class _SchemaVersion51Migrator(_SchemaVersionMigrator, target_version=51):
+    def _apply_update(self) -> None:
+        """Version specific update method."""
+        # New shared attributes and event data may be stored compressed,
+        # existing rows are compressed by StateAttributesCompressionMigration
+        # and EventDataCompressionMigration
+
+
 def _migrate_statistics_columns_to_timestamp_removing_duplicates(
     hass: HomeAssistant,
     instance: Recorder,
@@ -2971,6 +3012,193 @@ class EntityIDPostMigration(BaseMigrationWithQuery, BaseOffLineMigration):
         return has_used_states_entity_ids()
 
 
+class StatisticsRollupMigration(BaseMigrationWithQuery, BaseRunTimeMigration):
+    """Migration to compile the daily and monthly rollups of existing statistics."""
+
+    migration_id = "statistics_rollups"
+    max_initial_schema_version = 48
+
+    def __init__(
+        self,
+        *,
+        initial_schema_version: int,
+        start_schema_version: int,
+        migration_changes: dict[str, int],
+    ) -> None:
+        """Initialize a new StatisticsRollupMigration."""
+        super().__init__(
+            initial_schema_version=initial_schema_version,
+            start_schema_version=start_schema_version,
+            migration_changes=migration_changes,
+        )
+        self._next_start_ts: float | None = None
+
+    def migrate_data_impl(self, instance: Recorder) -> DataMigrationStatus:
+        """Compile the rollups of one month, return True if completed."""
+        _, month_start_end = reduce_month_ts_factory()
+        with session_scope(session=instance.get_session()) as session:
+            first_start_ts, last_start_ts = session.execute(
+                get_statistics_start_ts_range()
+            ).one()
+            if first_start_ts is None:
+                return DataMigrationStatus(needs_migrate=False, migration_done=True)
+            start_ts = self._next_start_ts
+            if start_ts is None:
+                start_ts = month_start_end(first_start_ts)[0]
+            end_ts = month_start_end(start_ts)[1]
+            _LOGGER.debug("Compiling statistics rollups starting at %s", start_ts)
+            backfill_statistics_rollups(session, start_ts, end_ts)
+        self._next_start_ts = end_ts
+        is_done = end_ts > last_start_ts
+        return DataMigrationStatus(needs_migrate=not is_done, migration_done=is_done)
+
+    def needs_migrate_query(self) -> StatementLambdaElement:
+        """Check if there are statistics to roll up."""
+        return has_statistics_to_rollup()
+
+
+class StateAttributesRefCountMigration(BaseRunTimeMigration):
+    """Migration to count the references to existing state attributes."""
+
+    migration_id = "state_attributes_ref_count"
+    max_initial_schema_version = 49
+
+    def __init__(
+        self,
+        *,
+        initial_schema_version: int,
+        start_schema_version: int,
+        migration_changes: dict[str, int],
+    ) -> None:
+        """Initialize a new StateAttributesRefCountMigration."""
+        super().__init__(
+            initial_schema_version=initial_schema_version,
+            start_schema_version=start_schema_version,
+            migration_changes=migration_changes,
+        )
+        self._last_attributes_id = 0
+
+    def migrate_data_impl(self, instance: Recorder) -> DataMigrationStatus:
+        """Count the references to a batch of attributes, return True if completed."""
+        _LOGGER.debug("Counting references to state attributes")
+        with session_scope(session=instance.get_session()) as session:
+            if attributes_ids := (
+                session.execute(
+                    find_attributes_ids_after(
+                        self._last_attributes_id, instance.max_bind_vars
+                    )
+                )
+                .scalars()
+                .all()
+            ):
+                session.execute(recount_attributes_refs(attributes_ids))
+                self._last_attributes_id = attributes_ids[-1]
+            is_done = not attributes_ids
+        return DataMigrationStatus(needs_migrate=not is_done, migration_done=is_done)
+
+    def needs_migrate_impl(
+        self, instance: Recorder, session: Session
+    ) -> DataMigrationStatus:
+        """Return if the migration needs to run."""
+        return DataMigrationStatus(needs_migrate=True, migration_done=False)
+
+
+class StateAttributesCompressionMigration(BaseRunTimeMigration):
+    """Migration to compress existing large shared attributes."""
+
+    migration_id = "state_attributes_compression"
+    max_initial_schema_version = 50
+
+    def __init__(
+        self,
+        *,
+        initial_schema_version: int,
+        start_schema_version: int,
+        migration_changes: dict[str, int],
+    ) -> None:
+        """Initialize a new StateAttributesCompressionMigration."""
+        super().__init__(
+            initial_schema_version=initial_schema_version,
+            start_schema_version=start_schema_version,
+            migration_changes=migration_changes,
+        )
+        self._last_attributes_id = 0
+
+    def migrate_data_impl(self, instance: Recorder) -> DataMigrationStatus:
+        """Compress a batch of shared attributes, return True if completed."""
+        _LOGGER.debug("Compressing shared attributes")
+        with session_scope(session=instance.get_session()) as session:
+            if rows := session.execute(
+                find_shared_attrs_to_compress(
+                    self._last_attributes_id, instance.max_bind_vars
+                )
+            ).all():
+                if params := [
+                    {"b_attributes_id": attributes_id, "b_shared_attrs": compressed}
+                    for attributes_id, shared_attrs in rows
+                    if not shared_attrs.startswith(COMPRESSED_V1_PREFIX)
+                    and (compressed := compress_shared_json(shared_attrs.encode()))
+                    != shared_attrs
+                ]:
+                    session.connection().execute(update_shared_attrs(), params)
+                self._last_attributes_id = rows[-1].attributes_id
+            is_done = not rows
+        return DataMigrationStatus(needs_migrate=not is_done, migration_done=is_done)
+
+    def needs_migrate_impl(
+        self, instance: Recorder, session: Session
+    ) -> DataMigrationStatus:
+        """Return if the migration needs to run."""
+        return DataMigrationStatus(needs_migrate=True, migration_done=False)
+
+
+class EventDataCompressionMigration(BaseRunTimeMigration):
+    """Migration to compress existing large shared event data."""
+
+    migration_id = "event_data_compression"
+    max_initial_schema_version = 50
+
+    def __init__(
+        self,
+        *,
+        initial_schema_version: int,
+        start_schema_version: int,
+        migration_changes: dict[str, int],
+    ) -> None:
+        """Initialize a new EventDataCompressionMigration."""
+        super().__init__(
+            initial_schema_version=initial_schema_version,
+            start_schema_version=start_schema_version,
+            migration_changes=migration_changes,
+        )
+        self._last_data_id = 0
+
+    def migrate_data_impl(self, instance: Recorder) -> DataMigrationStatus:
+        """Compress a batch of shared event data, return True if completed."""
+        _LOGGER.debug("Compressing shared event data")
+        with session_scope(session=instance.get_session()) as session:
+            if rows := session.execute(
+                find_shared_data_to_compress(self._last_data_id, instance.max_bind_vars)
+            ).all():
+                if params := [
+                    {"b_data_id": data_id, "b_shared_data": compressed}
+                    for data_id, shared_data in rows
+                    if not shared_data.startswith(COMPRESSED_V1_PREFIX)
+                    and (compressed := compress_shared_json(shared_data.encode()))
+                    != shared_data
+                ]:
+                    session.connection().execute(update_shared_data(), params)
+                self._last_data_id = rows[-1].data_id
+            is_done = not rows
+        return DataMigrationStatus(needs_migrate=not is_done, migration_done=is_done)
+
+    def needs_migrate_impl(
+        self, instance: Recorder, session: Session
+    ) -> DataMigrationStatus:
+        """Return if the migration needs to run."""
+        return DataMigrationStatus(needs_migrate=True, migration_done=False)
+
+
 NON_LIVE_DATA_MIGRATORS: tuple[type[BaseOffLineMigration], ...] = (
     StatesContextIDMigration,  # Introduced in HA Core 2023.4 by PR #88942
     EventsContextIDMigration,  # Introduced in HA Core 2023.4 by PR #88942
@@ -2981,6 +3209,10 @@ NON_LIVE_DATA_MIGRATORS: tuple[type[BaseOffLineMigration], ...] = (
 
 LIVE_DATA_MIGRATORS: tuple[type[BaseRunTimeMigration], ...] = (
     EventIDPostMigration,  # Introduced in HA Core 2023.4 by PR #89901
+    StatisticsRollupMigration,
+    StateAttributesRefCountMigration,
+    StateAttributesCompressionMigration,
+    EventDataCompressionMigration,
 )
 
 
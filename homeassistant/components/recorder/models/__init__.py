@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from .compression import compress_shared_json, decompress_shared_json
 from .context import (
     bytes_to_ulid_or_none,
     bytes_to_uuid_hex_or_none,
@@ -43,7 +44,9 @@ __all__ = [
     "UnsupportedDialect",
     "bytes_to_ulid_or_none",
     "bytes_to_uuid_hex_or_none",
+    "compress_shared_json",
     "datetime_to_timestamp_or_none",
+    "decompress_shared_json",
     "extract_event_type_ids",
     "extract_metadata_ids",
     "process_timestamp",
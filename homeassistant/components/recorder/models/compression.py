@@ -0,0 +1,166 @@
+"""Compact storage of shared attributes and event data."""
+
+from __future__ import annotations
+
+from base64 import b64decode, b64encode
+from typing import overload
+import zlib
+
+from homeassistant.helpers.json import json_bytes
+from homeassistant.util.json import json_loads_object
+
+# Prefix of shared attributes and event data compressed with
+# raw deflate using _ZDICT_V1 as the preset dictionary.
+#
+# The compressed data is stored as a JSON object so the SQL queries
+# reading keys of the JSON still work. The space after the brace is
+# never written by the JSON encoder so the prefix cannot be confused
+# with uncompressed data.
+COMPRESSED_V1_PREFIX = '{ "z1":"'
+_COMPRESSED_V1_PREFIX_LEN = len(COMPRESSED_V1_PREFIX)
+
+# The keys read by SQL queries, they are stored next to the
+# compressed data with their uncompressed value:
+#  - icon and unit_of_measurement of attributes by the logbook
+#  - entity_id and device_id of event data by the logbook and filters
+SQL_VISIBLE_KEYS = ("device_id", "entity_id", "icon", "unit_of_measurement")
+
+# Shared attributes and event data smaller than this are
+# stored as JSON since compressing them saves very little
+COMPRESS_MIN_BYTES = 512
+
+# The preset dictionary holds the keys found in most attributes and
+# event data, the most common ones last as they are the cheapest to
+# reference.
+#
+# The dictionary must never change once data has been written with it,
+# use a new prefix for a new dictionary instead.
+_ZDICT_V1 = b"".join(
+    f'"{key}":'.encode()
+    for key in (
+        "media_content_id",
+        "media_content_type",
+        "media_duration",
+        "media_position",
+        "media_position_updated_at",
+        "media_title",
+        "media_artist",
+        "media_album_name",
+        "app_name",
+        "source_list",
+        "sound_mode_list",
+        "volume_level",
+        "is_volume_muted",
+        "entity_picture",
+        "hvac_modes",
+        "hvac_action",
+        "fan_modes",
+        "preset_modes",
+        "swing_modes",
+        "current_temperature",
+        "target_temp_high",
+        "target_temp_low",
+        "target_temp_step",
+        "min_temp",
+        "max_temp",
+        "supported_color_modes",
+        "color_mode",
+        "brightness",
+        "color_temp_kelvin",
+        "min_color_temp_kelvin",
+        "max_color_temp_kelvin",
+        "hs_color",
+        "rgb_color",
+        "xy_color",
+        "effect_list",
+        "effect",
+        "options",
+        "latitude",
+        "longitude",
+        "gps_accuracy",
+        "service_data",
+        "service",
+        "domain",
+        "name",
+        "source",
+        "id",
+        "last_triggered",
+        "current",
+        "editable",
+        "entity_id",
+        "forecast",
+        "datetime",
+        "condition",
+        "templow",
+        "precipitation_probability",
+        "precipitation",
+        "wind_bearing",
+        "wind_speed",
+        "pressure",
+        "humidity",
+        "temperature",
+        "icon",
+        "state_class",
+        "device_class",
+        "unit_of_measurement",
+        "friendly_name",
+    )
+)
+
+
+def compress_shared_json(shared_bytes: bytes) -> str:
+    """Return the text to store for the JSON of shared attributes or event data.
+
+    The JSON is returned unchanged if it is small or if
+    compressing it would not make it smaller.
+    """
+    shared_json = shared_bytes.decode("utf-8")
+    if len(shared_bytes) < COMPRESS_MIN_BYTES:
+        return shared_json
+    compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS, zdict=_ZDICT_V1)
+    compressed = (
+        COMPRESSED_V1_PREFIX
+        + b64encode(compressor.compress(shared_bytes) + compressor.flush()).decode(
+            "ascii"
+        )
+        + '"'
+    )
+    shared_dict = json_loads_object(shared_bytes)
+    if sql_visible := {
+        key: shared_dict[key] for key in SQL_VISIBLE_KEYS if key in shared_dict
+    }:
+        # The members of the JSON object without its braces
+        compressed += "," + json_bytes(sql_visible)[1:-1].decode("utf-8")
+    compressed += "}"
+    if len(compressed) >= len(shared_bytes):
+        return shared_json
+    return compressed
+
+
+@overload
+def decompress_shared_json(source: str) -> str: ...
+
+
+@overload
+def decompress_shared_json(source: bytes) -> bytes: ...
+
+
+def decompress_shared_json(source: str | bytes) -> str | bytes:
+    """Return the JSON of stored shared attributes or event data.
+
+    Anything that is not compressed text is returned unchanged.
+
+    Raises ValueError if the compressed data is corrupt.
+    """
+    if not isinstance(source, str) or not source.startswith(COMPRESSED_V1_PREFIX):
+        return source
+    end = source.find('"', _COMPRESSED_V1_PREFIX_LEN)
+    decompressor = zlib.decompressobj(wbits=-zlib.MAX_WBITS, zdict=_ZDICT_V1)
+    try:
+        shared_bytes = decompressor.decompress(
+            b64decode(source[_COMPRESSED_V1_PREFIX_LEN:end], validate=True)
+        )
+        shared_bytes += decompressor.flush()
+    except (zlib.error, ValueError) as err:
+        raise ValueError(f"Invalid compressed data: {err}") from err
+    return shared_bytes.decode("utf-8")
@@ -7,6 +7,8 @@ from typing import Any
 
 from homeassistant.util.json import json_loads_object
 
+from .compression import decompress_shared_json
+
 EMPTY_JSON_OBJECT = "{}"
 _LOGGER = logging.getLogger(__name__)
 
@@ -20,7 +22,9 @@ def decode_attributes_from_source(
     if (attributes := attr_cache.get(source)) is not None:
         return attributes
     try:
-        attr_cache[source] = attributes = json_loads_object(source)
+        attr_cache[source] = attributes = json_loads_object(
+            decompress_shared_json(source)
+        )
     except ValueError:
         _LOGGER.exception("Error converting row to state attributes: %s", source)
         attr_cache[source] = attributes = {}
@@ -2,17 +2,23 @@
 
 from __future__ import annotations
 
+from collections import Counter
 from collections.abc import Callable
 from datetime import datetime
 import logging
+import math
+import re
 import time
 from typing import TYPE_CHECKING
 
+from sqlalchemy import text
+from sqlalchemy.engine import CursorResult
 from sqlalchemy.orm.session import Session
 
 from homeassistant.util.collection import chunked_or_all
 
-from .db_schema import Events, States, StatesMeta
+from .const import ATTRIBUTES_REF_COUNT_SCHEMA_VERSION, SupportedDialect
+from .db_schema import TABLE_STATES, Events, States, StatesMeta
 from .models import DatabaseEngine
 from .queries import (
     attributes_ids_exist_in_states,
@@ -26,9 +32,14 @@ from .queries import (
     delete_states_attributes_rows,
     delete_states_meta_rows,
     delete_states_rows,
+    delete_states_rows_before,
     delete_statistics_runs_rows,
     delete_statistics_short_term_rows,
     disconnect_states_rows,
+    disconnect_states_rows_before,
+    find_attributes_ref_counts,
+    find_attributes_refs,
+    find_attributes_refs_before,
     find_entity_ids_to_purge,
     find_event_types_to_purge,
     find_events_to_purge,
@@ -37,8 +48,10 @@ from .queries import (
     find_legacy_event_state_and_attributes_and_data_ids_to_purge,
     find_legacy_row,
     find_short_term_statistics_to_purge,
-    find_states_to_purge,
+    find_states_purge_boundary,
     find_statistics_runs_to_purge,
+    recount_attributes_refs,
+    update_attributes_ref_counts,
 )
 from .repack import repack_database
 from .util import retryable_database_job, session_scope
@@ -52,6 +65,24 @@ _LOGGER = logging.getLogger(__name__)
 DEFAULT_STATES_BATCHES_PER_PURGE = 20  # We expect ~95% de-dupe rate
 DEFAULT_EVENTS_BATCHES_PER_PURGE = 15  # We expect ~92% de-dupe rate
 
+_MYSQL_STATES_PARTITIONS = text(
+    "SELECT PARTITION_NAME, PARTITION_DESCRIPTION FROM information_schema.PARTITIONS"
+    " WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name"
+    " AND PARTITION_METHOD = 'RANGE'"
+    " AND PARTITION_EXPRESSION LIKE '%last_updated_ts%'"
+    " ORDER BY PARTITION_ORDINAL_POSITION"
+)
+_POSTGRESQL_STATES_PARTITIONS = text(
+    "SELECT child.relname, pg_get_expr(child.relpartbound, child.oid)"
+    " FROM pg_inherits"
+    " JOIN pg_class child ON child.oid = pg_inherits.inhrelid"
+    " JOIN pg_class parent ON parent.oid = pg_inherits.inhparent"
+    " WHERE parent.relname = :table_name"
+    " AND parent.relnamespace = to_regnamespace(current_schema())"
+    " AND pg_get_partkeydef(parent.oid) = 'RANGE (last_updated_ts)'"
+)
+_POSTGRESQL_PARTITION_UPPER_BOUND = re.compile(r" TO \('?([-+.\deE]+)'?")
+
 
 @retryable_database_job("purge")
 def purge_old_data(
@@ -182,33 +213,182 @@ def _purge_states_and_attributes_ids(
 ) -> bool:
     """Purge states and linked attributes id in a batch.
 
+    States are deleted by last_updated_ts range in chunks of about
+    max_bind_vars rows instead of by lists of state_ids.
+
     Returns true if there are more states to purge.
     """
-    database_engine = instance.database_engine
-    assert database_engine is not None
-    has_remaining_state_ids_to_purge = True
-    # There are more states relative to attributes_ids so
-    # we purge enough state_ids to try to generate a full
-    # size batch of attributes_ids that will be around the size
-    # max_bind_vars
-    attributes_ids_batch: set[int] = set()
+    purge_before_ts = purge_before.timestamp()
     max_bind_vars = instance.max_bind_vars
+    attributes_refs: Counter[int] = Counter()
+    _drop_expired_states_partitions(instance, session, purge_before_ts, attributes_refs)
+    has_remaining_states_to_purge = True
     for _ in range(states_batch_size):
-        state_ids, attributes_ids = _select_state_attributes_ids_to_purge(
-            session, purge_before, max_bind_vars
+        boundary_ts = session.execute(
+            find_states_purge_boundary(purge_before_ts, max_bind_vars)
+        ).scalar()
+        if boundary_ts is None:
+            # The remaining states fit in a single chunk, the purge is
+            # done once there is nothing left to delete
+            if not _purge_states_before(
+                instance, session, purge_before_ts, attributes_refs
+            ):
+                has_remaining_states_to_purge = False
+                break
+            continue
+        # Include all the states updated at boundary_ts, this makes sure
+        # the chunk is never empty if many states share a timestamp
+        _purge_states_before(
+            instance, session, math.nextafter(boundary_ts, math.inf), attributes_refs
         )
-        if not state_ids:
-            has_remaining_state_ids_to_purge = False
-            break
-        _purge_state_ids(instance, session, state_ids)
-        attributes_ids_batch = attributes_ids_batch | attributes_ids
 
-    _purge_unused_attributes_ids(instance, session, attributes_ids_batch)
+    _purge_attributes_refs(instance, session, attributes_refs)
     _LOGGER.debug(
         "After purging states and attributes_ids remaining=%s",
-        has_remaining_state_ids_to_purge,
+        has_remaining_states_to_purge,
+    )
+    return has_remaining_states_to_purge
+
+
+def _purge_states_before(
+    instance: Recorder,
+    session: Session,
+    end_ts: float,
+    attributes_refs: Counter[int],
+) -> int:
+    """Purge the states updated before end_ts and return the number deleted.
+
+    The references to attributes of the purged states are added to
+    attributes_refs.
+    """
+    _unlink_states_before(instance, session, end_ts, attributes_refs)
+    result: CursorResult = session.connection().execute(
+        delete_states_rows_before(end_ts)
+    )
+    _LOGGER.debug("Deleted %s states", result.rowcount)
+    return result.rowcount
+
+
+def _unlink_states_before(
+    instance: Recorder,
+    session: Session,
+    end_ts: float,
+    attributes_refs: Counter[int],
+) -> None:
+    """Prepare purging the states updated before end_ts."""
+    attributes_refs.update(
+        dict(session.execute(find_attributes_refs_before(end_ts)).tuples().all())
+    )
+    # Update old_state_id to NULL before deleting to ensure
+    # the delete does not fail due to a foreign key constraint
+    # since some databases (MSSQL) cannot do the ON DELETE SET NULL
+    # for us.
+    disconnected_rows = session.execute(disconnect_states_rows_before(end_ts))
+    _LOGGER.debug("Updated %s states to remove old_state_id", disconnected_rows)
+
+    # Evict any entries in the old_states cache referring to a purged state
+    instance.states_manager.evict_purged_states_before(
+        session, end_ts, instance.max_bind_vars
+    )
+
+
+def _drop_expired_states_partitions(
+    instance: Recorder,
+    session: Session,
+    purge_before_ts: float,
+    attributes_refs: Counter[int],
+) -> None:
+    """Drop the partitions of the states table which only have states to purge.
+
+    The states table is not partitioned by the recorder, but a MySQL or
+    PostgreSQL states table may be range partitioned by last_updated_ts
+    to drop whole partitions instead of deleting their states.
+    """
+    partitions: list[tuple[float, str]] = []
+    if instance.dialect_name == SupportedDialect.MYSQL:
+        for name, upper_bound in session.execute(
+            _MYSQL_STATES_PARTITIONS, {"table_name": TABLE_STATES}
+        ):
+            if upper_bound != "MAXVALUE":
+                partitions.append((float(upper_bound), name))
+    elif instance.dialect_name == SupportedDialect.POSTGRESQL:
+        for name, bound in session.execute(
+            _POSTGRESQL_STATES_PARTITIONS, {"table_name": TABLE_STATES}
+        ):
+            if match := _POSTGRESQL_PARTITION_UPPER_BOUND.search(bound):
+                partitions.append((float(match.group(1)), name))
+    preparer = session.get_bind().dialect.identifier_preparer
+    for upper_bound_ts, name in sorted(partitions):
+        if upper_bound_ts > purge_before_ts:
+            break
+        _unlink_states_before(instance, session, upper_bound_ts, attributes_refs)
+        if instance.dialect_name == SupportedDialect.MYSQL:
+            drop_partition = (
+                f"ALTER TABLE {TABLE_STATES} DROP PARTITION {preparer.quote(name)}"
+            )
+        else:
+            drop_partition = f"DROP TABLE {preparer.quote(name)}"
+        session.execute(text(drop_partition))
+        _LOGGER.debug("Dropped states partition %s", name)
+
+
+def _release_attributes_refs(
+    instance: Recorder, session: Session, attributes_refs: Counter[int]
+) -> None:
+    """Subtract the references of purged states from the attributes."""
+    if not attributes_refs or (
+        instance.schema_version < ATTRIBUTES_REF_COUNT_SCHEMA_VERSION
+    ):
+        return
+    session.connection().execute(
+        update_attributes_ref_counts(),
+        [
+            {"b_attributes_id": attributes_id, "b_refs": -refs}
+            for attributes_id, refs in attributes_refs.items()
+        ],
     )
-    return has_remaining_state_ids_to_purge
+
+
+def _purge_attributes_refs(
+    instance: Recorder, session: Session, attributes_refs: Counter[int]
+) -> None:
+    """Release the references of purged states and purge unused attributes.
+
+    Only the attributes whose reference count dropped to zero are checked
+    for remaining states. Attributes without a reference count, which have
+    not been counted since the schema was migrated, are always checked.
+    """
+    if not attributes_refs:
+        return
+    if instance.schema_version < ATTRIBUTES_REF_COUNT_SCHEMA_VERSION:
+        _purge_unused_attributes_ids(instance, session, set(attributes_refs))
+        return
+    _release_attributes_refs(instance, session, attributes_refs)
+    candidate_ids: set[int] = set()
+    for attributes_ids_chunk in chunked_or_all(
+        list(attributes_refs), instance.max_bind_vars
+    ):
+        candidate_ids.update(
+            attributes_id
+            for attributes_id, ref_count in session.execute(
+                find_attributes_ref_counts(attributes_ids_chunk)
+            )
+            if ref_count is None or ref_count <= 0
+        )
+    database_engine = instance.database_engine
+    assert database_engine is not None
+    unused_attributes_ids = _select_unused_attributes_ids(
+        instance, session, candidate_ids, database_engine
+    )
+    if unused_attributes_ids:
+        _purge_batch_attributes_ids(instance, session, unused_attributes_ids)
+    # Attributes which are still used by states the reference count
+    # does not know about, count their references again
+    if still_used_ids := candidate_ids - unused_attributes_ids:
+        for attributes_ids_chunk in chunked_or_all(
+            still_used_ids, instance.max_bind_vars
+        ):
+            session.execute(recount_attributes_refs(attributes_ids_chunk))
 
 
 def _purge_events_and_data_ids(
@@ -246,26 +426,6 @@ def _purge_events_and_data_ids(
     return has_remaining_event_ids_to_purge
 
 
-def _select_state_attributes_ids_to_purge(
-    session: Session, purge_before: datetime, max_bind_vars: int
-) -> tuple[set[int], set[int]]:
-    """Return sets of state and attribute ids to purge."""
-    state_ids = set()
-    attributes_ids = set()
-    for state_id, attributes_id in session.execute(
-        find_states_to_purge(purge_before.timestamp(), max_bind_vars)
-    ).all():
-        state_ids.add(state_id)
-        if attributes_id:
-            attributes_ids.add(attributes_id)
-    _LOGGER.debug(
-        "Selected %s state ids and %s attributes_ids to remove",
-        len(state_ids),
-        len(attributes_ids),
-    )
-    return state_ids, attributes_ids
-
-
 def _select_event_data_ids_to_purge(
     session: Session, purge_before: datetime, max_bind_vars: int
 ) -> tuple[set[int], set[int]]:
@@ -459,6 +619,12 @@ def _purge_state_ids(instance: Recorder, session: Session, state_ids: set[int])
     if not state_ids:
         return
 
+    _release_attributes_refs(
+        instance,
+        session,
+        Counter(dict(session.execute(find_attributes_refs(state_ids)).tuples().all())),
+    )
+
     # Update old_state_id to NULL before deleting to ensure
     # the delete does not fail due to a foreign key constraint
     # since some databases (MSSQL) cannot do the ON DELETE SET NULL
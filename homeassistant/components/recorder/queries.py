@@ -5,7 +5,17 @@ from __future__ import annotations
 from collections.abc import Iterable
 from datetime import datetime
 
-from sqlalchemy import and_, delete, distinct, func, lambda_stmt, select, update
+from sqlalchemy import (
+    and_,
+    bindparam,
+    delete,
+    distinct,
+    func,
+    lambda_stmt,
+    select,
+    update,
+)
+from sqlalchemy.sql.dml import Update
 from sqlalchemy.sql.lambdas import StatementLambdaElement
 from sqlalchemy.sql.selectable import Select
 
@@ -22,6 +32,7 @@ from .db_schema import (
     StatisticsRuns,
     StatisticsShortTerm,
 )
+from .models.compression import COMPRESS_MIN_BYTES
 
 
 def select_event_type_ids(event_types: tuple[str, ...]) -> Select:
@@ -53,6 +64,26 @@ def get_shared_event_datas(hashes: list[int]) -> StatementLambdaElement:
     )
 
 
+def get_shared_attributes_by_ids(
+    attributes_ids: Iterable[int],
+) -> StatementLambdaElement:
+    """Load shared attributes from the database by attributes_id."""
+    return lambda_stmt(
+        lambda: select(
+            StateAttributes.attributes_id, StateAttributes.shared_attrs
+        ).where(StateAttributes.attributes_id.in_(attributes_ids))
+    )
+
+
+def get_shared_event_datas_by_ids(data_ids: Iterable[int]) -> StatementLambdaElement:
+    """Load shared event data from the database by data_id."""
+    return lambda_stmt(
+        lambda: select(EventData.data_id, EventData.shared_data).where(
+            EventData.data_id.in_(data_ids)
+        )
+    )
+
+
 def find_event_type_ids(event_types: Iterable[str]) -> StatementLambdaElement:
     """Find an event_type id by event_type."""
     return lambda_stmt(
@@ -172,6 +203,175 @@ def disconnect_states_rows(state_ids: Iterable[int]) -> StatementLambdaElement:
     )
 
 
+def disconnect_states_rows_before(end_ts: float) -> StatementLambdaElement:
+    """Disconnect states rows linked to states updated before end_ts."""
+    # MySQL does not allow selecting from the table being updated in a
+    # subquery, the derived table is materialized to work around it
+    return lambda_stmt(
+        lambda: update(States)
+        .where(
+            States.old_state_id.in_(
+                select(
+                    select(States.state_id)
+                    .where(States.last_updated_ts < end_ts)
+                    .subquery()
+                    .c.state_id
+                )
+            )
+        )
+        .values(old_state_id=None)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def delete_states_rows_before(end_ts: float) -> StatementLambdaElement:
+    """Delete states rows updated before end_ts."""
+    return lambda_stmt(
+        lambda: delete(States)
+        .where(States.last_updated_ts < end_ts)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def find_states_purge_boundary(
+    purge_before: float, max_rows: int
+) -> StatementLambdaElement:
+    """Find the last_updated_ts after the oldest max_rows states."""
+    return lambda_stmt(
+        lambda: select(States.last_updated_ts)
+        .filter(States.last_updated_ts < purge_before)
+        .order_by(States.last_updated_ts.asc())
+        .offset(max_rows)
+        .limit(1)
+    )
+
+
+def find_states_ids_before(
+    state_ids: Iterable[int], end_ts: float
+) -> StatementLambdaElement:
+    """Find which of the state_ids are states updated before end_ts."""
+    return lambda_stmt(
+        lambda: select(States.state_id).filter(
+            States.state_id.in_(state_ids), States.last_updated_ts < end_ts
+        )
+    )
+
+
+def find_attributes_refs_before(end_ts: float) -> StatementLambdaElement:
+    """Count the references to attributes by states updated before end_ts."""
+    return lambda_stmt(
+        lambda: select(States.attributes_id, func.count())
+        .filter(States.last_updated_ts < end_ts, States.attributes_id.isnot(None))
+        .group_by(States.attributes_id)
+    )
+
+
+def find_attributes_refs(state_ids: Iterable[int]) -> StatementLambdaElement:
+    """Count the references to attributes by the state_ids."""
+    return lambda_stmt(
+        lambda: select(States.attributes_id, func.count())
+        .filter(States.state_id.in_(state_ids), States.attributes_id.isnot(None))
+        .group_by(States.attributes_id)
+    )
+
+
+def find_attributes_ref_counts(
+    attributes_ids: Iterable[int],
+) -> StatementLambdaElement:
+    """Find the reference counts of attributes."""
+    return lambda_stmt(
+        lambda: select(StateAttributes.attributes_id, StateAttributes.ref_count).filter(
+            StateAttributes.attributes_id.in_(attributes_ids)
+        )
+    )
+
+
+def update_attributes_ref_counts() -> Update:
+    """Add b_refs to the reference count of attributes b_attributes_id.
+
+    Reference counts which are not known stay NULL.
+    """
+    return (
+        update(StateAttributes)
+        .where(StateAttributes.attributes_id == bindparam("b_attributes_id"))
+        .values(ref_count=StateAttributes.ref_count + bindparam("b_refs"))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def recount_attributes_refs(attributes_ids: Iterable[int]) -> StatementLambdaElement:
+    """Count the references to attributes from scratch."""
+    return lambda_stmt(
+        lambda: update(StateAttributes)
+        .where(StateAttributes.attributes_id.in_(attributes_ids))
+        .values(
+            ref_count=select(func.count())
+            .select_from(States)
+            .where(States.attributes_id == StateAttributes.attributes_id)
+            .scalar_subquery()
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def find_attributes_ids_after(
+    attributes_id: int, max_bind_vars: int
+) -> StatementLambdaElement:
+    """Find the attributes_ids after attributes_id."""
+    return lambda_stmt(
+        lambda: select(StateAttributes.attributes_id)
+        .filter(StateAttributes.attributes_id > attributes_id)
+        .order_by(StateAttributes.attributes_id.asc())
+        .limit(max_bind_vars)
+    )
+
+
+def find_shared_attrs_to_compress(
+    attributes_id: int, max_bind_vars: int
+) -> StatementLambdaElement:
+    """Find the shared attributes after attributes_id large enough to compress."""
+    return lambda_stmt(
+        lambda: select(StateAttributes.attributes_id, StateAttributes.shared_attrs)
+        .filter(StateAttributes.attributes_id > attributes_id)
+        .filter(func.length(StateAttributes.shared_attrs) >= COMPRESS_MIN_BYTES)
+        .order_by(StateAttributes.attributes_id.asc())
+        .limit(max_bind_vars)
+    )
+
+
+def update_shared_attrs() -> Update:
+    """Replace the shared attributes b_shared_attrs of attributes b_attributes_id."""
+    return (
+        update(StateAttributes)
+        .where(StateAttributes.attributes_id == bindparam("b_attributes_id"))
+        .values(shared_attrs=bindparam("b_shared_attrs"))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def find_shared_data_to_compress(
+    data_id: int, max_bind_vars: int
+) -> StatementLambdaElement:
+    """Find the shared event data after data_id large enough to compress."""
+    return lambda_stmt(
+        lambda: select(EventData.data_id, EventData.shared_data)
+        .filter(EventData.data_id > data_id)
+        .filter(func.length(EventData.shared_data) >= COMPRESS_MIN_BYTES)
+        .order_by(EventData.data_id.asc())
+        .limit(max_bind_vars)
+    )
+
+
+def update_shared_data() -> Update:
+    """Replace the shared event data b_shared_data of event data b_data_id."""
+    return (
+        update(EventData)
+        .where(EventData.data_id == bindparam("b_data_id"))
+        .values(shared_data=bindparam("b_shared_data"))
+        .execution_options(synchronize_session=False)
+    )
+
+
 def delete_states_rows(state_ids: Iterable[int]) -> StatementLambdaElement:
     """Delete states rows."""
     return lambda_stmt(
@@ -258,17 +458,6 @@ def find_events_to_purge(
     )
 
 
-def find_states_to_purge(
-    purge_before: float, max_bind_vars: int
-) -> StatementLambdaElement:
-    """Find states to purge."""
-    return lambda_stmt(
-        lambda: select(States.state_id, States.attributes_id)
-        .filter(States.last_updated_ts < purge_before)
-        .limit(max_bind_vars)
-    )
-
-
 def find_oldest_state() -> StatementLambdaElement:
     """Find the last_updated_ts of the oldest state."""
     return lambda_stmt(
@@ -419,6 +608,18 @@ def has_used_states_event_ids() -> StatementLambdaElement:
     )
 
 
+def has_statistics_to_rollup() -> StatementLambdaElement:
+    """Check if there are hourly statistics to compile rollups for."""
+    return lambda_stmt(lambda: select(Statistics.id).limit(1))
+
+
+def get_statistics_start_ts_range() -> StatementLambdaElement:
+    """Find the start of the oldest and newest hourly statistics."""
+    return lambda_stmt(
+        lambda: select(func.min(Statistics.start_ts), func.max(Statistics.start_ts))
+    )
+
+
 def has_events_context_ids_to_migrate() -> StatementLambdaElement:
     """Check if there are events context ids to migrate."""
     return lambda_stmt(
@@ -0,0 +1,161 @@
+"""Buffer of recent states used to compile short term statistics."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Iterable
+from operator import attrgetter
+import time
+
+from homeassistant.core import Event, EventStateChangedData, State, split_entity_id
+
+from .history.const import SIGNIFICANT_DOMAINS
+
+_LAST_UPDATED_TIMESTAMP = attrgetter("last_updated_timestamp")
+
+
+class StatesBuffer:
+    """Keep the recent states of tracked entities in memory.
+
+    The recorder thread feeds every recorded state change into the
+    buffer as it is processed so short term statistics can be compiled
+    from memory instead of querying the states table every five minutes.
+
+    An entity is only covered from the moment it starts being tracked;
+    any window that starts before that has to be read from the database.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the states buffer."""
+        self._states: dict[str, list[State]] = {}
+        self._covered_since: dict[str, float] = {}
+        self._invalidated = False
+
+    def process_state_changed_event(self, event: Event[EventStateChangedData]) -> None:
+        """Add the new state from a state_changed event if the entity is tracked.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        entity_id = event.data["entity_id"]
+        if (states := self._states.get(entity_id)) is None:
+            return
+        if (new_state := event.data["new_state"]) is None:
+            # The entity was removed, stop tracking it
+            del self._states[entity_id]
+            del self._covered_since[entity_id]
+            return
+        if (
+            not states
+            or new_state.last_updated_timestamp >= states[-1].last_updated_timestamp
+        ):
+            states.append(new_state)
+        else:
+            insort(states, new_state, key=_LAST_UPDATED_TIMESTAMP)
+
+    def track(self, current_states: Iterable[State]) -> None:
+        """Track exactly the given entities.
+
+        Entities which are not already tracked are seeded with
+        their current state. Entities which are no longer in
+        current_states are dropped.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._reset_if_invalidated()
+        now_timestamp = time.time()
+        states = self._states
+        covered_since = self._covered_since
+        current_entity_ids: set[str] = set()
+        for state in current_states:
+            entity_id = state.entity_id
+            current_entity_ids.add(entity_id)
+            if entity_id not in states:
+                states[entity_id] = [state]
+                # Changes older than the current state were processed before
+                # the entity was tracked and are not in the buffer
+                covered_since[entity_id] = max(
+                    now_timestamp, state.last_updated_timestamp
+                )
+        for entity_id in states.keys() - current_entity_ids:
+            del states[entity_id]
+            del covered_since[entity_id]
+
+    def get_states(
+        self,
+        entity_id: str,
+        start_time_ts: float,
+        end_time_ts: float,
+        significant_changes_only: bool = True,
+    ) -> list[State] | None:
+        """Return the states of an entity between start and end time.
+
+        The result matches get_full_significant_states_with_session:
+        the state at the start time followed by the states which were
+        updated after start_time_ts and before end_time_ts.
+
+        Returns None if the buffer does not cover the window.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._reset_if_invalidated()
+        if (
+            covered_since := self._covered_since.get(entity_id)
+        ) is None or start_time_ts < covered_since:
+            return None
+        states = self._states[entity_id]
+        start_idx = bisect_left(states, start_time_ts, key=_LAST_UPDATED_TIMESTAMP)
+        window_idx = bisect_right(states, start_time_ts, key=_LAST_UPDATED_TIMESTAMP)
+        end_idx = bisect_left(states, end_time_ts, key=_LAST_UPDATED_TIMESTAMP)
+        result = [states[start_idx - 1]] if start_idx else []
+        in_window = states[window_idx:end_idx]
+        if significant_changes_only and (
+            split_entity_id(entity_id)[0] not in SIGNIFICANT_DOMAINS
+        ):
+            result.extend(
+                state
+                for state in in_window
+                if state.last_changed_timestamp == state.last_updated_timestamp
+            )
+        else:
+            result.extend(in_window)
+        return result
+
+    def prune(self, before_ts: float) -> None:
+        """Drop states which are not needed for windows starting at before_ts.
+
+        The last state before before_ts is kept since it is the
+        state at the start of the next window.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        covered_since = self._covered_since
+        for entity_id, states in self._states.items():
+            if idx := bisect_left(states, before_ts, key=_LAST_UPDATED_TIMESTAMP):
+                del states[: idx - 1]
+            covered_since[entity_id] = max(covered_since[entity_id], before_ts)
+
+    def invalidate(self) -> None:
+        """Mark the buffer as incomplete because state changes were missed.
+
+        This call is thread-safe.
+        """
+        self._invalidated = True
+
+    def reset(self) -> None:
+        """Stop tracking all entities.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._invalidated = False
+        self._states.clear()
+        self._covered_since.clear()
+
+    def _reset_if_invalidated(self) -> None:
+        """Reset the buffer if it was invalidated."""
+        if self._invalidated:
+            self.reset()
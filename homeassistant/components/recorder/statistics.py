@@ -3,18 +3,29 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from collections.abc import Callable, Iterable, Sequence
+from collections.abc import Callable, Collection, Iterable, Iterator, Sequence
 import dataclasses
 from datetime import datetime, timedelta
+from fractions import Fraction
 from functools import lru_cache, partial
-from itertools import chain, groupby
+from itertools import groupby
 import logging
 from operator import itemgetter
 import re
 from time import time as time_time
-from typing import TYPE_CHECKING, Any, Literal, TypedDict, cast
-
-from sqlalchemy import Select, and_, bindparam, func, lambda_stmt, select, text
+from typing import TYPE_CHECKING, Any, Literal, NamedTuple, TypedDict, cast
+
+from sqlalchemy import (
+    Select,
+    and_,
+    bindparam,
+    delete,
+    func,
+    insert,
+    lambda_stmt,
+    select,
+    text,
+)
 from sqlalchemy.engine.row import Row
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm.session import Session
@@ -63,7 +74,10 @@ from .db_schema import (
     STATISTICS_TABLES,
     Statistics,
     StatisticsBase,
+    StatisticsDaily,
     StatisticsMeta,
+    StatisticsMonthly,
+    StatisticsRollupBase,
     StatisticsRuns,
     StatisticsShortTerm,
 )
@@ -453,6 +467,8 @@ def _compile_hourly_statistics(session: Session, start: datetime) -> None:
         Statistics.from_stats_ts(metadata_id, summary_item, now_timestamp)
         for metadata_id, summary_item in summary.items()
     )
+    if summary:
+        _update_statistics_rollups(session, summary, start_time_ts, end_time_ts)
 
 
 @retryable_database_job("compile missing statistics")
@@ -805,7 +821,7 @@ async def async_list_statistic_ids(
             result = _statistic_by_id_from_metadata(hass, metadata)
             return _flatten_list_statistic_ids_metadata_result(result)
 
-    return await instance.async_add_executor_job(
+    return await instance.async_add_read_executor_job(
         list_statistic_ids,
         hass,
         statistic_ids,
@@ -909,65 +925,6 @@ def list_statistic_ids(
     return _flatten_list_statistic_ids_metadata_result(result)
 
 
-def _reduce_statistics(
-    stats: dict[str, list[StatisticsRow]],
-    same_period: Callable[[float, float], bool],
-    period_start_end: Callable[[float], tuple[float, float]],
-    period: timedelta,
-    types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
-) -> dict[str, list[StatisticsRow]]:
-    """Reduce hourly statistics to daily or monthly statistics."""
-    result: dict[str, list[StatisticsRow]] = defaultdict(list)
-    period_seconds = period.total_seconds()
-    _want_mean = "mean" in types
-    _want_min = "min" in types
-    _want_max = "max" in types
-    _want_last_reset = "last_reset" in types
-    _want_state = "state" in types
-    _want_sum = "sum" in types
-    for statistic_id, stat_list in stats.items():
-        max_values: list[float] = []
-        mean_values: list[float] = []
-        min_values: list[float] = []
-        prev_stat: StatisticsRow = stat_list[0]
-        fake_entry: StatisticsRow = {"start": stat_list[-1]["start"] + period_seconds}
-
-        # Loop over the hourly statistics + a fake entry to end the period
-        for statistic in chain(stat_list, (fake_entry,)):
-            if not same_period(prev_stat["start"], statistic["start"]):
-                start, end = period_start_end(prev_stat["start"])
-                # The previous statistic was the last entry of the period
-                row: StatisticsRow = {
-                    "start": start,
-                    "end": end,
-                }
-                if _want_mean:
-                    row["mean"] = mean(mean_values) if mean_values else None
-                    mean_values.clear()
-                if _want_min:
-                    row["min"] = min(min_values) if min_values else None
-                    min_values.clear()
-                if _want_max:
-                    row["max"] = max(max_values) if max_values else None
-                    max_values.clear()
-                if _want_last_reset:
-                    row["last_reset"] = prev_stat.get("last_reset")
-                if _want_state:
-                    row["state"] = prev_stat.get("state")
-                if _want_sum:
-                    row["sum"] = prev_stat["sum"]
-                result[statistic_id].append(row)
-            if _want_max and (_max := statistic.get("max")) is not None:
-                max_values.append(_max)
-            if _want_mean and (_mean := statistic.get("mean")) is not None:
-                mean_values.append(_mean)
-            if _want_min and (_min := statistic.get("min")) is not None:
-                min_values.append(_min)
-            prev_stat = statistic
-
-    return result
-
-
 def reduce_day_ts_factory() -> (
     tuple[
         Callable[[float, float], bool],
@@ -1006,17 +963,6 @@ def reduce_day_ts_factory() -> (
     return _same_day_ts, _day_start_end_ts_cached
 
 
-def _reduce_statistics_per_day(
-    stats: dict[str, list[StatisticsRow]],
-    types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
-) -> dict[str, list[StatisticsRow]]:
-    """Reduce hourly statistics to daily statistics."""
-    _same_day_ts, _day_start_end_ts = reduce_day_ts_factory()
-    return _reduce_statistics(
-        stats, _same_day_ts, _day_start_end_ts, timedelta(days=1), types
-    )
-
-
 def reduce_week_ts_factory() -> (
     tuple[
         Callable[[float, float], bool],
@@ -1056,17 +1002,6 @@ def reduce_week_ts_factory() -> (
     return _same_week_ts, _week_start_end_ts_cached
 
 
-def _reduce_statistics_per_week(
-    stats: dict[str, list[StatisticsRow]],
-    types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
-) -> dict[str, list[StatisticsRow]]:
-    """Reduce hourly statistics to weekly statistics."""
-    _same_week_ts, _week_start_end_ts = reduce_week_ts_factory()
-    return _reduce_statistics(
-        stats, _same_week_ts, _week_start_end_ts, timedelta(days=7), types
-    )
-
-
 def _find_month_end_time(timestamp: datetime) -> datetime:
     """Return the end of the month (midnight at the first day of the next month)."""
     # We add 4 days to the end to make sure we are in the next month
@@ -1111,15 +1046,307 @@ def reduce_month_ts_factory() -> (
     return _same_month_ts, _month_start_end_ts_cached
 
 
-def _reduce_statistics_per_month(
-    stats: dict[str, list[StatisticsRow]],
-    types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
-) -> dict[str, list[StatisticsRow]]:
-    """Reduce hourly statistics to monthly statistics."""
-    _same_month_ts, _month_start_end_ts = reduce_month_ts_factory()
-    return _reduce_statistics(
-        stats, _same_month_ts, _month_start_end_ts, timedelta(days=31), types
+_PERIOD_TS_FACTORIES: dict[
+    str,
+    Callable[
+        [],
+        tuple[Callable[[float, float], bool], Callable[[float], tuple[float, float]]],
+    ],
+] = {
+    "day": reduce_day_ts_factory,
+    "week": reduce_week_ts_factory,
+    "month": reduce_month_ts_factory,
+}
+
+
+class _RollupRow(NamedTuple):
+    """Statistics of one statistic_id during one period."""
+
+    metadata_id: int
+    start_ts: float
+    mean: float | None
+    mean_weight: int
+    min: float | None
+    max: float | None
+    last_reset_ts: float | None
+    state: float | None
+    sum: float | None
+
+
+def _period_starts(
+    period_start_end: Callable[[float], tuple[float, float]],
+    start_ts: float,
+    end_ts: float,
+) -> tuple[list[float], float]:
+    """Return the start of each period overlapping start_ts - end_ts.
+
+    The end of the last period is returned as well.
+    """
+    starts: list[float] = []
+    while start_ts < end_ts:
+        period_start_ts, start_ts = period_start_end(start_ts)
+        starts.append(period_start_ts)
+    return starts, start_ts
+
+
+def _generate_rollup_rows_stmt(
+    table: type[Statistics | StatisticsRollupBase],
+    metadata_ids: list[int] | None,
+    start_ts: float,
+    end_ts: float | None,
+) -> StatementLambdaElement:
+    """Generate a statement to fetch the rows used to compile rollups."""
+    stmt = lambda_stmt(
+        lambda: select(
+            table.metadata_id,
+            table.start_ts,
+            table.mean,
+            table.min,
+            table.max,
+            table.last_reset_ts,
+            table.state,
+            table.sum,
+        ).filter(table.start_ts >= start_ts)
+    )
+    if table is not Statistics:
+        stmt += lambda q: q.add_columns(table.mean_weight)  # type: ignore[union-attr]
+    if end_ts is not None:
+        stmt += lambda q: q.filter(table.start_ts < end_ts)
+    if metadata_ids is not None:
+        stmt += lambda q: q.filter(table.metadata_id.in_(metadata_ids))
+    stmt += lambda q: q.order_by(table.metadata_id, table.start_ts)
+    return stmt
+
+
+def _get_rollup_rows(
+    session: Session,
+    table: type[Statistics | StatisticsRollupBase],
+    metadata_ids: list[int] | None,
+    start_ts: float,
+    end_ts: float | None,
+) -> Iterator[_RollupRow]:
+    """Return hourly statistics or rollups as rollup rows.
+
+    Every hourly mean has a weight of 1.
+    """
+    stmt = _generate_rollup_rows_stmt(table, metadata_ids, start_ts, end_ts)
+    rows = cast(
+        Sequence[Row], execute_stmt_lambda_element(session, stmt, orm_rows=False)
+    )
+    if table is Statistics:
+        for metadata_id, start, _mean, _min, _max, last_reset, state, _sum in rows:
+            yield _RollupRow(
+                metadata_id, start, _mean, 1, _min, _max, last_reset, state, _sum
+            )
+        return
+    for metadata_id, start, _mean, _min, _max, last_reset, state, _sum, weight in rows:
+        yield _RollupRow(
+            metadata_id, start, _mean, weight, _min, _max, last_reset, state, _sum
+        )
+
+
+def _reduce_rollup_rows(
+    rows: Iterable[_RollupRow],
+    period_start_end: Callable[[float], tuple[float, float]],
+) -> list[_RollupRow]:
+    """Reduce rows sorted by metadata_id and start_ts to one row per period.
+
+    The mean is weighted by the number of hourly means each row was
+    compiled from and computed exactly, like statistics.mean does.
+    """
+    result: list[_RollupRow] = []
+    for metadata_id, metadata_rows in groupby(rows, itemgetter(0)):
+        for period_start_ts, period_rows in groupby(
+            metadata_rows, lambda row: period_start_end(row.start_ts)[0]
+        ):
+            weighted_means: list[Fraction] = []
+            mean_weight = 0
+            min_values: list[float] = []
+            max_values: list[float] = []
+            for row in period_rows:
+                if row.mean is not None and row.mean_weight:
+                    weighted_means.append(Fraction(row.mean) * row.mean_weight)
+                    mean_weight += row.mean_weight
+                if row.min is not None:
+                    min_values.append(row.min)
+                if row.max is not None:
+                    max_values.append(row.max)
+            # The last row of the period has the period's state and sum
+            result.append(
+                _RollupRow(
+                    metadata_id,
+                    period_start_ts,
+                    float(sum(weighted_means) / mean_weight) if mean_weight else None,
+                    mean_weight,
+                    min(min_values) if min_values else None,
+                    max(max_values) if max_values else None,
+                    row.last_reset_ts,
+                    row.state,
+                    row.sum,
+                )
+            )
+    return result
+
+
+def _replace_rollup_rows(
+    session: Session,
+    table: type[StatisticsRollupBase],
+    metadata_ids: list[int] | None,
+    start_ts: float,
+    end_ts: float,
+    rows: list[_RollupRow],
+    now_timestamp: float,
+) -> None:
+    """Replace the rollups in start_ts - end_ts."""
+    stmt = delete(table).where(table.start_ts >= start_ts, table.start_ts < end_ts)
+    if metadata_ids is not None:
+        stmt = stmt.where(table.metadata_id.in_(metadata_ids))
+    session.execute(stmt)
+    if rows:
+        session.execute(
+            insert(table),
+            [{**row._asdict(), "created_ts": now_timestamp} for row in rows],
+        )
+
+
+def _update_statistics_rollups(
+    session: Session,
+    metadata_ids: Collection[int] | None,
+    start_ts: float,
+    end_ts: float,
+) -> None:
+    """Compile the daily and monthly rollups of the hourly statistics.
+
+    All local days and months overlapping start_ts - end_ts are compiled
+    again, days from the hourly statistics and months from the days.
+    """
+    _, day_start_end = reduce_day_ts_factory()
+    _, month_start_end = reduce_month_ts_factory()
+    days, days_end_ts = _period_starts(day_start_end, start_ts, end_ts)
+    if not days:
+        return
+    months, months_end_ts = _period_starts(month_start_end, days[0], days_end_ts)
+    ids = None if metadata_ids is None else list(metadata_ids)
+    now_timestamp = time_time()
+    # Make sure new hourly statistics are included
+    session.flush()
+    daily_rows = _reduce_rollup_rows(
+        _get_rollup_rows(session, Statistics, ids, days[0], days_end_ts),
+        day_start_end,
+    )
+    _replace_rollup_rows(
+        session, StatisticsDaily, ids, days[0], days_end_ts, daily_rows, now_timestamp
+    )
+    # Days compiled before a time zone change don't line up with the
+    # local days anymore and are skipped
+    monthly_rows = _reduce_rollup_rows(
+        (
+            row
+            for row in _get_rollup_rows(
+                session, StatisticsDaily, ids, months[0], months_end_ts
+            )
+            if day_start_end(row.start_ts)[0] == row.start_ts
+        ),
+        month_start_end,
+    )
+    _replace_rollup_rows(
+        session,
+        StatisticsMonthly,
+        ids,
+        months[0],
+        months_end_ts,
+        monthly_rows,
+        now_timestamp,
+    )
+
+
+def backfill_statistics_rollups(
+    session: Session, start_ts: float, end_ts: float
+) -> None:
+    """Compile the daily and monthly rollups of all statistics."""
+    _update_statistics_rollups(session, None, start_ts, end_ts)
+
+
+def _get_statistics_rollup_rows(
+    session: Session,
+    metadata_ids: list[int],
+    start_time: datetime,
+    end_time: datetime | None,
+    period: Literal["day", "week", "month"],
+) -> list[_RollupRow]:
+    """Return one row per statistic and day, week or month.
+
+    The rows of the periods within start_time - end_time are read from
+    the daily or monthly rollups. Periods which don't have a rollup and
+    the periods which are only partly within start_time - end_time are
+    reduced from the hourly statistics within start_time - end_time.
+    """
+    rollup_table: type[StatisticsRollupBase]
+    if period == "month":
+        rollup_table = StatisticsMonthly
+        _, period_start_end = reduce_month_ts_factory()
+    else:
+        rollup_table = StatisticsDaily
+        _, period_start_end = reduce_day_ts_factory()
+    start_ts = start_time.timestamp()
+    end_ts = None if end_time is None else end_time.timestamp()
+    rollup_rows = list(
+        _get_rollup_rows(session, rollup_table, metadata_ids, start_ts, end_ts)
     )
+    if end_ts is None:
+        end_ts = period_start_end(
+            max(time_time(), max((row.start_ts for row in rollup_rows), default=0))
+        )[1]
+    period_starts, periods_end_ts = _period_starts(period_start_end, start_ts, end_ts)
+    period_ends = [*period_starts[1:], periods_end_ts]
+    # Rollups are only used for the periods fully within start_ts - end_ts,
+    # rollups compiled before a time zone change don't line up with the
+    # local periods anymore and are ignored as well
+    full_periods = {
+        period_start_ts
+        for period_start_ts, period_end_ts in zip(
+            period_starts, period_ends, strict=True
+        )
+        if period_start_ts >= start_ts and period_end_ts <= end_ts
+    }
+    rows_by_period = {
+        (row.metadata_id, row.start_ts): row
+        for row in rollup_rows
+        if row.start_ts in full_periods
+    }
+    missing_ids: list[int] = []
+    missing_start_ts = periods_end_ts
+    missing_end_ts = start_ts
+    for metadata_id in metadata_ids:
+        missing = [
+            idx
+            for idx, period_start_ts in enumerate(period_starts)
+            if (metadata_id, period_start_ts) not in rows_by_period
+        ]
+        if missing:
+            missing_ids.append(metadata_id)
+            missing_start_ts = min(
+                missing_start_ts, max(start_ts, period_starts[missing[0]])
+            )
+            missing_end_ts = max(missing_end_ts, min(end_ts, period_ends[missing[-1]]))
+    if missing_ids:
+        # There may be hourly statistics after the newest rollup
+        if end_time is None and missing_end_ts == periods_end_ts:
+            end_ts = None
+        else:
+            end_ts = missing_end_ts
+        for row in _reduce_rollup_rows(
+            _get_rollup_rows(
+                session, Statistics, missing_ids, missing_start_ts, end_ts
+            ),
+            period_start_end,
+        ):
+            rows_by_period.setdefault((row.metadata_id, row.start_ts), row)
+    rows = sorted(rows_by_period.values(), key=itemgetter(0, 1))
+    if period == "week":
+        _, week_start_end = reduce_week_ts_factory()
+        rows = _reduce_rollup_rows(rows, week_start_end)
+    return rows
 
 
 def _generate_statistics_during_period_stmt(
@@ -1777,19 +2004,31 @@ def _statistics_during_period_with_session(
     table: type[Statistics | StatisticsShortTerm] = (
         Statistics if period != "5minute" else StatisticsShortTerm
     )
-    stmt = _generate_statistics_during_period_stmt(
-        start_time, end_time, metadata_ids, table, types
-    )
-    stats = cast(
-        Sequence[Row], execute_stmt_lambda_element(session, stmt, orm_rows=False)
-    )
+    stats: Sequence[Row] | list[_RollupRow]
+    if period in _PERIOD_TS_FACTORIES:
+        stats = _get_statistics_rollup_rows(
+            session,
+            metadata_ids
+            if metadata_ids is not None
+            else [metadata_id for metadata_id, _ in metadata.values()],
+            start_time,
+            end_time,
+            period,  # type: ignore[arg-type]
+        )
+    else:
+        stmt = _generate_statistics_during_period_stmt(
+            start_time, end_time, metadata_ids, table, types
+        )
+        stats = cast(
+            Sequence[Row], execute_stmt_lambda_element(session, stmt, orm_rows=False)
+        )
 
     if not stats:
         return {}
 
     result = _sorted_statistics_to_dict(
         hass,
-        stats,
+        stats,  # type: ignore[arg-type]
         statistic_ids,
         metadata,
         True,
@@ -1798,14 +2037,13 @@ def _statistics_during_period_with_session(
         types,
     )
 
-    if period == "day":
-        result = _reduce_statistics_per_day(result, types)
-
-    if period == "week":
-        result = _reduce_statistics_per_week(result, types)
-
-    if period == "month":
-        result = _reduce_statistics_per_month(result, types)
+    if period in _PERIOD_TS_FACTORIES:
+        # There is one row per period, set the end of each row to the end
+        # of the period
+        _, period_start_end = _PERIOD_TS_FACTORIES[period]()
+        for stat_list in result.values():
+            for row in stat_list:
+                row["end"] = period_start_end(row["start"])[1]
 
     if "change" in _types:
         _augment_result_with_change(
@@ -2446,16 +2684,33 @@ def import_statistics(
     table: type[StatisticsBase],
 ) -> bool:
     """Process an import_statistics job."""
-
+    statistics = list(statistics)
     with session_scope(
         session=instance.get_session(),
         exception_filter=filter_unique_constraint_integrity_error(
             instance, "statistic"
         ),
     ) as session:
-        return _import_statistics_with_session(
+        if not _import_statistics_with_session(
             instance, session, metadata, statistics, table
-        )
+        ):
+            return False
+
+    if table is Statistics and statistics:
+        # The rollups are compiled once the imported statistics are committed,
+        # flushing rejected duplicated rows must not fail the import
+        starts = [stat["start"].timestamp() for stat in statistics]
+        with session_scope(session=instance.get_session()) as session:
+            if metadata_id_and_metadata := instance.statistics_meta_manager.get(
+                session, metadata["statistic_id"]
+            ):
+                _update_statistics_rollups(
+                    session,
+                    (metadata_id_and_metadata[0],),
+                    min(starts),
+                    max(starts) + Statistics.duration.total_seconds(),
+                )
+    return True
 
 
 @retryable_database_job("adjust_statistics")
@@ -2489,20 +2744,29 @@ def adjust_statistics(
             sum_adjustment,
         )
 
+        metadata_id = metadata[statistic_id][0]
+        hourly_start_time = start_time.replace(minute=0)
         _adjust_sum_statistics(
-            session,
-            Statistics,
-            metadata[statistic_id][0],
-            start_time.replace(minute=0),
-            sum_adjustment,
+            session, Statistics, metadata_id, hourly_start_time, sum_adjustment
         )
+        if last_start_ts := session.execute(
+            select(func.max(Statistics.start_ts)).filter(
+                Statistics.metadata_id == metadata_id
+            )
+        ).scalar():
+            _update_statistics_rollups(
+                session,
+                (metadata_id,),
+                hourly_start_time.timestamp(),
+                last_start_ts + Statistics.duration.total_seconds(),
+            )
 
     return True
 
 
 def _change_statistics_unit_for_table(
     session: Session,
-    table: type[StatisticsBase],
+    table: type[StatisticsBase | StatisticsRollupBase],
     metadata_id: int,
     convert: Callable[[float | None], float | None],
 ) -> None:
@@ -2554,9 +2818,11 @@ def change_statistics_unit(
             )
             return
 
-        tables: tuple[type[StatisticsBase], ...] = (
+        tables: tuple[type[StatisticsBase | StatisticsRollupBase], ...] = (
             Statistics,
             StatisticsShortTerm,
+            StatisticsDaily,
+            StatisticsMonthly,
         )
         for table in tables:
             _change_statistics_unit_for_table(session, table, metadata_id, convert)
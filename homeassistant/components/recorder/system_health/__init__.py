@@ -55,6 +55,22 @@ def _async_get_db_engine_info(instance: Recorder) -> dict[str, Any]:
     return db_engine_info
 
 
+@callback
+def _async_get_slow_query_info(instance: Recorder) -> dict[str, Any]:
+    """Get info about the slow queries when the query statistics are enabled."""
+    instrumentation = instance.query_instrumentation
+    if not instrumentation.enabled:
+        return {}
+    slow_queries = instrumentation.slow_queries
+    slow_query_info: dict[str, Any] = {"slow_queries": len(slow_queries)}
+    if slow_queries:
+        slowest = max(slow_queries, key=lambda slow_query: slow_query.elapsed)
+        slow_query_info["slowest_query"] = (
+            f"{slowest.label} ({slowest.elapsed * 1000:.0f} ms)"
+        )
+    return slow_query_info
+
+
 async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
     """Get info for the info page."""
     instance = get_instance(hass)
@@ -72,4 +88,4 @@ async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
             "oldest_recorder_run": recorder_runs_manager.first.start,
             "current_recorder_run": recorder_runs_manager.current.start,
         }
-    return db_runs | db_stats | db_engine_info
+    return db_runs | db_stats | db_engine_info | _async_get_slow_query_info(instance)
@@ -2,15 +2,25 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable, Iterable
+import logging
 from typing import TYPE_CHECKING, Any
 
 from lru import LRU
+from sqlalchemy.orm.session import Session
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 
+from homeassistant.util.collection import chunked_or_all
 from homeassistant.util.event_type import EventType
 
+from ..models import decompress_shared_json
+from ..util import execute_stmt_lambda_element
+
 if TYPE_CHECKING:
     from ..core import Recorder
 
+_LOGGER = logging.getLogger(__name__)
+
 
 class BaseTableManager[_DataT]:
     """Base class for table managers."""
@@ -53,17 +63,100 @@ class BaseTableManager[_DataT]:
         self._pending.clear()
 
 
+# The hit rate below which a full LRU cache is grown
+# when the recorder tunes the cache sizes
+LRU_TUNE_TARGET_HIT_RATE = 0.9
+# The number of misses needed since the last tuning before the
+# hit rate is considered, to avoid growing on a handful of lookups
+LRU_TUNE_MIN_MISSES = 100
+
+
 class BaseLRUTableManager[_DataT](BaseTableManager[_DataT]):
     """Base class for LRU table managers."""
 
-    def __init__(self, recorder: Recorder, lru_size: int) -> None:
+    # Query of the (id, shared JSON) rows of ids, set by the managers
+    # of shared attributes and event data to warm the cache
+    _find_shared_by_ids: Callable[[Iterable[int]], StatementLambdaElement]
+
+    def __init__(
+        self, recorder: Recorder, lru_size: int, max_lru_size: int | None = None
+    ) -> None:
         """Initialize the LRU table manager.
 
         We keep track of the most recently used items
         and evict the least recently used items when the cache is full.
+
+        If max_lru_size is set, the cache is grown up to that size
+        when the hit rate is low.
         """
         super().__init__(recorder)
         self._id_map = LRU(lru_size)
+        self._max_lru_size = max_lru_size
+        self.hits = 0
+        self.misses = 0
+        self._tuned_hits = 0
+        self._tuned_misses = 0
+
+    def get_from_cache(self, data: str) -> int | None:
+        """Resolve data to the id without accessing the underlying database.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if (data_id := self._id_map.get(data)) is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return data_id
+
+    def cache_stats(self) -> dict[str, int]:
+        """Return the hit and miss counters and the size of the LRU cache."""
+        lru = self._id_map
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(lru),
+            "size": lru.get_size(),
+        }
+
+    def tune_lru_size(self) -> None:
+        """Grow the LRU cache if the hit rate since the last tuning is low.
+
+        The cache is only grown when it is full since misses on a cache
+        that is not full are for data that has never been seen before.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        hits = self.hits - self._tuned_hits
+        misses = self.misses - self._tuned_misses
+        self._tuned_hits = self.hits
+        self._tuned_misses = self.misses
+        if not (max_lru_size := self._max_lru_size) or misses < LRU_TUNE_MIN_MISSES:
+            return
+        lru = self._id_map
+        size = lru.get_size()
+        if (
+            size < max_lru_size
+            and len(lru) >= size
+            and hits / (hits + misses) < LRU_TUNE_TARGET_HIT_RATE
+        ):
+            new_size = min(size * 2, max_lru_size)
+            _LOGGER.debug(
+                "Growing %s LRU cache from %s to %s",
+                type(self).__name__,
+                size,
+                new_size,
+            )
+            lru.set_size(new_size)
+
+    def snapshot(self) -> list[int]:
+        """Return the cached ids from the least to the most recently used.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        return list(reversed(self._id_map.values()))
 
     def adjust_lru_size(self, new_size: int) -> None:
         """Adjust the LRU cache size.
@@ -74,3 +167,26 @@ class BaseLRUTableManager[_DataT](BaseTableManager[_DataT]):
         lru = self._id_map
         if new_size > lru.get_size():
             lru.set_size(new_size)
+
+    def warm(self, ids: list[int], session: Session) -> None:
+        """Load a snapshot of the cache taken before the last shutdown.
+
+        The shared JSON is read back from the database so ids
+        that have been purged since the snapshot was taken are dropped.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        ids = ids[-self._id_map.get_size() :]
+        shared_by_id: dict[int, str] = {}
+        with session.no_autoflush:
+            for ids_chunk in chunked_or_all(ids, self.recorder.max_bind_vars):
+                for id_, shared in execute_stmt_lambda_element(
+                    session, self._find_shared_by_ids(ids_chunk), orm_rows=False
+                ):
+                    shared_by_id[id_] = shared
+        # Insert from the least to the most recently used
+        # to restore the order of the cache
+        for id_ in ids:
+            if (stored := shared_by_id.get(id_)) is not None:
+                self._id_map[decompress_shared_json(stored)] = id_
@@ -13,7 +13,8 @@ from homeassistant.util.collection import chunked_or_all
 from homeassistant.util.json import JSON_ENCODE_EXCEPTIONS
 
 from ..db_schema import EventData
-from ..queries import get_shared_event_datas
+from ..models import decompress_shared_json
+from ..queries import get_shared_event_datas, get_shared_event_datas_by_ids
 from ..util import execute_stmt_lambda_element
 from . import BaseLRUTableManager
 
@@ -22,6 +23,7 @@ if TYPE_CHECKING:
 
 
 CACHE_SIZE = 2048
+CACHE_MAX_SIZE = 16384
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -31,7 +33,8 @@ class EventDataManager(BaseLRUTableManager[EventData]):
 
     def __init__(self, recorder: Recorder) -> None:
         """Initialize the event type manager."""
-        super().__init__(recorder, CACHE_SIZE)
+        super().__init__(recorder, CACHE_SIZE, CACHE_MAX_SIZE)
+        self._find_shared_by_ids = get_shared_event_datas_by_ids
 
     def serialize_from_event(self, event: Event) -> bytes | None:
         """Serialize event data."""
@@ -96,23 +99,25 @@ class EventDataManager(BaseLRUTableManager[EventData]):
         results: dict[str, int | None] = {}
         with session.no_autoflush:
             for hashs_chunk in chunked_or_all(hashes, self.recorder.max_bind_vars):
-                for data_id, shared_data in execute_stmt_lambda_element(
+                for data_id, stored_data in execute_stmt_lambda_element(
                     session, get_shared_event_datas(hashs_chunk), orm_rows=False
                 ):
+                    shared_data = decompress_shared_json(stored_data)
                     results[shared_data] = self._id_map[shared_data] = cast(
                         int, data_id
                     )
 
         return results
 
-    def add_pending(self, db_event_data: EventData) -> None:
+    def add_pending(self, shared_data: str, db_event_data: EventData) -> None:
         """Add a pending EventData that will be committed at the next interval.
 
+        The EventData is keyed by the JSON of shared_data since
+        it may be stored compressed.
+
         This call is not thread-safe and must be called from the
         recorder thread.
         """
-        assert db_event_data.shared_data is not None
-        shared_data: str = db_event_data.shared_data
         self._pending[shared_data] = db_event_data
 
     def post_commit_pending(self) -> None:
@@ -2,9 +2,9 @@
 
 from __future__ import annotations
 
-from collections.abc import Collection, Iterable
+from collections.abc import Collection, Iterable, Mapping
 import logging
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, Any, cast
 
 from sqlalchemy.orm.session import Session
 
@@ -13,7 +13,8 @@ from homeassistant.util.collection import chunked_or_all
 from homeassistant.util.json import JSON_ENCODE_EXCEPTIONS
 
 from ..db_schema import StateAttributes
-from ..queries import get_shared_attributes
+from ..models import decompress_shared_json
+from ..queries import get_shared_attributes, get_shared_attributes_by_ids
 from ..util import execute_stmt_lambda_element
 from . import BaseLRUTableManager
 
@@ -27,6 +28,9 @@ if TYPE_CHECKING:
 # - How frequently states with overlapping attributes will change
 # - How much memory our low end hardware has
 CACHE_SIZE = 2048
+# The number of attribute ids the cache can grow to
+# when the hit rate is low
+CACHE_MAX_SIZE = 16384
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -36,12 +40,26 @@ class StateAttributesManager(BaseLRUTableManager[StateAttributes]):
 
     def __init__(self, recorder: Recorder) -> None:
         """Initialize the event type manager."""
-        super().__init__(recorder, CACHE_SIZE)
+        super().__init__(recorder, CACHE_SIZE, CACHE_MAX_SIZE)
+        self._find_shared_by_ids = get_shared_attributes_by_ids
+        # entity_id -> the attributes of the last state and their serialization
+        self._serialized: dict[str, tuple[Mapping[str, Any], bytes]] = {}
 
     def serialize_from_event(self, event: Event[EventStateChangedData]) -> bytes | None:
-        """Serialize event data."""
+        """Serialize event data.
+
+        The state machine keeps the attributes mapping of the old state
+        when the attributes did not change so the serialization of the
+        last state of the entity is reused when the mapping is the same.
+        """
+        if (new_state := event.data["new_state"]) is None:
+            self._serialized.pop(event.data["entity_id"], None)
+        elif (
+            serialized := self._serialized.get(new_state.entity_id)
+        ) is not None and serialized[0] is new_state.attributes:
+            return serialized[1]
         try:
-            return StateAttributes.shared_attrs_bytes_from_event(
+            shared_attrs_bytes = StateAttributes.shared_attrs_bytes_from_event(
                 event, self.recorder.dialect_name
             )
         except JSON_ENCODE_EXCEPTIONS as ex:
@@ -51,6 +69,21 @@ class StateAttributesManager(BaseLRUTableManager[StateAttributes]):
                 ex,
             )
             return None
+        if new_state is not None:
+            self._serialized[new_state.entity_id] = (
+                new_state.attributes,
+                shared_attrs_bytes,
+            )
+        return shared_attrs_bytes
+
+    def reset(self) -> None:
+        """Reset after the database has been reset or changed.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        super().reset()
+        self._serialized.clear()
 
     def load(
         self, events: list[Event[EventStateChangedData]], session: Session
@@ -107,23 +140,27 @@ class StateAttributesManager(BaseLRUTableManager[StateAttributes]):
         results: dict[str, int | None] = {}
         with session.no_autoflush:
             for hashs_chunk in chunked_or_all(hashes, self.recorder.max_bind_vars):
-                for attributes_id, shared_attrs in execute_stmt_lambda_element(
+                for attributes_id, stored_attrs in execute_stmt_lambda_element(
                     session, get_shared_attributes(hashs_chunk), orm_rows=False
                 ):
+                    shared_attrs = decompress_shared_json(stored_attrs)
                     results[shared_attrs] = self._id_map[shared_attrs] = cast(
                         int, attributes_id
                     )
 
         return results
 
-    def add_pending(self, db_state_attributes: StateAttributes) -> None:
+    def add_pending(
+        self, shared_attrs: str, db_state_attributes: StateAttributes
+    ) -> None:
         """Add a pending StateAttributes that will be committed at the next interval.
 
+        The StateAttributes are keyed by the JSON of shared_attrs since
+        they may be stored compressed.
+
         This call is not thread-safe and must be called from the
         recorder thread.
         """
-        assert db_state_attributes.shared_attrs is not None
-        shared_attrs: str = db_state_attributes.shared_attrs
         self._pending[shared_attrs] = db_state_attributes
 
     def post_commit_pending(self) -> None:
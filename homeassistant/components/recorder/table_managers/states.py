@@ -2,14 +2,23 @@
 
 from __future__ import annotations
 
+from collections import Counter
 from collections.abc import Sequence
+from functools import cache
 from typing import Any, cast
 
+from sqlalchemy import insert, inspect
 from sqlalchemy.engine.row import Row
 from sqlalchemy.orm.session import Session
 
+from homeassistant.util.collection import chunked_or_all
+
 from ..db_schema import States
-from ..queries import find_oldest_state
+from ..queries import (
+    find_oldest_state,
+    find_states_ids_before,
+    update_attributes_ref_counts,
+)
 from ..util import execute_stmt_lambda_element
 
 
@@ -19,6 +28,7 @@ class StatesManager:
     def __init__(self) -> None:
         """Initialize the states manager for linking old_state_id."""
         self._pending: dict[str, States] = {}
+        self._pending_inserts: list[States] = []
         self._last_committed_id: dict[str, int] = {}
         self._last_reported: dict[int, float] = {}
         self._oldest_ts: float | None = None
@@ -61,6 +71,92 @@ class StatesManager:
         if self._oldest_ts is None:
             self._oldest_ts = state.last_updated_ts
 
+    def add_pending_insert(self, state: States) -> None:
+        """Add a state to be written by insert_pending.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._pending_inserts.append(state)
+
+    def insert_pending(
+        self, session: Session, count_attributes_refs: bool = False
+    ) -> None:
+        """Write the pending States to the database.
+
+        The States are written with bulk INSERT statements instead of
+        going through the ORM unit of work, which is expensive for the
+        self-referencing states table. A state linking to an older state
+        of the same entity in this batch needs the state_id of that state,
+        so the states are written in waves with at most one state per
+        entity in each wave.
+
+        If count_attributes_refs is set the reference counts of the
+        StateAttributes the states link to are updated as well.
+
+        Must run in the recorder thread before the session is committed.
+        """
+        if not (pending_inserts := self._pending_inserts):
+            return
+        # Flush the StatesMeta and StateAttributes the
+        # states link to so their ids are available
+        session.flush()
+        waves: list[list[States]] = []
+        wave_by_state: dict[int, int] = {}
+        for db_state in pending_inserts:
+            wave = 0
+            if (old_state := db_state.old_state) is not None and (
+                old_wave := wave_by_state.get(id(old_state))
+            ) is not None:
+                wave = old_wave + 1
+            wave_by_state[id(db_state)] = wave
+            if wave == len(waves):
+                waves.append([])
+            waves[wave].append(db_state)
+
+        # The class is looked up from the objects as older
+        # schemas are swapped in by the migration tests
+        states_class = type(pending_inserts[0])
+        keys = _insert_keys(states_class)
+        connection = session.connection()
+        attributes_refs: Counter[int] = Counter()
+        returning = (
+            connection.dialect.insert_executemany_returning_sort_by_parameter_order
+        )
+        for wave_states in waves:
+            rows = [_state_to_row(db_state, keys) for db_state in wave_states]
+            if count_attributes_refs:
+                attributes_refs.update(
+                    attributes_id
+                    for row in rows
+                    if (attributes_id := row["attributes_id"]) is not None
+                )
+            if returning:
+                state_ids = connection.execute(
+                    insert(states_class).returning(
+                        states_class.state_id, sort_by_parameter_order=True
+                    ),
+                    rows,
+                ).scalars()
+                for db_state, state_id in zip(wave_states, state_ids, strict=True):
+                    db_state.state_id = state_id
+                continue
+            # The dialect cannot return the ids of an executemany
+            # so we fall back to one INSERT per state
+            for db_state, row in zip(wave_states, rows, strict=True):
+                db_state.state_id = connection.execute(
+                    insert(states_class), row
+                ).inserted_primary_key[0]
+        pending_inserts.clear()
+        if attributes_refs:
+            connection.execute(
+                update_attributes_ref_counts(),
+                [
+                    {"b_attributes_id": attributes_id, "b_refs": refs}
+                    for attributes_id, refs in attributes_refs.items()
+                ],
+            )
+
     def update_pending_last_reported(
         self, state_id: int, last_reported_timestamp: float
     ) -> None:
@@ -90,6 +186,7 @@ class StatesManager:
         """
         self._last_committed_id.clear()
         self._pending.clear()
+        self._pending_inserts.clear()
         self._oldest_ts = None
 
     def load_from_db(self, session: Session) -> None:
@@ -125,6 +222,24 @@ class StatesManager:
         ):
             last_committed_ids.pop(last_committed_ids_reversed[purged_state_id], None)
 
+    def evict_purged_states_before(
+        self, session: Session, end_ts: float, max_bind_vars: int
+    ) -> None:
+        """Evict committed states updated before end_ts.
+
+        Must run in the recorder thread before the states are purged.
+        """
+        purged_state_ids: set[int] = set()
+        for state_ids_chunk in chunked_or_all(
+            list(self._last_committed_id.values()), max_bind_vars
+        ):
+            purged_state_ids.update(
+                session.execute(
+                    find_states_ids_before(state_ids_chunk, end_ts)
+                ).scalars()
+            )
+        self.evict_purged_state_ids(purged_state_ids)
+
     def evict_purged_entity_ids(self, purged_entity_ids: set[str]) -> None:
         """Evict purged entity_ids from the committed states.
 
@@ -134,3 +249,29 @@ class StatesManager:
         last_committed_ids = self._last_committed_id
         for entity_id in purged_entity_ids:
             last_committed_ids.pop(entity_id, None)
+
+
+@cache
+def _insert_keys(states_class: type[States]) -> tuple[str, ...]:
+    """Return the columns to write for a bulk insert of states."""
+    return tuple(
+        attr.key
+        for attr in inspect(states_class).column_attrs
+        if attr.key != "state_id"
+    )
+
+
+def _state_to_row(db_state: States, keys: tuple[str, ...]) -> dict[str, Any]:
+    """Convert a States object to a row for a bulk insert.
+
+    The foreign keys are resolved from the relationships since
+    they are only synchronized by the ORM on flush.
+    """
+    row = {key: getattr(db_state, key) for key in keys}
+    if row["metadata_id"] is None and (states_meta := db_state.states_meta_rel):
+        row["metadata_id"] = states_meta.metadata_id
+    if row["attributes_id"] is None and (attributes := db_state.state_attributes):
+        row["attributes_id"] = attributes.attributes_id
+    if row["old_state_id"] is None and (old_state := db_state.old_state):
+        row["old_state_id"] = old_state.state_id
+    return row
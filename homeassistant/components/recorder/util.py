@@ -10,7 +10,7 @@ import functools
 import logging
 import os
 import time
-from typing import TYPE_CHECKING, Any, Concatenate, NoReturn
+from typing import TYPE_CHECKING, Any, Concatenate, NoReturn, cast
 
 from awesomeversion import (
     AwesomeVersion,
@@ -24,6 +24,7 @@ from sqlalchemy.engine.interfaces import DBAPIConnection
 from sqlalchemy.exc import OperationalError, SQLAlchemyError, StatementError
 from sqlalchemy.orm.query import Query
 from sqlalchemy.orm.session import Session
+from sqlalchemy.sql.compiler import SQLCompiler
 from sqlalchemy.sql.lambdas import StatementLambdaElement
 import voluptuous as vol
 
@@ -43,6 +44,11 @@ from .db_schema import (
     TABLES_TO_CHECK,
     RecorderRuns,
 )
+from .instrumentation import (
+    QUERY_INSTRUMENTATION,
+    QueryInstrumentation,
+    statement_label,
+)
 from .models import (
     DatabaseEngine,
     DatabaseOptimizer,
@@ -182,14 +188,36 @@ def execute_stmt_lambda_element(
     with .all().
     """
     use_all = not start_time or ((end_time or dt_util.utcnow()) - start_time).days <= 1
+    instrumentation: QueryInstrumentation | None = session.info.get(
+        QUERY_INSTRUMENTATION
+    )
+    if instrumentation is not None and not instrumentation.enabled:
+        instrumentation = None
     for tryno in range(RETRIES):
         try:
+            if instrumentation:
+                start = time.perf_counter()
             if orm_rows:
                 executed = session.execute(stmt)
             else:
                 executed = session.connection().execute(stmt)
             if use_all:
-                return executed.all()
+                rows = executed.all()
+                if instrumentation:
+                    _instrument_statement(
+                        instrumentation,
+                        session,
+                        stmt,
+                        time.perf_counter() - start,
+                        len(rows),
+                    )
+                return rows
+            if instrumentation:
+                # The rows are streamed to the caller so only the time
+                # to execute the statement is known
+                _instrument_statement(
+                    instrumentation, session, stmt, time.perf_counter() - start, None
+                )
             return executed.yield_per(yield_per)
         except SQLAlchemyError as err:
             _LOGGER.error("Error executing query: %s", err)
@@ -201,6 +229,52 @@ def execute_stmt_lambda_element(
     raise RuntimeError  # pragma: no cover
 
 
+def _instrument_statement(
+    instrumentation: QueryInstrumentation,
+    session: Session,
+    stmt: StatementLambdaElement,
+    elapsed: float,
+    rows: int | None,
+) -> None:
+    """Record a statement run and explain it if it was slow.
+
+    Statements which are still streaming rows are not explained
+    since some databases cannot run another statement on the
+    connection until the rows have been fetched.
+    """
+    statement: str | None = None
+    explain: list[list[str]] | None = None
+    if elapsed >= instrumentation.slow_query_threshold and rows is not None:
+        statement, explain = _explain_statement(session, stmt)
+    instrumentation.record(statement_label(stmt), elapsed, rows, statement, explain)
+
+
+def _explain_statement(
+    session: Session, stmt: StatementLambdaElement
+) -> tuple[str | None, list[list[str]] | None]:
+    """Return the SQL of a statement and the query plan of the database."""
+    dialect = session.get_bind().dialect
+    try:
+        # Statements are compiled by the SQL compiler of the dialect
+        compiled = cast(
+            SQLCompiler,
+            stmt.compile(dialect=dialect, compile_kwargs={"render_postcompile": True}),
+        )
+        params: Any = compiled.params
+        if compiled.positional and compiled.positiontup is not None:
+            params = tuple(compiled.params[name] for name in compiled.positiontup)
+        explain = (
+            "EXPLAIN QUERY PLAN "
+            if dialect.name == SupportedDialect.SQLITE
+            else "EXPLAIN "
+        )
+        result = session.connection().exec_driver_sql(explain + compiled.string, params)
+        return compiled.string, [[str(value) for value in row] for row in result]
+    except SQLAlchemyError as err:
+        _LOGGER.debug("Error explaining query: %s", err)
+        return None, None
+
+
 def validate_or_move_away_sqlite_database(dburl: str) -> bool:
     """Ensure that the database is valid or move it away."""
     dbpath = dburl_to_path(dburl)
@@ -413,34 +413,52 @@ def compile_statistics(  # noqa: C901
 
     sensor_states = _get_sensor_states(hass)
     wanted_statistics = _wanted_statistics(sensor_states)
-    # Get history between start and end
-    entities_full_history = [
-        i.entity_id for i in sensor_states if "sum" in wanted_statistics[i.entity_id]
-    ]
+    instance = get_instance(hass)
+    states_buffer = instance.states_buffer
+    start_time = start - datetime.timedelta.resolution
+    start_time_ts = start_time.timestamp()
+    end_ts = end.timestamp()
+    # Use the states buffered by the recorder thread when they cover the
+    # whole period and only query the database for the remaining entities
     history_list: dict[str, list[State]] = {}
+    entities_full_history: list[str] = []
+    entities_significant_history: list[str] = []
+    for _state in sensor_states:
+        entity_id = _state.entity_id
+        significant_changes_only = "sum" not in wanted_statistics[entity_id]
+        if (
+            buffered_states := states_buffer.get_states(
+                entity_id, start_time_ts, end_ts, significant_changes_only
+            )
+        ) is not None:
+            history_list[entity_id] = buffered_states
+        elif significant_changes_only:
+            entities_significant_history.append(entity_id)
+        else:
+            entities_full_history.append(entity_id)
+    # Get history between start and end
     if entities_full_history:
-        history_list = history.get_full_significant_states_with_session(
+        history_list |= history.get_full_significant_states_with_session(
             hass,
             session,
-            start - datetime.timedelta.resolution,
+            start_time,
             end,
             entity_ids=entities_full_history,
             significant_changes_only=False,
         )
-    entities_significant_history = [
-        i.entity_id
-        for i in sensor_states
-        if "sum" not in wanted_statistics[i.entity_id]
-    ]
     if entities_significant_history:
-        _history_list = history.get_full_significant_states_with_session(
+        history_list |= history.get_full_significant_states_with_session(
             hass,
             session,
-            start - datetime.timedelta.resolution,
+            start_time,
             end,
             entity_ids=entities_significant_history,
         )
-        history_list = {**history_list, **_history_list}
+    # Keep only what is needed for the next period and start tracking
+    # new sensors, states which are not recorded can't be buffered
+    states_buffer.prune((end - datetime.timedelta.resolution).timestamp())
+    if instance.recording:
+        states_buffer.track(sensor_states)
 
     entities_with_float_states: dict[str, list[tuple[float, State]]] = {}
     for _state in sensor_states:
@@ -458,7 +476,7 @@ def compile_statistics(  # noqa: C901
     # that are not in the metadata table and we are not working
     # with them anyway.
     old_metadatas = statistics.get_metadata_with_session(
-        get_instance(hass), session, statistic_ids=set(entities_with_float_states)
+        instance, session, statistic_ids=set(entities_with_float_states)
     )
     to_process: list[tuple[str, str | None, str, list[tuple[float, State]]]] = []
     to_query: set[str] = set()
@@ -16,6 +16,7 @@ from homeassistant.helpers.json import json_bytes
 from homeassistant.util.json import JsonValueType
 
 from .connection import ActiveConnection
+from .const import ENCODING_CBOR, ENCODING_JSON
 from .error import Disconnect
 
 if TYPE_CHECKING:
@@ -32,10 +33,16 @@ AUTH_MESSAGE_SCHEMA: Final = vol.Schema(
         vol.Required("type"): TYPE_AUTH,
         vol.Exclusive("api_password", "auth"): str,
         vol.Exclusive("access_token", "auth"): str,
+        vol.Optional("encoding", default=ENCODING_JSON): vol.In(
+            [ENCODING_JSON, ENCODING_CBOR]
+        ),
     }
 )
 
 AUTH_OK_MESSAGE = json_bytes({"type": TYPE_AUTH_OK, "ha_version": __version__})
+AUTH_OK_CBOR_MESSAGE = json_bytes(
+    {"type": TYPE_AUTH_OK, "ha_version": __version__, "encoding": ENCODING_CBOR}
+)
 AUTH_REQUIRED_MESSAGE = json_bytes(
     {"type": TYPE_AUTH_REQUIRED, "ha_version": __version__}
 )
@@ -57,6 +64,7 @@ class AuthPhase:
         cancel_ws: CALLBACK_TYPE,
         request: Request,
         send_bytes_text: Callable[[bytes], Coroutine[Any, Any, None]],
+        wait_send_queue_drained: Callable[[], Coroutine[Any, Any, None]] | None = None,
     ) -> None:
         """Initialize the authenticated connection."""
         self._hass = hass
@@ -67,6 +75,7 @@ class AuthPhase:
         self._request = request
         # send_bytes_text will directly send a message to the client.
         self._send_bytes_text = send_bytes_text
+        self._wait_send_queue_drained = wait_send_queue_drained
 
     async def async_handle(self, msg: JsonValueType) -> ActiveConnection:
         """Handle authentication."""
@@ -89,13 +98,20 @@ class AuthPhase:
                 self._send_message,
                 refresh_token.user,
                 refresh_token,
+                self._wait_send_queue_drained,
             )
             conn.subscriptions["auth"] = (
                 self._hass.auth.async_register_revoke_token_callback(
                     refresh_token.id, self._cancel_ws
                 )
             )
-            await self._send_bytes_text(AUTH_OK_MESSAGE)
+            # The auth_ok message is still JSON, it confirms the client
+            # can expect CBOR encoded messages in binary frames
+            if (encoding := valid_msg["encoding"]) == ENCODING_CBOR:
+                conn.encoding = encoding
+                await self._send_bytes_text(AUTH_OK_CBOR_MESSAGE)
+            else:
+                await self._send_bytes_text(AUTH_OK_MESSAGE)
             self._logger.debug("Auth OK")
             process_success_login(self._request)
             return conn
@@ -65,11 +65,18 @@ from homeassistant.util.json import format_unserializable_data
 from . import const, decorators, messages
 from .connection import ActiveConnection
 from .messages import construct_result_message
+from .subscription_hub import async_get_entity_subscription_hub, subscription_key
+from .throttle import EventThrottle
 
 ALL_SERVICE_DESCRIPTIONS_JSON_CACHE = "websocket_api_all_service_descriptions_json"
 
 _LOGGER = logging.getLogger(__name__)
 
+# Seconds during which the changes of an entity are merged into one message
+MIN_INTERVAL_SCHEMA = vol.All(
+    vol.Coerce(float), vol.Range(min=0, max=const.MAX_MIN_INTERVAL)
+)
+
 
 @callback
 def async_register_commands(
@@ -109,6 +116,7 @@ def pong_message(iden: int) -> dict[str, Any]:
 def _forward_events_check_permissions(
     send_message: Callable[[bytes | str | dict[str, Any]], None],
     user: User,
+    encode_event: Callable[[bytes, Event], bytes],
     message_id_as_bytes: bytes,
     event: Event,
 ) -> None:
@@ -122,17 +130,18 @@ def _forward_events_check_permissions(
         and not permissions.check_entity(event.data["entity_id"], POLICY_READ)
     ):
         return
-    send_message(messages.cached_event_message(message_id_as_bytes, event))
+    send_message(encode_event(message_id_as_bytes, event))
 
 
 @callback
 def _forward_events_unconditional(
     send_message: Callable[[bytes | str | dict[str, Any]], None],
+    encode_event: Callable[[bytes, Event], bytes],
     message_id_as_bytes: bytes,
     event: Event,
 ) -> None:
     """Forward events to websocket."""
-    send_message(messages.cached_event_message(message_id_as_bytes, event))
+    send_message(encode_event(message_id_as_bytes, event))
 
 
 @callback
@@ -140,6 +149,7 @@ def _forward_events_unconditional(
     {
         vol.Required("type"): "subscribe_events",
         vol.Optional("event_type", default=MATCH_ALL): str,
+        vol.Optional("min_interval"): MIN_INTERVAL_SCHEMA,
     }
 )
 def handle_subscribe_events(
@@ -156,23 +166,45 @@ def handle_subscribe_events(
         )
         raise Unauthorized(user_id=connection.user.id)
 
-    message_id_as_bytes = str(msg["id"]).encode()
+    encode_event: Callable[[bytes, Event], bytes]
+    if connection.encoding == const.ENCODING_CBOR:
+        message_id_as_bytes = messages.message_id_as_cbor(msg["id"])
+        encode_event = messages.cached_event_message_cbor
+    else:
+        message_id_as_bytes = str(msg["id"]).encode()
+        encode_event = messages.cached_event_message
 
     if event_type == EVENT_STATE_CHANGED:
         forward_events = partial(
             _forward_events_check_permissions,
             connection.send_message,
             connection.user,
+            encode_event,
             message_id_as_bytes,
         )
     else:
         forward_events = partial(
-            _forward_events_unconditional, connection.send_message, message_id_as_bytes
+            _forward_events_unconditional,
+            connection.send_message,
+            encode_event,
+            message_id_as_bytes,
         )
 
-    connection.subscriptions[msg["id"]] = hass.bus.async_listen(
-        event_type, forward_events
-    )
+    if min_interval := msg.get("min_interval"):
+        throttle = EventThrottle(hass, min_interval, forward_events)
+        unsub = hass.bus.async_listen(event_type, throttle.async_add)
+
+        @callback
+        def _async_unsub_throttled() -> None:
+            """Unsubscribe and drop the events held back."""
+            unsub()
+            throttle.async_cancel()
+
+        connection.subscriptions[msg["id"]] = _async_unsub_throttled
+    else:
+        connection.subscriptions[msg["id"]] = hass.bus.async_listen(
+            event_type, forward_events
+        )
 
     connection.send_result(msg["id"])
 
@@ -325,15 +357,23 @@ def _async_get_allowed_states(
 
 
 @callback
-@decorators.websocket_command({vol.Required("type"): "get_states"})
+@decorators.websocket_command(
+    {
+        vol.Required("type"): "get_states",
+        vol.Optional("attributes"): messages.ATTRIBUTE_PROJECTION_SCHEMA,
+    }
+)
 def handle_get_states(
     hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
 ) -> None:
     """Handle get states command."""
     states = _async_get_allowed_states(hass, connection)
+    projection = _async_get_attribute_projection(msg)
 
     try:
-        serialized_states = [state.as_dict_json for state in states]
+        serialized_states = [
+            messages.projected_state_dict_json(state, projection) for state in states
+        ]
     except (ValueError, TypeError):
         pass
     else:
@@ -344,7 +384,9 @@ def handle_get_states(
     serialized_states = []
     for state in states:
         try:
-            serialized_states.append(state.as_dict_json)
+            serialized_states.append(
+                messages.projected_state_dict_json(state, projection)
+            )
         except (ValueError, TypeError):
             connection.logger.error(
                 "Unable to serialize to JSON. Bad data found at %s",
@@ -356,6 +398,15 @@ def handle_get_states(
     _send_handle_get_states_response(connection, msg["id"], serialized_states)
 
 
+def _async_get_attribute_projection(
+    msg: dict[str, Any],
+) -> messages.AttributeProjection | None:
+    """Return the attributes to send of the entities of a command."""
+    if config := msg.get("attributes"):
+        return messages.AttributeProjection(config)
+    return None
+
+
 def _send_handle_get_states_response(
     connection: ActiveConnection, msg_id: int, serialized_states: list[bytes]
 ) -> None:
@@ -367,38 +418,13 @@ def _send_handle_get_states_response(
     )
 
 
-@callback
-def _forward_entity_changes(
-    send_message: Callable[[str | bytes | dict[str, Any]], None],
-    entity_ids: set[str] | None,
-    entity_filter: Callable[[str], bool] | None,
-    user: User,
-    message_id_as_bytes: bytes,
-    event: Event[EventStateChangedData],
-) -> None:
-    """Forward entity state changed events to websocket."""
-    entity_id = event.data["entity_id"]
-    if (entity_ids and entity_id not in entity_ids) or (
-        entity_filter and not entity_filter(entity_id)
-    ):
-        return
-    # We have to lookup the permissions again because the user might have
-    # changed since the subscription was created.
-    permissions = user.permissions
-    if (
-        not user.is_admin
-        and not permissions.access_all_entities(POLICY_READ)
-        and not permissions.check_entity(entity_id, POLICY_READ)
-    ):
-        return
-    send_message(messages.cached_state_diff_message(message_id_as_bytes, event))
-
-
 @callback
 @decorators.websocket_command(
     {
         vol.Required("type"): "subscribe_entities",
         vol.Optional("entity_ids"): cv.entity_ids,
+        vol.Optional("attributes"): messages.ATTRIBUTE_PROJECTION_SCHEMA,
+        vol.Optional("min_interval"): MIN_INTERVAL_SCHEMA,
         **INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA.schema,
     }
 )
@@ -409,22 +435,32 @@ def handle_subscribe_entities(
     entity_ids = set(msg.get("entity_ids", [])) or None
     _filter = convert_include_exclude_filter(msg)
     entity_filter = None if _filter.empty_filter else _filter.get_filter()
+    projection = _async_get_attribute_projection(msg)
     # We must never await between sending the states and listening for
     # state changed events or we will introduce a race condition
     # where some states are missed
     states = _async_get_allowed_states(hass, connection)
     msg_id = msg["id"]
-    message_id_as_bytes = str(msg_id).encode()
-    connection.subscriptions[msg_id] = hass.bus.async_listen(
-        EVENT_STATE_CHANGED,
-        partial(
-            _forward_entity_changes,
-            connection.send_message,
-            entity_ids,
-            entity_filter,
-            connection.user,
-            message_id_as_bytes,
-        ),
+    if cbor := connection.encoding == const.ENCODING_CBOR:
+        message_id_as_bytes = messages.message_id_as_cbor(msg_id)
+        serialize_state = messages.projected_compressed_state_cbor
+    else:
+        message_id_as_bytes = str(msg_id).encode()
+        serialize_state = messages.projected_compressed_state_json
+    # Identical subscriptions of all the connections share one listener
+    # which filters and encodes each state change once
+    connection.subscriptions[msg_id] = async_get_entity_subscription_hub(
+        hass
+    ).async_subscribe(
+        subscription_key(msg),
+        entity_ids,
+        entity_filter,
+        projection,
+        msg.get("min_interval", 0),
+        connection.send_message,
+        connection.user,
+        message_id_as_bytes,
+        cbor,
     )
     connection.send_result(msg_id)
 
@@ -434,14 +470,16 @@ def handle_subscribe_entities(
     try:
         if entity_ids or entity_filter:
             serialized_states = [
-                state.as_compressed_state_json
+                serialize_state(state, projection)
                 for state in states
                 if (not entity_ids or state.entity_id in entity_ids)
                 and (not entity_filter or entity_filter(state.entity_id))
             ]
-        else:
+        elif projection is None and not cbor:
             # Fast path when not filtering
             serialized_states = [state.as_compressed_state_json for state in states]
+        else:
+            serialized_states = [serialize_state(state, projection) for state in states]
     except (ValueError, TypeError):
         pass
     else:
@@ -453,7 +491,7 @@ def handle_subscribe_entities(
     serialized_states = []
     for state in states:
         try:
-            serialized_states.append(state.as_compressed_state_json)
+            serialized_states.append(serialize_state(state, projection))
         except (ValueError, TypeError):
             connection.logger.error(
                 "Unable to serialize to JSON. Bad data found at %s",
@@ -473,6 +511,13 @@ def _send_handle_entities_init_response(
     serialized_states: list[bytes],
 ) -> None:
     """Send handle entities init response."""
+    if connection.encoding == const.ENCODING_CBOR:
+        connection.send_message(
+            messages.compressed_states_message_cbor(
+                message_id_as_bytes, serialized_states
+            )
+        )
+        return
     connection.send_message(
         b"".join(
             (
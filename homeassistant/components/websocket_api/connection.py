@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable, Hashable
+from collections.abc import Callable, Coroutine, Hashable
 from contextvars import ContextVar
 from typing import TYPE_CHECKING, Any, Literal
 
@@ -19,6 +19,7 @@ from . import const, messages
 from .messages import (
     error_message,
     event_message,
+    message_to_cbor_or_none,
     message_to_json_bytes,
     result_message,
 )
@@ -48,9 +49,12 @@ class ActiveConnection:
         "subscriptions",
         "last_id",
         "can_coalesce",
+        "coalesce_window",
+        "encoding",
         "supported_features",
         "handlers",
         "binary_handlers",
+        "_wait_send_queue_drained",
     )
 
     def __init__(
@@ -60,6 +64,7 @@ class ActiveConnection:
         send_message: Callable[[bytes | str | dict[str, Any]], None],
         user: User,
         refresh_token: RefreshToken,
+        wait_send_queue_drained: Callable[[], Coroutine[Any, Any, None]] | None = None,
     ) -> None:
         """Initialize an active connection."""
         self.logger = logger
@@ -70,21 +75,44 @@ class ActiveConnection:
         self.subscriptions: dict[Hashable, Callable[[], Any]] = {}
         self.last_id = 0
         self.can_coalesce = False
+        self.coalesce_window = 0.0
+        self.encoding = const.ENCODING_JSON
         self.supported_features: dict[str, float] = {}
         self.handlers: dict[str, tuple[MessageHandler, vol.Schema | Literal[False]]] = (
             self.hass.data[const.DOMAIN]
         )
         self.binary_handlers: list[BinaryHandler | None] = []
+        self._wait_send_queue_drained = wait_send_queue_drained
         current_connection.set(self)
 
     def __repr__(self) -> str:
         """Return the representation."""
         return f"<ActiveConnection {self.get_description(None)}>"
 
+    async def async_wait_send_queue_drained(self) -> None:
+        """Wait until the messages queued so far have been sent to the client.
+
+        Commands which send a large response as many messages wait for
+        each message to be sent before building the next one so the
+        memory held by the pending messages stays bounded.
+        """
+        if self._wait_send_queue_drained is not None:
+            await self._wait_send_queue_drained()
+
     def set_supported_features(self, features: dict[str, float]) -> None:
         """Set supported features."""
         self.supported_features = features
         self.can_coalesce = const.FEATURE_COALESCE_MESSAGES in features
+        # The window is in milliseconds
+        self.coalesce_window = (
+            min(
+                max(features.get(const.FEATURE_COALESCE_WINDOW, 0), 0),
+                const.MAX_COALESCE_WINDOW,
+            )
+            / 1000
+            if self.can_coalesce
+            else 0.0
+        )
 
     def get_description(self, request: web.Request | None) -> str:
         """Return a description of the connection."""
@@ -129,15 +157,26 @@ class ActiveConnection:
 
         return index + 1, unsub
 
+    def _message_to_bytes(self, message: dict[str, Any]) -> bytes:
+        """Serialize a message in the encoding of the connection.
+
+        Falls back to JSON if the message cannot be encoded to CBOR.
+        """
+        if self.encoding == const.ENCODING_CBOR and (
+            binary_message := message_to_cbor_or_none(message)
+        ):
+            return binary_message
+        return message_to_json_bytes(message)
+
     @callback
     def send_result(self, msg_id: int, result: Any | None = None) -> None:
         """Send a result message."""
-        self.send_message(message_to_json_bytes(result_message(msg_id, result)))
+        self.send_message(self._message_to_bytes(result_message(msg_id, result)))
 
     @callback
     def send_event(self, msg_id: int, event: Any | None = None) -> None:
         """Send a event message."""
-        self.send_message(message_to_json_bytes(event_message(msg_id, event)))
+        self.send_message(self._message_to_bytes(event_message(msg_id, event)))
 
     @callback
     def send_error(
@@ -151,7 +190,7 @@ class ActiveConnection:
     ) -> None:
         """Send an error message."""
         self.send_message(
-            message_to_json_bytes(
+            self._message_to_bytes(
                 error_message(
                     msg_id,
                     code,
@@ -58,3 +58,23 @@ SIGNAL_WEBSOCKET_DISCONNECTED: Final = "websocket_disconnected"
 DATA_CONNECTIONS: Final = f"{DOMAIN}.connections"
 
 FEATURE_COALESCE_MESSAGES = "coalesce_messages"
+# Milliseconds to wait for more messages before sending coalesced messages
+FEATURE_COALESCE_WINDOW = "coalesce_window"
+
+# Maximum time to wait for more messages to coalesce in milliseconds
+MAX_COALESCE_WINDOW: Final = 1000
+# Size of the coalesced messages which are sent without waiting
+# for the end of the coalesce window
+MAX_COALESCE_SIZE: Final = 2**16
+
+# Messages smaller than this are not compressed even when
+# the client negotiated permessage-deflate
+MIN_COMPRESS_SIZE: Final = 512
+
+# Maximum min_interval of the throttled subscriptions in seconds
+MAX_MIN_INTERVAL: Final = 3600
+
+# Wire formats of the messages sent to the client, negotiated in the auth phase.
+# The CBOR messages are sent in binary frames, the other messages stay JSON.
+ENCODING_JSON: Final = "json"
+ENCODING_CBOR: Final = "cbor"
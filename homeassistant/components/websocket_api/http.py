@@ -5,6 +5,7 @@ from __future__ import annotations
 import asyncio
 from collections import deque
 from collections.abc import Callable, Coroutine
+from dataclasses import dataclass
 import datetime as dt
 from functools import partial
 import logging
@@ -19,12 +20,17 @@ from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.event import async_call_later
 from homeassistant.util.async_ import create_eager_task
+from homeassistant.util.cbor import MAJOR_ARRAY, cbor_head
+from homeassistant.util.hass_dict import HassKey
 from homeassistant.util.json import json_loads
 
 from .auth import AUTH_REQUIRED_MESSAGE, AuthPhase
 from .const import (
     DATA_CONNECTIONS,
+    ENCODING_CBOR,
+    MAX_COALESCE_SIZE,
     MAX_PENDING_MSG,
+    MIN_COMPRESS_SIZE,
     PENDING_MSG_MAX_FORCE_READY,
     PENDING_MSG_PEAK,
     PENDING_MSG_PEAK_TIME,
@@ -33,7 +39,7 @@ from .const import (
     URL,
 )
 from .error import Disconnect
-from .messages import message_to_json_bytes
+from .messages import BinaryMessage, message_to_cbor_or_none, message_to_json_bytes
 from .util import describe_request
 
 CLOSE_MSG_TYPES = {WSMsgType.CLOSE, WSMsgType.CLOSED, WSMsgType.CLOSING}
@@ -45,6 +51,75 @@ if TYPE_CHECKING:
 _WS_LOGGER: Final = logging.getLogger(f"{__name__}.connection")
 
 
+@dataclass(slots=True)
+class WebSocketStats:
+    """Counters of the frames written to the websocket clients."""
+
+    frames: int = 0
+    messages: int = 0
+    coalesced_frames: int = 0
+    coalesced_messages: int = 0
+    compressed_frames: int = 0
+    binary_frames: int = 0
+    # Size of the frames sent compressed, before compression
+    compress_input_bytes: int = 0
+    uncompressed_bytes: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters as a dict."""
+        return {
+            "frames": self.frames,
+            "messages": self.messages,
+            "coalesced_frames": self.coalesced_frames,
+            "coalesced_messages": self.coalesced_messages,
+            "compressed_frames": self.compressed_frames,
+            "binary_frames": self.binary_frames,
+            "compress_input_bytes": self.compress_input_bytes,
+            "uncompressed_bytes": self.uncompressed_bytes,
+        }
+
+
+DATA_WEBSOCKET_STATS: HassKey[WebSocketStats] = HassKey("websocket_api_stats")
+
+
+@callback
+def async_get_websocket_stats(hass: HomeAssistant) -> WebSocketStats:
+    """Return the counters of the frames written to the websocket clients."""
+    if (stats := hass.data.get(DATA_WEBSOCKET_STATS)) is None:
+        stats = hass.data[DATA_WEBSOCKET_STATS] = WebSocketStats()
+    return stats
+
+
+def _coalesce_mixed_messages(messages: deque[bytes]) -> list[bytes]:
+    """Coalesce the consecutive messages of the same format.
+
+    The JSON messages are coalesced in a JSON array and
+    the CBOR messages in a CBOR array.
+    """
+    frames: list[bytes] = []
+    run: list[bytes] = []
+    run_binary = False
+    for message in messages:
+        binary = type(message) is BinaryMessage
+        if run and binary is not run_binary:
+            frames.append(_coalesce_run(run, run_binary))
+            run = []
+        run_binary = binary
+        run.append(message)
+    if run:
+        frames.append(_coalesce_run(run, run_binary))
+    return frames
+
+
+def _coalesce_run(run: list[bytes], binary: bool) -> bytes:
+    """Coalesce messages of the same format."""
+    if len(run) == 1:
+        return run[0]
+    if binary:
+        return BinaryMessage(cbor_head(MAJOR_ARRAY, len(run)) + b"".join(run))
+    return b"".join((b"[", b",".join(run), b"]"))
+
+
 class WebsocketAPIView(HomeAssistantView):
     """View to serve a websockets endpoint."""
 
@@ -84,6 +159,13 @@ class WebSocketHandler:
         "_message_queue",
         "_ready_future",
         "_release_ready_queue_size",
+        "_release_ready_timer",
+        "_coalesce_size",
+        "_compress",
+        "_stats",
+        "_queued_count",
+        "_written_count",
+        "_drain_waiters",
     )
 
     def __init__(self, hass: HomeAssistant, request: web.Request) -> None:
@@ -107,6 +189,16 @@ class WebSocketHandler:
         self._message_queue: deque[bytes] = deque()
         self._ready_future: asyncio.Future[int] | None = None
         self._release_ready_queue_size: int = 0
+        self._release_ready_timer: asyncio.TimerHandle | None = None
+        self._coalesce_size = 0
+        # Window bits of the negotiated permessage-deflate or 0
+        self._compress = 0
+        self._stats = async_get_websocket_stats(hass)
+        # Messages ever queued and written, used to release the
+        # futures waiting for the queued messages to be written.
+        self._queued_count = 0
+        self._written_count = 0
+        self._drain_waiters: list[tuple[int, asyncio.Future[None]]] = []
 
     def __repr__(self) -> str:
         """Return the representation."""
@@ -140,6 +232,7 @@ class WebSocketHandler:
         is_debug_log_enabled = partial(logger.isEnabledFor, logging.DEBUG)
         debug = logger.debug
         can_coalesce = connection.can_coalesce
+        stats = self._stats
         ready_message_count = len(message_queue)
         # Exceptions if Socket disconnected or cancelled by connection handler
         try:
@@ -160,13 +253,27 @@ class WebSocketHandler:
                     if is_debug_log_enabled():
                         debug("%s: Sending %s", self.description, message)
                     await send_bytes_text(message)
+                    self._written_count += 1
+                    if self._drain_waiters:
+                        self._release_drain_waiters()
                     continue
 
-                coalesced_messages = b"".join((b"[", b",".join(message_queue), b"]"))
+                coalesced_count = len(message_queue)
+                if connection.encoding == ENCODING_CBOR:
+                    frames = _coalesce_mixed_messages(message_queue)
+                else:
+                    frames = [b"".join((b"[", b",".join(message_queue), b"]"))]
                 message_queue.clear()
-                if is_debug_log_enabled():
-                    debug("%s: Sending %s", self.description, coalesced_messages)
-                await send_bytes_text(coalesced_messages)
+                for coalesced_messages in frames:
+                    if is_debug_log_enabled():
+                        debug("%s: Sending %s", self.description, coalesced_messages)
+                    await send_bytes_text(coalesced_messages)
+                stats.coalesced_frames += len(frames)
+                stats.coalesced_messages += coalesced_count
+                stats.messages += coalesced_count - len(frames)
+                self._written_count += coalesced_count
+                if self._drain_waiters:
+                    self._release_drain_waiters()
         except asyncio.CancelledError:
             debug("%s: Writer cancelled", self.description)
             raise
@@ -176,6 +283,54 @@ class WebSocketHandler:
             debug("%s: Writer done", self.description)
             # Clean up the peak checker when we shut down the writer
             self._cancel_peak_checker()
+            # Nothing else will be written so stop waiting
+            self._written_count = self._queued_count
+            self._release_drain_waiters()
+
+    async def _async_send_frame(self, writer: WebSocketWriter, message: bytes) -> None:
+        """Send a frame, compressed if it is large enough.
+
+        CBOR messages are sent in binary frames, the others in text frames.
+
+        Compressing small frames costs more than it saves so only the
+        frames large enough are compressed with the permessage-deflate
+        negotiated with the client.
+        """
+        stats = self._stats
+        stats.frames += 1
+        stats.messages += 1
+        if type(message) is BinaryMessage:
+            opcode = WSMsgType.BINARY
+            stats.binary_frames += 1
+        else:
+            opcode = WSMsgType.TEXT
+        if not (compress := self._compress) or len(message) < MIN_COMPRESS_SIZE:
+            stats.uncompressed_bytes += len(message)
+            await writer.send_frame(message, opcode)
+            return
+        stats.compressed_frames += 1
+        stats.compress_input_bytes += len(message)
+        await writer.send_frame(message, opcode, compress=compress)
+
+    async def _async_wait_send_queue_drained(self) -> None:
+        """Wait until the messages queued so far have been written."""
+        if self._closing or self._written_count == self._queued_count:
+            return
+        future: asyncio.Future[None] = self._loop.create_future()
+        self._drain_waiters.append((self._queued_count, future))
+        await future
+
+    @callback
+    def _release_drain_waiters(self) -> None:
+        """Release the waiters whose messages have all been written."""
+        written_count = self._written_count
+        waiting: list[tuple[int, asyncio.Future[None]]] = []
+        for queued_count, future in self._drain_waiters:
+            if queued_count > written_count:
+                waiting.append((queued_count, future))
+            elif not future.done():
+                future.set_result(None)
+        self._drain_waiters = waiting
 
     @callback
     def _cancel_peak_checker(self) -> None:
@@ -184,6 +339,13 @@ class WebSocketHandler:
             self._peak_checker_unsub()
             self._peak_checker_unsub = None
 
+    @callback
+    def _cancel_release_ready_timer(self) -> None:
+        """Cancel the end of the coalesce window."""
+        if self._release_ready_timer is not None:
+            self._release_ready_timer.cancel()
+            self._release_ready_timer = None
+
     @callback
     def _send_message(self, message: str | bytes | dict[str, Any]) -> None:
         """Queue sending a message to the client.
@@ -199,12 +361,21 @@ class WebSocketHandler:
 
         if type(message) is not bytes:  # noqa: E721
             if isinstance(message, dict):
-                message = message_to_json_bytes(message)
+                if (
+                    (connection := self._connection) is None
+                    or connection.encoding != ENCODING_CBOR
+                    or (binary_message := message_to_cbor_or_none(message)) is None
+                ):
+                    message = message_to_json_bytes(message)
+                else:
+                    message = binary_message
             elif isinstance(message, str):
                 message = message.encode("utf-8")
 
         message_queue = self._message_queue
         message_queue.append(message)
+        self._queued_count += 1
+        self._coalesce_size += len(message)
         if (queue_size_after_add := len(message_queue)) >= MAX_PENDING_MSG:
             self._logger.error(
                 (
@@ -222,7 +393,19 @@ class WebSocketHandler:
         if self._release_ready_queue_size == 0:
             # Try to coalesce more messages to reduce the number of writes
             self._release_ready_queue_size = queue_size_after_add
-            self._loop.call_soon(self._release_ready_future_or_reschedule)
+            if (connection := self._connection) and connection.coalesce_window:
+                self._release_ready_timer = self._loop.call_later(
+                    connection.coalesce_window, self._release_ready_future
+                )
+            else:
+                self._loop.call_soon(self._release_ready_future_or_reschedule)
+        elif self._release_ready_timer is not None and (
+            queue_size_after_add >= PENDING_MSG_MAX_FORCE_READY
+            or self._coalesce_size >= MAX_COALESCE_SIZE
+        ):
+            # Do not wait for the end of the window for large batches
+            self._release_ready_timer.cancel()
+            self._release_ready_future()
 
         peak_checker_active = self._peak_checker_unsub is not None
 
@@ -250,6 +433,7 @@ class WebSocketHandler:
             queue_size := len(self._message_queue)
         ):
             self._release_ready_queue_size = 0
+            self._coalesce_size = 0
             return
         # If we are below the max pending to force ready, and there are new messages
         # in the queue since the last time we tried to release the ready future, we
@@ -259,9 +443,23 @@ class WebSocketHandler:
             self._loop.call_soon(self._release_ready_future_or_reschedule)
             return
         self._release_ready_queue_size = 0
+        self._coalesce_size = 0
         if not ready_future.done():
             ready_future.set_result(queue_size)
 
+    @callback
+    def _release_ready_future(self) -> None:
+        """Release the ready future at the end of the coalesce window."""
+        self._release_ready_timer = None
+        self._release_ready_queue_size = 0
+        self._coalesce_size = 0
+        if (
+            (ready_future := self._ready_future)
+            and not ready_future.done()
+            and (queue_size := len(self._message_queue))
+        ):
+            ready_future.set_result(queue_size)
+
     @callback
     def _check_write_peak(self, _utc_time: dt.datetime) -> None:
         """Check that we are no longer above the write peak."""
@@ -288,6 +486,7 @@ class WebSocketHandler:
         """Cancel the connection."""
         self._closing = True
         self._cancel_peak_checker()
+        self._cancel_release_ready_timer()
         if self._handle_task is not None:
             self._handle_task.cancel()
         if self._writer_task is not None:
@@ -330,9 +529,21 @@ class WebSocketHandler:
         if TYPE_CHECKING:
             assert writer is not None
 
-        send_bytes_text = partial(writer.send_frame, opcode=WSMsgType.TEXT)
+        # Window bits of the permessage-deflate aiohttp negotiated
+        # with the client, 0 if the client does not support it.
+        # The frames are only compressed when the compression is
+        # passed with the frame.
+        self._compress = writer.compress
+        writer.compress = 0
+        send_bytes_text = partial(self._async_send_frame, writer)
         auth = AuthPhase(
-            logger, hass, self._send_message, self._cancel, request, send_bytes_text
+            logger,
+            hass,
+            self._send_message,
+            self._cancel,
+            request,
+            send_bytes_text,
+            self._async_wait_send_queue_drained,
         )
         connection: ActiveConnection | None = None
         disconnect_warn: str | None = None
@@ -357,6 +568,7 @@ class WebSocketHandler:
             unsub_stop()
 
             self._cancel_peak_checker()
+            self._cancel_release_ready_timer()
 
             if connection is not None:
                 connection.async_handle_close()
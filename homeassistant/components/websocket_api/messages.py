@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
 from functools import lru_cache
 import logging
 from typing import Any, Final
@@ -15,13 +16,21 @@ from homeassistant.const import (
     COMPRESSED_STATE_LAST_UPDATED,
     COMPRESSED_STATE_STATE,
 )
-from homeassistant.core import CompressedState, Event, EventStateChangedData
+from homeassistant.core import (
+    CompressedState,
+    Event,
+    EventStateChangedData,
+    State,
+    split_entity_id,
+    state_changed_attributes_diff,
+)
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.json import (
     JSON_DUMP,
     find_paths_unserializable_data,
     json_bytes,
 )
+from homeassistant.util.cbor import MAJOR_MAP, cbor_bytes, cbor_head
 from homeassistant.util.json import format_unserializable_data
 
 from . import const
@@ -59,6 +68,61 @@ INVALID_JSON_PARTIAL_MESSAGE = json_bytes(
     }
 )
 
+CBOR_ID_KEY: Final = cbor_bytes("id")
+_CBOR_TYPE_EVENT_ITEM: Final = cbor_bytes("type") + cbor_bytes("event")
+_CBOR_EVENT_ADD_KEYS: Final = (
+    cbor_bytes("event") + cbor_head(MAJOR_MAP, 1) + cbor_bytes(ENTITY_EVENT_ADD)
+)
+
+
+class BinaryMessage(bytes):
+    """A CBOR encoded message, sent to the client in a binary frame."""
+
+    __slots__ = ()
+
+
+def _cbor_map_items(message: dict[str, Any]) -> tuple[int, bytes]:
+    """Return the count and the CBOR encoded items of a map."""
+    return len(message), b"".join(
+        cbor_bytes(key) + cbor_bytes(value) for key, value in message.items()
+    )
+
+
+INVALID_CBOR_PARTIAL_MESSAGE: Final = _cbor_map_items(
+    {
+        **BASE_ERROR_MESSAGE,
+        "error": {
+            "code": const.ERR_UNKNOWN_ERROR,
+            "message": "Invalid CBOR in response",
+        },
+    }
+)
+
+
+def message_id_as_cbor(iden: int) -> bytes:
+    """Return the CBOR encoding of a message id."""
+    return cbor_bytes(iden)
+
+
+def _cbor_message_with_id(
+    partial_message: tuple[int, bytes], message_id_as_cbor: bytes
+) -> BinaryMessage:
+    """Return a message from the items of a cached map and its id."""
+    count, items = partial_message
+    return BinaryMessage(
+        b"".join(
+            (cbor_head(MAJOR_MAP, count + 1), items, CBOR_ID_KEY, message_id_as_cbor)
+        )
+    )
+
+
+def message_to_cbor_or_none(message: dict[str, Any]) -> BinaryMessage | None:
+    """Serialize a websocket message to CBOR or return None."""
+    try:
+        return BinaryMessage(cbor_bytes(message))
+    except (ValueError, TypeError):
+        return None
+
 
 def result_message(iden: int, result: Any = None) -> dict[str, Any]:
     """Return a success result message."""
@@ -141,8 +205,132 @@ def _partial_cached_event_message(event: Event) -> bytes:
     )
 
 
+ATTRIBUTE_PROJECTION_SCHEMA: Final = vol.Schema(
+    {
+        vol.Optional("domains"): {cv.string: [cv.string]},
+        vol.Optional("entity_ids"): {cv.entity_id: [cv.string]},
+    }
+)
+
+
+class AttributeProjection:
+    """Attributes to send of the entities of a domain or of an entity.
+
+    The attributes of an entity id take precedence over the attributes
+    of its domain. All the attributes are sent for the other entities.
+    """
+
+    __slots__ = ("domains", "entity_ids")
+
+    def __init__(self, config: dict[str, dict[str, list[str]]]) -> None:
+        """Initialize the projection from a validated config."""
+        self.domains = {
+            domain: frozenset(attributes)
+            for domain, attributes in config.get("domains", {}).items()
+        }
+        self.entity_ids = {
+            entity_id: frozenset(attributes)
+            for entity_id, attributes in config.get("entity_ids", {}).items()
+        }
+
+    def get(self, entity_id: str) -> frozenset[str] | None:
+        """Return the attributes to send of an entity or None for all of them."""
+        if (attributes := self.entity_ids.get(entity_id)) is not None:
+            return attributes
+        return self.domains.get(split_entity_id(entity_id)[0])
+
+
+def _project_attributes(
+    attributes: Mapping[str, Any], allowed: frozenset[str]
+) -> dict[str, Any]:
+    """Return the allowed attributes."""
+    return {key: attributes[key] for key in allowed if key in attributes}
+
+
+def projected_state_dict_json(
+    state: State, projection: AttributeProjection | None
+) -> bytes:
+    """Return the JSON of a state with the projected attributes."""
+    if projection is None or (allowed := projection.get(state.entity_id)) is None:
+        return state.as_dict_json
+    return json_bytes(
+        {
+            **state.as_dict(),
+            "attributes": _project_attributes(state.attributes, allowed),
+        }
+    )
+
+
+def projected_compressed_state_json(
+    state: State, projection: AttributeProjection | None
+) -> bytes:
+    """Return the compressed JSON key value pair of a state for adds."""
+    if projection is None or (allowed := projection.get(state.entity_id)) is None:
+        return state.as_compressed_state_json
+    return json_bytes({state.entity_id: _projected_compressed_state(state, allowed)})[
+        1:-1
+    ]
+
+
+def projected_compressed_state_cbor(
+    state: State, projection: AttributeProjection | None
+) -> bytes:
+    """Return the compressed CBOR key value pair of a state for adds."""
+    if projection is None or (allowed := projection.get(state.entity_id)) is None:
+        return state.as_compressed_state_cbor
+    return cbor_bytes(state.entity_id) + cbor_bytes(
+        _projected_compressed_state(state, allowed)
+    )
+
+
+def _projected_compressed_state(
+    state: State, allowed: frozenset[str]
+) -> dict[str, Any]:
+    """Return the compressed state with the allowed attributes.
+
+    The compressed state of the state is cached, so a copy is returned.
+    """
+    compressed_state: dict[str, Any] = dict(state.as_compressed_state)
+    compressed_state[COMPRESSED_STATE_ATTRIBUTES] = _project_attributes(
+        state.attributes, allowed
+    )
+    return compressed_state
+
+
+def cached_event_message_cbor(message_id_as_cbor: bytes, event: Event) -> BinaryMessage:
+    """Return an event message in CBOR.
+
+    The binary variant of cached_event_message.
+    """
+    return _cbor_message_with_id(
+        _partial_cached_event_message_cbor(event), message_id_as_cbor
+    )
+
+
+@lru_cache(maxsize=128)
+def _partial_cached_event_message_cbor(event: Event) -> tuple[int, bytes]:
+    """Cache and serialize the items of the event message to CBOR."""
+    return _message_to_cbor_items({"type": "event", "event": event})
+
+
+def _message_to_cbor_items(message: dict[str, Any]) -> tuple[int, bytes]:
+    """Serialize the items of a websocket message to CBOR or return an error."""
+    try:
+        return _cbor_map_items(message)
+    except (ValueError, TypeError):
+        _LOGGER.error(
+            "Unable to serialize to CBOR. Bad data found at %s",
+            format_unserializable_data(
+                find_paths_unserializable_data(message, dump=JSON_DUMP)
+            ),
+        )
+    return INVALID_CBOR_PARTIAL_MESSAGE
+
+
 def cached_state_diff_message(
-    message_id_as_bytes: bytes, event: Event[EventStateChangedData]
+    message_id_as_bytes: bytes,
+    event: Event[EventStateChangedData],
+    projection: AttributeProjection | None = None,
 ) -> bytes:
     """Return an event message.
 
@@ -152,9 +340,16 @@ def cached_state_diff_message(
     all getting many of the same events (mostly state changed)
     we can avoid serializing the same data for each connection.
     """
+    if (
+        projection is None
+        or (allowed := projection.get(event.data["entity_id"])) is None
+    ):
+        partial_message = _partial_cached_state_diff_message(event)
+    else:
+        partial_message = _partial_cached_projected_state_diff_message(event, allowed)
     return b"".join(
         (
-            _partial_cached_state_diff_message(event)[:-1],
+            partial_message[:-1],
             b',"id":',
             message_id_as_bytes,
             b"}",
@@ -177,8 +372,76 @@ def _partial_cached_state_diff_message(event: Event[EventStateChangedData]) -> b
     )
 
 
+@lru_cache(maxsize=128)
+def _partial_cached_projected_state_diff_message(
+    event: Event[EventStateChangedData], allowed: frozenset[str]
+) -> bytes:
+    """Cache and serialize the event with the allowed attributes to json.
+
+    Subscriptions projecting the same attributes share the message.
+    """
+    return (
+        _message_to_json_bytes_or_none(
+            {"type": "event", "event": _state_diff_event(event, allowed)}
+        )
+        or INVALID_JSON_PARTIAL_MESSAGE
+    )
+
+
+def cached_state_diff_message_cbor(
+    message_id_as_cbor: bytes,
+    event: Event[EventStateChangedData],
+    projection: AttributeProjection | None = None,
+) -> BinaryMessage:
+    """Return a state diff event message in CBOR.
+
+    The binary variant of cached_state_diff_message.
+    """
+    if (
+        projection is None
+        or (allowed := projection.get(event.data["entity_id"])) is None
+    ):
+        allowed = None
+    return _cbor_message_with_id(
+        _partial_cached_state_diff_message_cbor(event, allowed), message_id_as_cbor
+    )
+
+
+@lru_cache(maxsize=128)
+def _partial_cached_state_diff_message_cbor(
+    event: Event[EventStateChangedData], allowed: frozenset[str] | None
+) -> tuple[int, bytes]:
+    """Cache and serialize the items of the state diff message to CBOR."""
+    return _message_to_cbor_items(
+        {"type": "event", "event": _state_diff_event(event, allowed)}
+    )
+
+
+def compressed_states_message_cbor(
+    message_id_as_cbor: bytes, serialized_states: list[bytes]
+) -> BinaryMessage:
+    """Return the event message adding compressed states in CBOR.
+
+    The states are serialized with projected_compressed_state_cbor.
+    """
+    return BinaryMessage(
+        b"".join(
+            (
+                cbor_head(MAJOR_MAP, 3),
+                CBOR_ID_KEY,
+                message_id_as_cbor,
+                _CBOR_TYPE_EVENT_ITEM,
+                _CBOR_EVENT_ADD_KEYS,
+                cbor_head(MAJOR_MAP, len(serialized_states)),
+                *serialized_states,
+            )
+        )
+    )
+
+
 def _state_diff_event(
     event: Event[EventStateChangedData],
+    allowed: frozenset[str] | None = None,
 ) -> dict[
     str,
     list[str]
@@ -194,10 +457,18 @@ def _state_diff_event(
         "c": {entity_id: diff,…}
         "r": [entity_id,…]
     }
+
+    Only the allowed attributes are sent when they are given.
     """
     if (new_state := event.data["new_state"]) is None:
         return {ENTITY_EVENT_REMOVE: [event.data["entity_id"]]}
     if (old_state := event.data["old_state"]) is None:
+        if allowed is not None:
+            return {
+                ENTITY_EVENT_ADD: {
+                    new_state.entity_id: _projected_compressed_state(new_state, allowed)
+                }
+            }
         return {ENTITY_EVENT_ADD: {new_state.entity_id: new_state.as_compressed_state}}
     additions: dict[str, Any] = {}
     diff: dict[str, dict[str, Any]] = {STATE_DIFF_ADDITIONS: additions}
@@ -221,20 +492,16 @@ def _state_diff_event(
             additions[COMPRESSED_STATE_CONTEXT]["id"] = new_state_context.id
         else:
             additions[COMPRESSED_STATE_CONTEXT] = new_state_context.id
-    if (old_attributes := old_state.attributes) != (
-        new_attributes := new_state.attributes
-    ):
-        if added := {
-            key: value
-            for key, value in new_attributes.items()
-            if key not in old_attributes or old_attributes[key] != value
-        }:
-            additions[COMPRESSED_STATE_ATTRIBUTES] = added
-        if removed := old_attributes.keys() - new_attributes:
-            # sets are not JSON serializable by default so we convert to list
-            # here if there are any values to avoid jumping into the json_encoder_default
-            # for every state diff with a removed attribute
-            diff[STATE_DIFF_REMOVALS] = {COMPRESSED_STATE_ATTRIBUTES: list(removed)}
+    if attributes_diff := state_changed_attributes_diff(event):
+        changed = attributes_diff.changed
+        removed = attributes_diff.removed
+        if allowed is not None:
+            changed = _project_attributes(changed, allowed)
+            removed = [key for key in removed if key in allowed]
+        if changed:
+            additions[COMPRESSED_STATE_ATTRIBUTES] = changed
+        if removed:
+            diff[STATE_DIFF_REMOVALS] = {COMPRESSED_STATE_ATTRIBUTES: removed}
     return {ENTITY_EVENT_CHANGE: {new_state.entity_id: diff}}
 
 
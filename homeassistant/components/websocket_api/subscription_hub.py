@@ -0,0 +1,244 @@
+"""Share the state changed listener of identical entity subscriptions."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable, Iterable
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.auth.models import User
+from homeassistant.auth.permissions.const import POLICY_READ
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    callback,
+)
+from homeassistant.helpers.singleton import singleton
+from homeassistant.util.hass_dict import HassKey
+
+from . import messages
+from .throttle import EventThrottle
+
+DATA_ENTITY_SUBSCRIPTION_HUB: HassKey[EntitySubscriptionHub] = HassKey(
+    "websocket_api_entity_subscription_hub"
+)
+
+
+def _freeze(value: Any) -> Hashable:
+    """Return a hashable version of a validated subscription option."""
+    if isinstance(value, dict):
+        return frozenset((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, set, frozenset)):
+        return frozenset(_freeze(item) for item in value)
+    if isinstance(value, Hashable):
+        return value
+    raise TypeError(f"Subscription option {value!r} is not hashable")
+
+
+def subscription_key(msg: dict[str, Any]) -> Hashable:
+    """Return the key of the subscriptions receiving the same messages."""
+    return _freeze(
+        {key: value for key, value in msg.items() if key not in ("id", "type")}
+    )
+
+
+class _Member:
+    """A subscription of a connection in a group."""
+
+    __slots__ = ("cbor", "message_id_as_bytes", "send_message", "throttle", "user")
+
+    def __init__(
+        self,
+        send_message: Callable[[str | bytes | dict[str, Any]], None],
+        user: User,
+        message_id_as_bytes: bytes,
+        cbor: bool,
+    ) -> None:
+        """Initialize the member."""
+        self.send_message = send_message
+        self.user = user
+        self.message_id_as_bytes = message_id_as_bytes
+        self.cbor = cbor
+        self.throttle: EventThrottle | None = None
+
+
+class EntitySubscriptionGroup:
+    """Subscriptions to the same entities sharing a state changed listener.
+
+    The entity filter runs once per event for the whole group, the
+    permissions once per user and the message is encoded once per
+    subscription id, so connections subscribing with the same id get
+    the same bytes.
+
+    With a minimum interval each member is throttled on its own, so
+    the interval of a member starts with its own subscription and the
+    merged events start from the last state sent to the member.
+    """
+
+    __slots__ = (
+        "_unsub",
+        "entity_filter",
+        "entity_ids",
+        "key",
+        "members",
+        "min_interval",
+        "projection",
+    )
+
+    def __init__(
+        self,
+        key: Hashable,
+        entity_ids: set[str] | None,
+        entity_filter: Callable[[str], bool] | None,
+        projection: messages.AttributeProjection | None,
+        min_interval: float,
+    ) -> None:
+        """Initialize the group."""
+        self.key = key
+        self.entity_ids = entity_ids
+        self.entity_filter = entity_filter
+        self.projection = projection
+        self.min_interval = min_interval
+        self.members: dict[_Member, None] = {}
+        self._unsub: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_start(self, hass: HomeAssistant) -> None:
+        """Start listening for state changed events."""
+        self._unsub = hass.bus.async_listen(EVENT_STATE_CHANGED, self.async_forward)
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop listening for state changed events."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def async_add_member(self, hass: HomeAssistant, member: _Member) -> None:
+        """Add a member and its throttle if the group has a minimum interval."""
+        if self.min_interval:
+            member.throttle = EventThrottle(
+                hass, self.min_interval, partial(self._async_send, members=(member,))
+            )
+        self.members[member] = None
+
+    @callback
+    def async_remove_member(self, member: _Member) -> bool:
+        """Remove a member and return if it was in the group."""
+        if self.members.pop(member, False) is False:
+            return False
+        if member.throttle is not None:
+            member.throttle.async_cancel()
+            member.throttle = None
+        return True
+
+    @callback
+    def async_forward(self, event: Event[EventStateChangedData]) -> None:
+        """Forward entity state changed events to the members."""
+        entity_id = event.data["entity_id"]
+        if (self.entity_ids and entity_id not in self.entity_ids) or (
+            self.entity_filter and not self.entity_filter(entity_id)
+        ):
+            return
+        if not self.min_interval:
+            self._async_send(event, self.members)
+            return
+        for member in list(self.members):
+            if TYPE_CHECKING:
+                assert member.throttle is not None
+            member.throttle.async_add(event)
+
+    @callback
+    def _async_send(
+        self, event: Event[EventStateChangedData], members: Iterable[_Member]
+    ) -> None:
+        """Send an entity state changed event to members of the group."""
+        entity_id = event.data["entity_id"]
+        allowed: dict[str, bool] = {}
+        encoded: dict[bytes, bytes] = {}
+        encoded_cbor: dict[bytes, bytes] = {}
+        for member in members:
+            # We have to lookup the permissions again because the user might
+            # have changed since the subscription was created.
+            user = member.user
+            if (can_read := allowed.get(user.id)) is None:
+                permissions = user.permissions
+                can_read = allowed[user.id] = (
+                    user.is_admin
+                    or permissions.access_all_entities(POLICY_READ)
+                    or permissions.check_entity(entity_id, POLICY_READ)
+                )
+            if not can_read:
+                continue
+            message_id_as_bytes = member.message_id_as_bytes
+            if member.cbor:
+                if (message := encoded_cbor.get(message_id_as_bytes)) is None:
+                    message = encoded_cbor[message_id_as_bytes] = (
+                        messages.cached_state_diff_message_cbor(
+                            message_id_as_bytes, event, self.projection
+                        )
+                    )
+            elif (message := encoded.get(message_id_as_bytes)) is None:
+                message = encoded[message_id_as_bytes] = (
+                    messages.cached_state_diff_message(
+                        message_id_as_bytes, event, self.projection
+                    )
+                )
+            member.send_message(message)
+
+
+class EntitySubscriptionHub:
+    """Group the identical subscribe_entities subscriptions of all connections."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the hub."""
+        self._hass = hass
+        self.groups: dict[Hashable, EntitySubscriptionGroup] = {}
+
+    @callback
+    def async_subscribe(
+        self,
+        key: Hashable,
+        entity_ids: set[str] | None,
+        entity_filter: Callable[[str], bool] | None,
+        projection: messages.AttributeProjection | None,
+        min_interval: float,
+        send_message: Callable[[str | bytes | dict[str, Any]], None],
+        user: User,
+        message_id_as_bytes: bytes,
+        cbor: bool = False,
+    ) -> CALLBACK_TYPE:
+        """Add a subscription to the group of its key.
+
+        The message id is CBOR encoded for the connections using CBOR.
+        """
+        if (group := self.groups.get(key)) is None:
+            group = self.groups[key] = EntitySubscriptionGroup(
+                key, entity_ids, entity_filter, projection, min_interval
+            )
+            group.async_start(self._hass)
+        member = _Member(send_message, user, message_id_as_bytes, cbor)
+        group.async_add_member(self._hass, member)
+        return partial(self._async_unsubscribe, group, member)
+
+    @callback
+    def _async_unsubscribe(
+        self, group: EntitySubscriptionGroup, member: _Member
+    ) -> None:
+        """Remove a subscription and the listener of its group once empty."""
+        if not group.async_remove_member(member) or group.members:
+            return
+        group.async_stop()
+        if self.groups.get(group.key) is group:
+            del self.groups[group.key]
+
+
+@callback
+@singleton(DATA_ENTITY_SUBSCRIPTION_HUB)
+def async_get_entity_subscription_hub(hass: HomeAssistant) -> EntitySubscriptionHub:
+    """Get the entity subscription hub."""
+    return EntitySubscriptionHub(hass)
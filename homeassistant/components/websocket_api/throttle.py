@@ -0,0 +1,120 @@
+"""Throttle the events of the entities sent to a subscription."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from typing import Any
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.util.event_type import EventType
+
+
+class EventThrottle:
+    """Send at most one event per entity per interval.
+
+    The first event of an entity is sent right away and starts the
+    interval of the entity. The later events of the entity in its interval
+    are replaced by the latest one, which is sent at the end of the
+    interval and starts the next one. Pending state changed events are
+    merged so the sent event goes from the state which was sent last to
+    the latest state. Events without an entity are sent right away.
+    """
+
+    __slots__ = ("_hass", "_interval", "_pending", "_send", "_sent", "_timer")
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        interval: float,
+        send: Callable[[Event[Any]], None],
+    ) -> None:
+        """Initialize the throttle."""
+        self._hass = hass
+        self._interval = interval
+        self._send = send
+        # Loop time of the last event sent per entity, oldest first
+        self._sent: dict[tuple[EventType[Any] | str, str], float] = {}
+        self._pending: dict[tuple[EventType[Any] | str, str], Event[Any]] = {}
+        self._timer: asyncio.TimerHandle | None = None
+
+    @callback
+    def async_add(self, event: Event[Any]) -> None:
+        """Send or hold back an event."""
+        if (entity_id := event.data.get("entity_id")) is None or not isinstance(
+            entity_id, str
+        ):
+            self._send(event)
+            return
+        key = (event.event_type, entity_id)
+        if key not in self._sent:
+            self._sent[key] = self._hass.loop.time()
+            if self._timer is None:
+                self._timer = self._hass.loop.call_later(
+                    self._interval, self._async_flush
+                )
+            self._send(event)
+            return
+        if (
+            event.event_type == EVENT_STATE_CHANGED
+            and (pending := self._pending.get(key)) is not None
+        ):
+            event = _merge_state_changed_events(pending, event)
+        self._pending[key] = event
+
+    @callback
+    def _async_flush(self) -> None:
+        """Send the pending events of the entities at the end of their interval."""
+        now = self._hass.loop.time()
+        interval = self._interval
+        sent = self._sent
+        pending = self._pending
+        events: list[Event[Any]] = []
+        while sent:
+            key, sent_time = next(iter(sent.items()))
+            if sent_time + interval > now:
+                break
+            del sent[key]
+            if (event := pending.pop(key, None)) is not None:
+                # The entity cannot be sent again during its next interval
+                sent[key] = now
+                events.append(event)
+        self._timer = (
+            self._hass.loop.call_at(
+                next(iter(sent.values())) + interval, self._async_flush
+            )
+            if sent
+            else None
+        )
+        for event in events:
+            if event.event_type == EVENT_STATE_CHANGED and (
+                event.data["old_state"] is None and event.data["new_state"] is None
+            ):
+                # Added and removed again during the interval
+                continue
+            self._send(event)
+
+    @callback
+    def async_cancel(self) -> None:
+        """Drop the pending events."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._pending.clear()
+        self._sent.clear()
+
+
+def _merge_state_changed_events(first: Event[Any], last: Event[Any]) -> Event[Any]:
+    """Return a state changed event from the old state of first to the new of last."""
+    return Event(
+        EVENT_STATE_CHANGED,
+        {
+            "entity_id": last.data["entity_id"],
+            "old_state": first.data["old_state"],
+            "new_state": last.data["new_state"],
+        },
+        last.origin,
+        last.time_fired_timestamp,
+        last.context,
+    )
@@ -25,6 +25,7 @@ import functools
 import inspect
 import logging
 import re
+import sys
 import threading
 import time
 from time import monotonic
@@ -34,11 +35,13 @@ from typing import (
     Final,
     Generic,
     NotRequired,
+    Protocol,
     Self,
     TypedDict,
     cast,
     overload,
 )
+import weakref
 
 from propcache import cached_property, under_cached_property
 from typing_extensions import TypeVar
@@ -99,6 +102,7 @@ from .util.async_ import (
     run_callback_threadsafe,
     shutdown_run_callback_threadsafe,
 )
+from .util.cbor import cbor_bytes
 from .util.event_type import EventType
 from .util.executor import InterruptibleThreadPoolExecutor
 from .util.hass_dict import HassDict
@@ -367,6 +371,16 @@ class HassJob[**_P, _R_co]:
         return f"<Job {self.name} {self.job_type} {self.target}>"
 
 
+class JobProfiler(Protocol):
+    """Measure the time jobs and events take in the event loop."""
+
+    def run_callback(self, hassjob: HassJob[..., Any], args: tuple[Any, ...]) -> None:
+        """Run and measure a callback job."""
+
+    def record_event(self, event_type: EventType[Any] | str, elapsed: float) -> None:
+        """Record the time taken to dispatch an event."""
+
+
 @dataclass(frozen=True)
 class HassJobWithArgs:
     """Container for a HassJob and arguments."""
@@ -455,6 +469,8 @@ class HomeAssistant:
             max_workers=1, thread_name_prefix="ImportExecutor"
         )
         self.loop_thread_id = getattr(self.loop, "_thread_id")
+        # Set by the profiler integration to measure the jobs run in the loop
+        self.job_profiler: JobProfiler | None = None
 
     def verify_event_loop_thread(self, what: str) -> None:
         """Report and raise if we are not running in the event loop thread."""
@@ -937,7 +953,10 @@ class HomeAssistant:
         if hassjob.job_type is HassJobType.Callback:
             if TYPE_CHECKING:
                 hassjob = cast(HassJob[..., _R], hassjob)
-            hassjob.target(*args)
+            if self.job_profiler is None:
+                hassjob.target(*args)
+            else:
+                self.job_profiler.run_callback(hassjob, args)
             return None
 
         return self._async_add_hass_job(hassjob, *args, background=background)
@@ -1459,7 +1478,13 @@ def _verify_event_type_length_or_raise(event_type: EventType[_DataT] | str) -> N
 class EventBus:
     """Allow the firing of and listening for events."""
 
-    __slots__ = ("_debug", "_hass", "_listeners", "_match_all_listeners")
+    __slots__ = (
+        "_debug",
+        "_hass",
+        "_keyed_listeners",
+        "_listeners",
+        "_match_all_listeners",
+    )
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
@@ -1467,6 +1492,10 @@ class EventBus:
             EventType[Any] | str, list[_FilterableJobType[Any]]
         ] = defaultdict(list)
         self._match_all_listeners: list[_FilterableJobType[Any]] = []
+        # event_type -> data key -> data value -> listeners
+        self._keyed_listeners: dict[
+            EventType[Any] | str, dict[str, dict[Any, list[_FilterableJobType[Any]]]]
+        ] = {}
         self._listeners[MATCH_ALL] = self._match_all_listeners
         self._hass = hass
         self._async_logging_changed()
@@ -1483,7 +1512,14 @@ class EventBus:
 
         This method must be run in the event loop.
         """
-        return {key: len(listeners) for key, listeners in self._listeners.items()}
+        listeners = {key: len(listeners) for key, listeners in self._listeners.items()}
+        for event_type, keyed_listeners in self._keyed_listeners.items():
+            listeners[event_type] = listeners.get(event_type, 0) + sum(
+                len(jobs)
+                for listeners_by_value in keyed_listeners.values()
+                for jobs in listeners_by_value.values()
+            )
+        return listeners
 
     @property
     def listeners(self) -> dict[EventType[Any] | str, int]:
@@ -1548,7 +1584,16 @@ class EventBus:
                 "Bus:Handling %s", _event_repr(event_type, origin, event_data)
             )
 
+        job_profiler = self._hass.job_profiler
+        start = time.perf_counter() if job_profiler is not None else 0.0
+
         listeners = self._listeners.get(event_type, EMPTY_LIST)
+        if event_data is not None and (
+            keyed_listeners := self._keyed_listeners.get(event_type)
+        ):
+            listeners = listeners + _keyed_listeners_for_data(
+                keyed_listeners, event_data
+            )
         if event_type not in EVENTS_EXCLUDED_FROM_MATCH_ALL:
             match_all_listeners = self._match_all_listeners
         else:
@@ -1578,6 +1623,9 @@ class EventBus:
             except Exception:
                 _LOGGER.exception("Error running job: %s", job)
 
+        if job_profiler is not None:
+            job_profiler.record_event(event_type, time.perf_counter() - start)
+
     def listen(
         self,
         event_type: EventType[_DataT] | str,
@@ -1653,6 +1701,42 @@ class EventBus:
             self._async_remove_listener, event_type, filterable_job
         )
 
+    @callback
+    def async_listen_keyed(
+        self,
+        event_type: EventType[_DataT] | str,
+        key: str,
+        value: Any,
+        listener: Callable[[Event[_DataT]], Coroutine[Any, Any, None] | None],
+        event_filter: Callable[[_DataT], bool] | None = None,
+    ) -> CALLBACK_TYPE:
+        """Listen for events of a specific type with a data key set to a value.
+
+        Keyed listeners are found with a lookup of the value of the key in
+        the event data, instead of running a filter for every listener.
+        The value must be hashable.
+
+        An optional event_filter, which must be a callable decorated with
+        @callback that returns a boolean value, determines if the
+        listener callable should run for the events matching the key.
+
+        This method must be run in the event loop.
+        """
+        if event_type == MATCH_ALL:
+            raise HomeAssistantError("Keyed listeners require an event type")
+        if event_filter is not None and not is_callback_check_partial(event_filter):
+            raise HomeAssistantError(f"Event filter {event_filter} is not a callback")
+        filterable_job: _FilterableJobType[_DataT] = (
+            HassJob(listener, f"listen {event_type} {key}={value}"),
+            event_filter,
+        )
+        self._keyed_listeners.setdefault(event_type, {}).setdefault(key, {}).setdefault(
+            value, []
+        ).append(filterable_job)
+        return functools.partial(
+            self._async_remove_keyed_listener, event_type, key, value, filterable_job
+        )
+
     def listen_once(
         self,
         event_type: EventType[_DataT] | str,
@@ -1741,6 +1825,53 @@ class EventBus:
                 "Unable to remove unknown job listener %s", filterable_job
             )
 
+    @callback
+    def _async_remove_keyed_listener(
+        self,
+        event_type: EventType[_DataT] | str,
+        key: str,
+        value: Any,
+        filterable_job: _FilterableJobType[_DataT],
+    ) -> None:
+        """Remove a keyed listener of a specific event_type.
+
+        This method must be run in the event loop.
+        """
+        try:
+            keyed_listeners = self._keyed_listeners[event_type]
+            listeners_by_value = keyed_listeners[key]
+            listeners = listeners_by_value[value]
+            listeners.remove(filterable_job)
+        except (KeyError, ValueError):
+            _LOGGER.exception(
+                "Unable to remove unknown keyed job listener %s", filterable_job
+            )
+            return
+
+        # delete the empty mappings
+        if not listeners:
+            del listeners_by_value[value]
+            if not listeners_by_value:
+                del keyed_listeners[key]
+                if not keyed_listeners:
+                    del self._keyed_listeners[event_type]
+
+
+def _keyed_listeners_for_data(
+    keyed_listeners: dict[str, dict[Any, list[_FilterableJobType[Any]]]],
+    event_data: Mapping[str, Any],
+) -> list[_FilterableJobType[Any]]:
+    """Return the keyed listeners matching the event data."""
+    listeners: list[_FilterableJobType[Any]] = []
+    for key, listeners_by_value in keyed_listeners.items():
+        try:
+            if matched := listeners_by_value.get(event_data.get(key, _SENTINEL)):
+                listeners += matched
+        except TypeError:
+            # The value in the event data is not hashable
+            continue
+    return listeners
+
 
 class CompressedState(TypedDict):
     """Compressed dict of a state."""
@@ -1957,6 +2088,15 @@ class State:
         """
         return json_bytes({self.entity_id: self.as_compressed_state})[1:-1]
 
+    @under_cached_property
+    def as_compressed_state_cbor(self) -> bytes:
+        """Build a compressed CBOR key value pair of a state for adds.
+
+        The binary variant of as_compressed_state_json, the pairs of
+        multiple states follow the head of a map of their count.
+        """
+        return cbor_bytes(self.entity_id) + cbor_bytes(self.as_compressed_state)
+
     @classmethod
     def from_dict(cls, json_dict: dict[str, Any]) -> Self | None:
         """Initialize a state from a dict.
@@ -2021,6 +2161,179 @@ class State:
         )
 
 
+_EMPTY_ATTRIBUTES: ReadOnlyDict[str, Any] = ReadOnlyDict()
+
+
+# Types of the attribute values which are shared by compact states, the
+# values of other types may be containers of values which are equal but of
+# different types
+_INTERNED_VALUE_TYPES: Final = frozenset({str, int, float, bool, type(None)})
+
+
+class CompactState(State):
+    """State which keeps its timestamps as floats to reduce memory use.
+
+    The last_changed, last_reported and last_updated datetimes are
+    built when they are accessed instead of being kept on the state.
+    The domain is interned and the object_id is derived from the
+    entity_id when it is accessed.
+
+    Used by the state machine when compact states are enabled.
+    """
+
+    __slots__ = ()
+
+    def __init__(
+        self,
+        entity_id: str,
+        state: str,
+        attributes: Mapping[str, Any] | None = None,
+        last_changed: datetime.datetime | None = None,
+        last_reported: datetime.datetime | None = None,
+        last_updated: datetime.datetime | None = None,
+        context: Context | None = None,
+        validate_entity_id: bool | None = True,
+        state_info: StateInfo | None = None,
+        last_updated_timestamp: float | None = None,
+        *,
+        last_changed_timestamp: float | None = None,
+    ) -> None:
+        """Initialize a new compact state."""
+        self._cache = {}
+        state = str(state)
+
+        if validate_entity_id and not valid_entity_id(entity_id):
+            raise InvalidEntityFormatError(
+                f"Invalid entity id encountered: {entity_id}. "
+                "Format should be <domain>.<object_id>"
+            )
+
+        validate_state(state)
+
+        self.entity_id = entity_id
+        self.state = state
+        if not attributes:
+            self.attributes = _EMPTY_ATTRIBUTES
+        elif type(attributes) is not ReadOnlyDict:
+            self.attributes = ReadOnlyDict(attributes)
+        else:
+            self.attributes = attributes
+        self.context = context or Context()
+        self.state_info = state_info
+        self.domain = sys.intern(split_entity_id(entity_id)[0])
+
+        if last_reported is not None:
+            last_reported_timestamp = last_reported.timestamp()
+        else:
+            last_reported_timestamp = last_updated_timestamp or time.time()
+        if last_updated is not None:
+            last_updated_timestamp = last_updated.timestamp()
+        elif not last_updated_timestamp:
+            last_updated_timestamp = last_reported_timestamp
+        if last_changed is not None:
+            last_changed_timestamp = last_changed.timestamp()
+        elif not last_changed_timestamp:
+            last_changed_timestamp = last_updated_timestamp
+        self.last_updated_timestamp = last_updated_timestamp
+        self._cache["last_changed_timestamp"] = last_changed_timestamp
+        self._cache["last_reported_timestamp"] = last_reported_timestamp
+
+    @property
+    def object_id(self) -> str:  # type: ignore[override]
+        """Object id of this state."""
+        return split_entity_id(self.entity_id)[1]
+
+    @property
+    def last_changed(self) -> datetime.datetime:
+        """Last time the state was changed."""
+        return dt_util.utc_from_timestamp(self.last_changed_timestamp)
+
+    @last_changed.setter
+    def last_changed(self, value: datetime.datetime) -> None:
+        """Set the last time the state was changed."""
+        self._cache["last_changed_timestamp"] = value.timestamp()
+
+    @property
+    def last_updated(self) -> datetime.datetime:
+        """Last time the state or attributes were changed."""
+        return dt_util.utc_from_timestamp(self.last_updated_timestamp)
+
+    @last_updated.setter
+    def last_updated(self, value: datetime.datetime) -> None:
+        """Set the last time the state or attributes were changed."""
+        self.last_updated_timestamp = value.timestamp()
+
+    @property
+    def last_reported(self) -> datetime.datetime:
+        """Last time the state was reported."""
+        return dt_util.utc_from_timestamp(self.last_reported_timestamp)
+
+    @last_reported.setter
+    def last_reported(self, value: datetime.datetime) -> None:
+        """Set the last time the state was reported."""
+        self._cache["last_reported_timestamp"] = value.timestamp()
+
+
+@dataclass(slots=True, frozen=True)
+class AttributesDiff:
+    """Attributes which differ between two states.
+
+    changed: the attributes which were added or changed, with their new value
+    removed: the keys of the attributes which were removed
+    """
+
+    changed: Mapping[str, Any]
+    removed: list[str]
+
+    def __bool__(self) -> bool:
+        """Return if any attribute differs."""
+        return bool(self.changed or self.removed)
+
+
+EMPTY_ATTRIBUTES_DIFF: Final = AttributesDiff(_EMPTY_ATTRIBUTES, [])
+
+
+def attributes_diff(
+    old_attributes: Mapping[str, Any], new_attributes: Mapping[str, Any]
+) -> AttributesDiff:
+    """Return the attributes which differ between two states."""
+    # The state machine passes the attributes on unchanged
+    # so the identity check is the common case
+    if old_attributes is new_attributes or old_attributes == new_attributes:
+        return EMPTY_ATTRIBUTES_DIFF
+    return AttributesDiff(
+        {
+            key: value
+            for key, value in new_attributes.items()
+            if key not in old_attributes or old_attributes[key] != value
+        },
+        list(old_attributes.keys() - new_attributes.keys()),
+    )
+
+
+def state_changed_attributes_diff(
+    event: Event[EventStateChangedData],
+) -> AttributesDiff:
+    """Return the attributes which changed in a state_changed event.
+
+    The diff is computed once per event and shared by all the
+    listeners of the event. A state which was added or removed
+    has an empty diff.
+    """
+    try:
+        diff: AttributesDiff = event._cache["attributes_diff"]  # noqa: SLF001
+    except KeyError:
+        data = event.data
+        if (old_state := data["old_state"]) is None or (
+            new_state := data["new_state"]
+        ) is None:
+            diff = EMPTY_ATTRIBUTES_DIFF
+        else:
+            diff = attributes_diff(old_state.attributes, new_state.attributes)
+        event._cache["attributes_diff"] = diff  # noqa: SLF001
+    return diff
+
+
 class States(UserDict[str, State]):
     """Container for states, maps entity_id -> State.
 
@@ -2066,7 +2379,15 @@ class States(UserDict[str, State]):
 class StateMachine:
     """Helper class that tracks the state of different entities."""
 
-    __slots__ = ("_states", "_states_data", "_reservations", "_bus", "_loop")
+    __slots__ = (
+        "_states",
+        "_states_data",
+        "_reservations",
+        "_bus",
+        "_loop",
+        "_compact",
+        "_interned_attributes",
+    )
 
     def __init__(self, bus: EventBus, loop: asyncio.events.AbstractEventLoop) -> None:
         """Initialize state machine."""
@@ -2077,6 +2398,53 @@ class StateMachine:
         self._reservations: set[str] = set()
         self._bus = bus
         self._loop = loop
+        self._compact = False
+        # hash of the attribute items -> attributes shared by the compact states
+        self._interned_attributes: weakref.WeakValueDictionary[
+            int, ReadOnlyDict[str, Any]
+        ] = weakref.WeakValueDictionary()
+
+    @callback
+    def async_set_compact(self, compact: bool) -> None:
+        """Enable or disable compact states.
+
+        Compact states keep their timestamps as floats and share the
+        attributes with other states which have the same attributes.
+        Only the states set after the call are affected.
+        """
+        self._compact = compact
+        if not compact:
+            self._interned_attributes.clear()
+
+    @callback
+    def _async_intern_attributes(
+        self, attributes: Mapping[str, Any]
+    ) -> Mapping[str, Any]:
+        """Return the shared attributes equal to the attributes.
+
+        Only attributes with str, int, float, bool and None values are
+        shared. Values of different types are never shared even when they
+        are equal, so the attributes keep the types they were set with.
+        """
+        if not attributes:
+            return _EMPTY_ATTRIBUTES
+        for value in attributes.values():
+            if type(value) not in _INTERNED_VALUE_TYPES:
+                return attributes
+        key = hash(frozenset(attributes.items()))
+        if (
+            (interned := self._interned_attributes.get(key)) is not None
+            and interned == attributes
+            and all(
+                type(interned[name]) is type(value)
+                for name, value in attributes.items()
+            )
+        ):
+            return interned
+        if type(attributes) is not ReadOnlyDict:
+            attributes = ReadOnlyDict(attributes)
+        self._interned_attributes[key] = attributes
+        return attributes
 
     def entity_ids(self, domain_filter: str | None = None) -> list[str]:
         """List of entity ids that are being tracked."""
@@ -2316,7 +2684,11 @@ class StateMachine:
             last_changed = None
         else:
             same_state = old_state.state == new_state and not force_update
-            same_attr = old_state.attributes == attributes
+            # Writers which did not change the attributes
+            # may pass the mapping of the old state
+            same_attr = (
+                old_state.attributes is attributes or old_state.attributes == attributes
+            )
             last_changed = old_state.last_changed if same_state else None
 
         # It is much faster to convert a timestamp to a utc datetime object
@@ -2358,20 +2730,42 @@ class StateMachine:
                 assert old_state is not None
             attributes = old_state.attributes
 
-        # This is intentionally called with positional only arguments for performance
-        # reasons
-        state = State(
-            entity_id,
-            new_state,
-            attributes,
-            last_changed,
-            now,
-            now,
-            context,
-            old_state is None,
-            state_info,
-            timestamp,
-        )
+        state: State
+        if self._compact:
+            if not same_attr:
+                attributes = self._async_intern_attributes(attributes or {})
+            state = CompactState(
+                entity_id,
+                new_state,
+                attributes,
+                None,
+                None,
+                None,
+                context,
+                old_state is None,
+                state_info,
+                timestamp,
+                last_changed_timestamp=(
+                    old_state.last_changed_timestamp  # type: ignore[union-attr]
+                    if same_state
+                    else timestamp
+                ),
+            )
+        else:
+            # This is intentionally called with positional only arguments for
+            # performance reasons
+            state = State(
+                entity_id,
+                new_state,
+                attributes,
+                last_changed,
+                now,
+                now,
+                context,
+                old_state is None,
+                state_info,
+                timestamp,
+            )
         if old_state is not None:
             old_state.expire()
         self._states[entity_id] = state
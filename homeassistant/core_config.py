@@ -62,6 +62,7 @@ from .helpers import config_validation as cv, issue_registry as ir
 from .helpers.entity_values import EntityValues
 from .helpers.frame import ReportBehavior, report_usage
 from .helpers.storage import Store
+from .helpers.timer_wheel import async_get_timer_wheel
 from .helpers.typing import UNDEFINED, UndefinedType
 from .util import dt as dt_util, location
 from .util.hass_dict import HassKey
@@ -83,8 +84,10 @@ _LOGGER = logging.getLogger(__name__)
 
 DATA_CUSTOMIZE: HassKey[EntityValues] = HassKey("hass_customize")
 
+CONF_COMPACT_STATES: Final = "compact_states"
 CONF_CREDENTIAL: Final = "credential"
 CONF_ICE_SERVERS: Final = "ice_servers"
+CONF_TIMER_RESOLUTION: Final = "timer_resolution"
 CONF_WEBRTC: Final = "webrtc"
 
 CORE_STORAGE_KEY = "core.config"
@@ -324,6 +327,10 @@ CORE_CONFIG_SCHEMA = vol.All(
             vol.Optional(CONF_COUNTRY): cv.country,
             vol.Optional(CONF_LANGUAGE): cv.language,
             vol.Optional(CONF_DEBUG): cv.boolean,
+            vol.Optional(CONF_COMPACT_STATES): cv.boolean,
+            vol.Optional(CONF_TIMER_RESOLUTION): vol.All(
+                vol.Coerce(float), vol.Range(min=0, max=60)
+            ),
             vol.Optional(CONF_WEBRTC): vol.Schema(
                 {
                     vol.Required(CONF_ICE_SERVERS): vol.All(
@@ -416,6 +423,12 @@ async def async_process_ha_core_config(hass: HomeAssistant, config: dict) -> Non
     if config.get(CONF_DEBUG):
         hac.debug = True
 
+    if CONF_COMPACT_STATES in config:
+        hass.states.async_set_compact(config[CONF_COMPACT_STATES])
+
+    if CONF_TIMER_RESOLUTION in config:
+        async_get_timer_wheel(hass).async_set_resolution(config[CONF_TIMER_RESOLUTION])
+
     if CONF_WEBRTC in config:
         hac.webrtc.ice_servers = [
             RTCIceServer(
@@ -70,6 +70,8 @@ PLATFORM_NOT_READY_BASE_WAIT_TIME = 30  # seconds
 
 _LOGGER = getLogger(__name__)
 
+type EntityServiceBatchHandler = Callable[[list[Entity], ServiceCall], Awaitable[None]]
+
 
 class AddEntitiesCallback(Protocol):
     """Protocol type for EntityPlatform.add_entities callback."""
@@ -154,6 +156,11 @@ class EntityPlatform:
         # Method to cancel the retry of setup
         self._async_cancel_retry_setup: CALLBACK_TYPE | None = None
         self._process_updates: asyncio.Lock | None = None
+        # Handlers calling a service for several entities at once
+        # indexed by the domain and the name of the service
+        self.batch_service_handlers: dict[
+            tuple[str, str], EntityServiceBatchHandler
+        ] = {}
 
         self.parallel_updates: asyncio.Semaphore | None = None
         self._update_in_sequence: bool = False
@@ -1024,6 +1031,19 @@ class EntityPlatform:
             supports_response=supports_response,
         )
 
+    @callback
+    def async_register_batch_service_handler(
+        self, domain: str, name: str, handler: EntityServiceBatchHandler
+    ) -> None:
+        """Register a handler calling an entity service for several entities.
+
+        When a call of the service targets more than one entity of the
+        platform and does not return a response, the handler is awaited
+        once with all these entities instead of calling each entity.
+        This lets integrations send a single group or bulk command.
+        """
+        self.batch_service_handlers[(domain, name)] = handler
+
     async def _async_update_entity_states(self) -> None:
         """Update the states of all the polling entities.
 
@@ -55,6 +55,7 @@ from .entity_registry import (
 from .ratelimit import KeyedRateLimit
 from .sun import get_astral_event_next
 from .template import RenderInfo, Template, result_as_boolean
+from .timer_wheel import WheelTimer, async_get_timer_wheel
 from .typing import TemplateVarsType
 
 _TRACK_STATE_CHANGE_DATA: HassKey[_KeyedEventData[EventStateChangedData]] = HassKey(
@@ -981,6 +982,7 @@ class TrackTemplateResultInfo:
         track_templates: Sequence[TrackTemplate],
         action: TrackTemplateResultListener,
         has_super_template: bool = False,
+        batch_max_latency: float | None = None,
     ) -> None:
         """Handle removal / refresh of tracker init."""
         self.hass = hass
@@ -989,6 +991,13 @@ class TrackTemplateResultInfo:
         self._track_templates = track_templates
         self._has_super_template = has_super_template
 
+        self._batch_max_latency = batch_max_latency
+        # The latest state change triggering each template of the batch
+        self._batch: dict[Template, Event[EventStateChangedData]] = {}
+        self._batch_task: asyncio.Task[None] | None = None
+        self.batches = 0
+        self.renders_saved = 0
+
         self._last_result: dict[Template, bool | str | TemplateError] = {}
 
         for track_template_ in track_templates:
@@ -1060,7 +1069,9 @@ class TrackTemplateResultInfo:
                     log_fn(logging.ERROR, str(info.exception))
 
         self._track_state_changes = async_track_state_change_filtered(
-            self.hass, _render_infos_to_track_states(self._info.values()), self._refresh
+            self.hass,
+            _render_infos_to_track_states(self._info.values()),
+            self._refresh if self._batch_max_latency is None else self._queue_refresh,
         )
         self._update_time_listeners()
         _LOGGER.debug(
@@ -1120,6 +1131,49 @@ class TrackTemplateResultInfo:
         self._rate_limit.async_remove()
         for template in list(self._time_listeners):
             self._time_listeners.pop(template)()
+        if self._batch_task is not None:
+            self._batch_task.cancel()
+            self._batch_task = None
+        self._batch.clear()
+
+    @callback
+    def _queue_refresh(self, event: Event[EventStateChangedData]) -> None:
+        """Queue the templates a state change re-renders to the batch.
+
+        Each template renders at most once per batch with the
+        latest state change which triggered it.
+        """
+        for track_template_ in self._track_templates:
+            template = track_template_.template
+            if (info := self._info.get(template)) is None or (
+                not _event_triggers_rerender(event, info)
+            ):
+                continue
+            if template in self._batch:
+                self.renders_saved += 1
+            self._batch[template] = event
+
+        if self._batch and self._batch_task is None:
+            # A task instead of a timer so waiting for the pending
+            # work of hass includes the batch
+            self._batch_task = self.hass.async_create_task_internal(
+                self._async_refresh_batch(),
+                f"track template result batch {self._track_templates}",
+            )
+
+    async def _async_refresh_batch(self) -> None:
+        """Re-render the templates of the batch.
+
+        The batch collects the state changes of an iteration of the
+        event loop when the max latency is 0.
+        """
+        await asyncio.sleep(self._batch_max_latency or 0)
+        self._batch_task = None
+        batch, self._batch = self._batch, {}
+        self.batches += 1
+        # The latest state change of the batch is passed to the action
+        event = max(batch.values(), key=lambda event: event.time_fired_timestamp)
+        self._refresh(event, batch=batch)
 
     @callback
     def async_refresh(self) -> None:
@@ -1222,6 +1276,7 @@ class TrackTemplateResultInfo:
         event: Event[EventStateChangedData] | None,
         track_templates: Iterable[TrackTemplate] | None = None,
         replayed: bool | None = False,
+        batch: Mapping[Template, Event[EventStateChangedData]] | None = None,
     ) -> None:
         """Refresh the template.
 
@@ -1234,6 +1289,11 @@ class TrackTemplateResultInfo:
 
         replayed is True if the event is being replayed because the
         rate limit was hit.
+
+        batch is an optional mapping of the templates to re-render to
+        the latest state_changed event that triggered them, in the order
+        they were first triggered. If provided, the other templates are
+        not considered.
         """
         updates: list[TrackTemplateResult] = []
         info_changed = False
@@ -1242,11 +1302,27 @@ class TrackTemplateResultInfo:
         block_updates = False
         super_template = self._track_templates[0] if self._has_super_template else None
 
-        track_templates = track_templates or self._track_templates
+        if batch is not None:
+            # Render in the order of the state changes which triggered
+            # the templates, the same order as without batching
+            by_template = {
+                track_template_.template: track_template_
+                for track_template_ in self._track_templates
+            }
+            track_templates = [by_template[template] for template in batch]
+        else:
+            track_templates = track_templates or self._track_templates
 
         # Update the super template first
         if super_template is not None:
-            update = self._render_template_if_ready(super_template, now, event)
+            if batch is None:
+                update = self._render_template_if_ready(super_template, now, event)
+            elif (super_event := batch.get(super_template.template)) is not None:
+                update = self._render_template_if_ready(
+                    super_template, now, super_event
+                )
+            else:
+                update = False
             info_changed |= self._apply_update(updates, update, super_template.template)
 
             if isinstance(update, TrackTemplateResult):
@@ -1269,6 +1345,7 @@ class TrackTemplateResultInfo:
                 # Super template changed from not True to True, force re-render
                 # of all templates in the group
                 event = None
+                batch = None
                 track_templates = self._track_templates
 
         # Then update the remaining templates unless blocked by the super template
@@ -1277,7 +1354,11 @@ class TrackTemplateResultInfo:
                 if track_template_ == super_template:
                     continue
 
-                update = self._render_template_if_ready(track_template_, now, event)
+                update = self._render_template_if_ready(
+                    track_template_,
+                    now,
+                    event if batch is None else batch[track_template_.template],
+                )
                 info_changed |= self._apply_update(
                     updates, update, track_template_.template
                 )
@@ -1341,6 +1422,7 @@ def async_track_template_result(
     strict: bool = False,
     log_fn: Callable[[int, str], None] | None = None,
     has_super_template: bool = False,
+    batch_max_latency: float | None = None,
 ) -> TrackTemplateResultInfo:
     """Add a listener that fires when the result of a template changes.
 
@@ -1372,13 +1454,20 @@ def async_track_template_result(
     has_super_template
         When set to True, the first template will block rendering of other
         templates if it doesn't render as True.
+    batch_max_latency
+        When not None, the re-renders triggered by state changes are batched
+        and each template renders at most once per batch. A batch renders in
+        the next iteration of the event loop when 0, otherwise at most
+        batch_max_latency seconds after the first state change of the batch.
 
     Returns
     -------
     Info object used to unregister the listener, and refresh the template.
 
     """
-    tracker = TrackTemplateResultInfo(hass, track_templates, action, has_super_template)
+    tracker = TrackTemplateResultInfo(
+        hass, track_templates, action, has_super_template, batch_max_latency
+    )
     tracker.async_setup(strict=strict, log_fn=log_fn)
     return tracker
 
@@ -1492,14 +1581,13 @@ class _TrackPointUTCTime:
     job: HassJob[[datetime], Coroutine[Any, Any, None] | None]
     utc_point_in_time: datetime
     expected_fire_timestamp: float
-    _cancel_callback: asyncio.TimerHandle | None = None
+    _cancel_callback: WheelTimer | asyncio.TimerHandle | None = None
 
     def async_attach(self) -> None:
         """Initialize track job."""
-        loop = self.hass.loop
-        self._cancel_callback = loop.call_at(
-            loop.time() + self.expected_fire_timestamp - time.time(), self
-        )
+        self._cancel_callback = async_get_timer_wheel(
+            self.hass
+        ).async_call_at_timestamp(self.expected_fire_timestamp, self)
 
     @callback
     def __call__(self) -> None:
@@ -1517,8 +1605,9 @@ class _TrackPointUTCTime:
         # time.
         if (delta := (self.expected_fire_timestamp - time_tracker_timestamp())) > 0:
             _LOGGER.debug("Called %f seconds too early, rearming", delta)
-            loop = self.hass.loop
-            self._cancel_callback = loop.call_at(loop.time() + delta, self)
+            self._cancel_callback = async_get_timer_wheel(self.hass).async_call_later(
+                delta, self
+            )
             return
 
         self.hass.async_run_hass_job(self.job, self.utc_point_in_time)
@@ -1623,7 +1712,7 @@ class _TrackTimeInterval:
     cancel_on_shutdown: bool | None
     _track_job: HassJob[[datetime], Coroutine[Any, Any, None] | None] | None = None
     _run_job: HassJob[[datetime], Coroutine[Any, Any, None] | None] | None = None
-    _timer_handle: asyncio.TimerHandle | None = None
+    _timer_handle: WheelTimer | asyncio.TimerHandle | None = None
 
     def async_attach(self) -> None:
         """Initialize track job."""
@@ -1644,10 +1733,8 @@ class _TrackTimeInterval:
         """Schedule the timer."""
         if TYPE_CHECKING:
             assert self._track_job is not None
-        hass = self.hass
-        loop = hass.loop
-        self._timer_handle = loop.call_at(
-            loop.time() + self.seconds, self._interval_listener, self._track_job
+        self._timer_handle = async_get_timer_wheel(self.hass).async_call_later(
+            self.seconds, self._interval_listener, self._track_job
         )
 
     @callback
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+from collections import defaultdict
 from collections.abc import Awaitable, Callable, Coroutine, Iterable
 import dataclasses
 from enum import Enum
@@ -32,6 +33,7 @@ from homeassistant.const import (
 from homeassistant.core import (
     Context,
     EntityServiceResponse,
+    Event,
     HassJob,
     HassJobType,
     HomeAssistant,
@@ -69,6 +71,7 @@ from .typing import ConfigType, TemplateVarsType, VolDictType, VolSchemaType
 
 if TYPE_CHECKING:
     from .entity import Entity
+    from .entity_platform import EntityPlatform, EntityServiceBatchHandler
 
 CONF_SERVICE_ENTITY_ID = "entity_id"
 
@@ -81,6 +84,16 @@ ALL_SERVICE_DESCRIPTIONS_CACHE: HassKey[
     tuple[set[tuple[str, str]], dict[str, dict[str, Any]]]
 ] = HassKey("all_service_descriptions_cache")
 
+type _TargetKey = tuple[frozenset[str], frozenset[str], frozenset[str], frozenset[str]]
+type _Dependency = tuple[str, str]
+
+TARGET_RESOLUTION_CACHE: HassKey[TargetResolutionCache] = HassKey(
+    "target_resolution_cache"
+)
+
+# The resolved targets are cleared when the cache grows above the limit
+MAX_RESOLVED_TARGETS = 1024
+
 
 @cache
 def _base_components() -> dict[str, ModuleType]:
@@ -502,7 +515,7 @@ def _has_match(ids: str | list[str] | None) -> TypeGuard[str | list[str]]:
 
 
 @bind_hass
-def async_extract_referenced_entity_ids(  # noqa: C901
+def async_extract_referenced_entity_ids(
     hass: HomeAssistant, service_call: ServiceCall, expand_group: bool = True
 ) -> SelectedEntities:
     """Extract referenced entity IDs from a service call."""
@@ -526,6 +539,198 @@ def async_extract_referenced_entity_ids(  # noqa: C901
     ):
         return selected
 
+    key: _TargetKey = (
+        frozenset(selector.device_ids),
+        frozenset(selector.area_ids),
+        frozenset(selector.floor_ids),
+        frozenset(selector.label_ids),
+    )
+    cache = async_get_target_resolution_cache(hass)
+    if (resolved := cache.async_get(key)) is None:
+        resolved = _async_resolve_registry_targets(hass, selector)
+        cache.async_set(key, resolved)
+
+    # Copy the cached sets since callers are free to modify them
+    selected.indirectly_referenced.update(resolved.indirectly_referenced)
+    selected.missing_devices.update(resolved.missing_devices)
+    selected.missing_areas.update(resolved.missing_areas)
+    selected.missing_floors.update(resolved.missing_floors)
+    selected.missing_labels.update(resolved.missing_labels)
+    selected.referenced_devices.update(resolved.referenced_devices)
+    selected.referenced_areas.update(resolved.referenced_areas)
+    return selected
+
+
+class TargetResolutionCache:
+    """Cache of the targets resolved from the registries.
+
+    The resolved targets are indexed by the registry items they depend
+    on. Registry updates only drop the resolved targets depending on
+    the updated item, which is looked up in the index.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the cache."""
+        self.hass = hass
+        self._resolved: dict[_TargetKey, SelectedEntities] = {}
+        self._dependencies: dict[_TargetKey, set[_Dependency]] = {}
+        self._index: defaultdict[_Dependency, set[_TargetKey]] = defaultdict(set)
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    @callback
+    def async_setup(self) -> None:
+        """Listen to the registry updates."""
+        bus = self.hass.bus
+        bus.async_listen(
+            area_registry.EVENT_AREA_REGISTRY_UPDATED, self._async_area_updated
+        )
+        bus.async_listen(
+            device_registry.EVENT_DEVICE_REGISTRY_UPDATED, self._async_device_updated
+        )
+        bus.async_listen(
+            entity_registry.EVENT_ENTITY_REGISTRY_UPDATED, self._async_entity_updated
+        )
+        bus.async_listen(
+            floor_registry.EVENT_FLOOR_REGISTRY_UPDATED, self._async_floor_updated
+        )
+        bus.async_listen(
+            label_registry.EVENT_LABEL_REGISTRY_UPDATED, self._async_label_updated
+        )
+
+    @callback
+    def async_get(self, key: _TargetKey) -> SelectedEntities | None:
+        """Return the resolved targets."""
+        if (resolved := self._resolved.get(key)) is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return resolved
+
+    @callback
+    def async_set(self, key: _TargetKey, resolved: SelectedEntities) -> None:
+        """Store resolved targets and index them by their dependencies."""
+        if len(self._resolved) >= MAX_RESOLVED_TARGETS:
+            self._resolved.clear()
+            self._dependencies.clear()
+            self._index.clear()
+        device_ids, area_ids, floor_ids, label_ids = key
+        dependencies: set[_Dependency] = {
+            *(("device", device_id) for device_id in device_ids),
+            *(("device", device_id) for device_id in resolved.referenced_devices),
+            *(("area", area_id) for area_id in area_ids),
+            *(("area", area_id) for area_id in resolved.referenced_areas),
+            *(("floor", floor_id) for floor_id in floor_ids),
+            *(("label", label_id) for label_id in label_ids),
+            *(("entity", entity_id) for entity_id in resolved.indirectly_referenced),
+        }
+        self._resolved[key] = resolved
+        self._dependencies[key] = dependencies
+        for dependency in dependencies:
+            self._index[dependency].add(key)
+
+    @callback
+    def _async_invalidate(self, dependencies: Iterable[_Dependency]) -> None:
+        """Drop the resolved targets depending on registry items."""
+        for dependency in dependencies:
+            if (keys := self._index.pop(dependency, None)) is None:
+                continue
+            for key in keys:
+                del self._resolved[key]
+                self.invalidations += 1
+                for other in self._dependencies.pop(key):
+                    if other != dependency and (other_keys := self._index.get(other)):
+                        other_keys.discard(key)
+                        if not other_keys:
+                            del self._index[other]
+
+    @callback
+    def _async_area_updated(
+        self, event: Event[area_registry.EventAreaRegistryUpdatedData]
+    ) -> None:
+        """Drop the resolved targets depending on an area."""
+        area_id = event.data["area_id"]
+        dependencies: list[_Dependency] = [("area", area_id)]
+        # A new or updated area may join the targets of its floor and labels
+        if area := area_registry.async_get(self.hass).async_get_area(area_id):
+            if area.floor_id:
+                dependencies.append(("floor", area.floor_id))
+            dependencies.extend(("label", label_id) for label_id in area.labels)
+        self._async_invalidate(dependencies)
+
+    @callback
+    def _async_device_updated(
+        self, event: Event[device_registry.EventDeviceRegistryUpdatedData]
+    ) -> None:
+        """Drop the resolved targets depending on a device."""
+        device_id = event.data["device_id"]
+        dependencies: list[_Dependency] = [("device", device_id)]
+        if device := device_registry.async_get(self.hass).async_get(device_id):
+            if device.area_id:
+                dependencies.append(("area", device.area_id))
+            dependencies.extend(("label", label_id) for label_id in device.labels)
+        self._async_invalidate(dependencies)
+
+    @callback
+    def _async_entity_updated(
+        self, event: Event[entity_registry.EventEntityRegistryUpdatedData]
+    ) -> None:
+        """Drop the resolved targets depending on an entity."""
+        data = event.data
+        entity_id = data["entity_id"]
+        dependencies: list[_Dependency] = [("entity", entity_id)]
+        if data["action"] == "update" and "old_entity_id" in data:
+            dependencies.append(("entity", data["old_entity_id"]))
+        if entry := entity_registry.async_get(self.hass).async_get(entity_id):
+            if entry.area_id:
+                dependencies.append(("area", entry.area_id))
+            if entry.device_id:
+                dependencies.append(("device", entry.device_id))
+            dependencies.extend(("label", label_id) for label_id in entry.labels)
+        self._async_invalidate(dependencies)
+
+    @callback
+    def _async_floor_updated(
+        self, event: Event[floor_registry.EventFloorRegistryUpdatedData]
+    ) -> None:
+        """Drop the resolved targets depending on a floor."""
+        self._async_invalidate((("floor", event.data["floor_id"]),))
+
+    @callback
+    def _async_label_updated(
+        self, event: Event[label_registry.EventLabelRegistryUpdatedData]
+    ) -> None:
+        """Drop the resolved targets depending on a label."""
+        self._async_invalidate((("label", event.data["label_id"]),))
+
+    @callback
+    def async_get_stats(self) -> dict[str, Any]:
+        """Return the statistics of the cache."""
+        return {
+            "entries": len(self._resolved),
+            "indexed_items": len(self._index),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+        }
+
+
+@callback
+def async_get_target_resolution_cache(hass: HomeAssistant) -> TargetResolutionCache:
+    """Return the cache of the targets resolved from the registries."""
+    if (cache := hass.data.get(TARGET_RESOLUTION_CACHE)) is None:
+        cache = hass.data[TARGET_RESOLUTION_CACHE] = TargetResolutionCache(hass)
+        cache.async_setup()
+    return cache
+
+
+@callback
+def _async_resolve_registry_targets(
+    hass: HomeAssistant, selector: ServiceTargetSelector
+) -> SelectedEntities:
+    """Resolve the device, area, floor and label targets from the registries."""
+    selected = SelectedEntities()
     entities = entity_registry.async_get(hass).entities
     dev_reg = device_registry.async_get(hass)
     area_reg = area_registry.async_get(hass)
@@ -1012,6 +1217,12 @@ async def entity_service_call(
             await entity.async_update_ha_state(True)
         return {entity.entity_id: single_response} if return_response else None
 
+    # Entities of platforms with a batch handler are called at once
+    # unless the service call requests a response
+    single_entities, batches = (
+        (entities, []) if return_response else _group_batch_entities(call, entities)
+    )
+
     # Use asyncio.gather here to ensure the returned results
     # are in the same order as the entities list
     results: list[ServiceResponse | BaseException] = await asyncio.gather(
@@ -1019,16 +1230,25 @@ async def entity_service_call(
             entity.async_request_call(
                 _handle_entity_call(hass, entity, func, data, call.context)
             )
-            for entity in entities
+            for entity in single_entities
+        ],
+        *[
+            batch_entities[0].async_request_call(
+                _handle_entity_batch_call(handler, batch_entities, call)
+            )
+            for handler, batch_entities in batches
         ],
         return_exceptions=True,
     )
 
-    response_data: EntityServiceResponse = {}
-    for entity, result in zip(entities, results, strict=False):
+    for result in results:
         if isinstance(result, BaseException):
             raise result from None
-        response_data[entity.entity_id] = result
+
+    response_data: EntityServiceResponse = {
+        entity.entity_id: cast(ServiceResponse, result)
+        for entity, result in zip(single_entities, results, strict=False)
+    }
 
     tasks: list[asyncio.Task[None]] = []
 
@@ -1050,6 +1270,41 @@ async def entity_service_call(
     return response_data if return_response and response_data else None
 
 
+def _group_batch_entities(
+    call: ServiceCall, entities: list[Entity]
+) -> tuple[list[Entity], list[tuple[EntityServiceBatchHandler, list[Entity]]]]:
+    """Group the entities of the platforms with a batch handler for the service."""
+    key = (call.domain, call.service)
+    single_entities: list[Entity] = []
+    platform_entities: dict[EntityPlatform, list[Entity]] = {}
+    for entity in entities:
+        if (
+            entity.platform is not None
+            and key in entity.platform.batch_service_handlers
+        ):
+            platform_entities.setdefault(entity.platform, []).append(entity)
+        else:
+            single_entities.append(entity)
+
+    batches: list[tuple[EntityServiceBatchHandler, list[Entity]]] = []
+    for platform, batch_entities in platform_entities.items():
+        # A single entity is called directly
+        if len(batch_entities) == 1:
+            single_entities.append(batch_entities[0])
+        else:
+            batches.append((platform.batch_service_handlers[key], batch_entities))
+    return single_entities, batches
+
+
+async def _handle_entity_batch_call(
+    handler: EntityServiceBatchHandler, entities: list[Entity], call: ServiceCall
+) -> None:
+    """Handle calling a service for several entities at once."""
+    for entity in entities:
+        entity.async_set_context(call.context)
+    await handler(entities, call)
+
+
 async def _handle_entity_call(
     hass: HomeAssistant,
     entity: Entity,
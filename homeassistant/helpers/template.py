@@ -12,8 +12,11 @@ from contextvars import ContextVar
 from copy import deepcopy
 from datetime import date, datetime, time, timedelta
 from functools import cache, lru_cache, partial, wraps
+import hashlib
+from importlib.util import MAGIC_NUMBER
 import json
 import logging
+import marshal
 import math
 from operator import contains
 import pathlib
@@ -53,14 +56,17 @@ from homeassistant.const import (
     ATTR_LONGITUDE,
     ATTR_PERSONS,
     ATTR_UNIT_OF_MEASUREMENT,
+    EVENT_HOMEASSISTANT_FINAL_WRITE,
     EVENT_HOMEASSISTANT_START,
     EVENT_HOMEASSISTANT_STOP,
     STATE_UNAVAILABLE,
     STATE_UNKNOWN,
     UnitOfLength,
+    __version__,
 )
 from homeassistant.core import (
     Context,
+    Event,
     HomeAssistant,
     ServiceResponse,
     State,
@@ -78,6 +84,7 @@ from homeassistant.util import (
     slugify as slugify_util,
 )
 from homeassistant.util.async_ import run_callback_threadsafe
+from homeassistant.util.file import WriteError, write_utf8_file
 from homeassistant.util.hass_dict import HassKey
 from homeassistant.util.json import JSON_DECODE_EXCEPTIONS, json_loads
 from homeassistant.util.read_only_dict import ReadOnlyDict
@@ -94,6 +101,7 @@ from . import (
 )
 from .deprecation import deprecated_function
 from .singleton import singleton
+from .storage import STORAGE_DIR
 from .translation import async_translate_state
 from .typing import TemplateVarsType
 
@@ -114,6 +122,14 @@ _ENVIRONMENT_STRICT: HassKey[TemplateEnvironment] = HassKey(
     "template.environment_strict"
 )
 _HASS_LOADER = "template.hass_loader"
+_TEMPLATE_CODE_CACHE: HassKey[TemplateCodeCache] = HassKey("template.code_cache")
+
+TEMPLATE_CODE_CACHE_FILE = "core.template_code_cache"
+# Bump when a change to the environment changes the compiled code
+TEMPLATE_CODE_CACHE_VERSION = 2
+# The maximum number of compiled templates kept and saved, the least
+# recently compiled ones are dropped first
+TEMPLATE_CODE_CACHE_SIZE = 2048
 
 # Match "simple" ints and floats. -1.0, 1, +5, 5.0
 _IS_NUMERIC = re.compile(r"^[+-]?(?!0\d)\d*(?:\.\d*)?$")
@@ -2851,6 +2867,116 @@ class HassLoader(jinja2.BaseLoader):
         return self._sources[template], template, lambda: cur_reload == self._reload
 
 
+def _template_code_cache_version() -> tuple[int, str, str, bytes]:
+    """Return the version the cached code must have been compiled with."""
+    return (
+        TEMPLATE_CODE_CACHE_VERSION,
+        __version__,
+        jinja2.__version__,
+        MAGIC_NUMBER,
+    )
+
+
+class TemplateCodeCache:
+    """Cache of compiled template code which persists across restarts.
+
+    The code is keyed by the hash of the template source and of the kind
+    of environment which compiled it. Jinja resolves the filters and tests
+    at compile time, and they differ in the limited environment. It is kept
+    marshalled and only unmarshalled when a template with the same
+    source is compiled, so loading the cache is cheap. Only the code of
+    the most recently compiled templates of a run is saved.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialize the cache."""
+        self._path = path
+        self._stored: dict[bytes, bytes] = {}
+        self._used: LRU[bytes, bytes] = LRU(TEMPLATE_CODE_CACHE_SIZE)
+        self._dirty = False
+
+    @staticmethod
+    def _key(kind: str, source: str) -> bytes:
+        """Return the key of a template source compiled by a kind of environment."""
+        return hashlib.sha256(f"{kind}\0{source}".encode()).digest()
+
+    def get(self, kind: str, source: str) -> CodeType | None:
+        """Return the cached code of a template source."""
+        key = self._key(kind, source)
+        if (marshalled := self._used.get(key)) is None and (
+            marshalled := self._stored.pop(key, None)
+        ) is None:
+            return None
+        try:
+            code = marshal.loads(marshalled)
+        except (EOFError, ValueError, TypeError):
+            return None
+        self._used[key] = marshalled
+        return code  # type: ignore[no-any-return]
+
+    def set(self, kind: str, source: str, code: CodeType) -> None:
+        """Cache the compiled code of a template source."""
+        self._used[self._key(kind, source)] = marshal.dumps(code)
+        self._dirty = True
+
+    def load(self) -> None:
+        """Load the cache from disk."""
+        try:
+            with open(self._path, "rb") as fdesc:
+                data = marshal.load(fdesc)
+        except FileNotFoundError:
+            return
+        except (OSError, EOFError, ValueError, TypeError) as err:
+            _LOGGER.debug("Could not load the template code cache: %s", err)
+            return
+        if (
+            type(data) is not dict
+            or data.get("version") != _template_code_cache_version()
+            or type(code := data.get("code")) is not dict
+        ):
+            return
+        self._stored = {
+            key: marshalled for key, marshalled in code.items() if key not in self._used
+        }
+
+    async def async_save(self, hass: HomeAssistant) -> None:
+        """Save the code compiled during this run if there is new code."""
+        if not self._dirty:
+            return
+        self._dirty = False
+        data = {
+            "version": _template_code_cache_version(),
+            "code": dict(self._used.items()),
+        }
+        await hass.async_add_executor_job(self._save, data)
+
+    def _save(self, data: dict[str, Any]) -> None:
+        """Save the cache to disk."""
+        pathlib.Path(self._path).parent.mkdir(parents=True, exist_ok=True)
+        try:
+            write_utf8_file(self._path, marshal.dumps(data), private=True, mode="wb")
+        except WriteError as err:
+            _LOGGER.debug("Could not save the template code cache: %s", err)
+
+
+async def async_load_template_code_cache(hass: HomeAssistant) -> None:
+    """Load the compiled template code cache.
+
+    Templates compiled before the cache has been loaded are
+    compiled by Jinja and added to the cache.
+    """
+    code_cache = TemplateCodeCache(
+        hass.config.path(STORAGE_DIR, TEMPLATE_CODE_CACHE_FILE)
+    )
+    hass.data[_TEMPLATE_CODE_CACHE] = code_cache
+    await hass.async_add_executor_job(code_cache.load)
+
+    async def _async_save(_: Event) -> None:
+        await code_cache.async_save(hass)
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_FINAL_WRITE, _async_save)
+
+
 class TemplateEnvironment(ImmutableSandboxedEnvironment):
     """The Home Assistant template environment."""
 
@@ -2864,6 +2990,8 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
         """Initialise template environment."""
         super().__init__(undefined=make_logging_undefined(strict, log_fn))
         self.hass = hass
+        # Environments of the same kind compile a source to the same code
+        self.code_cache_kind = f"limited={bool(limited)},strict={bool(strict)}"
         self.template_cache: weakref.WeakValueDictionary[
             str | jinja2.nodes.Template, CodeType | None
         ] = weakref.WeakValueDictionary()
@@ -3219,7 +3347,16 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
                 defer_init,
             )
 
-        compiled = super().compile(source)
+        if (
+            type(source) is str
+            and self.hass is not None
+            and (code_cache := self.hass.data.get(_TEMPLATE_CODE_CACHE)) is not None
+        ):
+            if (compiled := code_cache.get(self.code_cache_kind, source)) is None:
+                compiled = super().compile(source)
+                code_cache.set(self.code_cache_kind, source, compiled)
+        else:
+            compiled = super().compile(source)
         self.template_cache[source] = compiled
         return compiled
 
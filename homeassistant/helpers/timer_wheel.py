@@ -0,0 +1,203 @@
+"""Group the timers of the time tracking helpers into shared wakeups."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import math
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HassJob, HomeAssistant, callback
+from homeassistant.util.hass_dict import HassKey
+
+from .singleton import singleton
+
+DATA_TIMER_WHEEL: HassKey[TimerWheel] = HassKey("timer_wheel")
+
+
+class WheelTimer:
+    """A timer in a slot of the timer wheel."""
+
+    __slots__ = ("_args", "_callback", "_cancelled", "_wheel", "slot")
+
+    def __init__(
+        self,
+        wheel: TimerWheel,
+        slot: float,
+        callback_: Callable[..., Any],
+        args: tuple[Any, ...],
+    ) -> None:
+        """Initialize the timer."""
+        self._wheel = wheel
+        self._callback = callback_
+        self._args = args
+        self._cancelled = False
+        self.slot = slot
+
+    def __repr__(self) -> str:
+        """Return the representation of the timer."""
+        return f"<WheelTimer {self.slot} {self._callback!r}{self._args!r}>"
+
+    def cancel(self) -> None:
+        """Cancel the timer."""
+        if not self._cancelled:
+            self._cancelled = True
+            self._wheel.async_remove(self)
+
+    def cancelled(self) -> bool:
+        """Return if the timer was cancelled."""
+        return self._cancelled
+
+
+class _Slot:
+    """Timers which fire in the same tick and their loop timer.
+
+    The slot is the callback of the loop timer so the timers
+    show in the representation of the loop timer when debugging.
+    """
+
+    __slots__ = ("handle", "timers", "timestamp", "wheel")
+
+    def __init__(self, wheel: TimerWheel, timestamp: float) -> None:
+        """Initialize the slot."""
+        self.wheel = wheel
+        self.timestamp = timestamp
+        self.timers: dict[WheelTimer, None] = {}
+        self.handle: asyncio.TimerHandle | None = None
+
+    def __repr__(self) -> str:
+        """Return the representation of the slot."""
+        return f"<TimerWheel slot {self.timestamp} {list(self.timers)}>"
+
+    @callback
+    def __call__(self) -> None:
+        """Run the timers of the slot."""
+        self.wheel.async_fire_slot(self)
+
+
+class TimerWheel:
+    """Schedule the timers firing in the same tick with a single loop timer.
+
+    The fire times are rounded up to the resolution so timers never
+    fire early. A resolution of zero only groups the timers which
+    fire at the exact same time.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the timer wheel."""
+        self._loop = hass.loop
+        self._slots: dict[float, _Slot] = {}
+        self.resolution = 0.0
+        self.timers = 0
+        self.scheduled = 0
+        self.fired = 0
+        self.wakeups = 0
+        self.total_lateness = 0.0
+        self.max_lateness = 0.0
+
+    @callback
+    def async_set_resolution(self, resolution: float) -> None:
+        """Set the resolution of the ticks in seconds.
+
+        Only the timers scheduled after the call are affected.
+        """
+        self.resolution = resolution
+
+    @callback
+    def async_call_at_timestamp(
+        self, timestamp: float, callback_: Callable[..., Any], *args: Any
+    ) -> WheelTimer | asyncio.TimerHandle:
+        """Call a callback at a UNIX timestamp.
+
+        Timers passing a HassJob cancelled on shutdown as their first
+        argument get their own loop timer, as the loop timers of those
+        jobs are cancelled when Home Assistant stops.
+        """
+        if args and type(job := args[0]) is HassJob and job.cancel_on_shutdown:
+            loop = self._loop
+            return loop.call_at(loop.time() + timestamp - time.time(), callback_, *args)
+        if resolution := self.resolution:
+            timestamp = math.ceil(timestamp / resolution) * resolution
+        if (slot := self._slots.get(timestamp)) is None:
+            loop = self._loop
+            slot = self._slots[timestamp] = _Slot(self, timestamp)
+            slot.handle = loop.call_at(loop.time() + timestamp - time.time(), slot)
+        timer = WheelTimer(self, timestamp, callback_, args)
+        slot.timers[timer] = None
+        self.timers += 1
+        self.scheduled += 1
+        return timer
+
+    @callback
+    def async_call_later(
+        self, delay: float, callback_: Callable[..., Any], *args: Any
+    ) -> WheelTimer | asyncio.TimerHandle:
+        """Call a callback after a delay in seconds."""
+        return self.async_call_at_timestamp(time.time() + delay, callback_, *args)
+
+    @callback
+    def async_remove(self, timer: WheelTimer) -> None:
+        """Remove a cancelled timer from its slot."""
+        if (slot := self._slots.get(timer.slot)) is None or (
+            slot.timers.pop(timer, False) is False
+        ):
+            return
+        self.timers -= 1
+        if not slot.timers:
+            # Do not leave loop timers behind for empty slots
+            if TYPE_CHECKING:
+                assert slot.handle is not None
+            slot.handle.cancel()
+            del self._slots[timer.slot]
+
+    @callback
+    def async_fire_slot(self, slot: _Slot) -> None:
+        """Run the timers of a slot."""
+        if TYPE_CHECKING:
+            assert slot.handle is not None
+        del self._slots[slot.timestamp]
+        lateness = max(0.0, self._loop.time() - slot.handle.when())
+        self.wakeups += 1
+        self.total_lateness += lateness
+        self.max_lateness = max(lateness, self.max_lateness)
+        self.timers -= len(slot.timers)
+        for timer in slot.timers:
+            # A timer can be cancelled by one run before it in the slot
+            if timer._cancelled:  # noqa: SLF001
+                continue
+            # Mark the timer as done so cancelling it from
+            # its callback does not look it up again
+            timer._cancelled = True  # noqa: SLF001
+            self.fired += 1
+            try:
+                timer._callback(*timer._args)  # noqa: SLF001
+            except Exception as ex:  # noqa: BLE001
+                self._loop.call_exception_handler(
+                    {
+                        "message": f"Exception in callback {timer._callback!r}",  # noqa: SLF001
+                        "exception": ex,
+                    }
+                )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the timer counts and lateness statistics."""
+        return {
+            "resolution": self.resolution,
+            "timers": self.timers,
+            "slots": len(self._slots),
+            "scheduled": self.scheduled,
+            "fired": self.fired,
+            "wakeups": self.wakeups,
+            "mean_lateness": self.total_lateness / self.wakeups
+            if self.wakeups
+            else 0.0,
+            "max_lateness": self.max_lateness,
+        }
+
+
+@callback
+@singleton(DATA_TIMER_WHEEL)
+def async_get_timer_wheel(hass: HomeAssistant) -> TimerWheel:
+    """Get the timer wheel."""
+    return TimerWheel(hass)
@@ -8,6 +8,7 @@ from collections.abc import Callable
 from contextlib import suppress
 import logging
 from timeit import default_timer as timer
+from typing import Any
 
 from homeassistant import core
 from homeassistant.const import EVENT_STATE_CHANGED
@@ -16,7 +17,7 @@ from homeassistant.helpers.event import (
     async_track_state_change,
     async_track_state_change_event,
 )
-from homeassistant.helpers.json import JSON_DUMP
+from homeassistant.helpers.json import JSON_DUMP, json_bytes
 
 # mypy: allow-untyped-calls, allow-untyped-defs, no-check-untyped-defs
 # mypy: no-warn-return-any
@@ -116,6 +117,104 @@ async def fire_events_with_filter(hass):
     return timer() - start
 
 
+@benchmark
+async def fire_events_keyed(hass):
+    """Fire 100k events to 100 listeners filtered or keyed on the event data."""
+    count = 0
+    event_name = "benchmark_event"
+    events_to_fire = 10**5
+    listeners = 100
+
+    @core.callback
+    def listener(_):
+        """Handle event."""
+        nonlocal count
+        count += 1
+
+    def filter_for(entity_id):
+        @core.callback
+        def event_filter(event_data):
+            """Filter event."""
+            return event_data["entity_id"] == entity_id
+
+        return event_filter
+
+    async def run():
+        events_data = [
+            {"entity_id": f"light.kitchen_{i % listeners}"}
+            for i in range(events_to_fire)
+        ]
+        start = timer()
+        for event_data in events_data:
+            hass.bus.async_fire_internal(event_name, event_data)
+        await hass.async_block_till_done()
+        return timer() - start
+
+    unsubs = [
+        hass.bus.async_listen(
+            event_name, listener, event_filter=filter_for(f"light.kitchen_{i}")
+        )
+        for i in range(listeners)
+    ]
+    filtered_time = await run()
+    for unsub in unsubs:
+        unsub()
+    assert count == events_to_fire
+
+    for i in range(listeners):
+        hass.bus.async_listen_keyed(
+            event_name, "entity_id", f"light.kitchen_{i}", listener
+        )
+    keyed_time = await run()
+    assert count == 2 * events_to_fire
+
+    print(f"Filtered listeners: {filtered_time:.3f}s")
+    print(f"Keyed listeners: {keyed_time:.3f}s")
+    return keyed_time
+
+
+@benchmark
+async def state_machine_memory(hass):
+    """Measure the memory used per entity by default and compact states."""
+    import gc  # pylint: disable=import-outside-toplevel
+    import tracemalloc  # pylint: disable=import-outside-toplevel
+
+    shared_attributes = {
+        "unit_of_measurement": "°C",
+        "device_class": "temperature",
+        "state_class": "measurement",
+    }
+
+    def set_states(compact: bool, count: int) -> float:
+        """Return the bytes per entity of the states."""
+        states = core.StateMachine(hass.bus, hass.loop)
+        states.async_set_compact(compact)
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        for i in range(count):
+            # Half of the entities have the same attributes
+            if i % 2:
+                attributes = dict(shared_attributes)
+            else:
+                attributes = {**shared_attributes, "friendly_name": f"Sensor {i}"}
+            states.async_set(f"sensor.sensor_{i}", str(i), attributes)
+        gc.collect()
+        used = tracemalloc.get_traced_memory()[0] - before
+        tracemalloc.stop()
+        return used / count
+
+    start = timer()
+    for count in (1000, 5000, 15000):
+        default_bytes = set_states(False, count)
+        compact_bytes = set_states(True, count)
+        print(
+            f"{count} entities: {default_bytes:.0f} bytes per entity,"
+            f" {compact_bytes:.0f} bytes per entity with compact states"
+        )
+    return timer() - start
+
+
 @benchmark
 async def state_changed_helper(hass):
     """Run a million events through state changed helper with 1000 entities."""
@@ -308,3 +407,255 @@ async def json_serialize_states(hass):
     start = timer()
     JSON_DUMP(states)
     return timer() - start
+
+
+@benchmark
+async def recorder_write_states(hass):
+    """Write 100k states with old state links through the recorder write paths.
+
+    Compares the ORM unit of work with the bulk insert of the states manager.
+    """
+    # pylint: disable=import-outside-toplevel
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    from homeassistant.components.recorder.db_schema import Base, States
+    from homeassistant.components.recorder.table_managers.states import StatesManager
+
+    rows_to_write = 10**5
+    entities = 1000
+
+    def _make_states() -> list[States]:
+        pending: dict[int, States] = {}
+        db_states = []
+        for idx in range(rows_to_write):
+            metadata_id = idx % entities + 1
+            db_state = States(
+                state=str(idx),
+                metadata_id=metadata_id,
+                attributes_id=1,
+                last_updated_ts=float(idx),
+                old_state=pending.get(metadata_id),
+            )
+            pending[metadata_id] = db_state
+            db_states.append(db_state)
+        return db_states
+
+    def _write_orm() -> float:
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        db_states = _make_states()
+        start = timer()
+        with Session(engine) as session:
+            session.add_all(db_states)
+            session.commit()
+        return timer() - start
+
+    def _write_bulk() -> float:
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        states_manager = StatesManager()
+        db_states = _make_states()
+        start = timer()
+        with Session(engine) as session:
+            for db_state in db_states:
+                states_manager.add_pending_insert(db_state)
+            states_manager.insert_pending(session)
+            session.commit()
+        return timer() - start
+
+    orm_time = await hass.async_add_executor_job(_write_orm)
+    bulk_time = await hass.async_add_executor_job(_write_bulk)
+    print(f"ORM unit of work: {rows_to_write / orm_time:.0f} rows/s")
+    print(f"Bulk insert: {rows_to_write / bulk_time:.0f} rows/s")
+    return orm_time + bulk_time
+
+
+@benchmark
+async def recorder_shared_data_compression(hass):
+    """Compare storing large shared attributes as JSON and compressed.
+
+    Reports the database size and the decode throughput of both.
+    """
+    # pylint: disable=import-outside-toplevel
+    import os
+    import tempfile
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    from homeassistant.components.recorder.db_schema import Base, StateAttributes
+    from homeassistant.components.recorder.models import compress_shared_json
+
+    rows_to_write = 10**4
+
+    def _make_shared_bytes(idx: int) -> bytes:
+        return json_bytes(
+            {
+                "temperature": idx % 30,
+                "humidity": 50,
+                "forecast": [
+                    {
+                        "condition": "sunny",
+                        "datetime": f"2024-01-{day:02d}T00:00:00+00:00",
+                        "precipitation_probability": (idx + day) % 100,
+                        "temperature": (idx + day) % 30,
+                        "templow": (idx + day) % 20,
+                        "wind_bearing": (idx + day) % 360,
+                        "wind_speed": 10.5,
+                    }
+                    for day in range(1, 15)
+                ],
+                "friendly_name": "Forecast",
+            }
+        )
+
+    def _write_and_decode(compress: bool) -> tuple[int, float]:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "benchmark.db")
+            engine = create_engine(f"sqlite:///{db_path}")
+            Base.metadata.create_all(engine)
+            with Session(engine) as session:
+                for idx in range(rows_to_write):
+                    shared_bytes = _make_shared_bytes(idx)
+                    session.add(
+                        StateAttributes(
+                            shared_attrs=compress_shared_json(shared_bytes)
+                            if compress
+                            else shared_bytes.decode(),
+                            hash=idx,
+                        )
+                    )
+                session.commit()
+            with Session(engine) as session:
+                rows = session.query(StateAttributes).all()
+                start = timer()
+                for row in rows:
+                    row.to_native()
+                decode_time = timer() - start
+            engine.dispose()
+            return os.path.getsize(db_path), decode_time
+
+    json_size, json_time = await hass.async_add_executor_job(_write_and_decode, False)
+    zip_size, zip_time = await hass.async_add_executor_job(_write_and_decode, True)
+    print(f"JSON: {json_size / 1024:.0f} KiB, {rows_to_write / json_time:.0f} rows/s")
+    print(
+        f"Compressed: {zip_size / 1024:.0f} KiB, {rows_to_write / zip_time:.0f} rows/s"
+    )
+    return json_time + zip_time
+
+
+@benchmark
+async def subscribe_entities_fan_out(hass):
+    """Fan out 1000 state changes to 10, 100 and 500 subscribe_entities connections.
+
+    Compares a listener per connection with connections sharing the listener
+    and the encoded message of their identical subscription.
+    """
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.auth.models import Group, User
+    from homeassistant.components.websocket_api.subscription_hub import (
+        EntitySubscriptionHub,
+    )
+
+    events = 1000
+    entity_id = "light.kitchen"
+    # Wall tablets usually share a non admin dashboard user
+    user = User(
+        name="Tablet",
+        perm_lookup=None,
+        is_active=True,
+        groups=[
+            Group(name="Tablets", policy={"entities": {"domains": {"light": True}}})
+        ],
+    )
+
+    def _fan_out(connections: int, shared: bool) -> float:
+        hub = EntitySubscriptionHub(hass)
+        queues: list[list[str | bytes | dict[str, Any]]] = [
+            [] for _ in range(connections)
+        ]
+        unsubs = [
+            hub.async_subscribe(
+                None if shared else idx, None, None, None, 0, queue.append, user, b"7"
+            )
+            for idx, queue in enumerate(queues)
+        ]
+        states = [core.State(entity_id, str(idx)) for idx in range(events + 1)]
+        start = timer()
+        for idx in range(events):
+            hass.bus.async_fire_internal(
+                EVENT_STATE_CHANGED,
+                {
+                    "entity_id": entity_id,
+                    "old_state": states[idx],
+                    "new_state": states[idx + 1],
+                },
+            )
+        duration = timer() - start
+        for unsub in unsubs:
+            unsub()
+        return duration
+
+    total = 0.0
+    for connections in (10, 100, 500):
+        separate_time = _fan_out(connections, False)
+        shared_time = _fan_out(connections, True)
+        total += separate_time + shared_time
+        print(
+            f"{connections} connections: separate {separate_time:.4f}s, "
+            f"shared {shared_time:.4f}s"
+        )
+    return total
+
+
+@benchmark
+async def websocket_snapshot_encoding(hass):
+    """Encode a subscribe_entities snapshot of 10k entities to JSON and CBOR.
+
+    Reports the size and the time to encode the states of the snapshot.
+    """
+    # pylint: disable=import-outside-toplevel
+    from homeassistant.components.websocket_api import messages
+
+    entity_count = 10**4
+
+    def _make_states() -> list[core.State]:
+        return [
+            core.State(
+                f"sensor.power_{idx}",
+                str(idx * 1.5),
+                {
+                    "state_class": "measurement",
+                    "unit_of_measurement": "W",
+                    "device_class": "power",
+                    "friendly_name": f"Power {idx}",
+                    "last_reset": None,
+                    "attribution": "Data provided by the meter",
+                },
+            )
+            for idx in range(entity_count)
+        ]
+
+    states = _make_states()
+    start = timer()
+    json_message = b"".join(
+        (
+            b'{"id":1,"type":"event","event":{"a":{',
+            b",".join(state.as_compressed_state_json for state in states),
+            b"}}}",
+        )
+    )
+    json_time = timer() - start
+
+    states = _make_states()
+    id_as_cbor = messages.message_id_as_cbor(1)
+    start = timer()
+    cbor_message = messages.compressed_states_message_cbor(
+        id_as_cbor, [state.as_compressed_state_cbor for state in states]
+    )
+    cbor_time = timer() - start
+
+    print(f"JSON: {len(json_message) / 1024:.0f} KiB in {json_time:.4f}s")
+    print(f"CBOR: {len(cbor_message) / 1024:.0f} KiB in {cbor_time:.4f}s")
+    return json_time + cbor_time
@@ -0,0 +1,155 @@
+"""Encode CBOR (RFC 8949) data.
+
+Only the types which can be represented in JSON are encoded natively,
+other objects are converted the way the JSON helpers convert them so a
+message decodes to the same data in both formats.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+import dataclasses
+import datetime
+from enum import Enum
+from pathlib import Path
+from struct import Struct
+from typing import Any, Final
+from uuid import UUID
+
+import orjson
+
+CBOR_TRUE: Final = b"\xf5"
+CBOR_FALSE: Final = b"\xf4"
+CBOR_NULL: Final = b"\xf6"
+
+MAJOR_UNSIGNED: Final = 0
+MAJOR_NEGATIVE: Final = 1
+MAJOR_BYTES: Final = 2
+MAJOR_TEXT: Final = 3
+MAJOR_ARRAY: Final = 4
+MAJOR_MAP: Final = 5
+MAJOR_SIMPLE: Final = 7
+
+_UINT8 = Struct(">BB")
+_UINT16 = Struct(">BH")
+_UINT32 = Struct(">BI")
+_UINT64 = Struct(">BQ")
+_FLOAT64 = Struct(">Bd")
+_FLOAT64_HEAD: Final = MAJOR_SIMPLE << 5 | 27
+_SMALL_HEADS: Final = tuple(
+    tuple(bytes((major << 5 | length,)) for length in range(24)) for major in range(8)
+)
+
+
+def cbor_head(major: int, length: int) -> bytes:
+    """Return the head of a data item with its major type and length or value."""
+    if length < 24:
+        return _SMALL_HEADS[major][length]
+    major <<= 5
+    if length < 0x100:
+        return _UINT8.pack(major | 24, length)
+    if length < 0x10000:
+        return _UINT16.pack(major | 25, length)
+    if length < 0x100000000:
+        return _UINT32.pack(major | 26, length)
+    if length < 0x10000000000000000:
+        return _UINT64.pack(major | 27, length)
+    raise TypeError("Integer exceeds 64-bit range")
+
+
+def _convert(obj: Any) -> Any:
+    """Convert an object which is not natively encoded.
+
+    Matches json_encoder_default and the types orjson serializes natively.
+    """
+    if isinstance(obj, Enum):
+        return obj.value
+    if hasattr(obj, "as_dict"):
+        return obj.as_dict()
+    if hasattr(obj, "json_fragment"):
+        return orjson.loads(orjson.dumps(obj.json_fragment))
+    if isinstance(obj, orjson.Fragment):
+        return orjson.loads(orjson.dumps(obj))
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, (datetime.datetime, datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, Path):
+        return obj.as_posix()
+    if isinstance(obj, UUID):
+        return str(obj)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    raise TypeError(f"Type is not CBOR serializable: {type(obj).__name__}")
+
+
+def _map_key(key: Any) -> str:
+    """Return the text of a map key like orjson with non str keys."""
+    if isinstance(key, Enum):
+        key = key.value
+    if isinstance(key, (datetime.datetime, datetime.date, datetime.time)):
+        return key.isoformat()
+    if isinstance(key, bool):
+        return "true" if key else "false"
+    if key is None:
+        return "null"
+    return str(key)
+
+
+def _encode(obj: Any, append: Callable[[bytes], None]) -> None:
+    """Append the encoding of an object."""
+    obj_type = type(obj)
+    if obj_type is str:
+        data = obj.encode()
+        append(cbor_head(MAJOR_TEXT, len(data)))
+        append(data)
+    elif obj_type is int:
+        if obj >= 0:
+            append(cbor_head(MAJOR_UNSIGNED, obj))
+        else:
+            append(cbor_head(MAJOR_NEGATIVE, -1 - obj))
+    elif obj_type is float:
+        append(_FLOAT64.pack(_FLOAT64_HEAD, obj))
+    elif obj is None:
+        append(CBOR_NULL)
+    elif obj is True:
+        append(CBOR_TRUE)
+    elif obj is False:
+        append(CBOR_FALSE)
+    elif obj_type is dict or isinstance(obj, Mapping):
+        append(cbor_head(MAJOR_MAP, len(obj)))
+        for key, value in obj.items():
+            _encode(key if type(key) is str else _map_key(key), append)
+            _encode(value, append)
+    elif obj_type is list:
+        append(cbor_head(MAJOR_ARRAY, len(obj)))
+        for value in obj:
+            _encode(value, append)
+    elif isinstance(obj, (bytes, bytearray, memoryview)):
+        append(cbor_head(MAJOR_BYTES, len(obj)))
+        append(bytes(obj))
+    # Subclasses of the native types, enums first to encode their value
+    elif isinstance(obj, Enum):
+        _encode(obj.value, append)
+    elif isinstance(obj, str):
+        _encode(str(obj), append)
+    elif isinstance(obj, bool):
+        append(CBOR_TRUE if obj else CBOR_FALSE)
+    elif isinstance(obj, int):
+        _encode(int(obj), append)
+    elif isinstance(obj, float):
+        _encode(float(obj), append)
+    elif isinstance(obj, list):
+        _encode(list(obj), append)
+    else:
+        _encode(_convert(obj), append)
+
+
+def cbor_bytes(obj: Any) -> bytes:
+    """Encode an object to CBOR.
+
+    Raises TypeError if the object or one of its values cannot be encoded.
+    """
+    parts: list[bytes] = []
+    _encode(obj, parts.append)
+    return b"".join(parts)
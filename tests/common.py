@@ -23,6 +23,7 @@ import json
 import logging
 import os
 import pathlib
+from struct import Struct, error as StructError
 import time
 from types import FrameType, ModuleType
 from typing import Any, Literal, NoReturn
@@ -95,6 +96,15 @@ from homeassistant.util.async_ import (
     get_scheduled_timer_handles,
     run_callback_threadsafe,
 )
+from homeassistant.util.cbor import (
+    MAJOR_ARRAY,
+    MAJOR_BYTES,
+    MAJOR_MAP,
+    MAJOR_NEGATIVE,
+    MAJOR_SIMPLE,
+    MAJOR_TEXT,
+    MAJOR_UNSIGNED,
+)
 import homeassistant.util.dt as dt_util
 from homeassistant.util.event_type import EventType
 from homeassistant.util.json import (
@@ -572,6 +582,89 @@ def json_round_trip(obj: Any) -> Any:
     return json_loads(json_dumps(obj))
 
 
+class CBORDecodeError(ValueError):
+    """Error decoding CBOR data."""
+
+
+_CBOR_FLOAT16 = Struct(">e")
+_CBOR_FLOAT32 = Struct(">f")
+_CBOR_FLOAT64 = Struct(">d")
+
+
+def cbor_loads(data: bytes | bytearray | memoryview) -> Any:
+    """Decode CBOR data.
+
+    Tags are ignored and their content is returned.
+    """
+    data = bytes(data)
+    try:
+        obj, offset = _cbor_decode(data, 0)
+    except (IndexError, UnicodeDecodeError, StructError) as err:
+        raise CBORDecodeError("Truncated or invalid CBOR data") from err
+    if offset != len(data):
+        raise CBORDecodeError("Extra data after the CBOR data item")
+    return obj
+
+
+def _cbor_decode_argument(data: bytes, offset: int, info: int) -> tuple[int, int]:
+    """Decode the argument of a head and return it with the new offset."""
+    if info < 24:
+        return info, offset
+    if info > 27:
+        raise CBORDecodeError(f"Unsupported additional information {info}")
+    end = offset + (1 << (info - 24))
+    if end > len(data):
+        raise CBORDecodeError("Truncated CBOR data item")
+    return int.from_bytes(data[offset:end]), end
+
+
+def _cbor_decode(data: bytes, offset: int) -> tuple[Any, int]:
+    """Decode the data item at an offset and return it with the new offset."""
+    initial = data[offset]
+    major = initial >> 5
+    info = initial & 0x1F
+    offset += 1
+    if major == MAJOR_SIMPLE:
+        if info == 20:
+            return False, offset
+        if info == 21:
+            return True, offset
+        if info in (22, 23):
+            return None, offset
+        if info == 25:
+            return _CBOR_FLOAT16.unpack_from(data, offset)[0], offset + 2
+        if info == 26:
+            return _CBOR_FLOAT32.unpack_from(data, offset)[0], offset + 4
+        if info == 27:
+            return _CBOR_FLOAT64.unpack_from(data, offset)[0], offset + 8
+        raise CBORDecodeError(f"Unsupported simple value {info}")
+    value, offset = _cbor_decode_argument(data, offset, info)
+    if major == MAJOR_UNSIGNED:
+        return value, offset
+    if major == MAJOR_NEGATIVE:
+        return -1 - value, offset
+    if major in (MAJOR_BYTES, MAJOR_TEXT):
+        end = offset + value
+        if end > len(data):
+            raise CBORDecodeError("Truncated CBOR string")
+        chunk = data[offset:end]
+        return (chunk.decode() if major == MAJOR_TEXT else chunk), end
+    if major == MAJOR_ARRAY:
+        items = []
+        for _ in range(value):
+            item, offset = _cbor_decode(data, offset)
+            items.append(item)
+        return items, offset
+    if major == MAJOR_MAP:
+        result = {}
+        for _ in range(value):
+            key, offset = _cbor_decode(data, offset)
+            result[key], offset = _cbor_decode(data, offset)
+        return result, offset
+    # Tag, return its content
+    return _cbor_decode(data, offset)
+
+
 def mock_state_change_event(
     hass: HomeAssistant, new_state: State, old_state: State | None = None
 ) -> None:
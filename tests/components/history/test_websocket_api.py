@@ -403,6 +403,239 @@ async def test_history_during_period_significant_domain(
     assert "lc" not in sensor_test_history[0]  # skipped if the same a last_updated (lu)
 
 
+async def test_history_during_period_downsampled(
+    hass: HomeAssistant, recorder_mock: Recorder, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test history_during_period reduces numeric states to buckets."""
+    start = dt_util.utcnow().replace(microsecond=0) - timedelta(hours=3)
+
+    await async_setup_component(hass, "history", {})
+    await async_recorder_block_till_done(hass)
+    for offset, state in (
+        (timedelta(minutes=1), "1"),
+        (timedelta(minutes=2), "3"),
+        (timedelta(minutes=40), "10"),
+        (timedelta(minutes=80), "unavailable"),
+    ):
+        with freeze_time(start + offset):
+            hass.states.async_set("sensor.power", state)
+            await async_recorder_block_till_done(hass)
+    await async_wait_recording_done(hass)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/history_during_period",
+            "start_time": start.isoformat(),
+            "end_time": (start + timedelta(hours=2)).isoformat(),
+            "entity_ids": ["sensor.power", "sensor.missing"],
+            "buckets": 4,
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    start_ts = start.timestamp()
+    assert response["result"] == {
+        "sensor.power": {
+            "lu": [start_ts, start_ts + 1800, start_ts + 3600],
+            "s": ["3", "10", "unavailable"],
+            "min": [1.0, 10.0, None],
+            "mean": [2.0, 10.0, None],
+            "max": [3.0, 10.0, None],
+        }
+    }
+
+    await client.send_json(
+        {
+            "id": 2,
+            "type": "history/history_during_period",
+            "start_time": start.isoformat(),
+            "end_time": (start + timedelta(hours=2)).isoformat(),
+            "entity_ids": ["sensor.power"],
+            "minimum_resolution": {"hours": 1},
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"] == {
+        "sensor.power": {
+            "lu": [start_ts, start_ts + 3600],
+            "s": ["10", "unavailable"],
+            "min": [1.0, None],
+            "mean": [14 / 3, None],
+            "max": [10.0, None],
+        }
+    }
+
+
+async def test_history_during_period_chunked(
+    hass: HomeAssistant, recorder_mock: Recorder, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test history_during_period sends the history in chunks."""
+    start = dt_util.utcnow().replace(microsecond=0) - timedelta(hours=3)
+
+    await async_setup_component(hass, "history", {})
+    await async_recorder_block_till_done(hass)
+    for offset, entity_id, state in (
+        (timedelta(minutes=30), "sensor.one", "a"),
+        (timedelta(minutes=30), "sensor.two", "x"),
+        # Exactly on the boundary of the first and the second window
+        (timedelta(hours=1), "sensor.one", "b"),
+        (timedelta(minutes=90), "sensor.one", "c"),
+    ):
+        with freeze_time(start + offset):
+            hass.states.async_set(entity_id, state)
+            await async_recorder_block_till_done(hass)
+    await async_wait_recording_done(hass)
+
+    client = await hass_ws_client()
+    with (
+        patch.object(websocket_api, "CHUNK_MAX_ENTITIES", 1),
+        patch.object(websocket_api, "CHUNK_TIME_WINDOW", timedelta(hours=1)),
+    ):
+        await client.send_json(
+            {
+                "id": 1,
+                "type": "history/history_during_period",
+                "start_time": start.isoformat(),
+                "end_time": (start + timedelta(hours=2)).isoformat(),
+                "entity_ids": ["sensor.one", "sensor.two"],
+                "significant_changes_only": False,
+                "no_attributes": True,
+                "chunked": True,
+            }
+        )
+        response = await client.receive_json()
+        assert response["success"]
+        assert response["result"] is None
+
+        events = []
+        while True:
+            response = await client.receive_json()
+            assert response["id"] == 1
+            assert response["type"] == "event"
+            events.append(response["event"])
+            if not response["event"].get("partial"):
+                break
+
+    # The empty chunk of sensor.two in the second window is only
+    # sent because it is the last one
+    assert [(event["states"], event.get("partial")) for event in events] == [
+        (
+            {
+                "sensor.one": [
+                    {
+                        "s": "a",
+                        "a": {},
+                        "lu": (start + timedelta(minutes=30)).timestamp(),
+                    },
+                    {"s": "b", "a": {}, "lu": (start + timedelta(hours=1)).timestamp()},
+                ]
+            },
+            True,
+        ),
+        (
+            {
+                "sensor.two": [
+                    {
+                        "s": "x",
+                        "a": {},
+                        "lu": (start + timedelta(minutes=30)).timestamp(),
+                    }
+                ]
+            },
+            True,
+        ),
+        (
+            {
+                "sensor.one": [
+                    {
+                        "s": "c",
+                        "a": {},
+                        "lu": (start + timedelta(minutes=90)).timestamp(),
+                    }
+                ]
+            },
+            True,
+        ),
+        ({}, None),
+    ]
+    assert events[0]["start_time"] == start.timestamp()
+    assert events[-1]["end_time"] == (start + timedelta(hours=2)).timestamp()
+
+    await client.send_json(
+        {
+            "id": 2,
+            "type": "history/history_during_period",
+            "start_time": start.isoformat(),
+            "entity_ids": ["sensor.one"],
+            "buckets": 4,
+            "chunked": True,
+        }
+    )
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "invalid_format"
+
+
+async def test_history_during_period_chunked_empty(
+    hass: HomeAssistant, recorder_mock: Recorder, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test chunked history_during_period ends with an empty event without states."""
+    now = dt_util.utcnow()
+    await async_setup_component(hass, "history", {})
+    await async_recorder_block_till_done(hass)
+
+    client = await hass_ws_client()
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "history/history_during_period",
+            "start_time": (now + timedelta(hours=1)).isoformat(),
+            "entity_ids": ["sensor.one"],
+            "chunked": True,
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    response = await client.receive_json()
+    assert response["event"]["states"] == {}
+    assert "partial" not in response["event"]
+
+
+async def test_history_during_period_chunked_error(
+    hass: HomeAssistant, recorder_mock: Recorder, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test chunked history_during_period sends an error if a chunk fails."""
+    now = dt_util.utcnow()
+    await async_setup_component(hass, "history", {})
+    await async_recorder_block_till_done(hass)
+
+    client = await hass_ws_client()
+    with patch.object(
+        websocket_api.history,
+        "get_significant_states_with_session",
+        side_effect=ValueError("Boom"),
+    ):
+        await client.send_json(
+            {
+                "id": 1,
+                "type": "history/history_during_period",
+                "start_time": (now - timedelta(hours=1)).isoformat(),
+                "entity_ids": ["sensor.one"],
+                "chunked": True,
+            }
+        )
+        response = await client.receive_json()
+        assert response["success"]
+        response = await client.receive_json()
+
+    assert response["id"] == 1
+    assert not response["success"]
+    assert response["error"]["code"] == "unknown_error"
+
+
 async def test_history_during_period_bad_start_time(
     hass: HomeAssistant, recorder_mock: Recorder, hass_ws_client: WebSocketGenerator
 ) -> None:
@@ -3,7 +3,12 @@
 import pytest
 
 from homeassistant.components import automation
-from homeassistant.const import ATTR_ENTITY_ID, ENTITY_MATCH_ALL, SERVICE_TURN_OFF
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    ENTITY_MATCH_ALL,
+    MATCH_ALL,
+    SERVICE_TURN_OFF,
+)
 from homeassistant.core import Context, HomeAssistant, ServiceCall
 from homeassistant.setup import async_setup_component
 
@@ -430,6 +435,39 @@ async def test_if_not_fires_if_event_data_not_matches(
     assert len(service_calls) == 0
 
 
+async def test_if_fires_on_any_event_with_data(
+    hass: HomeAssistant, service_calls: list[ServiceCall]
+) -> None:
+    """Test firing on events of any type with matching data."""
+    assert await async_setup_component(
+        hass,
+        automation.DOMAIN,
+        {
+            automation.DOMAIN: {
+                "trigger": {
+                    "platform": "event",
+                    "event_type": [MATCH_ALL, "test_event"],
+                    "event_data": {"some_attr": "some_value"},
+                },
+                "action": {"service": "test.automation"},
+            }
+        },
+    )
+
+    hass.bus.async_fire("other_event", {"some_attr": "some_other_value"})
+    await hass.async_block_till_done()
+    assert len(service_calls) == 0
+
+    hass.bus.async_fire("other_event", {"some_attr": "some_value"})
+    await hass.async_block_till_done()
+    assert len(service_calls) == 1
+
+    # Listening to test_event as well runs the action twice
+    hass.bus.async_fire("test_event", {"some_attr": "some_value"})
+    await hass.async_block_till_done()
+    assert len(service_calls) == 3
+
+
 async def test_if_not_fires_if_event_context_not_matches(
     hass: HomeAssistant, service_calls: list[ServiceCall], context_with_user: Context
 ) -> None:
@@ -19,6 +19,8 @@ from homeassistant.components.logbook.models import EventAsRow, LazyEventPartial
 from homeassistant.components.logbook.processor import EventProcessor
 from homeassistant.components.logbook.queries.common import PSEUDO_EVENT_STATE_CHANGED
 from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder.db_schema import EventData, StateAttributes
+from homeassistant.components.recorder.models.compression import COMPRESSED_V1_PREFIX
 from homeassistant.components.script import EVENT_SCRIPT_STARTED
 from homeassistant.components.sensor import SensorStateClass
 from homeassistant.const import (
@@ -1855,6 +1857,82 @@ async def test_icon_and_state(
     assert response_json[2]["state"] == STATE_OFF
 
 
+@pytest.mark.usefixtures("recorder_mock")
+async def test_compressed_attributes_and_event_data(
+    hass: HomeAssistant, hass_client: ClientSessionGenerator
+) -> None:
+    """Test the logbook reads attributes and event data stored compressed."""
+    config = logbook.CONFIG_SCHEMA(
+        {
+            ha.DOMAIN: {},
+            logbook.DOMAIN: {CONF_EXCLUDE: {CONF_ENTITIES: ["light.excluded"]}},
+        }
+    )
+    await asyncio.gather(
+        async_setup_component(hass, "homeassistant", {}),
+        async_setup_component(hass, "logbook", config),
+    )
+    await async_recorder_block_till_done(hass)
+
+    effect_list = [f"Effect {number}" for number in range(100)]
+    hass.states.async_set(
+        "light.kitchen",
+        STATE_OFF,
+        {"icon": "mdi:chemical-weapon", "effect_list": effect_list},
+    )
+    hass.states.async_set(
+        "light.kitchen", STATE_ON, {"icon": "mdi:security", "effect_list": effect_list}
+    )
+    hass.states.async_set(
+        "light.kitchen",
+        STATE_OFF,
+        {"icon": "mdi:chemical-weapon", "effect_list": effect_list},
+    )
+    hass.states.async_set(
+        "sensor.continuous",
+        "1",
+        {ATTR_UNIT_OF_MEASUREMENT: "W", "effect_list": effect_list},
+    )
+    hass.states.async_set(
+        "sensor.continuous",
+        "2",
+        {ATTR_UNIT_OF_MEASUREMENT: "W", "effect_list": effect_list},
+    )
+    message = " ".join(effect_list)
+    hass.bus.async_fire(
+        EVENT_LOGBOOK_ENTRY,
+        {ATTR_NAME: "Kitchen", "message": message, ATTR_ENTITY_ID: "light.kitchen"},
+    )
+    hass.bus.async_fire(
+        EVENT_LOGBOOK_ENTRY,
+        {ATTR_NAME: "Excluded", "message": message, ATTR_ENTITY_ID: "light.excluded"},
+    )
+    await async_wait_recording_done(hass)
+
+    def _get_stored() -> list[str]:
+        with recorder.util.session_scope(hass=hass, read_only=True) as session:
+            return [
+                *(row.shared_attrs for row in session.query(StateAttributes)),
+                *(row.shared_data for row in session.query(EventData)),
+            ]
+
+    stored = await recorder.get_instance(hass).async_add_executor_job(_get_stored)
+    assert sum(data.startswith(COMPRESSED_V1_PREFIX) for data in stored) == 5
+
+    client = await hass_client()
+    entries = await _async_fetch_logbook(client)
+    assert len(entries) == 3
+    _assert_entry(entries[0], entity_id="light.kitchen", state=STATE_ON)
+    assert entries[0]["icon"] == "mdi:security"
+    _assert_entry(entries[1], entity_id="light.kitchen", state=STATE_OFF)
+    assert entries[1]["icon"] == "mdi:chemical-weapon"
+    _assert_entry(entries[2], name="Kitchen", message=message)
+
+    entries = await _async_fetch_logbook(client, {"entity": "light.kitchen"})
+    assert len(entries) == 3
+    _assert_entry(entries[2], name="Kitchen", message=message)
+
+
 @pytest.mark.usefixtures("recorder_mock")
 async def test_fire_logbook_entries(
     hass: HomeAssistant, hass_client: ClientSessionGenerator
@@ -0,0 +1,45 @@
+"""Test the profiler diagnostics."""
+
+from homeassistant.components.profiler.const import DOMAIN
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.helpers import area_registry as ar, service
+
+from tests.common import MockConfigEntry
+from tests.components.diagnostics import get_diagnostics_for_config_entry
+from tests.typing import ClientSessionGenerator
+
+
+async def test_entry_diagnostics(
+    hass: HomeAssistant,
+    hass_client: ClientSessionGenerator,
+    area_registry: ar.AreaRegistry,
+) -> None:
+    """Test config entry diagnostics."""
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    area = area_registry.async_create("Kitchen")
+    call = ServiceCall(hass, "light", "turn_on", {"area_id": area.id})
+    service.async_extract_referenced_entity_ids(hass, call)
+    service.async_extract_referenced_entity_ids(hass, call)
+
+    result = await get_diagnostics_for_config_entry(hass, hass_client, entry)
+
+    assert result.keys() == {
+        "loop",
+        "timers",
+        "target_resolution_cache",
+        "websocket",
+    }
+    assert result["loop"]["total_count"] > 0
+    assert result["timers"]["timers"] >= 1
+    assert result["target_resolution_cache"] == {
+        "entries": 1,
+        "indexed_items": 1,
+        "hits": 1,
+        "misses": 1,
+        "invalidations": 0,
+    }
+    assert result["websocket"]["frames"] == 0
@@ -5,7 +5,7 @@ from functools import lru_cache
 import logging
 import os
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 
 from freezegun.api import FrozenDateTimeFactory
 from lru import LRU
@@ -32,11 +32,12 @@ from homeassistant.components.profiler import (
 )
 from homeassistant.components.profiler.const import DOMAIN
 from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TYPE
-from homeassistant.core import HomeAssistant
+from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 import homeassistant.util.dt as dt_util
 
 from tests.common import MockConfigEntry, async_fire_time_changed
+from tests.typing import WebSocketGenerator
 
 
 async def test_basic_usage(hass: HomeAssistant, tmp_path: Path) -> None:
@@ -447,3 +448,72 @@ async def test_set_asyncio_debug(
 
     assert await hass.config_entries.async_unload(entry.entry_id)
     await hass.async_block_till_done()
+
+
+async def test_loop_profiler(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the event loop time of the jobs is measured."""
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    assert hass.job_profiler is not None
+
+    @callback
+    def nested_listener(event: Event) -> None:
+        """Listen for the nested event."""
+
+    @callback
+    def listener(event: Event) -> None:
+        """Listen for the event."""
+        hass.bus.async_fire("profiler_nested_event")
+
+    listener.__module__ = "homeassistant.components.demo.light"
+    hass.bus.async_listen("profiler_event", listener)
+    hass.bus.async_listen("profiler_nested_event", nested_listener)
+
+    for _ in range(3):
+        hass.bus.async_fire("profiler_event")
+    await hass.async_block_till_done()
+
+    freezer.tick(timedelta(seconds=30))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.busiest_integration")
+    assert state.state in ("demo", "core")
+    assert "demo" in state.attributes["integrations"]
+    state = hass.states.get("sensor.event_loop_busy")
+    assert float(state.state) >= 0
+
+    client = await hass_ws_client(hass)
+    await client.send_json_auto_id(
+        {"type": "profiler/subscribe_loop_stats", "limit": 100}
+    )
+    msg = await client.receive_json()
+    assert msg["success"]
+    msg = await client.receive_json()
+    stats = msg["event"]
+    assert stats["integrations"]["demo"]["count"] == 3
+    assert stats["jobs"][f"{listener.__module__}.{listener.__qualname__}"] == {
+        "count": 3,
+        "total_time": ANY,
+        "max_time": ANY,
+    }
+    assert stats["jobs"][f"{__name__}.{nested_listener.__qualname__}"]["count"] == 3
+    assert stats["events"]["profiler_event"]["count"] == 3
+    assert stats["events"]["profiler_nested_event"]["count"] == 3
+    assert stats["timers"]["timers"] >= 1
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert hass.job_profiler is None
+
+    await client.send_json_auto_id({"type": "profiler/subscribe_loop_stats"})
+    msg = await client.receive_json()
+    assert not msg["success"]
+    assert msg["error"]["code"] == "not_found"
@@ -0,0 +1,52 @@
+"""The tests for the recorder state attributes manager."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from homeassistant.components import recorder
+from homeassistant.components.recorder.db_schema import StateAttributes
+from homeassistant.components.recorder.table_managers.state_attributes import (
+    StateAttributesManager,
+)
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import HomeAssistant
+
+from tests.common import async_capture_events
+from tests.components.recorder.common import async_wait_recording_done
+from tests.typing import RecorderInstanceGenerator
+
+
+async def test_serialize_reuses_unchanged_attributes(
+    async_setup_recorder_instance: RecorderInstanceGenerator, hass: HomeAssistant
+) -> None:
+    """Test the attributes of a state are only serialized when they change."""
+    instance = await async_setup_recorder_instance(
+        hass, {recorder.CONF_COMMIT_INTERVAL: 0}
+    )
+    manager = StateAttributesManager(instance)
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    hass.states.async_set("sensor.one", "1", {"unit_of_measurement": "°C"})
+    hass.states.async_set("sensor.one", "2", {"unit_of_measurement": "°C"})
+    hass.states.async_set("sensor.one", "3", {"unit_of_measurement": "°F"})
+    hass.states.async_remove("sensor.one")
+    hass.states.async_set("sensor.one", "4", {"unit_of_measurement": "°F"})
+    await async_wait_recording_done(hass)
+
+    with patch.object(
+        StateAttributes,
+        "shared_attrs_bytes_from_event",
+        wraps=StateAttributes.shared_attrs_bytes_from_event,
+    ) as mock_serialize:
+        results = [manager.serialize_from_event(event) for event in events]
+
+    assert results == [
+        b'{"unit_of_measurement":"\xc2\xb0C"}',
+        b'{"unit_of_measurement":"\xc2\xb0C"}',
+        b'{"unit_of_measurement":"\xc2\xb0F"}',
+        b"{}",
+        b'{"unit_of_measurement":"\xc2\xb0F"}',
+    ]
+    # The second state kept the attributes of the first one
+    assert mock_serialize.call_count == 4
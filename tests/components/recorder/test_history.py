@@ -1014,3 +1014,33 @@ async def test_get_last_state_changes_with_non_existent_entity_ids_returns_empty
 ) -> None:
     """Test get_last_state_changes returns an empty dict when entities not in the db."""
     assert history.get_last_state_changes(hass, 1, "nonexistent.entity") == {}
+
+
+def test_downsample_states() -> None:
+    """Test reducing states to buckets."""
+    assert history.modern.downsample_states(iter(()), 100.0, 10.0) == {
+        "lu": [],
+        "s": [],
+        "min": [],
+        "mean": [],
+        "max": [],
+    }
+    assert history.modern.downsample_states(
+        [
+            ("4", 0),  # start time state
+            ("2", 101.0),
+            ("nan", 105.0),
+            ("8", 109.0),
+            ("unknown", 112.0),
+            ("5", 135.0),
+            (None, 136.0),
+        ],
+        100.0,
+        10.0,
+    ) == {
+        "lu": [100.0, 110.0, 130.0],
+        "s": ["8", "unknown", None],
+        "min": [2.0, None, 5.0],
+        "mean": [14 / 3, None, 5.0],
+        "max": [8.0, None, 5.0],
+    }
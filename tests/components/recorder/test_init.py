@@ -37,6 +37,7 @@ from homeassistant.components.recorder.const import (
     EVENT_RECORDER_5MIN_STATISTICS_GENERATED,
     EVENT_RECORDER_HOURLY_STATISTICS_GENERATED,
     KEEPALIVE_TIME,
+    LRU_SNAPSHOT_STORAGE_KEY,
     SupportedDialect,
 )
 from homeassistant.components.recorder.db_schema import (
@@ -50,7 +51,12 @@ from homeassistant.components.recorder.db_schema import (
     StatesMeta,
     StatisticsRuns,
 )
-from homeassistant.components.recorder.models import process_timestamp
+from homeassistant.components.recorder.history import get_significant_states
+from homeassistant.components.recorder.models import (
+    decompress_shared_json,
+    process_timestamp,
+)
+from homeassistant.components.recorder.models.compression import COMPRESSED_V1_PREFIX
 from homeassistant.components.recorder.queries import select_event_type_ids
 from homeassistant.components.recorder.services import (
     SERVICE_DISABLE,
@@ -77,6 +83,7 @@ from homeassistant.helpers import (
     issue_registry as ir,
     recorder as recorder_helper,
 )
+from homeassistant.helpers.json import json_dumps
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.setup import async_setup_component
 from homeassistant.util import dt as dt_util
@@ -287,6 +294,115 @@ async def test_saving_state(hass: HomeAssistant, setup_recorder: None) -> None:
     assert state.as_dict() == _state_with_context(hass, entity_id).as_dict()
 
 
+async def test_saving_large_attributes_and_event_data_compressed(
+    hass: HomeAssistant, setup_recorder: None
+) -> None:
+    """Test large attributes and event data are stored compressed."""
+    entity_id = "weather.forecast"
+    attributes = {
+        "friendly_name": "Forecast",
+        "forecast": [
+            {"datetime": f"2024-01-{day:02d}T00:00:00+00:00", "temperature": day}
+            for day in range(1, 29)
+        ],
+    }
+    start = dt_util.utcnow()
+    hass.states.async_set(entity_id, "sunny", attributes)
+    hass.states.async_set("test.small", "on", {"friendly_name": "Small"})
+    hass.bus.async_fire("test_large_event", {"forecast": attributes["forecast"]})
+    await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        shared_attrs = {
+            db_attrs.to_native()["friendly_name"]: db_attrs.shared_attrs
+            for db_attrs in session.query(StateAttributes)
+        }
+        assert shared_attrs["Forecast"].startswith(COMPRESSED_V1_PREFIX)
+        assert shared_attrs["Small"] == '{"friendly_name":"Small"}'
+        event_data = (
+            session.query(EventData)
+            .join(Events, Events.data_id == EventData.data_id)
+            .join(EventTypes, Events.event_type_id == EventTypes.event_type_id)
+            .filter(EventTypes.event_type == "test_large_event")
+            .one()
+        )
+        assert event_data.shared_data.startswith(COMPRESSED_V1_PREFIX)
+        assert event_data.to_native() == {"forecast": attributes["forecast"]}
+
+    states = await recorder.get_instance(hass).async_add_executor_job(
+        get_significant_states, hass, start, None, [entity_id]
+    )
+    assert states[entity_id][0].attributes == attributes
+
+
+async def test_migrate_compresses_existing_attributes_and_event_data(
+    hass: HomeAssistant, setup_recorder: None
+) -> None:
+    """Test the live migrations compress large existing rows."""
+    forecast = [
+        {"datetime": f"2024-01-{day:02d}T00:00:00+00:00", "temperature": day}
+        for day in range(1, 29)
+    ]
+    large_json = json_dumps({"forecast": forecast})
+    small_json = '{"friendly_name":"Small"}'
+    instance = recorder.get_instance(hass)
+
+    def _insert_uncompressed() -> None:
+        with session_scope(hass=hass) as session:
+            session.add_all(
+                [
+                    StateAttributes(shared_attrs=large_json, hash=1),
+                    StateAttributes(shared_attrs=small_json, hash=2),
+                    EventData(shared_data=large_json, hash=1),
+                    EventData(shared_data=small_json, hash=2),
+                ]
+            )
+
+    def _get_stored() -> tuple[list[str], list[str]]:
+        with session_scope(hass=hass, read_only=True) as session:
+            return (
+                [
+                    row.shared_attrs
+                    for row in session.query(StateAttributes).filter(
+                        StateAttributes.hash.in_((1, 2))
+                    )
+                ],
+                [
+                    row.shared_data
+                    for row in session.query(EventData).filter(
+                        EventData.hash.in_((1, 2))
+                    )
+                ],
+            )
+
+    await instance.async_add_executor_job(_insert_uncompressed)
+    for migrator_cls in (
+        migration.StateAttributesCompressionMigration,
+        migration.EventDataCompressionMigration,
+    ):
+        migrator = migrator_cls(
+            initial_schema_version=50, start_schema_version=50, migration_changes={}
+        )
+        status = await instance.async_add_executor_job(
+            migrator.migrate_data_impl, instance
+        )
+        assert status == migration.DataMigrationStatus(
+            needs_migrate=True, migration_done=False
+        )
+        status = await instance.async_add_executor_job(
+            migrator.migrate_data_impl, instance
+        )
+        assert status == migration.DataMigrationStatus(
+            needs_migrate=False, migration_done=True
+        )
+
+    stored_attrs, stored_data = await instance.async_add_executor_job(_get_stored)
+    for stored in (stored_attrs, stored_data):
+        assert stored[0].startswith(COMPRESSED_V1_PREFIX)
+        assert decompress_shared_json(stored[0]) == large_json
+        assert stored[1] == small_json
+
+
 @pytest.mark.parametrize(
     ("db_engine", "expected_attributes"),
     [
@@ -394,19 +510,14 @@ async def test_saving_state_with_exception(
     state = "restoring_from_db"
     attributes = {"test_attr": 5, "test_attr_10": "nice"}
 
-    def _throw_if_state_in_session(*args, **kwargs):
-        for obj in get_instance(hass).event_session:
-            if isinstance(obj, States):
-                raise OperationalError(
-                    "insert the state", "fake params", "forced to fail"
-                )
-
     with (
         patch("time.sleep"),
         patch.object(
-            get_instance(hass).event_session,
-            "flush",
-            side_effect=_throw_if_state_in_session,
+            get_instance(hass).states_manager,
+            "insert_pending",
+            side_effect=OperationalError(
+                "insert the state", "fake params", "forced to fail"
+            ),
         ),
     ):
         hass.states.async_set(entity_id, "fail", attributes)
@@ -1473,6 +1584,36 @@ async def test_saving_sets_old_state(hass: HomeAssistant, setup_recorder: None)
         assert states_by_state["s4"].old_state_id == states_by_state["s2"].state_id
 
 
+async def test_saving_sets_old_state_without_executemany_returning(
+    hass: HomeAssistant, setup_recorder: None
+) -> None:
+    """Test saving sets old state when the database cannot return bulk inserted ids."""
+    instance = get_instance(hass)
+    await async_wait_recording_done(hass)
+    with patch.object(
+        instance.engine.dialect,
+        "insert_executemany_returning_sort_by_parameter_order",
+        False,
+    ):
+        hass.states.async_set("test.one", "s1", {})
+        hass.states.async_set("test.two", "s2", {})
+        hass.states.async_set("test.one", "s3", {})
+        await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        states = list(
+            session.query(
+                StatesMeta.entity_id, States.state_id, States.old_state_id, States.state
+            ).outerjoin(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+        )
+        assert len(states) == 3
+        states_by_state = {state.state: state for state in states}
+        assert states_by_state["s1"].old_state_id is None
+        assert states_by_state["s2"].old_state_id is None
+        assert states_by_state["s3"].entity_id == "test.one"
+        assert states_by_state["s3"].old_state_id == states_by_state["s1"].state_id
+
+
 async def test_saving_state_with_serializable_data(
     hass: HomeAssistant, caplog: pytest.LogCaptureFixture, setup_recorder: None
 ) -> None:
@@ -2517,6 +2658,82 @@ async def test_lru_increases_with_many_entities(
     assert instance.states_meta_manager._id_map.get_size() == mock_entity_count * 2
 
 
+async def test_lru_grows_with_low_hit_rate(
+    small_cache_size: None, hass: HomeAssistant, setup_recorder: None
+) -> None:
+    """Test that the shared attributes LRU cache grows when the hit rate is low."""
+    instance = get_instance(hass)
+    manager = instance.state_attributes_manager
+    await async_wait_recording_done(hass)
+
+    def _fill_and_miss() -> None:
+        for idx in range(8):
+            manager._id_map[f"attrs{idx}"] = idx
+        for idx in range(200):
+            assert manager.get_from_cache(f"missing{idx}") is None
+        assert manager.get_from_cache("attrs7") == 7
+
+    await instance.async_add_executor_job(_fill_and_miss)
+    stats = manager.cache_stats()
+    assert stats["hits"] >= 1
+    assert stats["misses"] >= 200
+    assert stats["size"] == 8
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=10))
+    await async_wait_recording_done(hass)
+
+    assert manager._id_map.get_size() == 16
+
+    # Without new lookups the hit rate is not considered again
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=20))
+    await async_wait_recording_done(hass)
+
+    assert manager._id_map.get_size() == 16
+
+
+@pytest.mark.parametrize("persistent_database", [True])
+async def test_lru_snapshot_warms_cache_after_restart(
+    async_test_recorder: RecorderInstanceGenerator,
+    hass_storage: dict[str, Any],
+) -> None:
+    """Test the shared data caches are saved at shutdown and warmed at startup."""
+    async with (
+        async_test_home_assistant() as hass,
+        async_test_recorder(hass) as instance,
+    ):
+        await hass.async_start()
+        hass.states.async_set("sensor.one", "on", {"unit": "one"})
+        hass.states.async_set("sensor.two", "on", {"unit": "two"})
+        hass.bus.async_fire("test_event", {"data": "one"})
+        await async_wait_recording_done(hass)
+        attributes_ids = instance.state_attributes_manager.snapshot()
+        data_ids = instance.event_data_manager.snapshot()
+        await hass.async_stop()
+
+    lru_snapshot = hass_storage[LRU_SNAPSHOT_STORAGE_KEY]["data"]
+    assert lru_snapshot["state_attributes"] == attributes_ids
+    assert lru_snapshot["event_data"] == data_ids
+    assert len(attributes_ids) >= 2
+    assert len(data_ids) >= 1
+    # Ids that have been purged since the snapshot are not loaded
+    lru_snapshot["state_attributes"].append(max(attributes_ids) + 100)
+
+    async with (
+        async_test_home_assistant() as hass,
+        async_test_recorder(hass) as instance,
+    ):
+        await hass.async_start()
+        await async_wait_recording_done(hass)
+        # Events fired during startup may have reordered the caches
+        manager = instance.state_attributes_manager
+        assert sorted(manager.snapshot()) == sorted(attributes_ids)
+        assert manager.get_from_cache('{"unit":"two"}') in attributes_ids
+        manager = instance.event_data_manager
+        assert sorted(manager.snapshot()) == sorted(data_ids)
+        assert manager.get_from_cache('{"data":"one"}') in data_ids
+        await hass.async_stop()
+
+
 async def test_clean_shutdown_when_recorder_thread_raises_during_initialize_database(
     hass: HomeAssistant,
 ) -> None:
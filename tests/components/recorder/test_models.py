@@ -1,7 +1,7 @@
 """The tests for the Recorder component."""
 
 from datetime import datetime, timedelta
-from unittest.mock import PropertyMock
+from unittest.mock import ANY, PropertyMock
 
 import pytest
 
@@ -14,12 +14,16 @@ from homeassistant.components.recorder.db_schema import (
 )
 from homeassistant.components.recorder.models import (
     LazyState,
+    compress_shared_json,
+    decompress_shared_json,
     process_timestamp,
     process_timestamp_to_utc_isoformat,
 )
+from homeassistant.components.recorder.models.compression import COMPRESSED_V1_PREFIX
 from homeassistant.const import EVENT_STATE_CHANGED
 import homeassistant.core as ha
 from homeassistant.exceptions import InvalidEntityFormatError
+from homeassistant.helpers.json import json_bytes
 from homeassistant.util import dt as dt_util
 from homeassistant.util.json import json_loads
 
@@ -172,6 +176,51 @@ def test_handling_broken_json_state_attributes(
     assert "Error converting row to state attributes" in caplog.text
 
 
+def test_compress_shared_json_round_trip() -> None:
+    """Test large shared attributes are compressed and small ones are not."""
+    small = json_bytes({"friendly_name": "Small"})
+    assert compress_shared_json(small) == small.decode()
+
+    attributes = {
+        "friendly_name": "Forecast",
+        "icon": "mdi:weather-sunny",
+        "forecast": [
+            {"datetime": f"2024-01-{day:02d}T00:00:00+00:00", "temperature": day}
+            for day in range(1, 29)
+        ],
+    }
+    large = json_bytes(attributes)
+    compressed = compress_shared_json(large)
+    assert compressed.startswith(COMPRESSED_V1_PREFIX)
+    # The keys read by SQL queries are kept next to the compressed data
+    assert json_loads(compressed) == {"z1": ANY, "icon": "mdi:weather-sunny"}
+    assert len(compressed) < len(large)
+    assert decompress_shared_json(compressed) == large.decode()
+    assert decompress_shared_json(small.decode()) == small.decode()
+
+    state_attributes = StateAttributes(
+        attributes_id=1, hash=1234, shared_attrs=compressed
+    )
+    assert state_attributes.to_native() == attributes
+    event_data = EventData(data_id=1, hash=1234, shared_data=compressed)
+    assert event_data.to_native() == attributes
+    row = PropertyMock(entity_id="sensor.forecast", attributes=compressed)
+    assert LazyState(row, {}, None, row.entity_id, "", 1, False).attributes == (
+        attributes
+    )
+
+
+def test_handling_broken_compressed_state_attributes(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test we handle corrupt compressed data in state attributes."""
+    state_attributes = StateAttributes(
+        attributes_id=444, hash=1234, shared_attrs='{ "z1":"bm90IGRlZmxhdGU="}'
+    )
+    assert state_attributes.to_native() == {}
+    assert "Error converting row to state attributes" in caplog.text
+
+
 def test_from_event_to_delete_state() -> None:
     """Test converting deleting state event to db state."""
     event = ha.Event(
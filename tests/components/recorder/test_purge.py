@@ -8,11 +8,12 @@ from unittest.mock import patch
 
 from freezegun import freeze_time
 import pytest
+from sqlalchemy import TextClause, text
 from sqlalchemy.exc import DatabaseError, OperationalError
 from sqlalchemy.orm.session import Session
 from voluptuous.error import MultipleInvalid
 
-from homeassistant.components.recorder import DOMAIN as RECORDER_DOMAIN, Recorder
+from homeassistant.components.recorder import DOMAIN as RECORDER_DOMAIN, Recorder, purge
 from homeassistant.components.recorder.const import SupportedDialect
 from homeassistant.components.recorder.db_schema import (
     Events,
@@ -2249,3 +2250,135 @@ async def test_purge_entities_keep_days(
     )
     assert len(states["sensor.keep"]) == 2
     assert "sensor.purge" not in states
+
+
+async def test_purge_old_states_releases_attributes_refs(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test purging states keeps the state attributes reference counts."""
+    await hass.async_block_till_done()
+    await async_wait_recording_done(hass)
+    start = dt_util.utcnow()
+    one_week_ago = start - timedelta(days=7)
+    with freeze_time(one_week_ago):
+        hass.states.async_set("sensor.old", "1", {"unit": "shared"})
+        hass.states.async_set("sensor.old", "2", {"unit": "shared"})
+        hass.states.async_set("sensor.old", "3", {"unit": "old"})
+    await async_wait_recording_done(hass)
+
+    hass.states.async_set("sensor.new", "1", {"unit": "shared"})
+    await async_wait_recording_done(hass)
+
+    def _get_ref_counts() -> dict[str, int | None]:
+        with session_scope(hass=hass) as session:
+            return dict(
+                session.query(StateAttributes.shared_attrs, StateAttributes.ref_count)
+            )
+
+    ref_counts = await recorder_mock.async_add_executor_job(_get_ref_counts)
+    assert ref_counts['{"unit":"shared"}'] == 3
+    assert ref_counts['{"unit":"old"}'] == 1
+
+    finished = await recorder_mock.async_add_executor_job(
+        purge_old_data, recorder_mock, start - timedelta(days=1), False
+    )
+    assert finished
+
+    ref_counts = await recorder_mock.async_add_executor_job(_get_ref_counts)
+    assert ref_counts['{"unit":"shared"}'] == 1
+    assert '{"unit":"old"}' not in ref_counts
+
+
+@pytest.mark.parametrize(
+    ("dialect_name", "partitions_query", "partitions", "drop_statements"),
+    [
+        (
+            SupportedDialect.MYSQL,
+            "_MYSQL_STATES_PARTITIONS",
+            [("p_old", "{old}"), ("p_new", "{new}"), ("p_max", "MAXVALUE")],
+            ["ALTER TABLE states DROP PARTITION p_old"],
+        ),
+        (
+            SupportedDialect.POSTGRESQL,
+            "_POSTGRESQL_STATES_PARTITIONS",
+            [
+                ("states_p_new", "FOR VALUES FROM ('{old}') TO ('{new}')"),
+                ("states_p_old", "FOR VALUES FROM (MINVALUE) TO ('{old}')"),
+                ("states_default", "DEFAULT"),
+            ],
+            ["DROP TABLE states_p_old"],
+        ),
+    ],
+)
+async def test_purge_old_states_drops_expired_partitions(
+    hass: HomeAssistant,
+    recorder_mock: Recorder,
+    dialect_name: SupportedDialect,
+    partitions_query: str,
+    partitions: list[tuple[str, str]],
+    drop_statements: list[str],
+) -> None:
+    """Test purging states drops the partitions older than the purge cutoff.
+
+    The states of partitions which are not dropped are still purged with
+    row deletes.
+    """
+    await hass.async_block_till_done()
+    await async_wait_recording_done(hass)
+    start = dt_util.utcnow()
+    two_weeks_ago = start - timedelta(days=14)
+    one_week_ago = start - timedelta(days=7)
+    with freeze_time(two_weeks_ago):
+        hass.states.async_set("sensor.old", "1", {"unit": "old"})
+    with freeze_time(one_week_ago):
+        hass.states.async_set("sensor.old", "2", {"unit": "old"})
+    await async_wait_recording_done(hass)
+    hass.states.async_set("sensor.new", "1", {"unit": "new"})
+    await async_wait_recording_done(hass)
+
+    bounds = {
+        "old": (two_weeks_ago + timedelta(days=1)).timestamp(),
+        "new": (start + timedelta(days=1)).timestamp(),
+    }
+    partitions_select = " UNION ALL ".join(
+        f"SELECT '{name}', '{bound.format(**bounds).replace("'", "''")}'"
+        " WHERE :table_name = 'states'"
+        for name, bound in partitions
+    )
+    executed_drops: list[str] = []
+    original_text = purge.text
+
+    def _text(statement: str) -> TextClause:
+        if statement.startswith(("ALTER TABLE", "DROP TABLE")):
+            # The test database is not partitioned
+            executed_drops.append(statement)
+            return original_text("SELECT 1")
+        return original_text(statement)
+
+    with (
+        patch.object(recorder_mock, "dialect_name", dialect_name),
+        patch.object(purge, partitions_query, text(partitions_select)),
+        patch.object(purge, "text", _text),
+    ):
+        finished = await recorder_mock.async_add_executor_job(
+            purge_old_data, recorder_mock, start - timedelta(days=1), False
+        )
+    assert finished
+    assert executed_drops == drop_statements
+
+    def _get_states_and_ref_counts() -> tuple[list[str], dict[str, int | None]]:
+        with session_scope(hass=hass) as session:
+            return (
+                [state.state for state in session.query(States)],
+                dict(
+                    session.query(
+                        StateAttributes.shared_attrs, StateAttributes.ref_count
+                    )
+                ),
+            )
+
+    states, ref_counts = await recorder_mock.async_add_executor_job(
+        _get_states_and_ref_counts
+    )
+    assert states == ["1"]
+    assert ref_counts == {'{"unit":"new"}': 1}
@@ -0,0 +1,108 @@
+"""The tests for the recorder states buffer."""
+
+from datetime import datetime, timedelta
+
+from freezegun.api import FrozenDateTimeFactory
+
+from homeassistant.components.recorder.states_buffer import StatesBuffer
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, State
+from homeassistant.util import dt as dt_util
+
+
+def _state(
+    value: str, last_updated: datetime, last_changed: datetime | None = None
+) -> State:
+    return State(
+        "sensor.test",
+        value,
+        last_changed=last_changed or last_updated,
+        last_updated=last_updated,
+    )
+
+
+def _state_changed(old_state: State | None, new_state: State | None) -> Event:
+    return Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": "sensor.test", "old_state": old_state, "new_state": new_state},
+    )
+
+
+def test_states_buffer(freezer: FrozenDateTimeFactory) -> None:
+    """Test the buffer returns the states of a period once it covers it."""
+    zero = dt_util.utcnow()
+    freezer.move_to(zero)
+    buffer = StatesBuffer()
+    seed = _state("1", zero - timedelta(minutes=10))
+    buffer.track([seed])
+
+    # Periods starting before the entity was tracked are not covered
+    assert (
+        buffer.get_states(
+            "sensor.test", (zero - timedelta(seconds=1)).timestamp(), zero.timestamp()
+        )
+        is None
+    )
+    assert buffer.get_states("sensor.other", zero.timestamp(), zero.timestamp()) is None
+
+    state_2 = _state("2", zero + timedelta(minutes=1))
+    attribute_change = _state(
+        "2", zero + timedelta(minutes=2), last_changed=zero + timedelta(minutes=1)
+    )
+    # Events can be processed out of order
+    state_4 = _state("4", zero + timedelta(minutes=6))
+    state_3 = _state("3", zero + timedelta(minutes=4))
+    for old_state, new_state in (
+        (seed, state_2),
+        (state_2, attribute_change),
+        (state_3, state_4),
+        (attribute_change, state_3),
+    ):
+        buffer.process_state_changed_event(_state_changed(old_state, new_state))
+
+    start_ts = zero.timestamp()
+    end_ts = (zero + timedelta(minutes=5)).timestamp()
+    assert buffer.get_states("sensor.test", start_ts, end_ts) == [
+        seed,
+        state_2,
+        state_3,
+    ]
+    assert buffer.get_states(
+        "sensor.test", start_ts, end_ts, significant_changes_only=False
+    ) == [seed, state_2, attribute_change, state_3]
+
+    # Pruning keeps the state at the start of the next period
+    buffer.prune(end_ts)
+    assert buffer.get_states("sensor.test", start_ts, end_ts) is None
+    assert buffer.get_states(
+        "sensor.test", end_ts, (zero + timedelta(minutes=10)).timestamp()
+    ) == [state_3, state_4]
+
+    # Entities which are removed are no longer tracked
+    buffer.process_state_changed_event(_state_changed(state_4, None))
+    assert buffer.get_states("sensor.test", end_ts, end_ts) is None
+
+
+def test_states_buffer_track_and_invalidate(freezer: FrozenDateTimeFactory) -> None:
+    """Test tracking is replaced by track and dropped when invalidated."""
+    zero = dt_util.utcnow()
+    freezer.move_to(zero)
+    buffer = StatesBuffer()
+    state = _state("1", zero)
+    other_state = State("sensor.other", "1", last_updated=zero, last_changed=zero)
+    buffer.track([state, other_state])
+    later_ts = (zero + timedelta(minutes=5)).timestamp()
+    assert buffer.get_states("sensor.test", later_ts, later_ts) == [state]
+    assert buffer.get_states("sensor.other", later_ts, later_ts) == [other_state]
+
+    buffer.track([state])
+    assert buffer.get_states("sensor.test", later_ts, later_ts) == [state]
+    assert buffer.get_states("sensor.other", later_ts, later_ts) is None
+
+    buffer.invalidate()
+    assert buffer.get_states("sensor.test", later_ts, later_ts) is None
+    buffer.process_state_changed_event(
+        _state_changed(state, _state("2", zero + timedelta(minutes=1)))
+    )
+    buffer.track([state])
+    assert buffer.get_states("sensor.test", later_ts, later_ts) == [state]
@@ -1,15 +1,20 @@
 """The tests for sensor recorder platform."""
 
 from datetime import timedelta
-from typing import Any
+from typing import Any, Literal
 from unittest.mock import ANY, Mock, patch
 
 import pytest
-from sqlalchemy import select
+from sqlalchemy import delete, select
 
 from homeassistant.components import recorder
-from homeassistant.components.recorder import Recorder, history, statistics
-from homeassistant.components.recorder.db_schema import StatisticsShortTerm
+from homeassistant.components.recorder import Recorder, history, migration, statistics
+from homeassistant.components.recorder.db_schema import (
+    Statistics,
+    StatisticsDaily,
+    StatisticsMonthly,
+    StatisticsShortTerm,
+)
 from homeassistant.components.recorder.models import (
     datetime_to_timestamp_or_none,
     process_timestamp,
@@ -1428,6 +1433,199 @@ async def test_weekly_statistics_mean(
     assert stats == {}
 
 
+@pytest.mark.parametrize("timezone", ["America/Regina", "Europe/Vienna", "UTC"])
+@pytest.mark.freeze_time("2022-10-01 00:00:00+00:00")
+async def test_statistics_rollups(
+    hass: HomeAssistant,
+    setup_recorder: None,
+    timezone,
+) -> None:
+    """Test daily and monthly statistics are read from the rollup tables."""
+    await hass.config.async_set_time_zone(timezone)
+    await async_wait_recording_done(hass)
+
+    zero = dt_util.utcnow()
+    period1 = dt_util.as_utc(dt_util.parse_datetime("2022-10-03 00:00:00"))
+    period2 = dt_util.as_utc(dt_util.parse_datetime("2022-10-03 01:00:00"))
+    period3 = dt_util.as_utc(dt_util.parse_datetime("2022-10-04 00:00:00"))
+    external_statistics = (
+        {"start": period1, "max": 0, "mean": 10, "min": -100},
+        {"start": period2, "max": 10, "mean": 20, "min": -90},
+        {"start": period3, "max": 20, "mean": 60, "min": -80},
+    )
+    external_metadata = {
+        "has_mean": True,
+        "has_sum": False,
+        "name": "Total imported energy",
+        "source": "test",
+        "statistic_id": "test:total_energy_import",
+        "unit_of_measurement": "kWh",
+    }
+    async_add_external_statistics(hass, external_metadata, external_statistics)
+    await async_wait_recording_done(hass)
+
+    def _get_rollups() -> list[tuple[str, float, float, int, float, float]]:
+        with session_scope(hass=hass, read_only=True) as session:
+            return [
+                (table.__tablename__, *row)
+                for table in (StatisticsDaily, StatisticsMonthly)
+                for row in session.execute(
+                    select(
+                        table.start_ts,
+                        table.mean,
+                        table.mean_weight,
+                        table.min,
+                        table.max,
+                    ).order_by(table.start_ts)
+                )
+            ]
+
+    month_start = dt_util.as_utc(dt_util.parse_datetime("2022-10-01 00:00:00"))
+    month_end = dt_util.as_utc(dt_util.parse_datetime("2022-11-01 00:00:00"))
+    assert _get_rollups() == [
+        ("statistics_daily", period1.timestamp(), 15, 2, -100, 10),
+        ("statistics_daily", period3.timestamp(), 60, 1, -80, 20),
+        ("statistics_monthly", month_start.timestamp(), 30, 3, -100, 20),
+    ]
+    expected_month = {
+        "test:total_energy_import": [
+            {
+                "start": month_start.timestamp(),
+                "end": month_end.timestamp(),
+                "max": 20,
+                "mean": 30,
+                "min": -100,
+            }
+        ]
+    }
+    expected_week = {
+        "test:total_energy_import": [
+            {
+                "start": period1.timestamp(),
+                "end": (period1 + timedelta(days=7)).timestamp(),
+                "max": 20,
+                "mean": 30,
+                "min": -100,
+            }
+        ]
+    }
+
+    # The hourly statistics are not needed once the rollups are compiled
+    with session_scope(hass=hass) as session:
+        session.execute(delete(Statistics))
+    for period, expected in (("month", expected_month), ("week", expected_week)):
+        stats = statistics_during_period(
+            hass,
+            zero,
+            period=period,
+            statistic_ids={"test:total_energy_import"},
+            types={"max", "mean", "min"},
+        )
+        assert stats == expected
+
+    # Periods without rollups are reduced from the hourly statistics
+    async_add_external_statistics(hass, external_metadata, external_statistics)
+    await async_wait_recording_done(hass)
+    with session_scope(hass=hass) as session:
+        session.execute(delete(StatisticsDaily))
+        session.execute(delete(StatisticsMonthly))
+    for period, expected in (("month", expected_month), ("week", expected_week)):
+        stats = statistics_during_period(
+            hass,
+            zero,
+            period=period,
+            statistic_ids={"test:total_energy_import"},
+            types={"max", "mean", "min"},
+        )
+        assert stats == expected
+
+    # The rollups of existing statistics are compiled by a migration
+    instance = recorder.get_instance(hass)
+    migrator = migration.StatisticsRollupMigration(
+        initial_schema_version=48, start_schema_version=48, migration_changes={}
+    )
+    status = await instance.async_add_executor_job(migrator.migrate_data_impl, instance)
+    assert status == migration.DataMigrationStatus(
+        needs_migrate=False, migration_done=True
+    )
+    assert _get_rollups() == [
+        ("statistics_daily", period1.timestamp(), 15, 2, -100, 10),
+        ("statistics_daily", period3.timestamp(), 60, 1, -80, 20),
+        ("statistics_monthly", month_start.timestamp(), 30, 3, -100, 20),
+    ]
+
+
+@pytest.mark.freeze_time("2022-10-01 00:00:00+00:00")
+async def test_statistics_rollups_unaligned(
+    hass: HomeAssistant,
+    setup_recorder: None,
+) -> None:
+    """Test only the periods fully within the requested time use the rollups."""
+    await hass.config.async_set_time_zone("UTC")
+    await async_wait_recording_done(hass)
+
+    day1 = dt_util.parse_datetime("2022-10-03 00:00:00+00:00")
+    day2 = dt_util.parse_datetime("2022-10-04 00:00:00+00:00")
+    day3 = dt_util.parse_datetime("2022-10-05 00:00:00+00:00")
+    month = dt_util.parse_datetime("2022-10-01 00:00:00+00:00")
+    external_statistics = (
+        {"start": day1, "max": 0, "mean": 10, "min": -100},
+        {"start": day1 + timedelta(hours=1), "max": 10, "mean": 20, "min": -90},
+        {"start": day2, "max": 20, "mean": 60, "min": -80},
+        {"start": day2 + timedelta(hours=1), "max": 30, "mean": 100, "min": -70},
+        {"start": day3, "max": 40, "mean": 200, "min": -60},
+        {"start": day3 + timedelta(hours=1), "max": 50, "mean": 300, "min": -50},
+    )
+    external_metadata = {
+        "has_mean": True,
+        "has_sum": False,
+        "name": "Total imported energy",
+        "source": "test",
+        "statistic_id": "test:total_energy_import",
+        "unit_of_measurement": "kWh",
+    }
+    async_add_external_statistics(hass, external_metadata, external_statistics)
+    await async_wait_recording_done(hass)
+
+    def _get_rows(
+        period: Literal["day", "week", "month"],
+    ) -> list[tuple[float, float, int, float, float]]:
+        with session_scope(hass=hass, read_only=True) as session:
+            metadata_id, _ = recorder.get_instance(hass).statistics_meta_manager.get(
+                session, "test:total_energy_import"
+            )
+            return [
+                (row.start_ts, row.mean, row.mean_weight, row.min, row.max)
+                for row in statistics._get_statistics_rollup_rows(
+                    session,
+                    [metadata_id],
+                    day1 + timedelta(minutes=30),
+                    day3 + timedelta(minutes=30),
+                    period,
+                )
+            ]
+
+    # The month is only partly requested and is reduced from the hourly
+    # statistics within the requested time
+    assert await hass.async_add_executor_job(_get_rows, "month") == [
+        (month.timestamp(), 95, 4, -90, 40),
+    ]
+
+    # The full day is read from its rollup
+    with session_scope(hass=hass) as session:
+        session.execute(
+            delete(Statistics).where(
+                Statistics.start_ts >= day2.timestamp(),
+                Statistics.start_ts < day3.timestamp(),
+            )
+        )
+    assert await hass.async_add_executor_job(_get_rows, "day") == [
+        (day1.timestamp(), 20, 1, -90, 10),
+        (day2.timestamp(), 80, 2, -80, 30),
+        (day3.timestamp(), 200, 1, -60, 40),
+    ]
+
+
 @pytest.mark.parametrize("timezone", ["America/Regina", "Europe/Vienna", "UTC"])
 @pytest.mark.freeze_time("2022-10-01 00:00:00+00:00")
 async def test_weekly_statistics_sum(
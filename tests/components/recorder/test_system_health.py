@@ -38,6 +38,29 @@ async def test_recorder_system_health(
     }
 
 
+async def test_recorder_system_health_slow_queries(
+    recorder_mock: Recorder, hass: HomeAssistant
+) -> None:
+    """Test recorder system health reports slow queries when enabled."""
+    assert await async_setup_component(hass, "system_health", {})
+    await async_wait_recording_done(hass)
+    info = await get_system_health_info(hass, "recorder")
+    assert "slow_queries" not in info
+
+    instrumentation = get_instance(hass).query_instrumentation
+    instrumentation.configure(True, 1.0)
+    info = await get_system_health_info(hass, "recorder")
+    assert info["slow_queries"] == 0
+    assert "slowest_query" not in info
+
+    instrumentation.record("fast_stmt", 0.5, 1)
+    instrumentation.record("slow_stmt", 1.5, 10)
+    instrumentation.record("slower_stmt", 2.5, 10)
+    info = await get_system_health_info(hass, "recorder")
+    assert info["slow_queries"] == 2
+    assert info["slowest_query"] == "slower_stmt (2500 ms)"
+
+
 @pytest.mark.parametrize(
     "db_engine", [SupportedDialect.MYSQL, SupportedDialect.POSTGRESQL]
 )
@@ -995,6 +995,47 @@ async def test_execute_stmt_lambda_element(
             assert rows == ["mock_row"]
 
 
+async def test_execute_stmt_lambda_element_instrumented(
+    hass: HomeAssistant,
+    setup_recorder: None,
+) -> None:
+    """Test execute_stmt_lambda_element records statements when instrumented."""
+    instance = recorder.get_instance(hass)
+    hass.states.async_set("sensor.on", "on")
+    await async_wait_recording_done(hass)
+    now = dt_util.utcnow()
+    one_week_from_now = now + timedelta(days=7)
+    instance.query_instrumentation.configure(True, 0)
+
+    with session_scope(hass=hass) as session:
+        metadata_id = instance.states_meta_manager.get("sensor.on", session, True)
+        start_time_ts = dt_util.utcnow().timestamp()
+        stmt = lambda_stmt(
+            lambda: _get_single_entity_start_time_stmt(
+                start_time_ts, metadata_id, False, False, False
+            )
+        )
+        stmt += lambda q: q.limit(1)
+        rows = util.execute_stmt_lambda_element(session, stmt)
+        assert len(rows) == 1
+        rows = util.execute_stmt_lambda_element(session, stmt, now, one_week_from_now)
+        assert next(rows).metadata_id == metadata_id
+
+    label = "test_execute_stmt_lambda_element_instrumented"
+    result = instance.query_instrumentation.as_dict()
+    assert result["statements"][label]["count"] == 2
+    assert result["statements"][label]["rows"] == 1
+    fetched, streamed = result["slow_queries"]
+    assert fetched["label"] == label
+    assert fetched["rows"] == 1
+    assert fetched["statement"].endswith("LIMIT ? OFFSET ?")
+    assert fetched["explain"]
+    # Statements still streaming rows are not explained
+    assert streamed["rows"] is None
+    assert streamed["statement"] is None
+    assert streamed["explain"] is None
+
+
 @pytest.mark.parametrize(
     ("start_time", "periods"),
     [
@@ -13,6 +13,7 @@ import pytest
 from homeassistant.components import recorder
 from homeassistant.components.recorder import Recorder
 from homeassistant.components.recorder.db_schema import Statistics, StatisticsShortTerm
+from homeassistant.components.recorder.history import get_significant_states
 from homeassistant.components.recorder.statistics import (
     async_add_external_statistics,
     get_last_statistics,
@@ -40,7 +41,7 @@ from .common import (
 )
 from .conftest import InstrumentedMigration
 
-from tests.common import async_fire_time_changed
+from tests.common import MockUser, async_fire_time_changed
 from tests.typing import RecorderInstanceGenerator, WebSocketGenerator
 
 
@@ -2557,14 +2558,125 @@ async def test_recorder_info(
     assert response["success"]
     assert response["result"] == {
         "backlog": 0,
+        "lru_caches": {
+            "event_data": {"entries": ANY, "hits": ANY, "misses": ANY, "size": 2048},
+            "state_attributes": {
+                "entries": ANY,
+                "hits": ANY,
+                "misses": ANY,
+                "size": 2048,
+            },
+        },
         "max_backlog": 65000,
         "migration_in_progress": False,
         "migration_is_live": False,
+        "read_queries": {},
+        "read_queue_depth": 0,
         "recording": True,
         "thread_running": True,
     }
 
 
+async def test_recorder_info_read_queries(
+    recorder_mock: Recorder, hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test recorder status reports read only query statistics."""
+    client = await hass_ws_client()
+
+    def _read_job(value: int) -> int:
+        return value * 2
+
+    assert await recorder_mock.async_add_read_executor_job(_read_job, 2) == 4
+    assert await recorder_mock.async_add_read_executor_job(_read_job, 3) == 6
+
+    await client.send_json_auto_id({"type": "recorder/info"})
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"]["read_queue_depth"] == 0
+    assert response["result"]["read_queries"] == {
+        _read_job.__qualname__: {"count": 2, "mean_time": ANY, "max_time": ANY}
+    }
+
+
+async def test_recorder_query_stats(
+    recorder_mock: Recorder, hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test collecting query statistics and the slow query log."""
+    client = await hass_ws_client()
+    now = dt_util.utcnow()
+    hass.states.async_set("sensor.test", "1")
+    await async_wait_recording_done(hass)
+
+    await client.send_json_auto_id({"type": "recorder/query_stats"})
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"] == {
+        "enabled": False,
+        "slow_query_threshold": 0.5,
+        "statements": {},
+        "slow_queries": [],
+    }
+
+    await client.send_json_auto_id(
+        {
+            "type": "recorder/query_stats/configure",
+            "enabled": True,
+            "slow_query_threshold": 0,
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+
+    states = await recorder_mock.async_add_executor_job(
+        get_significant_states, hass, now, None, ["sensor.test"]
+    )
+    assert len(states["sensor.test"]) == 1
+
+    await client.send_json_auto_id({"type": "recorder/query_stats"})
+    response = await client.receive_json()
+    assert response["success"]
+    result = response["result"]
+    assert result["enabled"] is True
+    assert result["slow_query_threshold"] == 0
+    stats = result["statements"]["get_significant_states_with_session"]
+    assert stats["count"] == 1
+    assert stats["rows"] == 1
+    assert sum(bucket["count"] for bucket in stats["histogram"]) == 1
+    assert result["slow_queries"][0]["label"] in result["statements"]
+    assert "SELECT" in result["slow_queries"][0]["statement"]
+    # SQLite explains with EXPLAIN QUERY PLAN, other databases with EXPLAIN
+    assert result["slow_queries"][0]["explain"]
+
+    await client.send_json_auto_id(
+        {"type": "recorder/query_stats/configure", "enabled": False}
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    await recorder_mock.async_add_executor_job(
+        get_significant_states, hass, now, None, ["sensor.test"]
+    )
+    await client.send_json_auto_id({"type": "recorder/query_stats"})
+    response = await client.receive_json()
+    assert response["result"]["enabled"] is False
+    assert response["result"]["statements"] == result["statements"]
+
+
+async def test_recorder_query_stats_requires_admin(
+    recorder_mock: Recorder,
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    hass_admin_user: MockUser,
+) -> None:
+    """Test the query statistics are only available to admins."""
+    hass_admin_user.groups = []
+    client = await hass_ws_client()
+
+    await client.send_json_auto_id({"type": "recorder/query_stats"})
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "unauthorized"
+
+
 async def test_recorder_info_no_recorder(
     hass: HomeAssistant, hass_ws_client: WebSocketGenerator
 ) -> None:
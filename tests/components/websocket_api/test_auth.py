@@ -22,6 +22,7 @@ from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.setup import async_setup_component
 
+from tests.common import cbor_loads
 from tests.typing import ClientSessionGenerator
 
 
@@ -296,3 +297,30 @@ async def test_auth_sending_unknown_type_disconnects(
         await ws._writer.send_frame(b"1" * 130, 0x30)
         auth_msg = await ws.receive()
         assert auth_msg.type == WSMsgType.close
+
+
+async def test_auth_negotiates_cbor(
+    hass: HomeAssistant, no_auth_websocket_client, hass_access_token: str
+) -> None:
+    """Test a client asking for CBOR gets binary frames after the auth phase."""
+    await no_auth_websocket_client.send_json(
+        {"type": TYPE_AUTH, "access_token": hass_access_token, "encoding": "cbor"}
+    )
+    auth_msg = await no_auth_websocket_client.receive_json()
+    assert auth_msg["type"] == TYPE_AUTH_OK
+    assert auth_msg["encoding"] == "cbor"
+
+    await no_auth_websocket_client.send_json({"id": 5, "type": "ping"})
+    msg = await no_auth_websocket_client.receive()
+    assert msg.type is WSMsgType.BINARY
+    assert cbor_loads(msg.data) == {"id": 5, "type": "pong"}
+
+
+async def test_auth_invalid_encoding(no_auth_websocket_client) -> None:
+    """Test an unknown encoding is refused."""
+    await no_auth_websocket_client.send_json(
+        {"type": TYPE_AUTH, "access_token": "token", "encoding": "xml"}
+    )
+    msg = await no_auth_websocket_client.receive_json()
+    assert msg["type"] == TYPE_AUTH_INVALID
+    assert "encoding" in msg["message"]
@@ -6,18 +6,24 @@ import logging
 from typing import Any
 from unittest.mock import ANY, AsyncMock, Mock, patch
 
+import aiohttp
+from freezegun.api import FrozenDateTimeFactory
 import pytest
 import voluptuous as vol
 
 from homeassistant import loader
 from homeassistant.components.device_automation import toggle_entity
-from homeassistant.components.websocket_api import const
+from homeassistant.components.websocket_api import const, messages
 from homeassistant.components.websocket_api.auth import (
     TYPE_AUTH,
     TYPE_AUTH_OK,
     TYPE_AUTH_REQUIRED,
 )
 from homeassistant.components.websocket_api.const import FEATURE_COALESCE_MESSAGES, URL
+from homeassistant.components.websocket_api.subscription_hub import (
+    async_get_entity_subscription_hub,
+    subscription_key,
+)
 from homeassistant.config_entries import ConfigEntryState
 from homeassistant.const import SIGNAL_BOOTSTRAP_INTEGRATIONS
 from homeassistant.core import Context, HomeAssistant, State, SupportsResponse, callback
@@ -34,7 +40,9 @@ from tests.common import (
     MockEntity,
     MockEntityPlatform,
     MockUser,
+    async_fire_time_changed,
     async_mock_service,
+    cbor_loads,
     mock_platform,
 )
 from tests.typing import (
@@ -2917,3 +2925,415 @@ async def test_subscribe_entities_chained_state_change(
 
     await websocket_client.close()
     await hass.async_block_till_done()
+
+
+async def test_subscribe_entities_shared_between_connections(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test identical entity subscriptions share a listener and messages."""
+    hub = async_get_entity_subscription_hub(hass)
+    hass.states.async_set("light.kitchen", "off")
+    clients = [await hass_ws_client(hass) for _ in range(3)]
+    for client in clients:
+        await client.send_json_auto_id(
+            {"type": "subscribe_entities", "entity_ids": ["light.kitchen"]}
+        )
+        msg = await client.receive_json()
+        assert msg["success"]
+        msg = await client.receive_json()
+        assert msg["event"]["a"]["light.kitchen"]["s"] == "off"
+
+    assert len(hub.groups) == 1
+    (group,) = hub.groups.values()
+    assert len(group.members) == 3
+
+    with patch(
+        "homeassistant.components.websocket_api.subscription_hub.messages.cached_state_diff_message",
+        wraps=messages.cached_state_diff_message,
+    ) as encode_mock:
+        hass.states.async_set("light.kitchen", "on")
+        for client in clients:
+            msg = await client.receive_json()
+            assert msg["id"] == 1
+            assert msg["event"]["c"]["light.kitchen"]["+"]["s"] == "on"
+    assert encode_mock.call_count == 1
+
+    await clients[0].send_json_auto_id(
+        {"type": "unsubscribe_events", "subscription": 1}
+    )
+    msg = await clients[0].receive_json()
+    assert msg["success"]
+    assert len(group.members) == 2
+
+    for client in clients[1:]:
+        await client.close()
+    await hass.async_block_till_done()
+    assert hub.groups == {}
+
+
+async def test_subscribe_entities_shared_permissions(
+    hass: HomeAssistant, hass_admin_user: MockUser
+) -> None:
+    """Test members of a shared subscription only get the entities they can read."""
+    hub = async_get_entity_subscription_hub(hass)
+    limited_user = MockUser().add_to_hass(hass)
+    limited_user.mock_policy({"entities": {"entity_ids": {"light.permitted": True}}})
+    admin_send = Mock()
+    limited_send = Mock()
+    key = subscription_key({"id": 5, "type": "subscribe_entities"})
+    unsub_admin = hub.async_subscribe(
+        key, None, None, None, 0, admin_send, hass_admin_user, b"5"
+    )
+    unsub_limited = hub.async_subscribe(
+        key, None, None, None, 0, limited_send, limited_user, b"5"
+    )
+    assert len(hub.groups) == 1
+
+    hass.states.async_set("light.permitted", "on")
+    hass.states.async_set("light.not_permitted", "on")
+    assert admin_send.call_count == 2
+    assert limited_send.call_count == 1
+    assert limited_send.call_args[0][0] is admin_send.call_args_list[0][0][0]
+
+    unsub_admin()
+    unsub_limited()
+    assert hub.groups == {}
+
+
+async def test_get_states_attribute_projection(
+    hass: HomeAssistant, websocket_client: MockHAClientWebSocket
+) -> None:
+    """Test get_states only sends the projected attributes."""
+    hass.states.async_set("sensor.power", "5", {"unit_of_measurement": "W", "x": 1})
+    hass.states.async_set("sensor.energy", "2", {"unit_of_measurement": "kWh"})
+    hass.states.async_set("light.kitchen", "on", {"brightness": 100, "color": "red"})
+
+    await websocket_client.send_json_auto_id(
+        {
+            "type": "get_states",
+            "attributes": {
+                "domains": {"sensor": ["unit_of_measurement"]},
+                "entity_ids": {"sensor.energy": []},
+            },
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    assert {state["entity_id"]: state["attributes"] for state in msg["result"]} == {
+        "sensor.power": {"unit_of_measurement": "W"},
+        "sensor.energy": {},
+        "light.kitchen": {"brightness": 100, "color": "red"},
+    }
+
+
+async def test_subscribe_entities_attribute_projection(
+    hass: HomeAssistant, websocket_client: MockHAClientWebSocket
+) -> None:
+    """Test subscribe_entities only sends the projected attributes."""
+    hass.states.async_set(
+        "media_player.tv", "playing", {"media_title": "News", "media_position": 1}
+    )
+    await websocket_client.send_json_auto_id(
+        {
+            "type": "subscribe_entities",
+            "attributes": {"domains": {"media_player": ["media_title"]}},
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    msg = await websocket_client.receive_json()
+    assert msg["event"]["a"]["media_player.tv"]["a"] == {"media_title": "News"}
+
+    hass.states.async_set(
+        "media_player.tv", "playing", {"media_title": "News", "media_position": 2}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {"c": {"media_player.tv": {"+": {"c": ANY, "lu": ANY}}}}
+
+    hass.states.async_set("media_player.tv", "paused", {"media_position": 3})
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {
+        "c": {
+            "media_player.tv": {
+                "+": {"c": ANY, "lc": ANY, "s": "paused"},
+                "-": {"a": ["media_title"]},
+            }
+        }
+    }
+
+    hass.states.async_set("media_player.radio", "on", {"media_title": "Jazz", "x": 1})
+    msg = await websocket_client.receive_json()
+    assert msg["event"]["a"]["media_player.radio"]["a"] == {"media_title": "Jazz"}
+
+
+async def test_subscribe_entities_attribute_projection_and_all_attributes(
+    hass: HomeAssistant, websocket_client: MockHAClientWebSocket
+) -> None:
+    """Test a projected subscription does not change the attributes of others."""
+    hass.states.async_set("media_player.tv", "on", {"media_title": "News", "x": 1})
+    await websocket_client.send_json_auto_id(
+        {
+            "type": "subscribe_entities",
+            "attributes": {"domains": {"media_player": ["media_title"]}},
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    msg = await websocket_client.receive_json()
+    assert msg["event"]["a"]["media_player.tv"]["a"] == {"media_title": "News"}
+
+    await websocket_client.send_json_auto_id({"type": "subscribe_entities"})
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    msg = await websocket_client.receive_json()
+    assert msg["event"]["a"]["media_player.tv"]["a"] == {"media_title": "News", "x": 1}
+
+    hass.states.async_set("media_player.radio", "on", {"media_title": "Jazz", "x": 2})
+    projected = await websocket_client.receive_json()
+    unprojected = await websocket_client.receive_json()
+    assert projected["event"]["a"]["media_player.radio"]["a"] == {"media_title": "Jazz"}
+    assert unprojected["event"]["a"]["media_player.radio"]["a"] == {
+        "media_title": "Jazz",
+        "x": 2,
+    }
+    assert hass.states.get("media_player.radio").as_compressed_state["a"] == {
+        "media_title": "Jazz",
+        "x": 2,
+    }
+
+
+async def test_subscribe_entities_min_interval(
+    hass: HomeAssistant,
+    websocket_client: MockHAClientWebSocket,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test subscribe_entities merges the changes of an entity in an interval."""
+    hass.states.async_set("sensor.power", "1", {"x": 1})
+    await websocket_client.send_json_auto_id(
+        {"type": "subscribe_entities", "min_interval": 5}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    msg = await websocket_client.receive_json()
+    assert msg["event"]["a"]["sensor.power"]["s"] == "1"
+
+    hass.states.async_set("sensor.power", "2", {"x": 1})
+    msg = await websocket_client.receive_json()
+    assert msg["event"]["c"]["sensor.power"]["+"]["s"] == "2"
+
+    hass.states.async_set("sensor.power", "3", {"x": 2, "y": 1})
+    hass.states.async_set("sensor.power", "4", {"x": 1})
+    hass.states.async_set("sensor.other", "on")
+    msg = await websocket_client.receive_json()
+    assert msg["event"]["a"]["sensor.other"]["s"] == "on"
+
+    freezer.tick(5)
+    async_fire_time_changed(hass)
+    msg = await websocket_client.receive_json()
+    # Merged from the last sent state so the attributes did not change
+    assert msg["event"] == {"c": {"sensor.power": {"+": {"c": ANY, "s": "4"}}}}
+
+    hass.states.async_set("sensor.power", "5", {"x": 1})
+    hass.states.async_remove("sensor.power")
+    freezer.tick(5)
+    async_fire_time_changed(hass)
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {"r": ["sensor.power"]}
+
+    # Held back until the end of the interval of the removal
+    hass.states.async_set("sensor.power", "6")
+    freezer.tick(5)
+    async_fire_time_changed(hass)
+    msg = await websocket_client.receive_json()
+    assert msg["event"]["a"]["sensor.power"]["s"] == "6"
+
+
+async def test_subscribe_entities_min_interval_per_entity(
+    hass: HomeAssistant,
+    websocket_client: MockHAClientWebSocket,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test an entity first changed during the interval of another gets its own."""
+    hass.states.async_set("sensor.power", "1")
+    hass.states.async_set("sensor.energy", "1")
+    await websocket_client.send_json_auto_id(
+        {"type": "subscribe_entities", "min_interval": 5}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    msg = await websocket_client.receive_json()
+    assert set(msg["event"]["a"]) == {"sensor.power", "sensor.energy"}
+
+    hass.states.async_set("sensor.power", "2")
+    msg = await websocket_client.receive_json()
+    assert msg["event"]["c"]["sensor.power"]["+"]["s"] == "2"
+
+    freezer.tick(3)
+    hass.states.async_set("sensor.energy", "2")
+    msg = await websocket_client.receive_json()
+    assert msg["event"]["c"]["sensor.energy"]["+"]["s"] == "2"
+
+    # The interval of sensor.power ended, the one of sensor.energy did not
+    freezer.tick(2)
+    async_fire_time_changed(hass)
+    hass.states.async_set("sensor.energy", "3")
+    hass.states.async_set("sensor.power", "3")
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {
+        "c": {"sensor.power": {"+": {"c": ANY, "s": "3", "lc": ANY}}}
+    }
+
+    freezer.tick(3)
+    async_fire_time_changed(hass)
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {
+        "c": {"sensor.energy": {"+": {"c": ANY, "s": "3", "lc": ANY}}}
+    }
+
+
+async def test_subscribe_entities_min_interval_per_subscription(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test a subscription joining during the interval of another has its own."""
+    hass.states.async_set("sensor.power", "1", {"x": 1})
+    first = await hass_ws_client(hass)
+    second = await hass_ws_client(hass)
+    await first.send_json_auto_id({"type": "subscribe_entities", "min_interval": 5})
+    assert (await first.receive_json())["success"]
+    await first.receive_json()
+
+    hass.states.async_set("sensor.power", "2", {"x": 1})
+    msg = await first.receive_json()
+    assert msg["event"]["c"]["sensor.power"]["+"]["s"] == "2"
+
+    freezer.tick(2)
+    hass.states.async_set("sensor.power", "3", {"x": 2})
+    await second.send_json_auto_id({"type": "subscribe_entities", "min_interval": 5})
+    assert (await second.receive_json())["success"]
+    msg = await second.receive_json()
+    assert msg["event"]["a"]["sensor.power"]["a"] == {"x": 2}
+
+    # Sent right away from the state the second subscription got
+    hass.states.async_set("sensor.power", "4", {"x": 2})
+    msg = await second.receive_json()
+    assert msg["event"] == {"c": {"sensor.power": {"+": {"c": ANY, "s": "4"}}}}
+
+    # Merged from the last state sent to the first subscription
+    freezer.tick(3)
+    async_fire_time_changed(hass)
+    msg = await first.receive_json()
+    assert msg["event"] == {
+        "c": {
+            "sensor.power": {
+                "+": {"a": {"x": 2}, "c": ANY, "lc": ANY, "s": "4"},
+            }
+        }
+    }
+
+
+async def test_subscribe_events_min_interval(
+    hass: HomeAssistant,
+    websocket_client: MockHAClientWebSocket,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test subscribe_events holds back the events of an entity in an interval."""
+    await websocket_client.send_json_auto_id(
+        {"type": "subscribe_events", "event_type": "test_event", "min_interval": 2}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    hass.bus.async_fire("test_event", {"entity_id": "sensor.power", "value": 1})
+    hass.bus.async_fire("test_event", {"entity_id": "sensor.power", "value": 2})
+    hass.bus.async_fire("test_event", {"entity_id": "sensor.power", "value": 3})
+    hass.bus.async_fire("test_event", {"value": 4})
+    for value in (1, 4):
+        msg = await websocket_client.receive_json()
+        assert msg["event"]["data"]["value"] == value
+
+    freezer.tick(2)
+    async_fire_time_changed(hass)
+    msg = await websocket_client.receive_json()
+    assert msg["event"]["data"] == {"entity_id": "sensor.power", "value": 3}
+
+    await websocket_client.send_json_auto_id(
+        {"type": "unsubscribe_events", "subscription": 1}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    hass.bus.async_fire("test_event", {"entity_id": "sensor.power", "value": 5})
+    freezer.tick(2)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+
+async def test_subscribe_with_cbor_encoding(
+    hass: HomeAssistant, no_auth_websocket_client, hass_access_token: str
+) -> None:
+    """Test the subscriptions of a CBOR connection send binary frames."""
+    client = no_auth_websocket_client
+    hass.states.async_set("light.kitchen", "off", {"brightness": 10})
+    await client.send_json(
+        {"type": "auth", "access_token": hass_access_token, "encoding": "cbor"}
+    )
+    assert (await client.receive_json())["type"] == "auth_ok"
+
+    async def _receive_cbor() -> Any:
+        msg = await client.receive()
+        assert msg.type is aiohttp.WSMsgType.BINARY
+        return cbor_loads(msg.data)
+
+    await client.send_json({"id": 5, "type": "subscribe_entities"})
+    assert await _receive_cbor() == {
+        "id": 5,
+        "type": "result",
+        "success": True,
+        "result": None,
+    }
+    snapshot = await _receive_cbor()
+    assert snapshot == {
+        "id": 5,
+        "type": "event",
+        "event": {
+            "a": {
+                "light.kitchen": {
+                    "s": "off",
+                    "a": {"brightness": 10},
+                    "c": ANY,
+                    "lc": ANY,
+                }
+            }
+        },
+    }
+
+    await client.send_json(
+        {"id": 6, "type": "subscribe_events", "event_type": "test_event"}
+    )
+    assert (await _receive_cbor())["success"]
+
+    hass.states.async_set("light.kitchen", "on", {"brightness": 20})
+    assert await _receive_cbor() == {
+        "type": "event",
+        "event": {
+            "c": {
+                "light.kitchen": {
+                    "+": {"s": "on", "a": {"brightness": 20}, "c": ANY, "lc": ANY}
+                }
+            }
+        },
+        "id": 5,
+    }
+
+    hass.bus.async_fire("test_event", {"hello": "world"})
+    msg = await _receive_cbor()
+    assert msg["id"] == 6
+    assert msg["event"]["event_type"] == "test_event"
+    assert msg["event"]["data"] == {"hello": "world"}
+
+    # Messages serialized to JSON before sending stay in text frames
+    await client.send_json({"id": 7, "type": "get_states"})
+    msg = await client.receive_json()
+    assert msg["id"] == 7
+    assert msg["result"][0]["entity_id"] == "light.kitchen"
@@ -10,16 +10,27 @@ import pytest
 
 from homeassistant.components.websocket_api import (
     async_register_command,
+    async_response,
     const,
     http,
     websocket_command,
 )
+from homeassistant.components.websocket_api.auth import (
+    TYPE_AUTH,
+    TYPE_AUTH_OK,
+    TYPE_AUTH_REQUIRED,
+)
 from homeassistant.components.websocket_api.connection import ActiveConnection
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.setup import async_setup_component
 from homeassistant.util.dt import utcnow
 
-from tests.common import async_fire_time_changed
-from tests.typing import MockHAClientWebSocket, WebSocketGenerator
+from tests.common import async_fire_time_changed, cbor_loads
+from tests.typing import (
+    ClientSessionGenerator,
+    MockHAClientWebSocket,
+    WebSocketGenerator,
+)
 
 
 @pytest.fixture
@@ -185,6 +196,38 @@ async def test_delayed_response_handler(
     assert "on closed connection" in caplog.text
 
 
+async def test_wait_send_queue_drained(
+    hass: HomeAssistant, websocket_client: MockHAClientWebSocket
+) -> None:
+    """Test waiting for the queued messages to be written."""
+    drained = asyncio.Event()
+
+    @websocket_command({"type": "drain_waiter"})
+    @async_response
+    async def async_drain_waiter(
+        hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+    ) -> None:
+        msg_id: int = msg["id"]
+        connection.send_result(msg_id)
+        for idx in range(3):
+            connection.send_event(msg_id, {"idx": idx})
+        await connection.async_wait_send_queue_drained()
+        drained.set()
+        # Nothing is queued so it does not wait
+        await connection.async_wait_send_queue_drained()
+        connection.send_event(msg_id, {"idx": 3})
+
+    async_register_command(hass, async_drain_waiter)
+
+    await websocket_client.send_json({"id": 1, "type": "drain_waiter"})
+    msg = await websocket_client.receive_json()
+    assert msg["type"] == "result"
+    for idx in range(4):
+        msg = await websocket_client.receive_json()
+        assert msg["event"] == {"idx": idx}
+    assert drained.is_set()
+
+
 async def test_ensure_disconnect_invalid_json(
     hass: HomeAssistant,
     websocket_client: MockHAClientWebSocket,
@@ -523,3 +566,140 @@ async def test_binary_message(
     assert "Received binary message for non-existing handler 0" in caplog.text
     assert "Received binary message for non-existing handler 3" in caplog.text
     assert "Received binary message for non-existing handler 10" in caplog.text
+
+
+async def test_compress_large_messages(
+    hass: HomeAssistant,
+    hass_client_no_auth: ClientSessionGenerator,
+    hass_access_token: str,
+) -> None:
+    """Test only the messages above the size threshold are compressed."""
+    assert await async_setup_component(hass, "websocket_api", {})
+    stats = http.async_get_websocket_stats(hass)
+    large_value = "state " * const.MIN_COMPRESS_SIZE
+
+    @callback
+    @websocket_command({"type": "get_large_message"})
+    def get_large_message(
+        hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+    ) -> None:
+        connection.send_result(msg["id"], large_value)
+
+    async_register_command(hass, get_large_message)
+    client = await hass_client_no_auth()
+
+    async with client.ws_connect(const.URL, compress=15) as ws:
+        assert ws.compress == 15
+        assert (await ws.receive_json())["type"] == TYPE_AUTH_REQUIRED
+        await ws.send_json({"type": TYPE_AUTH, "access_token": hass_access_token})
+        assert (await ws.receive_json())["type"] == TYPE_AUTH_OK
+        assert stats.compressed_frames == 0
+        assert stats.uncompressed_bytes > 0
+
+        await ws.send_json({"id": 5, "type": "get_large_message"})
+        msg = await ws.receive_json()
+        assert msg["result"] == large_value
+        assert stats.compressed_frames == 1
+        assert stats.compress_input_bytes > len(large_value)
+
+        await ws.send_json({"id": 6, "type": "ping"})
+        assert (await ws.receive_json())["type"] == "pong"
+        assert stats.compressed_frames == 1
+
+
+async def test_coalesce_window(
+    hass: HomeAssistant, websocket_client: MockHAClientWebSocket
+) -> None:
+    """Test messages are coalesced until the end of the coalesce window."""
+    stats = http.async_get_websocket_stats(hass)
+    await websocket_client.send_json(
+        {
+            "id": 1,
+            "type": "supported_features",
+            "features": {
+                const.FEATURE_COALESCE_MESSAGES: 1,
+                const.FEATURE_COALESCE_WINDOW: 50,
+            },
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"] is True
+
+    await websocket_client.send_json({"id": 2, "type": "ping"})
+    await websocket_client.send_json({"id": 3, "type": "ping"})
+    msg = await websocket_client.receive()
+    assert [item["id"] for item in msg.json()] == [2, 3]
+    assert stats.coalesced_frames == 1
+    assert stats.coalesced_messages == 2
+
+
+async def test_coalesce_window_max_size(
+    hass: HomeAssistant, websocket_client: MockHAClientWebSocket
+) -> None:
+    """Test large batches are sent before the end of the coalesce window."""
+    await websocket_client.send_json(
+        {
+            "id": 1,
+            "type": "supported_features",
+            "features": {
+                const.FEATURE_COALESCE_MESSAGES: 1,
+                const.FEATURE_COALESCE_WINDOW: const.MAX_COALESCE_WINDOW * 60,
+            },
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"] is True
+
+    with patch("homeassistant.components.websocket_api.http.MAX_COALESCE_SIZE", 1):
+        await websocket_client.send_json({"id": 2, "type": "ping"})
+        await websocket_client.send_json({"id": 3, "type": "ping"})
+        async with asyncio.timeout(5):
+            msg = await websocket_client.receive()
+    assert [item["id"] for item in msg.json()] == [2, 3]
+
+
+async def test_coalesce_cbor_and_json_messages(
+    hass: HomeAssistant,
+    no_auth_websocket_client: MockHAClientWebSocket,
+    hass_access_token: str,
+) -> None:
+    """Test consecutive messages of the same format are coalesced together."""
+    stats = http.async_get_websocket_stats(hass)
+    client = no_auth_websocket_client
+    await client.send_json(
+        {"type": TYPE_AUTH, "access_token": hass_access_token, "encoding": "cbor"}
+    )
+    assert (await client.receive_json())["type"] == TYPE_AUTH_OK
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "supported_features",
+            "features": {
+                const.FEATURE_COALESCE_MESSAGES: 1,
+                const.FEATURE_COALESCE_WINDOW: 50,
+            },
+        }
+    )
+    msg = await client.receive()
+    assert cbor_loads(msg.data)["success"] is True
+
+    await client.send_json({"id": 2, "type": "ping"})
+    await client.send_json({"id": 3, "type": "get_states"})
+    await client.send_json({"id": 4, "type": "ping"})
+    await client.send_json({"id": 5, "type": "ping"})
+
+    msg = await client.receive()
+    assert msg.type is WSMsgType.BINARY
+    assert cbor_loads(msg.data) == {"id": 2, "type": "pong"}
+    msg = await client.receive()
+    assert msg.type is WSMsgType.TEXT
+    assert msg.json()["id"] == 3
+    msg = await client.receive()
+    assert msg.type is WSMsgType.BINARY
+    assert cbor_loads(msg.data) == [
+        {"id": 4, "type": "pong"},
+        {"id": 5, "type": "pong"},
+    ]
+    assert stats.coalesced_frames == 3
+    assert stats.coalesced_messages == 4
+    assert stats.binary_frames == 3
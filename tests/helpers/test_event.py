@@ -2395,6 +2395,57 @@ async def test_track_template_result_transient_errors(
     assert "ValueError" not in repr(info)
 
 
+@pytest.mark.parametrize("batch_max_latency", [0, 0.05])
+async def test_track_template_result_batch(
+    hass: HomeAssistant, batch_max_latency: float
+) -> None:
+    """Test the re-renders of a burst of state changes are batched."""
+    template_sum = Template(
+        "{{ states('sensor.a') | int(0) + states('sensor.b') | int(0) }}", hass
+    )
+    template_b = Template("{{ states('sensor.b') }}", hass)
+
+    runs = []
+
+    @ha.callback
+    def listener(
+        event: Event[EventStateChangedData] | None,
+        updates: list[TrackTemplateResult],
+    ) -> None:
+        runs.append((event, [(update.template, update.result) for update in updates]))
+
+    info = async_track_template_result(
+        hass,
+        [TrackTemplate(template_sum, None), TrackTemplate(template_b, None)],
+        listener,
+        batch_max_latency=batch_max_latency,
+    )
+    info.async_refresh()
+    assert runs == [(None, [(template_sum, 0), (template_b, "unknown")])]
+    runs.clear()
+
+    hass.states.async_set("sensor.a", "1")
+    hass.states.async_set("sensor.b", "2")
+    hass.states.async_set("sensor.a", "3")
+    hass.states.async_set("sensor.c", "4")
+    await asyncio.sleep(0)
+    if batch_max_latency:
+        assert runs == []
+    await hass.async_block_till_done()
+
+    assert len(runs) == 1
+    event, updates = runs[0]
+    assert event.data["entity_id"] == "sensor.a"
+    assert updates == [(template_sum, 5), (template_b, 2)]
+    assert info.batches == 1
+    assert info.renders_saved == 2
+
+    hass.states.async_set("sensor.b", "3")
+    info.async_remove()
+    await hass.async_block_till_done()
+    assert len(runs) == 1
+
+
 async def test_static_string(hass: HomeAssistant) -> None:
     """Test a static string."""
     template_refresh = Template("{{ 'static' }}", hass)
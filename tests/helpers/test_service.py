@@ -38,6 +38,8 @@ from homeassistant.helpers import (
     area_registry as ar,
     device_registry as dr,
     entity_registry as er,
+    floor_registry as fr,
+    label_registry as lr,
     service,
 )
 import homeassistant.helpers.config_validation as cv
@@ -46,7 +48,9 @@ from homeassistant.setup import async_setup_component
 from homeassistant.util.yaml.loader import parse_yaml
 
 from tests.common import (
+    MockConfigEntry,
     MockEntity,
+    MockEntityPlatform,
     MockModule,
     MockUser,
     async_mock_service,
@@ -2037,6 +2041,148 @@ async def test_async_extract_config_entry_ids(hass: HomeAssistant) -> None:
     assert await service.async_extract_config_entry_ids(hass, call) == {"abc"}
 
 
+async def test_extract_referenced_entity_ids_cached(
+    hass: HomeAssistant,
+    area_registry: ar.AreaRegistry,
+    device_registry: dr.DeviceRegistry,
+    entity_registry: er.EntityRegistry,
+    floor_registry: fr.FloorRegistry,
+    label_registry: lr.LabelRegistry,
+) -> None:
+    """Test the targets resolved from the registries are cached."""
+    cache = service.async_get_target_resolution_cache(hass)
+    floor = floor_registry.async_create("Ground floor")
+    kitchen = area_registry.async_create("Kitchen", floor_id=floor.floor_id)
+    office = area_registry.async_create("Office")
+    label = label_registry.async_create("Lights")
+    entity_registry.async_get_or_create(
+        "light", "hue", "1234", suggested_object_id="ceiling"
+    )
+    entity_registry.async_update_entity("light.ceiling", area_id=kitchen.id)
+    kitchen_call = ServiceCall(hass, "light", "turn_on", {"area_id": kitchen.id})
+    office_call = ServiceCall(hass, "light", "turn_on", {"area_id": office.id})
+    floor_call = ServiceCall(hass, "light", "turn_on", {"floor_id": floor.floor_id})
+    label_call = ServiceCall(hass, "light", "turn_on", {"label_id": label.label_id})
+
+    selected = service.async_extract_referenced_entity_ids(hass, kitchen_call)
+    assert selected.indirectly_referenced == {"light.ceiling"}
+    for call in (office_call, floor_call, label_call):
+        service.async_extract_referenced_entity_ids(hass, call)
+    assert cache.async_get_stats() == {
+        "entries": 4,
+        "indexed_items": 5,
+        "hits": 0,
+        "misses": 4,
+        "invalidations": 0,
+    }
+
+    # The cached result is copied so it can be modified by the caller
+    selected.indirectly_referenced.add("light.other")
+    selected = service.async_extract_referenced_entity_ids(hass, kitchen_call)
+    assert selected.indirectly_referenced == {"light.ceiling"}
+    assert cache.async_get_stats()["hits"] == 1
+
+    # Only the targets depending on the updated items are dropped
+    entity_registry.async_get_or_create(
+        "light", "hue", "5678", suggested_object_id="table"
+    )
+    entity_registry.async_update_entity("light.table", area_id=kitchen.id)
+    assert cache.async_get_stats()["entries"] == 2
+    assert service.async_extract_referenced_entity_ids(
+        hass, floor_call
+    ).indirectly_referenced == {"light.ceiling", "light.table"}
+
+    config_entry = MockConfigEntry()
+    config_entry.add_to_hass(hass)
+    device = device_registry.async_get_or_create(
+        config_entry_id=config_entry.entry_id,
+        identifiers={("hue", "bridge")},
+    )
+    entity_registry.async_update_entity("light.table", device_id=device.id)
+    device_registry.async_update_device(device.id, labels={label.label_id})
+    assert service.async_extract_referenced_entity_ids(
+        hass, label_call
+    ).referenced_devices == {device.id}
+
+    entity_registry.async_update_entity("light.ceiling", area_id=office.id)
+    assert service.async_extract_referenced_entity_ids(
+        hass, office_call
+    ).indirectly_referenced == {"light.ceiling"}
+    assert service.async_extract_referenced_entity_ids(
+        hass, kitchen_call
+    ).indirectly_referenced == {"light.table"}
+
+    area_registry.async_update(office.id, floor_id=floor.floor_id)
+    assert service.async_extract_referenced_entity_ids(
+        hass, floor_call
+    ).indirectly_referenced == {"light.ceiling", "light.table"}
+
+
+async def test_entity_service_call_batch_handler(
+    hass: HomeAssistant, mock_entities: dict[str, MockEntity]
+) -> None:
+    """Test entities of a platform with a batch handler are called at once."""
+    platform = MockEntityPlatform(hass)
+    other_platform = MockEntityPlatform(hass)
+    batch_handler = AsyncMock(return_value=None)
+    platform.async_register_batch_service_handler(
+        "test_domain", "test_service", batch_handler
+    )
+    other_platform.async_register_batch_service_handler(
+        "test_domain", "test_service", batch_handler
+    )
+    for entity_id in ("light.kitchen", "light.living_room"):
+        mock_entities[entity_id].platform = platform
+    mock_entities["light.bedroom"].platform = other_platform
+    test_service_mock = AsyncMock(return_value=None)
+    context = Context()
+
+    await service.entity_service_call(
+        hass,
+        mock_entities,
+        HassJob(test_service_mock),
+        ServiceCall(
+            hass, "test_domain", "test_service", {"entity_id": "all"}, context=context
+        ),
+    )
+
+    # A single entity of a platform is called directly
+    assert batch_handler.call_count == 1
+    entities, call = batch_handler.call_args[0]
+    assert entities == unordered(
+        [mock_entities["light.kitchen"], mock_entities["light.living_room"]]
+    )
+    assert call.context is context
+    assert all(entity._context is context for entity in entities)
+    assert [call[0][0] for call in test_service_mock.call_args_list] == unordered(
+        [mock_entities["light.bedroom"], mock_entities["light.bathroom"]]
+    )
+
+    # Other services and calls returning a response call each entity
+    batch_handler.reset_mock()
+    test_service_mock.reset_mock()
+    await service.entity_service_call(
+        hass,
+        mock_entities,
+        HassJob(test_service_mock),
+        ServiceCall(hass, "test_domain", "other_service", {"entity_id": "all"}),
+    )
+    await service.entity_service_call(
+        hass,
+        mock_entities,
+        HassJob(test_service_mock),
+        ServiceCall(
+            hass,
+            "test_domain",
+            "test_service",
+            {"entity_id": "all"},
+            return_response=True,
+        ),
+    )
+    assert batch_handler.call_count == 0
+    assert test_service_mock.call_count == 8
+
+
 async def test_reload_service_helper(hass: HomeAssistant) -> None:
     """Test the reload service helper."""
 
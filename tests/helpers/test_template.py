@@ -6,13 +6,16 @@ from collections.abc import Iterable
 from datetime import datetime, timedelta
 import json
 import logging
+import marshal
 import math
+from pathlib import Path
 import random
 from types import MappingProxyType
 from typing import Any
 from unittest.mock import patch
 
 from freezegun import freeze_time
+import jinja2
 import orjson
 import pytest
 from syrupy import SnapshotAssertion
@@ -22,6 +25,7 @@ from homeassistant import config_entries
 from homeassistant.components import group
 from homeassistant.const import (
     ATTR_UNIT_OF_MEASUREMENT,
+    EVENT_HOMEASSISTANT_FINAL_WRITE,
     STATE_ON,
     STATE_UNAVAILABLE,
     UnitOfArea,
@@ -320,6 +324,90 @@ async def test_import(hass: HomeAssistant) -> None:
         ).async_render()
 
 
+async def test_template_code_cache(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Test compiled template code is reused after a restart."""
+    hass.config.config_dir = str(tmp_path)
+    await template.async_load_template_code_cache(hass)
+    assert template.Template("{{ 1 + 1 }}", hass).async_render() == 2
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_FINAL_WRITE)
+    await hass.async_block_till_done()
+    cache_path = tmp_path / ".storage" / template.TEMPLATE_CODE_CACHE_FILE
+    assert cache_path.exists()
+
+    # Simulate a restart
+    hass.data.pop(template._ENVIRONMENT)
+    code_cache = template.TemplateCodeCache(str(cache_path))
+    await hass.async_add_executor_job(code_cache.load)
+    hass.data[template._TEMPLATE_CODE_CACHE] = code_cache
+    with patch.object(
+        jinja2.Environment, "compile", side_effect=AssertionError("compiled")
+    ):
+        assert template.Template("{{ 1 + 1 }}", hass).async_render() == 2
+    # The source of an unknown template is compiled and cached
+    assert template.Template("{{ 2 + 2 }}", hass).async_render() == 4
+    kind = hass.data[template._ENVIRONMENT].code_cache_kind
+    assert code_cache.get(kind, "{{ 2 + 2 }}") is not None
+
+
+async def test_template_code_cache_environment_kind(
+    hass: HomeAssistant, tmp_path: Path
+) -> None:
+    """Test the code compiled by an environment is not reused by another kind."""
+    code_cache = template.TemplateCodeCache(str(tmp_path / "cache"))
+    hass.data[template._TEMPLATE_CODE_CACHE] = code_cache
+    source = "{{ 'light.kitchen' | area_id }}"
+    environment = template.TemplateEnvironment(hass)
+    limited_environment = template.TemplateEnvironment(hass, limited=True)
+    assert environment.code_cache_kind != limited_environment.code_cache_kind
+    # area_id is a plain function in the limited environment and
+    # a context function in the others so each compiles its own code
+    with patch.object(
+        jinja2.Environment, "compile", wraps=jinja2.Environment.compile, autospec=True
+    ) as compile_mock:
+        limited_environment.compile(source)
+        environment.compile(source)
+    assert compile_mock.call_count == 2
+    assert code_cache.get(limited_environment.code_cache_kind, source)
+    assert code_cache.get(environment.code_cache_kind, source)
+
+
+async def test_template_code_cache_size(hass: HomeAssistant, tmp_path: Path) -> None:
+    """Test only the most recently compiled templates are saved."""
+    cache_path = tmp_path / template.TEMPLATE_CODE_CACHE_FILE
+    with patch.object(template, "TEMPLATE_CODE_CACHE_SIZE", 2):
+        code_cache = template.TemplateCodeCache(str(cache_path))
+    code = compile("1", "<test>", "eval")
+    for source in ("one", "two", "three"):
+        code_cache.set("kind", source, code)
+    await code_cache.async_save(hass)
+
+    code_cache = template.TemplateCodeCache(str(cache_path))
+    await hass.async_add_executor_job(code_cache.load)
+    assert code_cache.get("kind", "one") is None
+    assert code_cache.get("kind", "two") == code
+    assert code_cache.get("kind", "three") == code
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"not marshalled",
+        marshal.dumps({"version": (0, "0", "0", b""), "code": {}}),
+        marshal.dumps([]),
+    ],
+)
+async def test_template_code_cache_invalid(
+    hass: HomeAssistant, tmp_path: Path, data: bytes
+) -> None:
+    """Test an invalid or outdated template code cache is ignored."""
+    cache_path = tmp_path / template.TEMPLATE_CODE_CACHE_FILE
+    cache_path.write_bytes(data)
+    code_cache = template.TemplateCodeCache(str(cache_path))
+    await hass.async_add_executor_job(code_cache.load)
+    hass.data[template._TEMPLATE_CODE_CACHE] = code_cache
+    assert template.Template("{{ 1 + 1 }}", hass).async_render() == 2
+
+
 async def test_import_change(hass: HomeAssistant) -> None:
     """Test that a change in HassLoader results in updated imports."""
     await template.async_load_custom_templates(hass)
@@ -0,0 +1,152 @@
+"""Test the timer wheel helper."""
+
+from datetime import timedelta
+import time
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.event import (
+    async_track_point_in_utc_time,
+    async_track_time_interval,
+)
+from homeassistant.helpers.timer_wheel import TimerWheel, async_get_timer_wheel
+from homeassistant.util import dt as dt_util
+
+from tests.common import async_fire_time_changed, get_scheduled_timer_handles
+
+
+def _active_handles(hass: HomeAssistant) -> int:
+    """Return the number of loop timers which are not cancelled."""
+    return sum(
+        not handle.cancelled() for handle in get_scheduled_timer_handles(hass.loop)
+    )
+
+
+async def test_timers_in_same_tick_share_loop_timer(hass: HomeAssistant) -> None:
+    """Test timers firing at the same time share a loop timer."""
+    wheel = TimerWheel(hass)
+    handles = _active_handles(hass)
+    calls: list[tuple[int, str]] = []
+    timestamp = time.time() + 5
+
+    timers = [
+        wheel.async_call_at_timestamp(timestamp, calls.append, (i, "run"))
+        for i in range(3)
+    ]
+    assert _active_handles(hass) == handles + 1
+    assert wheel.as_dict() | {"mean_lateness": 0.0} == {
+        "resolution": 0.0,
+        "timers": 3,
+        "slots": 1,
+        "scheduled": 3,
+        "fired": 0,
+        "wakeups": 0,
+        "mean_lateness": 0.0,
+        "max_lateness": 0.0,
+    }
+
+    timers[1].cancel()
+    assert timers[1].cancelled()
+    async_fire_time_changed(hass, dt_util.utc_from_timestamp(timestamp))
+    assert calls == [(0, "run"), (2, "run")]
+    assert _active_handles(hass) == handles
+
+    stats = wheel.as_dict()
+    assert stats["timers"] == 0
+    assert stats["slots"] == 0
+    assert stats["fired"] == 2
+    assert stats["wakeups"] == 1
+
+
+async def test_cancel_last_timer_cancels_loop_timer(hass: HomeAssistant) -> None:
+    """Test cancelling all the timers of a slot cancels its loop timer."""
+    wheel = TimerWheel(hass)
+    handles = _active_handles(hass)
+
+    timer = wheel.async_call_later(10, lambda: None)
+    assert _active_handles(hass) == handles + 1
+    timer.cancel()
+    timer.cancel()
+    assert _active_handles(hass) == handles
+    assert wheel.as_dict()["timers"] == 0
+
+
+async def test_cancel_timer_from_timer_in_same_slot(hass: HomeAssistant) -> None:
+    """Test a timer cancelled by a timer run before it in its slot."""
+    wheel = TimerWheel(hass)
+    calls: list[str] = []
+    timestamp = time.time() + 5
+
+    wheel.async_call_at_timestamp(timestamp, lambda: second.cancel())
+    second = wheel.async_call_at_timestamp(timestamp, calls.append, "second")
+    async_fire_time_changed(hass, dt_util.utc_from_timestamp(timestamp))
+    assert calls == []
+    assert wheel.as_dict()["fired"] == 1
+
+
+async def test_resolution(hass: HomeAssistant) -> None:
+    """Test timers are rounded up to the resolution."""
+    wheel = TimerWheel(hass)
+    wheel.async_set_resolution(5)
+    calls: list[str] = []
+    start = (time.time() // 5 + 1) * 5
+
+    wheel.async_call_at_timestamp(start + 1, calls.append, "first")
+    wheel.async_call_at_timestamp(start + 4, calls.append, "second")
+    assert wheel.as_dict()["slots"] == 1
+
+    async_fire_time_changed(hass, dt_util.utc_from_timestamp(start + 4))
+    assert calls == []
+    async_fire_time_changed(hass, dt_util.utc_from_timestamp(start + 5))
+    assert calls == ["first", "second"]
+
+
+async def test_exception_in_timer(hass: HomeAssistant) -> None:
+    """Test an exception in a timer does not stop the other timers of its slot."""
+    wheel = TimerWheel(hass)
+    calls: list[str] = []
+    timestamp = time.time() + 5
+    error = RuntimeError("timer failed")
+
+    def _raise_exception() -> None:
+        raise error
+
+    wheel.async_call_at_timestamp(timestamp, _raise_exception)
+    wheel.async_call_at_timestamp(timestamp, calls.append, "run")
+    with patch.object(hass.loop, "call_exception_handler") as mock_handler:
+        async_fire_time_changed(hass, dt_util.utc_from_timestamp(timestamp))
+    assert calls == ["run"]
+    mock_handler.assert_called_once()
+    context = mock_handler.call_args[0][0]
+    assert context["exception"] is error
+    assert "_raise_exception" in context["message"]
+
+
+async def test_time_tracking_helpers_use_wheel(hass: HomeAssistant) -> None:
+    """Test the time tracking helpers schedule their timers on the wheel."""
+    wheel = async_get_timer_wheel(hass)
+    timers = wheel.as_dict()["timers"]
+    handles = _active_handles(hass)
+    now = dt_util.utcnow()
+    point_in_time = now + timedelta(seconds=10)
+    calls: list[str] = []
+
+    unsub_points = [
+        async_track_point_in_utc_time(hass, lambda _: calls.append("point"), point)
+        for point in (point_in_time, point_in_time)
+    ]
+    unsub_interval = async_track_time_interval(
+        hass, lambda _: calls.append("interval"), timedelta(seconds=30)
+    )
+    assert wheel.as_dict()["timers"] == timers + 3
+    assert _active_handles(hass) == handles + 2
+
+    async_fire_time_changed(hass, point_in_time)
+    await hass.async_block_till_done()
+    assert calls == ["point", "point"]
+
+    unsub_interval()
+    for unsub in unsub_points:
+        unsub()
+    assert wheel.as_dict()["timers"] == timers
+    assert _active_handles(hass) == handles
@@ -57,6 +57,7 @@ from homeassistant.exceptions import (
     ServiceNotFound,
     ServiceValidationError,
 )
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.json import json_dumps
 from homeassistant.setup import async_setup_component
 from homeassistant.util.async_ import create_eager_task
@@ -65,6 +66,7 @@ from homeassistant.util.read_only_dict import ReadOnlyDict
 
 from .common import (
     async_capture_events,
+    async_fire_time_changed,
     async_mock_service,
     help_test_all,
     import_and_test_deprecated_alias,
@@ -355,6 +357,7 @@ async def test_async_create_task_schedule_coroutine_with_name() -> None:
 async def test_async_run_eager_hass_job_calls_callback() -> None:
     """Test that the callback annotation is respected."""
     hass = MagicMock()
+    hass.job_profiler = None
     calls = []
 
     def job():
@@ -379,6 +382,7 @@ async def test_async_run_eager_hass_job_calls_coro_function() -> None:
 async def test_async_run_hass_job_calls_callback() -> None:
     """Test that the callback annotation is respected."""
     hass = MagicMock()
+    hass.job_profiler = None
     calls = []
 
     def job():
@@ -1165,6 +1169,81 @@ async def test_eventbus_filtered_listener(hass: HomeAssistant) -> None:
     unsub()
 
 
+async def test_eventbus_keyed_listener(hass: HomeAssistant) -> None:
+    """Test listeners keyed on a value of the event data."""
+    calls = []
+    filtered_calls = []
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event)
+
+    @ha.callback
+    def filtered_listener(event):
+        """Mock filtered listener."""
+        filtered_calls.append(event)
+
+    @ha.callback
+    def mock_filter(event_data):
+        """Mock filter."""
+        return not event_data.get("filtered")
+
+    old_count = hass.bus.async_listeners().get("test", 0)
+    unsub = hass.bus.async_listen_keyed("test", "entity_id", "light.a", listener)
+    unsub_filtered = hass.bus.async_listen_keyed(
+        "test", "entity_id", "light.a", filtered_listener, event_filter=mock_filter
+    )
+    unsub_other = hass.bus.async_listen_keyed("test", "entity_id", "light.b", listener)
+    assert hass.bus.async_listeners()["test"] == old_count + 3
+
+    hass.bus.async_fire("test", {"entity_id": "light.a"})
+    hass.bus.async_fire("test", {"entity_id": "light.a", "filtered": True})
+    hass.bus.async_fire("test", {"entity_id": "light.c"})
+    hass.bus.async_fire("test", {"entity_id": ["light.a"]})
+    hass.bus.async_fire("test", {})
+    hass.bus.async_fire("test")
+    hass.bus.async_fire("other", {"entity_id": "light.a"})
+    await hass.async_block_till_done()
+
+    assert [event.data for event in calls] == [
+        {"entity_id": "light.a"},
+        {"entity_id": "light.a", "filtered": True},
+    ]
+    assert [event.data for event in filtered_calls] == [{"entity_id": "light.a"}]
+
+    unsub()
+    unsub_filtered()
+    assert hass.bus.async_listeners()["test"] == old_count + 1
+    hass.bus.async_fire("test", {"entity_id": "light.a"})
+    hass.bus.async_fire("test", {"entity_id": "light.b"})
+    await hass.async_block_till_done()
+    assert len(calls) == 3
+    assert len(filtered_calls) == 1
+
+    unsub_other()
+    assert hass.bus.async_listeners().get("test", 0) == old_count
+    assert not hass.bus._keyed_listeners
+
+
+async def test_eventbus_keyed_listener_invalid(hass: HomeAssistant) -> None:
+    """Test keyed listeners need an event type and a callback filter."""
+
+    def listener(_):
+        pass
+
+    with pytest.raises(HomeAssistantError):
+        hass.bus.async_listen_keyed(MATCH_ALL, "entity_id", "light.a", listener)
+
+    with pytest.raises(HomeAssistantError):
+        hass.bus.async_listen_keyed(
+            "test", "entity_id", "light.a", listener, event_filter=lambda _: True
+        )
+
+    with pytest.raises(TypeError):
+        hass.bus.async_listen_keyed("test", "entity_id", ["light.a"], listener)
+
+
 async def test_eventbus_run_immediately_callback(hass: HomeAssistant) -> None:
     """Test we can call events immediately with a callback."""
     calls = []
@@ -2678,6 +2757,155 @@ def test_state_timestamps() -> None:
     assert state.last_updated_timestamp == now.timestamp()
 
 
+def test_compact_state() -> None:
+    """Test a compact state matches a state with the same data."""
+    now = dt_util.utcnow()
+    later = now + timedelta(seconds=5)
+    context = ha.Context(id="1234")
+    state = ha.State(
+        "light.bedroom",
+        "on",
+        {"brightness": 100},
+        last_changed=now,
+        last_reported=later,
+        last_updated=later,
+        context=context,
+    )
+    compact_state = ha.CompactState(
+        "light.bedroom",
+        "on",
+        {"brightness": 100},
+        last_changed=now,
+        last_reported=later,
+        last_updated=later,
+        context=context,
+    )
+    assert compact_state.domain == "light"
+    assert compact_state.object_id == "bedroom"
+    assert compact_state.last_changed == now
+    assert compact_state.last_updated == later
+    assert compact_state.last_reported == later
+    assert compact_state.last_changed_timestamp == now.timestamp()
+    assert compact_state.last_updated_timestamp == later.timestamp()
+    assert compact_state.as_dict() == state.as_dict()
+    assert compact_state.as_compressed_state == state.as_compressed_state
+
+    compact_state.last_reported = later + timedelta(seconds=5)
+    assert compact_state.last_reported == later + timedelta(seconds=5)
+    assert compact_state.last_updated == later
+
+    with pytest.raises(InvalidEntityFormatError):
+        ha.CompactState("invalid_entity_format", "on")
+    with pytest.raises(InvalidStateError):
+        ha.CompactState("light.bedroom", "x" * 256)
+
+
+async def test_state_machine_compact_states(hass: HomeAssistant) -> None:
+    """Test the state machine can store compact states."""
+    hass.states.async_set_compact(True)
+    attributes = {"unit_of_measurement": "°C", "device_class": "temperature"}
+
+    hass.states.async_set("sensor.one", "1", attributes, timestamp=1000.0)
+    hass.states.async_set("sensor.two", "2", dict(attributes))
+    hass.states.async_set("sensor.three", "3", {"list": [1, 2]})
+    hass.states.async_set("sensor.four", "4")
+    hass.states.async_set("sensor.five", "5")
+
+    one = hass.states.get("sensor.one")
+    two = hass.states.get("sensor.two")
+    assert isinstance(one, ha.CompactState)
+    assert one.attributes is two.attributes
+    assert hass.states.get("sensor.three").attributes == {"list": [1, 2]}
+    assert (
+        hass.states.get("sensor.four").attributes
+        is hass.states.get("sensor.five").attributes
+    )
+
+    hass.states.async_set(
+        "sensor.one", "1", {"device_class": "temperature"}, timestamp=1010.0
+    )
+    new_one = hass.states.get("sensor.one")
+    assert new_one.last_changed_timestamp == 1000.0
+    assert new_one.last_updated_timestamp == 1010.0
+    assert new_one.last_changed == dt_util.utc_from_timestamp(1000.0)
+
+    hass.states.async_set(
+        "sensor.one", "1", {"device_class": "temperature"}, timestamp=1020.0
+    )
+    assert hass.states.get("sensor.one") is new_one
+    assert new_one.last_reported_timestamp == 1020.0
+    assert new_one.last_updated_timestamp == 1010.0
+
+    hass.states.async_set_compact(False)
+    hass.states.async_set("sensor.one", "2")
+    assert not isinstance(hass.states.get("sensor.one"), ha.CompactState)
+
+
+async def test_state_machine_compact_states_keep_attribute_types(
+    hass: HomeAssistant,
+) -> None:
+    """Test compact states only share attributes with the same value types."""
+    hass.states.async_set_compact(True)
+
+    hass.states.async_set("sensor.int", "1", {"x": 1})
+    hass.states.async_set("sensor.int_2", "1", {"x": 1})
+    hass.states.async_set("sensor.bool", "1", {"x": True})
+    hass.states.async_set("sensor.float", "1", {"x": 1.0})
+    hass.states.async_set("sensor.tuple", "1", {"hs": (1, 2)})
+    hass.states.async_set("sensor.tuple_2", "1", {"hs": (1.0, 2)})
+
+    int_attributes = hass.states.get("sensor.int").attributes
+    assert type(int_attributes["x"]) is int
+    assert type(hass.states.get("sensor.bool").attributes["x"]) is bool
+    assert type(hass.states.get("sensor.float").attributes["x"]) is float
+    assert hass.states.get("sensor.int_2").attributes is int_attributes
+    # Attributes with container values are not shared
+    assert type(hass.states.get("sensor.tuple").attributes["hs"][0]) is int
+    assert type(hass.states.get("sensor.tuple_2").attributes["hs"][0]) is float
+
+
+def test_attributes_diff() -> None:
+    """Test the diff of the attributes of two states."""
+    attributes = {"a": 1, "b": 2}
+    assert ha.attributes_diff(attributes, attributes) is ha.EMPTY_ATTRIBUTES_DIFF
+    assert ha.attributes_diff(attributes, dict(attributes)) is ha.EMPTY_ATTRIBUTES_DIFF
+    assert not ha.EMPTY_ATTRIBUTES_DIFF
+
+    diff = ha.attributes_diff(attributes, {"a": 1, "b": 3, "c": 4})
+    assert diff
+    assert diff.changed == {"b": 3, "c": 4}
+    assert diff.removed == []
+
+    diff = ha.attributes_diff(attributes, {"b": 2})
+    assert diff
+    assert diff.changed == {}
+    assert diff.removed == ["a"]
+
+
+async def test_state_changed_attributes_diff(hass: HomeAssistant) -> None:
+    """Test the attributes diff of a state_changed event is computed once."""
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    hass.states.async_set("light.kitchen", "on", {"brightness": 100})
+    hass.states.async_set("light.kitchen", "off", {"brightness": 100})
+    hass.states.async_set("light.kitchen", "on", {"brightness": 50, "color": "red"})
+    hass.states.async_remove("light.kitchen")
+    await hass.async_block_till_done()
+
+    assert hass.states.get("light.kitchen") is None
+    added, state_only, attributes_changed, removed = events
+    assert state_only.data["new_state"].attributes is (
+        state_only.data["old_state"].attributes
+    )
+    assert ha.state_changed_attributes_diff(added) is ha.EMPTY_ATTRIBUTES_DIFF
+    assert ha.state_changed_attributes_diff(state_only) is ha.EMPTY_ATTRIBUTES_DIFF
+    assert ha.state_changed_attributes_diff(removed) is ha.EMPTY_ATTRIBUTES_DIFF
+    diff = ha.state_changed_attributes_diff(attributes_changed)
+    assert diff.changed == {"brightness": 50, "color": "red"}
+    assert diff.removed == []
+    assert ha.state_changed_attributes_diff(attributes_changed) is diff
+
+
 async def test_state_firing_event_matches_context_id_ulid_time(
     hass: HomeAssistant,
 ) -> None:
@@ -2862,6 +3090,27 @@ async def test_cancellable_hassjob(hass: HomeAssistant, eager_start: bool) -> No
     timer2.cancel()
 
 
+async def test_cancellable_time_interval(hass: HomeAssistant) -> None:
+    """Test time intervals cancelled on shutdown are cancelled when stopping."""
+    calls: list[datetime] = []
+
+    @ha.callback
+    def action(now: datetime) -> None:
+        calls.append(now)
+
+    async_track_time_interval(
+        hass, action, timedelta(seconds=60), cancel_on_shutdown=True
+    )
+    unsub = async_track_time_interval(hass, action, timedelta(seconds=60))
+
+    await hass.async_stop()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=60))
+    assert len(calls) == 1
+
+    # Cleanup
+    unsub()
+
+
 async def test_validate_state(hass: HomeAssistant) -> None:
     """Test validate_state."""
     assert ha.validate_state("test") == "test"
@@ -3309,3 +3558,34 @@ async def test_async_set_updates_last_reported(hass: HomeAssistant) -> None:
         assert state.last_reported_timestamp != last_reported_timestamp
         last_reported = state.last_reported
         last_reported_timestamp = state.last_reported_timestamp
+
+
+async def test_job_profiler(hass: HomeAssistant) -> None:
+    """Test the job profiler runs the callback jobs and records the events."""
+    calls = []
+    events = []
+
+    class MockJobProfiler:
+        def run_callback(self, hassjob, args):
+            calls.append(args)
+            hassjob.target(*args)
+
+        def record_event(self, event_type, elapsed):
+            events.append(event_type)
+
+    received = []
+
+    @ha.callback
+    def listener(event):
+        received.append(event)
+
+    hass.bus.async_listen("test_event", listener)
+    hass.job_profiler = MockJobProfiler()
+    hass.bus.async_fire("test_event")
+    hass.job_profiler = None
+    hass.bus.async_fire("test_event")
+    await hass.async_block_till_done()
+
+    assert len(received) == 2
+    assert len(calls) == 1
+    assert events == ["test_event"]
@@ -27,7 +27,7 @@ from homeassistant.const import (
     EVENT_CORE_CONFIG_UPDATE,
     __version__,
 )
-from homeassistant.core import HomeAssistant, State
+from homeassistant.core import CompactState, HomeAssistant, State
 from homeassistant.core_config import (
     _CUSTOMIZE_DICT_SCHEMA,
     CORE_CONFIG_SCHEMA,
@@ -40,6 +40,7 @@ from homeassistant.core_config import (
 )
 from homeassistant.helpers import issue_registry as ir
 from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.timer_wheel import async_get_timer_wheel
 from homeassistant.util.unit_system import (
     METRIC_SYSTEM,
     US_CUSTOMARY_SYSTEM,
@@ -1066,6 +1067,19 @@ async def test_top_level_components(hass: HomeAssistant) -> None:
         hass.config.components.discard("homeassistant")
 
 
+async def test_compact_states(hass: HomeAssistant) -> None:
+    """Test compact states can be enabled from the core config."""
+    await async_process_ha_core_config(hass, {"compact_states": True})
+    hass.states.async_set("light.kitchen", "on")
+    assert isinstance(hass.states.get("light.kitchen"), CompactState)
+
+
+async def test_timer_resolution(hass: HomeAssistant) -> None:
+    """Test the timer resolution can be set from the core config."""
+    await async_process_ha_core_config(hass, {"timer_resolution": 0.5})
+    assert async_get_timer_wheel(hass).resolution == 0.5
+
+
 async def test_debug_mode_defaults_to_off(hass: HomeAssistant) -> None:
     """Test debug mode defaults to off."""
     assert not hass.config.debug
@@ -0,0 +1,145 @@
+"""Test Home Assistant CBOR utility functions."""
+
+import dataclasses
+from datetime import UTC, datetime
+from enum import StrEnum
+from pathlib import Path
+
+import pytest
+
+from homeassistant.core import State
+from homeassistant.util.cbor import cbor_bytes
+
+from tests.common import CBORDecodeError, cbor_loads
+
+
+class _Color(StrEnum):
+    RED = "red"
+
+
+@dataclasses.dataclass
+class _Point:
+    x: int
+    y: int
+
+
+# The examples of RFC 8949 appendix A which can be encoded, the floats
+# are always encoded in double precision so only those examples apply
+RFC_8949_EXAMPLES = [
+    (0, "00"),
+    (1, "01"),
+    (10, "0a"),
+    (23, "17"),
+    (24, "1818"),
+    (25, "1819"),
+    (100, "1864"),
+    (1000, "1903e8"),
+    (1000000, "1a000f4240"),
+    (1000000000000, "1b000000e8d4a51000"),
+    (18446744073709551615, "1bffffffffffffffff"),
+    (-1, "20"),
+    (-10, "29"),
+    (-100, "3863"),
+    (-1000, "3903e7"),
+    (1.1, "fb3ff199999999999a"),
+    (1.0e300, "fb7e37e43c8800759c"),
+    (-4.1, "fbc010666666666666"),
+    (False, "f4"),
+    (True, "f5"),
+    (None, "f6"),
+    (b"", "40"),
+    (b"\x01\x02\x03\x04", "4401020304"),
+    ("", "60"),
+    ("a", "6161"),
+    ("IETF", "6449455446"),
+    ('"\\', "62225c"),
+    ("\u00fc", "62c3bc"),
+    ("\u6c34", "63e6b0b4"),
+    ("\U00010151", "64f0908591"),
+    ([], "80"),
+    ([1, 2, 3], "83010203"),
+    ([1, [2, 3], [4, 5]], "8301820203820405"),
+    (
+        list(range(1, 26)),
+        "98190102030405060708090a0b0c0d0e0f101112131415161718181819",
+    ),
+    ({}, "a0"),
+    ({"a": 1, "b": [2, 3]}, "a26161016162820203"),
+    (["a", {"b": "c"}], "826161a161626163"),
+    (
+        {"a": "A", "b": "B", "c": "C", "d": "D", "e": "E"},
+        "a56161614161626142616361436164614461656145",
+    ),
+]
+
+
+@pytest.mark.parametrize(("value", "encoded"), RFC_8949_EXAMPLES)
+def test_encode_rfc_examples(value: object, encoded: str) -> None:
+    """Test encoding the RFC examples."""
+    assert cbor_bytes(value).hex() == encoded
+
+
+@pytest.mark.parametrize(("value", "encoded"), RFC_8949_EXAMPLES)
+def test_decode_rfc_examples(value: object, encoded: str) -> None:
+    """Test the decoder of the tests with the RFC examples."""
+    assert cbor_loads(bytes.fromhex(encoded)) == value
+
+
+def test_decode_half_and_single_precision() -> None:
+    """Test decoding the floats which are not encoded."""
+    assert cbor_loads(bytes.fromhex("f93c00")) == 1.0
+    assert cbor_loads(bytes.fromhex("fa47c35000")) == 100000.0
+
+
+def test_encode_converts_like_json() -> None:
+    """Test the objects which are not native are converted like in JSON."""
+    state = State("light.kitchen", "on", {"color": _Color.RED})
+    assert cbor_loads(
+        cbor_bytes(
+            {
+                "color": _Color.RED,
+                "time": datetime(2024, 1, 1, tzinfo=UTC),
+                "tuple": (1, 2),
+                "set": {3},
+                "path": Path("/config"),
+                "point": _Point(1, 2),
+                "state": state,
+                1: "int key",
+            }
+        )
+    ) == {
+        "color": "red",
+        "time": "2024-01-01T00:00:00+00:00",
+        "tuple": [1, 2],
+        "set": [3],
+        "path": "/config",
+        "point": {"x": 1, "y": 2},
+        "state": {
+            **state.as_dict(),
+            "context": dict(state.as_dict()["context"]),
+        },
+        "1": "int key",
+    }
+
+
+def test_compressed_state_cbor() -> None:
+    """Test the CBOR key value pair of a compressed state."""
+    state = State("light.kitchen", "on", {"brightness": 100})
+    assert cbor_loads(b"\xa1" + state.as_compressed_state_cbor) == {
+        "light.kitchen": state.as_compressed_state
+    }
+
+
+def test_encode_unsupported() -> None:
+    """Test encoding objects which cannot be encoded."""
+    with pytest.raises(TypeError):
+        cbor_bytes({"object": object()})
+    with pytest.raises(TypeError):
+        cbor_bytes(2**64)
+
+
+@pytest.mark.parametrize("data", ["1a000f42", "62c3", "8301", "0000", "fc"])
+def test_decode_invalid(data: str) -> None:
+    """Test decoding truncated or invalid data."""
+    with pytest.raises(CBORDecodeError):
+        cbor_loads(bytes.fromhex(data))